@@ -13,7 +13,7 @@ from .core.Projection import Projection
 from .inputs import *
 from .core.Dendrite import Dendrite
 from .core.Random import Uniform, DiscreteUniform, Normal, LogNormal, Gamma, Exponential, Binomial
-from .core.IO import save, load, load_parameter, load_parameters, save_parameters
+from .core.IO import save, load, load_parameter, load_parameters, save_parameters, checkpoint, restore
 from .core.Utils import sparse_random_matrix, sparse_delays_from_weights
 from .core.Monitor import *
 from .core.Network import Network, parallel_run
@@ -36,7 +36,7 @@ Warning: Cython modules can not be imported. If you are installing ANNarchy, thi
 """)
 
 # ANNarchy compilation
-from .generator import compile
+from .generator import compile, clear_compile_cache
 
 # several setup() arguments can be set on command-line
 from ANNarchy.generator.CmdLineArgParser import CmdLineArgParser
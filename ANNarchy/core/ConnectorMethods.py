@@ -9,7 +9,6 @@ import numpy as np
 
 from ANNarchy.core.Random import RandomDistribution, DiscreteUniform
 from ANNarchy.core.PopulationView import PopulationView
-from ANNarchy.parser.report.LatexParser import _process_random
 from ANNarchy.intern.ConfigManagement import get_global_config
 from ANNarchy.intern import Messages
 
@@ -18,6 +17,13 @@ try:
 except Exception as e:
     Messages._print(e)
 
+def _process_random(val):
+    "Transforms a connector attribute (weights, delays) into a string representation"
+    if isinstance(val, RandomDistribution):
+        return val.latex()
+    else:
+        return str(val)
+
 ################################
 ## Connector methods
 ################################
@@ -42,6 +42,10 @@ def clear(functions:bool=True, neurons:bool=True, synapses:bool=True, constants:
         check_profile_results()
         Profiler().disable_profiling()
 
+    # Forget the networks still compiled in the background
+    from ANNarchy.generator.Compiler import _pending_compilations
+    _pending_compilations.clear()
+
     # Reinitialize initial state
     NetworkManager().clear()
 
@@ -53,6 +57,7 @@ def check_profile_results():
         Profiler().print_profile()
 
         Profiler().store_cpp_time_as_csv()
+        Profiler().store_build_report()
 
 def reset(populations:bool=True, projections:bool=False, synapses:bool=False, monitors:bool=True, net_id:int=0):
     """
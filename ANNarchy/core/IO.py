@@ -9,8 +9,10 @@ from ANNarchy.core import Global
 from ANNarchy.core.Constant import Constant
 from ANNarchy.intern.NetworkManager import NetworkManager
 from ANNarchy.intern.GlobalObjects import GlobalObjectManager
+from ANNarchy.intern.ConfigManagement import _check_paradigm
 from ANNarchy.intern import Messages
 
+from copy import deepcopy
 import os
 import pickle
 import numpy as np
@@ -545,6 +547,94 @@ def load(filename:str, populations:bool=True, projections:bool=True, pickle_enco
                 proj._load_proj_data(desc[proj.name])
 
 
+def checkpoint(filename:str, net_id:int=0) -> None:
+    """
+    Saves the complete state of the simulation, so that it can be resumed later with ``restore()``.
+
+    Contrary to ``save()``, which only stores the parameters, variables and connectivity, the checkpoint contains the whole state of the C++ simulation core: current time step, random number generators of all threads, delayed outputs and pending synaptic events, spike histories and refractory states, internal cursors of inputs such as ``TimedArray`` or ``SpikeSourceArray``, progress of ``Schedule`` objects and the data recorded by the monitors. A simulation restored from a checkpoint continues bit-identically, e.g. to resume a long simulation interrupted by the preemption of the compute node:
+
+    ```python
+    # Same script as for the first run: definition of the network and compile()
+    ann.compile()
+
+    if os.path.exists('checkpoint.data'):
+        ann.restore('checkpoint.data')
+
+    while ann.get_current_step() < nb_steps:
+        ann.simulate(1000.)
+        ann.checkpoint('checkpoint.data')
+    ```
+
+    The network has to be defined by the same script (populations, projections and monitors created in the same order, same ``dt`` and number of threads), only the data is stored. The file is pickled as for ``save()`` (gzip-compressed if the extension is '.gz') and can only be restored on the same architecture. The attribute updates registered by ``set_every()`` are not stored and have to be registered again after ``restore()``.
+
+    Only available for CPU simulations.
+
+    :param filename: filename, may contain relative or absolute path.
+    """
+    if not _check_paradigm("openmp"):
+        Messages._error("checkpoint(): the state of the simulation can only be stored for CPU simulations.")
+
+    if os.path.splitext(filename)[1] in ['.mat', '.npz']:
+        Messages._error("checkpoint(): the checkpoints can not be stored in the Matlab or Numpy formats.")
+
+    cy_instance = NetworkManager().cy_instance(net_id=net_id)
+    if cy_instance is None:
+        Messages._error("checkpoint(): the network is not compiled yet.")
+
+    data = {
+        'checkpoint': True,
+        # The connectivity may have been modified by structural plasticity
+        'projections': _net_description(populations=False, projections=True, net_id=net_id),
+        # Recording periods are managed by the Python monitors
+        'monitors': [
+            (deepcopy(m._recorded_variables), deepcopy(m._last_recorded_variables))
+            for m in NetworkManager().get_monitors(net_id=net_id)
+        ],
+        # Everything else is stored by the C++ core
+        'state': cy_instance.get_state(),
+    }
+    _save_data(filename, data)
+
+def restore(filename:str, pickle_encoding:str=None, net_id:int=0) -> None:
+    """
+    Restores the complete state of the simulation stored by ``checkpoint()``.
+
+    The network must have been compiled by the same script as the one which created the checkpoint, see ``checkpoint()``.
+
+    :param filename: the filename with relative or absolute path.
+    :param pickle_encoding: optional parameter provided to the pickle.load() method. If set to None the default is used.
+    """
+    if not _check_paradigm("openmp"):
+        Messages._error("restore(): the state of the simulation can only be restored for CPU simulations.")
+
+    cy_instance = NetworkManager().cy_instance(net_id=net_id)
+    if cy_instance is None:
+        Messages._error("restore(): the network is not compiled yet.")
+
+    desc = _load_data(filename, pickle_encoding)
+    if desc is None:
+        Messages._error("restore(): unable to read the file", filename)
+
+    if not 'checkpoint' in desc.keys():
+        Messages._error("restore():", filename, "was not created by checkpoint().")
+
+    monitors = NetworkManager().get_monitors(net_id=net_id)
+    if len(monitors) != len(desc['monitors']):
+        Messages._error("restore(): the checkpoint was created by a network with", len(desc['monitors']), "monitors.")
+
+    # Connectivity
+    for proj in NetworkManager().get_projections(net_id=net_id):
+        if proj.name in desc['projections'].keys():
+            proj._load_proj_data(desc['projections'][proj.name])
+
+    # C++ state, the structure of the network is checked before anything is modified
+    if not cy_instance.set_state(desc['state']):
+        Messages._error("restore(): the checkpoint", filename, "does not match the current network.")
+
+    for monitor, (recorded, last_recorded) in zip(monitors, desc['monitors']):
+        monitor._recorded_variables = recorded
+        monitor._last_recorded_variables = last_recorded
+
 def _net_description(populations, projections, net_id=0):
     """
     Returns a dictionary containing the requested network data.
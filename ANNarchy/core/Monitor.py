@@ -383,12 +383,15 @@ class Monitor :
 
         :param variables: (list of) variables. By default, a dictionary with all variables is returned.
         :param keep: defines if the content in memory for each variable should be kept (default: False).
-        :param reshape: transforms the second axis of the array to match the population's geometry (default: False).
+        :param reshape: transforms the second axis of the array to match the population's geometry (default: False). For a population of a batched network, the array has the shape (time, batch, neurons) when False.
         :return: Recorded variables
         """
 
         def reshape_recording(self, data):
             if not reshape:
+                # Batched networks: the second axis is the instance
+                if isinstance(self.object, Population) and self.object._batch > 1 and data.ndim == 2:
+                    return data.reshape((data.shape[0], self.object._batch, -1))
                 return data
             else:
                 return data.reshape((data.shape[0],) + self.object.geometry)
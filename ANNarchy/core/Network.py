@@ -81,14 +81,45 @@ class Network :
     t2, n2 = net2.get(m).raster_plot()
     ```
     
+    When passing ``batch=N`` to the constructor, the network simulates N independent instances of the added objects
+    in a single library. Each population gains a leading batch dimension (its geometry becomes ``(N,) + geometry``),
+    so that one call to ``simulate()`` advances all instances and the population attributes or the recordings of
+    ``Monitor.get()`` have a batch axis:
+
+    ```python
+    pop = ann.Population(10, ann.Izhikevich)
+    proj = ann.Projection(pop, pop, 'exc')
+    proj.connect_fixed_probability(0.1, 1.0)
+    m = ann.Monitor(pop, 'v')
+
+    net = ann.Network(batch=100)
+    net.add([pop, proj, m])
+    net.compile()
+    net.get(pop).a = np.repeat(np.linspace(0.01, 0.1, 100), 10) # one value per instance
+    net.simulate(1000.)
+
+    v = net.get(m).get('v') # shape (time, 100, 10)
+    ```
+
+    The connectivity of a projection is created once for a single instance and shared by all instances, while
+    each instance has its own neural and synaptic variables. The neurons of instance ``b`` have the ranks
+    ``b * size`` to ``(b+1) * size - 1`` in the batched population. Population-wide parameters (``: population``)
+    and projection-wide parameters (``: projection``) are common to all instances, models with global variables
+    or global operations (``mean(r)``...) can therefore not be batched.
+
     :param everything: defines if all existing populations and projections should be automatically added (default: False).   
+    :param batch: number of independent instances of the network simulated together (default: 1).
     """
 
-    def __init__(self, everything:bool=False):
+    def __init__(self, everything:bool=False, batch:int=1):
 
         self.id = NetworkManager().add_network(self)
         self.everything = everything
 
+        if not isinstance(batch, int) or batch < 1:
+            Messages._error('Network(): batch must be a positive integer.')
+        self.batch = batch
+
         Simulate._callbacks.append([])
         Simulate._callbacks_enabled.append(True)
         
@@ -163,9 +194,16 @@ class Network :
 
         TODO: instead of creating copies by object construction, one should check if deepcopy works ...
         """
+        if self.batch > 1:
+            self._check_batch(obj)
+
         if isinstance(obj, Population):
             # Create a copy
-            pop = obj._copy()
+            if self.batch > 1:
+                pop = Population(geometry=(self.batch,) + obj.geometry, neuron=obj.neuron_type, name=obj.name, stop_condition=obj.stop_condition, storage_order=obj._storage_order, update_period=obj.update_period, copied=True)
+                pop._batch = self.batch
+            else:
+                pop = obj._copy()
 
             # Remove the object created by _copy from the global network
             NetworkManager()._remove_last_item_from_list(net_id=0, list_name='populations')
@@ -174,7 +212,7 @@ class Network :
             pop.id = obj.id
             pop.name = obj.name
             pop.class_name = obj.class_name
-            pop.init = obj.init
+            pop.init = obj.init if self.batch == 1 else {name: self._batched_value(value, obj.size) for name, value in obj.init.items()}
             pop.enabled = obj.enabled
             if not obj.enabled: # Also copy the enabled state:
                 pop.disable()
@@ -192,12 +230,12 @@ class Network :
             try:
                 pre_pop = self.get(obj.pre)
                 if isinstance(obj.pre, PopulationView):
-                    pre = PopulationView(population=pre_pop.population, ranks=obj.pre.ranks)
+                    pre = PopulationView(population=pre_pop.population, ranks=self._batched_ranks(obj.pre))
                 else:
                     pre = pre_pop
                 post_pop = self.get(obj.post)
                 if isinstance(obj.post, PopulationView):
-                    post = PopulationView(population=post_pop.population, ranks=obj.post.ranks)
+                    post = PopulationView(population=post_pop.population, ranks=self._batched_ranks(obj.post))
                 else:
                     post = post_pop
             except:
@@ -214,6 +252,13 @@ class Network :
             proj.name = obj.name
             proj.init = obj.init
 
+            # The connectivity of a single instance is replicated for each instance
+            if self.batch > 1:
+                proj.init = {name: list(value) * self.batch if isinstance(value, (list, np.ndarray)) else value for name, value in obj.init.items()}
+                proj._batch = self.batch
+                proj._batch_pre = obj.pre
+                proj._batch_post = obj.post
+
             # Copy the connectivity properties if the projection is not already set
             if proj._connection_method is None:
                 proj._store_connectivity(method=obj._connection_method, args=obj._connection_args, delay=obj._connection_delay, storage_format=obj._storage_format, storage_order=obj._storage_order)
@@ -287,6 +332,34 @@ class Network :
             # Add the copy to the local network (the monitor writes itself already in the right network)
             self.monitors.append(m)
 
+    def _check_batch(self, obj):
+        "Checks that *obj* can be replicated in a batched network."
+        if isinstance(obj, BoldMonitor) or (isinstance(obj, (Population, Projection)) and type(obj) not in [Population, Projection]):
+            Messages._error('Network(batch=...): specific populations, projections and monitors like', type(obj).__name__, 'can not be batched.')
+
+        if isinstance(obj, Population):
+            description = obj.neuron_type.description
+            if any(var['locality'] == 'global' for var in description['variables']) or len(description['global_operations']) > 0:
+                Messages._error('Network(batch=...): the neuron model of', obj.name, 'uses global variables or global operations, which would be shared by all instances.')
+
+        elif isinstance(obj, Projection):
+            description = obj.synapse_type.description
+            if any(var['locality'] == 'global' for var in description['variables']) or \
+               len(description['pre_global_operations']) > 0 or len(description['post_global_operations']) > 0:
+                Messages._error('Network(batch=...): the synapse model of', obj.name, 'uses global variables or global operations, which would be shared by all instances.')
+
+    def _batched_ranks(self, view):
+        "Returns the ranks of the PopulationView *view* in all instances of a batched network."
+        if self.batch == 1:
+            return view.ranks
+        return [b * view.population.size + rk for b in range(self.batch) for rk in view.ranks]
+
+    def _batched_value(self, value, size):
+        "Repeats the initial value of a local attribute for each instance of a batched network."
+        if isinstance(value, (list, np.ndarray)) and np.array(value).size == size:
+            return np.tile(np.array(value).flatten(), self.batch)
+        return value
+
     def get(self, obj):
         """
         Returns the local Population, Projection or Monitor corresponding to the provided argument.
@@ -321,7 +394,7 @@ class Network :
         elif isinstance(obj, PopulationView):
             for pop in self.populations:
                 if pop.id == obj.id:
-                    return PopulationView(pop, obj.ranks) # Create on the fly?
+                    return PopulationView(pop, self._batched_ranks(obj)) # Create on the fly?
         elif isinstance(obj, Projection):
             for proj in self.projections:
                 if proj.id == obj.id:
@@ -348,7 +421,10 @@ class Network :
                 annarchy_json:str="",
                 silent:bool=False,
                 debug_build:bool=False,
-                profile_enabled:bool=False):
+                profile_enabled:bool=False,
+                asynchronous:bool=False,
+                optimize:str=None,
+                pgo_warmup=None) -> "CompilationHandle":
         """
         Compiles the network.
 
@@ -359,9 +435,12 @@ class Network :
         :param cuda_config: dictionary defining the CUDA configuration for each population and projection.
         :param annarchy_json: compiler flags etc are stored in a .json file normally placed in the home directory. With this flag one can directly assign a file location.
         :param silent: defines if the "Compiling... OK" should be printed.
+        :param asynchronous: if True, the code is compiled in the background and a handle is returned, see ``compile()``.
+        :param optimize: 'lto' or 'pgo' to enable link-time or profile-guided optimization, see ``compile()``.
+        :param pgo_warmup: duration in ms or function performing the warm-up simulation of ``optimize='pgo'``, e.g. ``lambda: net.simulate(100.)``.
 
         """
-        Compiler.compile(directory=directory, clean=clean, silent=silent, debug_build=debug_build, add_sources=add_sources, extra_libs=extra_libs, compiler=compiler, compiler_flags=compiler_flags, cuda_config=cuda_config, annarchy_json=annarchy_json, profile_enabled=profile_enabled, net_id=self.id)
+        return Compiler.compile(directory=directory, clean=clean, silent=silent, debug_build=debug_build, add_sources=add_sources, extra_libs=extra_libs, compiler=compiler, compiler_flags=compiler_flags, cuda_config=cuda_config, annarchy_json=annarchy_json, profile_enabled=profile_enabled, asynchronous=asynchronous, optimize=optimize, pgo_warmup=pgo_warmup, net_id=self.id)
 
     def simulate(self, duration:float, measure_time:bool=False):
         """
@@ -547,6 +626,23 @@ class Network :
         """
         IO.save(filename, populations, projections, self.id)
 
+    def checkpoint(self, filename:str):
+        """
+        Saves the complete state of the simulation by calling ANNarchy.core.IO.checkpoint().
+
+        :param filename: filename, may contain relative or absolute path.
+        """
+        IO.checkpoint(filename, net_id=self.id)
+
+    def restore(self, filename:str, pickle_encoding:str=None):
+        """
+        Restores the complete state of the simulation by calling ANNarchy.core.IO.restore().
+
+        :param filename: filename, may contain relative or absolute path.
+        :param pickle_encoding: optional parameter provided to the pickle.load() method. If set to None the default is used.
+        """
+        IO.restore(filename, pickle_encoding=pickle_encoding, net_id=self.id)
+
 def parallel_run(
         method, 
         networks:list=None, 
@@ -3,12 +3,13 @@
 :license: GPLv2, see LICENSE for details.
 """
 
-from ANNarchy.parser.AnalyseNeuron import analyse_neuron
+from ANNarchy.parser import DescriptionCache
 from ANNarchy.core.PopulationView import PopulationView
 from ANNarchy.intern.ConfigManagement import get_global_config
 from ANNarchy.intern.GlobalObjects import GlobalObjectManager
 from ANNarchy.intern import Messages
 import numpy as np
+import time
 
 class Neuron :
     """
@@ -22,13 +23,14 @@ class Neuron :
     :param reset: changes to the variables after a spike (only for spiking neurons).
     :param axon_reset: changes to the variables after an axonal spike (only for spiking neurons).
     :param refractory: refractory period of a neuron after a spike (only for spiking neurons).
+    :param passive: declares that the neurons keep their state once they received no input during a complete step, e.g. relay neurons (``r = sum(exc)``) or integrators without leak. With ``setup(skip_inactive=True)``, the update of such populations is skipped until inputs arrive.
     :param name: name of the neuron type (used for reporting only).
     :param description: short description of the neuron type (used for reporting).
     """
     # Default name and description for reporting
     _default_names = {'rate': "Rate-coded neuron", 'spike': "Spiking neuron"}
 
-    def __init__(self, parameters:str="", equations:str="", spike:str=None, axon_spike:str=None, reset:str=None, axon_reset:str=None, refractory:str = None, functions:str=None, name:str="", description:str="", extra_values:dict={} ):
+    def __init__(self, parameters:str="", equations:str="", spike:str=None, axon_spike:str=None, reset:str=None, axon_reset:str=None, refractory:str = None, functions:str=None, passive:bool=False, name:str="", description:str="", extra_values:dict={} ):
 
         # Store the parameters and equations
         self.parameters = parameters
@@ -39,6 +41,7 @@ class Neuron :
         self.reset = reset
         self.axon_reset = axon_reset
         self.refractory = refractory
+        self.passive = passive
         self.extra_values = extra_values
 
         # Find the type of the neuron
@@ -71,7 +74,11 @@ class Neuron :
     def _analyse(self):
         # Analyse the neuron type
         if not self.description:
-            self.description = analyse_neuron(self)
+            t0 = time.time()
+            from ANNarchy.parser.AnalyseNeuron import analyse_neuron # imports sympy
+            self.description = DescriptionCache.analyse(self, analyse_neuron)
+            # reported by compile() when profiling is enabled
+            self._analysis_times = (t0, time.time())
 
     def __repr__(self):
         if self.type == 'rate':
@@ -31,6 +31,7 @@ class Population :
     :param neuron: `Neuron`instance. It can be user-defined or a built-in model.
     :param name: unique name of the population (optional, it defaults to `pop0`, `pop1`, etc).
     :param stop_condition: a single condition on a neural variable which can stop the simulation whenever it is true.
+    :param update_period: period (in ms, multiple of ``dt``) at which the neural equations are integrated, using the period as step size (rate-coded neurons only). By default, the neurons are updated at each step. The inputs are only taken into account at the update steps.
     """
 
     def __init__(self, 
@@ -39,6 +40,7 @@ class Population :
                  name:str = None, 
                  stop_condition:str = None, 
                  storage_order:str = 'post_to_pre', 
+                 update_period:float = None,
                  copied = False):
 
         # Check if the network has already been compiled
@@ -103,6 +105,15 @@ class Population :
         # Store the stop condition
         self.stop_condition = stop_condition
 
+        # Multi-rate integration
+        if update_period is not None:
+            if self.neuron_type.type == 'spike':
+                Messages._error('Population(): update_period is only available for rate-coded neurons.')
+            if update_period < get_global_config('dt') or abs(round(update_period/get_global_config('dt')) * get_global_config('dt') - update_period) > 1e-6:
+                Messages._error('Population(): update_period must be a multiple of dt, received', update_period)
+        self.update_period = update_period
+        "Period (in ms) of the neural updates, None if the neurons are updated at each step."
+
         # Attribute a name if not provided
         self.id = NetworkManager().number_populations(net_id=0)
         self.class_name = 'pop'+str(self.id)
@@ -182,15 +193,21 @@ class Population :
         # Recorded variables
         self._monitor = None
 
+        # Schedules of attribute updates (see Schedule)
+        self._schedules = []
+
         # Is overwritten by SpecificPopulations
         self._specific_template = {}
 
         # Storage order. TODO: why?
         self._storage_order = storage_order
 
+        # Number of instances in a batched network, see Network(batch=...)
+        self._batch = 1
+
     def _copy(self):
         "Returns a copy of the population when creating networks. Internal use only."
-        return Population(geometry=self.geometry, neuron=self.neuron_type, name=self.name, stop_condition=self.stop_condition, storage_order=self._storage_order, copied=True)
+        return Population(geometry=self.geometry, neuron=self.neuron_type, name=self.name, stop_condition=self.stop_condition, storage_order=self._storage_order, update_period=self.update_period, copied=True)
 
     def _generate(self):
         "Overriden by specific populations to generate the code."
@@ -214,7 +231,7 @@ class Population :
 
         if Profiler().enabled:
             t2 = time.time()
-            Profiler().add_entry(t1, t2, "pop"+str(self.id), "instantiate")
+            Profiler().add_phase(t1, t2, "instantiate", self.name, "instantiate")
 
     def _init_attributes(self):
         """ Method used after compilation to initialize the attributes."""
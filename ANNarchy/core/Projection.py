@@ -38,6 +38,7 @@ class Projection :
     :param synapse: A `Synapse` instance.
     :param name: Unique name of the projection (optional, it defaults to ``proj0``, ``proj1``, etc).
     :param disable_omp: Especially for small- and mid-scale sparse spiking networks, the parallelization of spike propagation is not scalable and disabled by default. It can be enabled by setting this parameter to `False`.
+    :param weight_dtype: storage precision of the weights (``'float32'`` or ``'float64'``), if it should differ from the precision set in ``setup()``. The post-synaptic potentials are still accumulated with the global precision. Single attributes of a synapse can be stored in single precision with the flag ``float``. Non-plastic weights using the ``lil`` format can also be quantized (``'int8'`` or ``'int16'``, with one scale per post-synaptic neuron), the weights read from Python are then the dequantized values.
     """
 
     def __init__(self, 
@@ -47,6 +48,7 @@ class Projection :
                  synapse: Synapse = None, 
                  name:str = None, 
                  disable_omp:bool = True, 
+                 weight_dtype:str = None,
                  copied:bool = False):
 
         # Check if the network has already been compiled
@@ -118,6 +120,12 @@ class Projection :
         # Analyse the parameters and variables
         self.synapse_type._analyse()
 
+        # Storage precision of the weights (mixed-precision or quantized weights)
+        self.weight_dtype = weight_dtype
+        self._weight_quantization = None
+        if weight_dtype is not None:
+            self._set_weight_dtype(weight_dtype)
+
         # Create a default name
         self.id = NetworkManager().number_projections(net_id=0)
         if name:
@@ -170,6 +178,11 @@ class Projection :
         self._connector = None
         self._lil_connectivity = None
 
+        # Batched networks: number of instances and pre-/post-synaptic populations of a single instance
+        self._batch = 1
+        self._batch_pre = None
+        self._batch_post = None
+
         # Default configuration for connectivity
         self._storage_format = "lil"
         self._storage_order = "post_to_pre"
@@ -185,6 +198,9 @@ class Projection :
         self.connector_name = "Specific"
         self.connector_description = "Specific"
 
+        # Schedules of attribute updates (see Schedule)
+        self._schedules = []
+
         # Overwritten by derived classes, to add
         # additional code
         self._specific_template = {}
@@ -225,6 +241,10 @@ class Projection :
             else:
                 self._no_split_matrix = get_global_config('disable_split_matrix')
 
+        # Quantized weights are only implemented for the non-partitioned LIL format
+        if self._weight_quantization is not None:
+            self._no_split_matrix = True
+
         # In particular for spiking models, the parallelization on the
         # inner or outer loop can make a performance difference
         if self._no_split_matrix:
@@ -262,7 +282,7 @@ class Projection :
 
     def _copy(self, pre, post):
         "Returns a copy of the projection when creating networks.  Internal use only."
-        copied_proj = Projection(pre=pre, post=post, target=self.target, synapse=self.synapse_type, name=self.name, disable_omp=self.disable_omp, copied=True)
+        copied_proj = Projection(pre=pre, post=post, target=self.target, synapse=self.synapse_type, name=self.name, disable_omp=self.disable_omp, weight_dtype=self.weight_dtype, copied=True)
 
         # these flags are modified during connect_XXX called before Network()
         copied_proj._single_constant_weight = self._single_constant_weight
@@ -307,7 +327,7 @@ class Projection :
 
         if Profiler().enabled:
             t2 = time.time()
-            Profiler().add_entry(t1, t2, "proj"+str(self.id), "instantiate")
+            Profiler().add_phase(t1, t2, "instantiate", self.name, "instantiate")
 
     def _init_attributes(self):
         """
@@ -329,7 +349,7 @@ class Projection :
                     reason is that there was not enough memory available.
         """
         # Local import to prevent circular import (HD: 28th June 2021)
-        from ANNarchy.generator.Utils import cpp_connector_available
+        from ANNarchy.generator.Utils import cpp_connector_available, cpp_pattern_available
 
         # Sanity check
         if not self._connection_method:
@@ -344,11 +364,17 @@ class Projection :
             cy_wrapper = getattr(module, 'proj'+str(self.id)+'_wrapper')
             self.cyInstance = cy_wrapper()
 
+        # Batched networks: the connectivity of a single instance is replicated
+        if self._batch > 1:
+            return self.cyInstance.init_from_lil_connectivity(self._batched_connectivity())
+
         # Check if there is a specialized CPP connector
         if not cpp_connector_available(self.connector_name, self._storage_format, self._storage_order):
             # No default connector -> initialize from LIL
             if self._lil_connectivity:
                 return self.cyInstance.init_from_lil_connectivity(self._lil_connectivity)
+            elif cpp_pattern_available(self):
+                return self._connect_cpp_pattern()
             else:
                 return self.cyInstance.init_from_lil_connectivity(self._connection_method(*((self.pre, self.post,) + self._connection_args)))
 
@@ -424,9 +450,87 @@ class Projection :
                 # This should never happen ...
                 Messages._error("No initialization for CPP-connector defined ...")
 
+    def _connect_cpp_pattern(self):
+        """
+        Creates the connectivity pattern with the generic C++ implementation (ConnectivityPatterns.hpp),
+        see generator.Utils.cpp_pattern_available(). The weights and delays are either constant or
+        drawn in C++ from the distribution with the parameters given here.
+        """
+        if get_global_config('verbose'):
+            print("Use generic CPP-side implementation of", self.connector_name, "pattern for ProjStruct"+str(self.id))
+
+        def dist_args(value):
+            "parameters of the distribution or the constant value"
+            if isinstance(value, RandomDistribution):
+                return value.get_cpp_args()
+            return value, value
+
+        def geometry(pop):
+            return list(pop.geometry) if isinstance(pop.geometry, tuple) else [pop.geometry]
+
+        args = self._connection_args
+
+        if self.connector_name == "One-to-One":
+            return self.cyInstance.one_to_one(self.post.ranks, self.pre.ranks, *dist_args(args[0]), *dist_args(args[1]))
+
+        elif self.connector_name == "All-to-All":
+            return self.cyInstance.all_to_all(self.post.ranks, self.pre.ranks, args[2], *dist_args(args[0]), *dist_args(args[1]))
+
+        elif self.connector_name == "Random":
+            return self.cyInstance.fixed_probability(self.post.ranks, self.pre.ranks, args[0], args[3], *dist_args(args[1]), *dist_args(args[2]))
+
+        elif self.connector_name in ["Random Convergent", "Random Divergent"]:
+            number = args[0]
+            candidates = self.pre.size if self.connector_name == "Random Convergent" else self.post.size
+            if number > candidates:
+                Messages._error(self.name + ": the number of synapses per neuron (" + str(number) + ") is higher than the size of the population (" + str(candidates) + ").")
+
+            if self.connector_name == "Random Convergent":
+                return self.cyInstance.fixed_number_pre(self.post.ranks, self.pre.ranks, number, args[3], *dist_args(args[1]), *dist_args(args[2]))
+            else:
+                return self.cyInstance.fixed_number_post(self.post.ranks, self.pre.ranks, number, args[3], *dist_args(args[1]), *dist_args(args[2]))
+
+        elif self.connector_name == "Gaussian":
+            amp, sigma, delays, limit, allow_self_connections = args[:5]
+            return self.cyInstance.gaussian(geometry(self.pre), geometry(self.post), amp, sigma, limit, allow_self_connections, *dist_args(delays))
+
+        elif self.connector_name == "Difference-of-Gaussian":
+            amp_pos, sigma_pos, amp_neg, sigma_neg, delays, limit, allow_self_connections = args[:7]
+            return self.cyInstance.dog(geometry(self.pre), geometry(self.post), amp_pos, sigma_pos, amp_neg, sigma_neg, limit, allow_self_connections, *dist_args(delays))
+
+        else:
+            # This should never happen ...
+            Messages._error("No initialization for the generic CPP-connector defined ...")
+
         # should be never reached ...
         return False
 
+    def _batched_connectivity(self):
+        """
+        Returns the connectivity of a projection in a batched network: the pattern is created once between
+        the populations of a single instance and repeated along the diagonal for each instance.
+        """
+        from ANNarchy.cython_ext import LILConnectivity
+
+        if self._lil_connectivity:
+            lil = self._lil_connectivity
+        else:
+            lil = self._connection_method(*((self._batch_pre, self._batch_post,) + self._connection_args))
+
+        pre_size = self._batch_pre.population.size if isinstance(self._batch_pre, PopulationView) else self._batch_pre.size
+        post_size = self._batch_post.population.size if isinstance(self._batch_post, PopulationView) else self._batch_post.size
+
+        # Conversion of the vectors into Python lists is done only once
+        post_ranks, pre_ranks, weights, delays = lil.post_rank, lil.pre_rank, lil.w, lil.delay
+        dt = get_global_config('dt')
+
+        batched = LILConnectivity()
+        for b in range(self._batch):
+            for post_rk, pre_rk, w, d in zip(post_ranks, pre_ranks, weights, delays):
+                batched.push_back(post_rk + b * post_size, [rk + b * pre_size for rk in pre_rk], w, [step * dt for step in d])
+
+        return batched
+
     def _store_connectivity(self, method, args, delay, storage_format, storage_order):
         """
         Store connectivity data. This function is called from cython_ext.Connectors module.
@@ -474,6 +578,9 @@ class Projection :
         if storage_order == "auto":
             self._storage_order = self._automatic_order_selection()
 
+        if self._weight_quantization is not None and (self._storage_format != "lil" or self._storage_order != "post_to_pre"):
+            Messages._error("Projection", self.name, ": quantized weights (weight_dtype='" + str(self.weight_dtype) + "') are only available for storage_format='lil'.")
+
         # Analyse the delay
         if isinstance(delay, (int, float)): # Uniform delay
             self.max_delay = round(delay/get_global_config('dt'))
@@ -585,6 +692,10 @@ class Projection :
         Messages._info("Automatic matrix order selection for", self.name, ":", storage_order)
         return storage_order
 
+    def _has_quantized_weights(self):
+        "If the weights are stored as integers with one scale per row (weight_dtype='int8' or 'int16')"
+        return self._weight_quantization is not None and not self._has_single_weight()
+
     def _has_single_weight(self):
         "If a single weight should be generated instead of a LIL"
         is_cpu = get_global_config('paradigm')=="openmp"
@@ -893,6 +1004,35 @@ class Projection :
             else:
                 self.cyInstance.set_global_attribute(attribute, value, ctype)
 
+    def _set_weight_dtype(self, weight_dtype):
+        """
+        Changes the C++ type of the weights in the synapse description.
+        """
+        if not _check_paradigm("openmp"):
+            Messages._error("Projection: the weight_dtype argument is only available for CPU simulations.")
+
+        try:
+            dtype = np.dtype(weight_dtype).name
+        except TypeError:
+            dtype = None
+
+        # Quantized weights: the description is unchanged, only the C++ storage differs (see QuantizedMatrix)
+        if dtype in ['int8', 'int16']:
+            if self.synapse_type.description['plasticity'] or get_global_config('structural_plasticity'):
+                Messages._error("Projection: quantized weights (weight_dtype='" + dtype + "') are only available for non-plastic synapses.")
+            self._weight_quantization = dtype + "_t"
+            return
+
+        if not dtype in ['float32', 'float64']:
+            Messages._error("Projection: weight_dtype must be either 'float32', 'float64', 'int8' or 'int16', not", weight_dtype)
+        ctype = {'float32': 'float', 'float64': 'double'}[dtype]
+
+        for var in self.synapse_type.description['parameters'] + self.synapse_type.description['variables']:
+            if var['name'] == 'w':
+                if not var['ctype'] in ['float', 'double']:
+                    Messages._error("Projection: weight_dtype can not be used for weights of type", var['ctype'])
+                var['ctype'] = ctype
+
     def _get_attribute_cpp_type(self, attribute):
         """
         Determine C++ data type for a given attribute
@@ -1317,6 +1457,14 @@ class Projection :
                     desc[var] = self.cyInstance.get_semiglobal_attribute_all(var, ctype)
                 else:
                     desc[var] = self.cyInstance.get_global_attribute(var, ctype) # linear array or single constant
+
+                # Attributes stored in single precision keep their dtype in the file
+                if ctype == "float":
+                    if ragged_list and var in self.synapse_type.description['local'] and not (var == "w" and self._has_single_weight()):
+                        for idx in range(len(desc[var])):
+                            desc[var][idx] = np.array(desc[var][idx], dtype=np.float32)
+                    else:
+                        desc[var] = np.array(desc[var], dtype=np.float32)
             except:
                 Messages._warning('Can not save the attribute ' + var + ' in the projection.')
 
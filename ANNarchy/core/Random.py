@@ -119,6 +119,9 @@ class DiscreteUniform(RandomDistribution):
     def latex(self):
         return "$\\mathcal{U}$(" + str(self.min) + ', ' + str(self.max) + ')'
 
+    def get_cpp_args(self):
+        return self.min, self.max
+
 
 class Normal(RandomDistribution):
     """
@@ -6,14 +6,17 @@
 from ANNarchy.intern.NetworkManager import NetworkManager
 from ANNarchy.core import Global
 from ANNarchy.core.Population import Population
+from ANNarchy.core.Projection import Projection
 
 from ANNarchy.intern.Profiler import Profiler
+from ANNarchy.intern.ConfigManagement import _check_paradigm
 from ANNarchy.intern import Messages
 
 
 from math import ceil
 import time
 import operator
+import numpy as np
 
 # Callbacks
 _callbacks = [[]]
@@ -44,6 +47,10 @@ def simulate(
     if Profiler().enabled:
         t0 = time.time()
 
+    # Networks compiled with compile(asynchronous=True) are instantiated on first use
+    from ANNarchy.generator.Compiler import _wait_for_compilation
+    _wait_for_compilation(net_id)
+
     if not NetworkManager().cy_instance(net_id=net_id):
         Messages._error('simulate(): the network is not compiled yet.')
 
@@ -109,6 +116,10 @@ def simulate_until(max_duration:float, population: Population | list[Population]
     :param measure_time: Defines whether the simulation time should be printed (default=False).
     :return: the actual duration of the simulation in milliseconds.
     """
+    # Networks compiled with compile(asynchronous=True) are instantiated on first use
+    from ANNarchy.generator.Compiler import _wait_for_compilation
+    _wait_for_compilation(net_id)
+
     if NetworkManager().cy_instance(net_id):
         Messages._error('simulate_until(): the network is not compiled yet.')
 
@@ -131,6 +142,10 @@ def step(net_id=0):
     """
     Performs a single simulation step (duration = `dt`).
     """
+    # Networks compiled with compile(asynchronous=True) are instantiated on first use
+    from ANNarchy.generator.Compiler import _wait_for_compilation
+    _wait_for_compilation(net_id)
+
     if not NetworkManager().cy_instance(net_id):
         Messages._error('simulate_until(): the network is not compiled yet.')
 
@@ -214,6 +229,115 @@ class every :
         return f
 
 
+class set_every :
+    """
+    Periodically sets an attribute of a population or projection to predefined values.
+
+    Contrary to a callback declared with ``every``, the updates are registered in the C++ core when ``simulate()`` is called and applied inside the simulation loop, without returning to Python. Example of setting a new input every 10 ms:
+
+    ```python
+    inputs = np.random.uniform(0.0, 1.0, (1000, pop.size))
+    set_every(pop, 'I', inputs, period=10.)
+
+    simulate(10000.)
+    ```
+
+    The n-th update (``n`` being 0 at the first update of each call to ``simulate()``, as for ``every``) sets the attribute to ``values[n]``. Once all values are used, the attribute is not modified anymore. ``values`` can also be a function of ``n`` returning the value, it is evaluated for all updates when ``simulate()`` is called and can therefore not depend on the state of the network.
+
+    Each value can be a single value or an array of the size of the attribute (number of neurons, of post-synaptic neurons for semiglobal attributes or a list of dendrites for local synaptic attributes).
+
+    The updates are applied at the beginning of the corresponding simulation step, before the callbacks declared with ``every`` for the same time are called. Only the callbacks declared with ``every`` interrupt the simulation.
+
+    :param obj: population or projection.
+    :param attribute: name of the parameter or variable.
+    :param values: list or array of values, or function of ``n`` returning a value.
+    :param period: interval in ms between two updates.
+    :param offset: delay of the updates within the period (see ``every``).
+    :param wait: allows to wait for a certain amount of time (in ms) before starting the updates.
+    """
+
+    def __init__(self, obj:Population | Projection, attribute:str, values, period:float, offset:float=0., wait:float=0.0, net_id:int=0) -> None:
+
+        if not _check_paradigm("openmp"):
+            Messages._error("set_every(): the attribute updates are only available for CPU simulations.")
+
+        if not isinstance(obj, (Population, Projection)):
+            Messages._error("set_every(): the object must be a Population or a Projection.")
+
+        if not attribute in obj.attributes:
+            Messages._error("set_every():", obj.name, "has no attribute", attribute)
+
+        self.obj = obj
+        self.attribute = attribute
+        self.values = values
+
+        self.period = max(float(period), Global.dt())
+        self.offset = min(float(offset), self.period)
+        self.wait = max(float(wait), 0.0)
+        _callbacks[net_id].append(self)
+
+    def _value(self, n):
+        """
+        Value of the n-th update, None if all values were used.
+        """
+        if callable(self.values):
+            return self.values(n)
+        if n < len(self.values):
+            return self.values[n]
+        return None
+
+    def _schedule(self, step, n):
+        """
+        Registers the n-th update for the given step in the C++ core.
+        """
+        value = self._value(n)
+        if value is None:
+            return
+
+        if self.obj.cyInstance is None or not hasattr(self.obj.cyInstance, "schedule_attribute"):
+            Messages._error("set_every(): the attributes of", self.obj.name, "can not be updated by the C++ core.")
+
+        try:
+            locality, value, ctype = _attribute_update(self.obj, self.attribute, value)
+            self.obj.cyInstance.schedule_attribute(-1, step, self.attribute, locality, value, ctype)
+
+        except Exception as e:
+            Messages._debug(e)
+            Messages._error("set_every(): the value of the update", n, "of", self.obj.name + "." + self.attribute, "does not have the right size.")
+
+
+def _attribute_update(obj, attribute, value):
+    """
+    Returns the locality, the value in the form expected by the generic setters of the C++ core and
+    the C++ type of an attribute update (set_every, Schedule). Single values are expanded to the size
+    of the attribute.
+    """
+    ctype = obj._get_attribute_cpp_type(attribute)
+
+    if isinstance(obj, Population):
+        if attribute in obj.neuron_type.description['local']:
+            locality = 'local'
+            value = np.full(obj.size, value) if np.ndim(value) == 0 else np.array(value).reshape(obj.size)
+        else:
+            locality = 'global'
+
+    else:
+        description = obj.synapse_type.description
+        if attribute == "w" and obj._has_single_weight():
+            locality = 'global'
+        elif attribute in description['local']:
+            locality = 'local'
+            if np.ndim(value) == 0:
+                value = [np.full(obj.cyInstance.dendrite_size(idx), value) for idx in range(len(obj.post_ranks))]
+        elif attribute in description['semiglobal']:
+            locality = 'semiglobal'
+            value = np.full(len(obj.post_ranks), value) if np.ndim(value) == 0 else np.array(value).reshape(len(obj.post_ranks))
+        else:
+            locality = 'global'
+
+    return locality, value, ctype
+
+
 def _simulate_with_callbacks(duration, progress_bar, net_id=0):
     """
     Replaces simulate() when call_backs are defined.
@@ -237,6 +361,16 @@ def _simulate_with_callbacks(duration, progress_bar, net_id=0):
     # Sort the times to be sure they are in the right order.
     times = sorted(times, key=operator.itemgetter(0))
 
+    # The attribute updates are applied by the C++ core, only the
+    # Python callbacks interrupt the simulation.
+    if any(isinstance(callback, set_every) for _, callback, _ in times):
+        NetworkManager().cy_instance(net_id).clear_timed_updates()
+        for time, callback, n in times:
+            if isinstance(callback, set_every):
+                callback._schedule(time, n)
+        NetworkManager().cy_instance(net_id).apply_timed_updates()
+        times = [(time, callback, n) for time, callback, n in times if not isinstance(callback, set_every)]
+
     for time, callback, n in times:
         # Advance the simulation to the desired time
         if time != Global.get_current_step(net_id):
@@ -3,10 +3,12 @@
 :license: GPLv2, see LICENSE for details.
 """
 
+import time
+
 from ANNarchy.intern.ConfigManagement import get_global_config
 from ANNarchy.intern.GlobalObjects import GlobalObjectManager
 from ANNarchy.intern import Messages
-from ANNarchy.parser.AnalyseSynapse import analyse_synapse
+from ANNarchy.parser import DescriptionCache
 
 class Synapse :
     """
@@ -98,7 +100,11 @@ class Synapse :
     def _analyse(self):
         # Analyse the synapse type
         if not self.description:
-            self.description = analyse_synapse(self)
+            t0 = time.time()
+            from ANNarchy.parser.AnalyseSynapse import analyse_synapse # imports sympy
+            self.description = DescriptionCache.analyse(self, analyse_synapse)
+            # reported by compile() when profiling is enabled
+            self._analysis_times = (t0, time.time())
 
     def __add__(self, synapse):
         Messages._error('adding synapse models is not implemented yet.')
@@ -37,6 +37,9 @@ cdef class LILConnectivity:
     # Method to validate a LIL object
     cpdef validate(self)
 
+    # Insert the rows created by the parallel patterns
+    cdef _push_rows(self, vector[int]& post_ranks, vector[vector[int]]& rows, weights, delays)
+
     # pre-defined pattern
     cpdef all_to_all(self, pre, post, weights, delays, allow_self_connections)
     cpdef one_to_one(self, pre, post, weights, delays)
@@ -45,3 +48,4 @@ cdef class LILConnectivity:
     cpdef fixed_number_post(self, pre, post, int number, weights, delays, allow_self_connections)
     cpdef gaussian(self, pre_pop, post_pop, float amp, float sigma, delays, limit, allow_self_connections)
     cpdef dog(self, pre_pop, post_pop, float amp_pos, float sigma_pos, float amp_neg, float sigma_neg, delays, limit, allow_self_connections)
+    cdef _distance_pattern(self, pre_pop, post_pop, int profile, float amp_pos, double denominator_pos, float amp_neg, double denominator_neg, double threshold, double max_distance, delays, allow_self_connections)
@@ -2,11 +2,17 @@
 
 from libcpp.vector cimport vector
 from libcpp cimport bool
+from libcpp.algorithm cimport sort
+from libcpp.unordered_set cimport unordered_set
+from libcpp.random cimport mt19937, uniform_int_distribution, uniform_real_distribution, geometric_distribution
+from libc.stdint cimport uint32_t, uint64_t
 
 import numpy as np
 cimport numpy as np
+cimport cython
+from cython.parallel cimport prange
 
-from libc.math cimport exp, fabs, ceil
+from libc.math cimport exp, fabs, ceil, floor, sqrt, log, INFINITY
 
 import ANNarchy
 from ANNarchy.core import Global
@@ -237,40 +243,17 @@ cdef class LILConnectivity:
     #####################################################
     cpdef all_to_all(self, pre, post, weights, delays, allow_self_connections):
         " Implementation of the all-to-all pattern "
-        cdef double weight
-        cdef int r_post, size_pre, i
-        cdef list tmp, post_ranks, pre_ranks
-        cdef vector[int] r
-        cdef vector[double] w, d
+        cdef vector[int] post_ranks = post.ranks.tolist()
+        cdef vector[int] pre_ranks = pre.ranks.tolist()
+        cdef vector[vector[int]] rows = vector[vector[int]](post_ranks.size())
+        cdef bool allow_self = allow_self_connections
+        cdef int num_threads = _num_threads()
+        cdef int i, n_post = post_ranks.size()
 
-        # Retríeve ranks
-        post_ranks = post.ranks.tolist()
-        pre_ranks = pre.ranks.tolist()
+        for i in prange(n_post, nogil=True, num_threads=num_threads, schedule='dynamic', chunksize=16):
+            _all_to_all_row(pre_ranks, post_ranks[i], allow_self, rows[i])
 
-        for r_post in post_ranks:
-            # List of pre ranks
-            tmp = [i for i  in pre_ranks]
-            if not allow_self_connections:
-                try:
-                    tmp.remove(r_post)
-                except: # was not in the list
-                    pass
-            r = tmp
-            size_pre = len(tmp)
-            # Weights
-            if isinstance(weights, (int, float)):
-                weight = weights
-                w = vector[double](1, weight)
-            elif isinstance(weights, RandomDistribution):
-                w = weights.get_list_values(size_pre)
-            # Delays
-            if isinstance(delays, (float, int)):
-                d = vector[double](1, delays)
-            elif isinstance(delays, RandomDistribution):
-                d = delays.get_list_values(size_pre)
-
-            # Create the dendrite
-            self.push_back(r_post, r, w, d)
+        self._push_rows(post_ranks, rows, weights, delays)
 
     cpdef one_to_one(self, pre, post, weights, delays):
         """ Cython implementation of the one-to-one pattern."""
@@ -294,276 +277,180 @@ cdef class LILConnectivity:
 
     cpdef fixed_probability(self, pre, post, probability, weights, delays, allow_self_connections):
         " Implementation of the fixed-probability pattern "
-        cdef double weight
-        cdef int r_post, r_pre, size_pre, max_size_pre
-        cdef list post_ranks
-        cdef vector[int] r
-        cdef vector[double] w, d
-        cdef np.ndarray random_values, tmp, pre_ranks
+        cdef vector[int] post_ranks = post.ranks.tolist()
+        cdef vector[int] pre_ranks = pre.ranks.tolist()
+        cdef vector[vector[int]] rows = vector[vector[int]](post_ranks.size())
+        cdef double p = probability
+        cdef bool allow_self = allow_self_connections
+        cdef uint64_t seed = _draw_seed()
+        cdef int num_threads = _num_threads()
+        cdef int i, n_post = post_ranks.size()
 
-        # Retríeve ranks
-        post_ranks = post.ranks.tolist()
-        pre_ranks = pre.ranks
-        max_size_pre = len(pre.ranks)
-
-        for r_post in post_ranks:
-            # List of pre ranks
-            random_values = np.random.random(max_size_pre)
-            tmp = pre_ranks[random_values < probability]
-            if not allow_self_connections:
-                tmp = tmp[tmp != r_post]
-
-            # sort the indices to prevent irregular accesses
-            r = np.sort(tmp)
-            size_pre = tmp.size
-            if size_pre == 0:
-                continue
+        for i in prange(n_post, nogil=True, num_threads=num_threads, schedule='dynamic', chunksize=16):
+            _fixed_probability_row(seed, pre_ranks, post_ranks[i], p, allow_self, rows[i])
 
-            # Weights
-            if isinstance(weights, (int, float)):
-                weight = weights
-                w = vector[double](1, weight)
-            elif isinstance(weights, RandomDistribution):
-                w = weights.get_list_values(size_pre)
-            # Delays
-            if isinstance(delays, (float, int)):
-                d = vector[double](1, delays)
-            elif isinstance(delays, RandomDistribution):
-                d = delays.get_list_values(size_pre)
-            # Create the dendrite
-            self.push_back(r_post, r, w, d)
+        self._push_rows(post_ranks, rows, weights, delays)
 
     cpdef fixed_number_pre(self, pre, post, int number, weights, delays, allow_self_connections):
-        cdef double weight
-        cdef int r_post, r_pre, size_pre
-        cdef list pre_ranks, post_ranks
-        cdef vector[int] r
-        cdef vector[double] w, d
-
-        # Retríeve ranks
-        post_ranks = post.ranks.tolist()
-        pre_ranks = pre.ranks.tolist()
-
-        for r_post in post_ranks:
-            # List of pre ranks
-            r = np.random.choice(pre_ranks, size=number, replace=False)
-            if len(r) == 0:
-                continue
-            if not allow_self_connections:
-                while r_post in list(r): # the post index is in the list
-                    r = np.random.choice(pre_ranks, size=number, replace=False)
-
-            # sort the indices to prevent irregular accesses
-            r = np.sort(r)
-
-            # Weights
-            if isinstance(weights, (int, float)):
-                weight = weights
-                w = vector[double](1, weight)
-            elif isinstance(weights, RandomDistribution):
-                w = weights.get_list_values(number)
-            # Delays
-            if isinstance(delays, (float, int)):
-                d = vector[double](1, delays)
-            elif isinstance(delays, RandomDistribution):
-                d = delays.get_list_values(number)
-            # Create the dendrite
-            self.push_back(r_post, r, w, d)
+        " Implementation of the fixed-number-pre pattern "
+        cdef vector[int] post_ranks = post.ranks.tolist()
+        cdef vector[int] pre_ranks = pre.ranks.tolist()
+        cdef vector[int] pre_index = _rank_index(pre_ranks)
+        cdef vector[vector[int]] rows = vector[vector[int]](post_ranks.size())
+        cdef bool allow_self = allow_self_connections
+        cdef uint64_t seed = _draw_seed()
+        cdef int num_threads = _num_threads()
+        cdef int i, k, self_idx, n_post = post_ranks.size()
+
+        if number > <int>pre_ranks.size():
+            ANNarchy.intern.Messages._error("fixed_number_pre: the number of synapses per neuron (" + str(number) + ") is higher than the size of the pre-synaptic population (" + str(pre_ranks.size()) + ").")
+
+        for i in prange(n_post, nogil=True, num_threads=num_threads, schedule='dynamic', chunksize=16):
+            self_idx = -1
+            if not allow_self and post_ranks[i] < <int>pre_index.size():
+                self_idx = pre_index[post_ranks[i]]
+            _fixed_number_row(seed, pre_ranks, post_ranks[i], self_idx, number, rows[i])
+            # positions -> ranks, sorted to prevent irregular accesses
+            for k in range(rows[i].size()):
+                rows[i][k] = pre_ranks[rows[i][k]]
+            sort(rows[i].begin(), rows[i].end())
+
+        self._push_rows(post_ranks, rows, weights, delays)
 
     cpdef fixed_number_post(self, pre, post, int number, weights, delays, allow_self_connections):
-        cdef double weight
-        cdef int r_post, r_pre, size_pre
-        cdef list pre_ranks, post_ranks
-        cdef list pre_r
-        cdef dict rk_mat
-        cdef vector[int] r
-        cdef vector[int] tmp
+        " Implementation of the fixed-number-post pattern "
+        cdef vector[int] post_ranks = post.ranks.tolist()
+        cdef vector[int] pre_ranks = pre.ranks.tolist()
+        cdef vector[int] post_index = _rank_index(post_ranks)
+        cdef vector[vector[int]] targets = vector[vector[int]](pre_ranks.size())
+        cdef vector[vector[int]] rows = vector[vector[int]](post_ranks.size())
+        cdef bool allow_self = allow_self_connections
+        cdef uint64_t seed = _draw_seed()
+        cdef int num_threads = _num_threads()
+        cdef int j, k, self_idx, n_pre = pre_ranks.size()
+
+        # Post-synaptic targets of each pre-synaptic neuron
+        for j in prange(n_pre, nogil=True, num_threads=num_threads, schedule='dynamic', chunksize=16):
+            self_idx = -1
+            if not allow_self and pre_ranks[j] < <int>post_index.size():
+                self_idx = post_index[pre_ranks[j]]
+            _fixed_number_row(seed, post_ranks, pre_ranks[j], self_idx, number, targets[j])
+
+        # Build the backward matrix in the order of the pre-synaptic ranks
+        for j in range(n_pre):
+            for k in range(targets[j].size()):
+                rows[targets[j][k]].push_back(pre_ranks[j])
+
+        self._push_rows(post_ranks, rows, weights, delays)
+
+    cdef _push_rows(self, vector[int]& post_ranks, vector[vector[int]]& rows, weights, delays):
+        """
+        Adds the rows in the order of *post_ranks*, empty rows are skipped. The
+        random weights and delays are drawn at once for all synapses.
+        """
+        cdef size_t i, k, offset = 0, nb_synapses = 0
+        cdef bool random_weights = isinstance(weights, RandomDistribution)
+        cdef bool random_delays = isinstance(delays, RandomDistribution)
+        cdef double[::1] w_values, d_values
         cdef vector[double] w, d
 
-        # Retrieve ranks
-        post_ranks = post.ranks.tolist()
-        pre_ranks = pre.ranks.tolist()
+        for i in range(rows.size()):
+            nb_synapses += rows[i].size()
 
-        # Build the backward matrix
-        rk_mat = {i: [] for i in post_ranks}
-        for r_pre in pre_ranks:
-            if number >= len(post_ranks):
-                tmp = post_ranks
-            else:
-                tmp = np.random.choice(post_ranks, size=number, replace=False)
-                if not allow_self_connections:
-                    # the post index is in the list, redraw
-                    while r_pre in list(tmp):   # TODO: maybe a find() would be better
-                        tmp = np.random.choice(post_ranks, size=number, replace=False)
-            for i in tmp:
-                rk_mat[i].append(r_pre)
-
-        # Create the dendrites
-        for r_post in post_ranks:
-            # List of pre ranks
-            r = rk_mat[r_post]
-            size_pre = len(r)
-            if size_pre == 0:
+        if random_weights:
+            w_values = np.ascontiguousarray(weights.get_values(nb_synapses), dtype=np.float64)
+        else:
+            w = vector[double](1, weights)
+        if random_delays:
+            d_values = np.ascontiguousarray(delays.get_values(nb_synapses), dtype=np.float64)
+        else:
+            d = vector[double](1, delays)
+
+        for i in range(rows.size()):
+            if rows[i].size() == 0:
                 continue
-            # Weights
-            if isinstance(weights, (int, float)):
-                weight = weights
-                w = vector[double](1, weight)
-            elif isinstance(weights, RandomDistribution):
-                w = weights.get_list_values(size_pre)
-            # Delays
-            if isinstance(delays, (float, int)):
-                d = vector[double](1, delays)
-            elif isinstance(delays, RandomDistribution):
-                d = delays.get_list_values(size_pre)
+            if random_weights:
+                w.resize(rows[i].size())
+                for k in range(rows[i].size()):
+                    w[k] = w_values[offset + k]
+            if random_delays:
+                d.resize(rows[i].size())
+                for k in range(rows[i].size()):
+                    d[k] = d_values[offset + k]
+            offset += rows[i].size()
+
             # Create the dendrite
-            self.push_back(r_post, r, w, d)
+            self.push_back(post_ranks[i], rows[i], w, d)
 
     cpdef gaussian(self, pre_pop, post_pop, float amp, float sigma, delays, limit, allow_self_connections):
-        cdef float distance, value
-        cdef int post, pre, pre_size, post_size, c, nb_synapses, pre_dim, post_dim
-        cdef tuple pre_coord, post_coord
-        cdef tuple pre_geometry, post_geometry
-        cdef list ranks, values
+        " Implementation of the gaussian pattern "
+        cdef double denominator = 2.0*sigma**2
+        cdef double threshold = limit * amp
 
-        cdef vector[int] r
-        cdef vector[double] w, d
-
-        # Retrieve simulation time step
-        dt = get_global_config('dt')
-
-        # Population sizes
-        pre_geometry = pre_pop.geometry
-        post_geometry = post_pop.geometry
-        if isinstance(pre_geometry, int):
-            pre_size = pre_geometry
-            pre_dim = 1
-        else:
-            pre_dim = len(pre_geometry)
-            pre_size = 1
-            for c in pre_geometry:
-                pre_size  = pre_size * c
-        if isinstance(post_geometry, int):
-            post_size = post_geometry
-            post_dim = 1
-        else:
-            post_dim = len(post_geometry)
-            post_size = 1
-            for c in post_geometry:
-                post_size  = post_size * c
-
-        # Create the projection data
-        for post in list(range(post_size)):
-            ranks = []
-            values = []
-            if post_dim == 1:
-                post_coord = (post/float(post_size-1), )
-            elif post_dim == 2:
-                post_coord = Coordinates.get_normalized_2d_coord(post, post_geometry)
-            elif post_dim == 3:
-                post_coord = Coordinates.get_normalized_3d_coord(post, post_geometry)
-            else:
-                post_coord = Coordinates.get_normalized_coord(post, post_geometry)
-            for pre in list(range(pre_size)):
-                if not allow_self_connections and pre==post:
-                    continue
-                if pre_dim == 1:
-                    pre_coord = (pre/float(pre_size-1), )
-                    distance = Coordinates.comp_dist1D(pre_coord, post_coord)
-                elif pre_dim == 2:
-                    pre_coord = Coordinates.get_normalized_2d_coord(pre, pre_geometry)
-                    distance = Coordinates.comp_dist2D(pre_coord, post_coord)
-                elif pre_dim == 3:
-                    pre_coord = Coordinates.get_normalized_3d_coord(pre, pre_geometry)
-                    distance = Coordinates.comp_dist3D(pre_coord, post_coord)
-                else:
-                    pre_coord = Coordinates.get_normalized_coord(pre, pre_geometry)
-                    distance = Coordinates.comp_distND(pre_coord, post_coord)
-                value = amp * exp(-distance/(2.0*sigma**2))
-                if value > limit * amp:
-                    ranks.append(pre)
-                    values.append(value)
-            nb_synapses = len(ranks)
-            r = ranks
-            w = values
-            if isinstance(delays, (float, int)):
-                d = vector[double](1, delays)
-            elif isinstance(delays, RandomDistribution):
-                d = delays.get_list_values(nb_synapses)
-            # Create the dendrite
-            self.push_back(post, r, w, d)
+        self._distance_pattern(pre_pop, post_pop, 0, amp, denominator, 0.0, 1.0, threshold,
+                               _cutoff_distance(amp, denominator, threshold),
+                               delays, allow_self_connections)
 
     cpdef dog(self, pre_pop, post_pop, float amp_pos, float sigma_pos, float amp_neg, float sigma_neg, delays, limit, allow_self_connections):
-        cdef float distance, value
-        cdef int post, pre, pre_size, post_size, c, nb_synapses, pre_dim, post_dim
-        cdef tuple pre_coord, post_coord
-        cdef tuple pre_geometry, post_geometry
-        cdef list ranks, values
-
+        " Implementation of the difference-of-gaussians pattern "
+        cdef double denominator_pos = 2.0*sigma_pos**2
+        cdef double denominator_neg = 2.0*sigma_neg**2
+        cdef double threshold = limit * fabs(amp_pos - amp_neg)
+
+        # |amp_pos * exp(-d/den_pos) - amp_neg * exp(-d/den_neg)| <= (|amp_pos| + |amp_neg|) * exp(-d/max(den_pos, den_neg))
+        self._distance_pattern(pre_pop, post_pop, 1, amp_pos, denominator_pos, amp_neg, denominator_neg, threshold,
+                               _cutoff_distance(fabs(amp_pos) + fabs(amp_neg), max(denominator_pos, denominator_neg), threshold),
+                               delays, allow_self_connections)
+
+    cdef _distance_pattern(self, pre_pop, post_pop, int profile, float amp_pos, double denominator_pos, float amp_neg, double denominator_neg, double threshold, double max_distance, delays, allow_self_connections):
+        """
+        Creates the synapses of the gaussian (profile=0) and dog (profile=1) patterns. Only the
+        pre-synaptic neurons within the cutoff distance (*max_distance*, squared normalized distance)
+        of each post-synaptic neuron are visited: they form a box in the regular grid of the
+        pre-synaptic population. The values are computed with the same precision as the
+        Coordinates module.
+        """
+        cdef int post, post_size, d, pre_dim, post_dim
+        cdef vector[int] pre_geometry, post_geometry
+        cdef vector[vector[double]] pre_axes, post_axes
+        cdef vector[double] post_coord
         cdef vector[int] r
-        cdef vector[double] w, d
+        cdef vector[double] w, d_values
+        cdef int self_rank
+
+        pre_geometry = [pre_pop.geometry] if isinstance(pre_pop.geometry, int) else list(pre_pop.geometry)
+        post_geometry = [post_pop.geometry] if isinstance(post_pop.geometry, int) else list(post_pop.geometry)
+        pre_dim = pre_geometry.size()
+        post_dim = post_geometry.size()
+        if post_dim < pre_dim:
+            ANNarchy.intern.Messages._error("The post-synaptic population must have at least as many dimensions as the pre-synaptic one.")
+
+        pre_axes = _normalized_axes(pre_geometry)
+        post_axes = _normalized_axes(post_geometry)
+
+        post_size = 1
+        for d in range(post_dim):
+            post_size *= post_geometry[d]
+
+        post_coord = vector[double](pre_dim, 0.0)
+        for post in range(post_size):
+            # normalized coordinates of the post-synaptic neuron, the first dimensions are compared
+            _unravel_coordinates(post, post_geometry, post_axes, post_coord)
+
+            r.clear()
+            w.clear()
+            self_rank = -1 if allow_self_connections else post
+            with nogil:
+                _distance_row(pre_geometry, pre_axes, post_coord, max_distance, self_rank,
+                              profile, amp_pos, denominator_pos, amp_neg, denominator_neg, threshold, r, w)
 
-        # Population sizes
-        pre_geometry = pre_pop.geometry
-        post_geometry = post_pop.geometry
-        if isinstance(pre_geometry, int):
-            pre_size = pre_geometry
-            pre_dim = 1
-        else:
-            pre_dim = len(pre_geometry)
-            pre_size = 1
-            for c in pre_geometry:
-                pre_size  = pre_size * c
-        if isinstance(post_geometry, int):
-            post_size = post_geometry
-            post_dim = 1
-        else:
-            post_dim = len(post_geometry)
-            post_size = 1
-            for c in post_geometry:
-                post_size  = post_size * c
-
-        # Create the projection data as LIL
-        for post in list(range(post_size)):
-            ranks = []
-            values = []
-            if post_dim == 1:
-                post_coord = (post/float(post_size-1), )
-            elif post_dim == 2:
-                post_coord = Coordinates.get_normalized_2d_coord(post, post_geometry)
-            elif post_dim == 3:
-                post_coord = Coordinates.get_normalized_3d_coord(post, post_geometry)
-            else:
-                post_coord = Coordinates.get_normalized_coord(post, post_geometry)
-            for pre in list(range(pre_size)):
-                if not allow_self_connections and pre==post:
-                    continue
-                if pre_dim == 1:
-                    pre_coord = (pre/float(pre_size-1), )
-                    distance = Coordinates.comp_dist1D(pre_coord, post_coord)
-                elif pre_dim == 2:
-                    pre_coord = Coordinates.get_normalized_2d_coord(pre, pre_geometry)
-                    distance = Coordinates.comp_dist2D(pre_coord, post_coord)
-                elif pre_dim == 3:
-                    pre_coord = Coordinates.get_normalized_3d_coord(pre, pre_geometry)
-                    distance = Coordinates.comp_dist3D(pre_coord, post_coord)
-                else:
-                    pre_coord = Coordinates.get_normalized_coord(pre, pre_geometry)
-                    distance = Coordinates.comp_distND(pre_coord, post_coord)
-                value = amp_pos * exp(-distance/(2.0*sigma_pos**2)) - amp_neg * exp(-distance/(2.0*sigma_neg**2))
-                if fabs(value) > limit * fabs(amp_pos - amp_neg):
-                    ranks.append(pre)
-                    values.append(value)
-            nb_synapses = len(ranks)
-            r = ranks
-            w = values
             if isinstance(delays, (float, int)):
-                d = vector[double](1, delays)
+                d_values = vector[double](1, delays)
             elif isinstance(delays, RandomDistribution):
-                d = delays.get_list_values(nb_synapses)
+                d_values = delays.get_list_values(r.size())
 
             # Create the dendrite
-            self.push_back(post, r, w, d)
+            self.push_back(post, r, w, d_values)
 
 cdef _get_weights_delays(int size, weights, delays):
 
@@ -583,3 +470,256 @@ cdef _get_weights_delays(int size, weights, delays):
         d = delays.get_list_values(size)
 
     return w, d
+
+##################################################
+### Distance-based patterns (gaussian, dog)   ####
+##################################################
+cdef vector[vector[double]] _normalized_axes(vector[int] geometry):
+    """
+    Normalized coordinates along each axis of a geometry. As in the Coordinates
+    module, they are rounded to single precision for 2D and 3D geometries.
+    """
+    cdef vector[vector[double]] axes = vector[vector[double]](geometry.size())
+    cdef bool single_precision = (geometry.size() == 2 or geometry.size() == 3)
+    cdef int d, c
+    cdef double norm
+
+    for d in range(geometry.size()):
+        axes[d] = vector[double](geometry[d], 0.0)
+        if geometry[d] < 2:
+            continue
+        for c in range(geometry[d]):
+            norm = c / <double>(geometry[d]-1)
+            axes[d][c] = <float>norm if single_precision else norm
+
+    return axes
+
+cdef void _unravel_coordinates(int rank, vector[int]& geometry, vector[vector[double]]& axes, vector[double]& coord) noexcept nogil:
+    """
+    Normalized coordinates of the neuron *rank* (row-major order), only the
+    first coord.size() dimensions are stored.
+    """
+    cdef int d
+    for d in range(geometry.size()-1, -1, -1):
+        if d < <int>coord.size():
+            coord[d] = axes[d][rank % geometry[d]]
+        rank = rank // geometry[d]
+
+cdef double _cutoff_distance(double scale, double denominator, double threshold):
+    """
+    Squared normalized distance beyond which scale * exp(-distance/denominator)
+    can not exceed threshold. A small margin covers the single precision of
+    the distances and values. The distance is not bounded if one of the
+    parameters is not positive.
+    """
+    if not (scale > 0.0 and denominator > 0.0 and threshold > 0.0):
+        return INFINITY
+    return denominator * (max(0.0, log(scale/threshold)) + 1e-6) + 1e-6
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _distance_row(vector[int]& geometry, vector[vector[double]]& axes, vector[double]& post_coord,
+                        double max_distance, int self_rank, int profile,
+                        float amp_pos, double denominator_pos, float amp_neg, double denominator_neg, double threshold,
+                        vector[int]& ranks, vector[double]& values) noexcept nogil:
+    """
+    Pre-synaptic ranks (ascending) and values of the gaussian (profile=0) or dog
+    (profile=1) pattern for one post-synaptic neuron. Only the box of the
+    pre-synaptic grid containing the cutoff distance is visited: the distances
+    along the last dimension are computed in one vectorizable loop before the
+    profile is evaluated.
+    """
+    cdef int dim = geometry.size()
+    cdef int last = dim - 1
+    cdef int d, c, k, base_rank, length
+    cdef double radius = sqrt(max_distance)
+    cdef double low, high, diff
+    cdef float value
+    cdef vector[int] lower = vector[int](dim, 0)
+    cdef vector[int] upper = vector[int](dim, 0)
+    cdef vector[int] index
+    cdef vector[float] partial = vector[float](dim, 0.0)
+    cdef vector[float] distances
+
+    # Box of the pre-synaptic neurons within the cutoff distance
+    for d in range(dim):
+        upper[d] = geometry[d] - 1
+        if max_distance == INFINITY or geometry[d] < 2:
+            continue
+        low = ceil((post_coord[d] - radius) * (geometry[d] - 1)) - 1.0
+        high = floor((post_coord[d] + radius) * (geometry[d] - 1)) + 1.0
+        if low > lower[d]:
+            lower[d] = <int>low
+        if high < upper[d]:
+            upper[d] = <int>high
+        if lower[d] > upper[d]:
+            return
+
+    # partial[d]: distance accumulated over the dimensions before d
+    index = lower
+    for d in range(last):
+        diff = axes[d][index[d]] - post_coord[d]
+        partial[d+1] = <float>(partial[d] + diff * diff)
+
+    length = upper[last] - lower[last] + 1
+    distances = vector[float](length, 0.0)
+
+    while True:
+        base_rank = 0
+        for d in range(last):
+            base_rank = (base_rank + index[d]) * geometry[d+1]
+
+        # Distances along the last dimension
+        for c in range(length):
+            diff = axes[last][lower[last] + c] - post_coord[last]
+            distances[c] = <float>(partial[last] + diff * diff)
+
+        # Profile
+        for c in range(length):
+            if base_rank + lower[last] + c == self_rank:
+                continue
+            if profile == 0:
+                value = amp_pos * exp(-distances[c]/denominator_pos)
+                if value > threshold:
+                    ranks.push_back(base_rank + lower[last] + c)
+                    values.push_back(value)
+            else:
+                value = amp_pos * exp(-distances[c]/denominator_pos) - amp_neg * exp(-distances[c]/denominator_neg)
+                if fabs(value) > threshold:
+                    ranks.push_back(base_rank + lower[last] + c)
+                    values.push_back(value)
+
+        # Next line of the box
+        d = last - 1
+        while d >= 0:
+            index[d] += 1
+            if index[d] <= upper[d]:
+                break
+            index[d] = lower[d]
+            d -= 1
+        if d < 0:
+            break
+        for k in range(d, last):
+            diff = axes[k][index[k]] - post_coord[k]
+            partial[k+1] = <float>(partial[k] + diff * diff)
+
+##################################################
+### Parallel construction of the rows         ####
+##################################################
+cdef inline uint32_t _row_seed(uint64_t seed, uint64_t row) noexcept nogil:
+    """
+    Seed of the random stream of a row (splitmix64 hash of the seed and the row
+    index), so that the rows do not depend on the thread creating them.
+    """
+    cdef uint64_t z = seed + (row + 1) * <uint64_t>0x9E3779B97F4A7C15
+    z = (z ^ (z >> 30)) * <uint64_t>0xBF58476D1CE4E5B9
+    z = (z ^ (z >> 27)) * <uint64_t>0x94D049BB133111EB
+    return <uint32_t>(z ^ (z >> 31))
+
+cdef uint64_t _draw_seed():
+    """
+    Seed of the random streams of a pattern, drawn from the global NumPy
+    generator so that setup(seed=...) still reproduces the connectivity.
+    """
+    return <uint64_t>np.random.randint(0, np.iinfo(np.int64).max, dtype=np.int64)
+
+cdef int _num_threads():
+    """
+    Number of threads building the rows, the ones of the simulation.
+    """
+    num_threads = get_global_config('num_threads')
+    return num_threads if num_threads is not None and num_threads > 0 else 1
+
+cdef void _sample_positions(mt19937& rng, int n, int k, vector[int]& positions) noexcept nogil:
+    """
+    Draws k distinct positions among n in ascending order: selection sampling
+    if k is large compared to n, Floyd's algorithm otherwise.
+    """
+    cdef uniform_real_distribution[double] unif = uniform_real_distribution[double](0.0, 1.0)
+    cdef uniform_int_distribution[int] position
+    cdef unordered_set[int] selected
+    cdef int j, t
+
+    positions.clear()
+    if k >= n:
+        for j in range(n):
+            positions.push_back(j)
+    elif 4 * k >= n:
+        j = 0
+        while j < n and <int>positions.size() < k:
+            if (n - j) * unif(rng) < k - <int>positions.size():
+                positions.push_back(j)
+            j += 1
+    else:
+        for j in range(n - k, n):
+            position = uniform_int_distribution[int](0, j)
+            t = position(rng)
+            if selected.count(t):
+                selected.insert(j)
+            else:
+                selected.insert(t)
+        for t in selected:
+            positions.push_back(t)
+        sort(positions.begin(), positions.end())
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _all_to_all_row(vector[int]& pre_ranks, int r_post, bool allow_self_connections, vector[int]& row) noexcept nogil:
+    cdef int j
+    row.reserve(pre_ranks.size())
+    for j in range(pre_ranks.size()):
+        if allow_self_connections or pre_ranks[j] != r_post:
+            row.push_back(pre_ranks[j])
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _fixed_probability_row(uint64_t seed, vector[int]& pre_ranks, int r_post, double probability, bool allow_self_connections, vector[int]& row) noexcept nogil:
+    cdef mt19937 rng = mt19937(_row_seed(seed, r_post))
+    cdef geometric_distribution[long] skip
+    cdef long j, n = pre_ranks.size()
+
+    if probability <= 0.0:
+        return
+
+    # the number of rejected candidates before the next synapse is geometric
+    skip = geometric_distribution[long](min(probability, 1.0))
+    j = skip(rng)
+    while j < n:
+        if allow_self_connections or pre_ranks[j] != r_post:
+            row.push_back(pre_ranks[j])
+        j += 1 + skip(rng)
+
+    # sort the indices to prevent irregular accesses
+    sort(row.begin(), row.end())
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _fixed_number_row(uint64_t seed, vector[int]& ranks, int rank, int self_idx, int number, vector[int]& positions) noexcept nogil:
+    """
+    Draws *number* positions among *ranks*, without the position *self_idx* if positive.
+    """
+    cdef mt19937 rng = mt19937(_row_seed(seed, rank))
+    cdef int k, n = ranks.size()
+
+    if self_idx >= 0:
+        n -= 1
+    _sample_positions(rng, n, number, positions)
+    if self_idx >= 0:
+        for k in range(positions.size()):
+            if positions[k] >= self_idx:
+                positions[k] += 1
+
+cdef vector[int] _rank_index(vector[int]& ranks):
+    """
+    Position of each rank in *ranks* (-1 if not contained).
+    """
+    cdef int i, max_rank = -1
+    for i in range(ranks.size()):
+        if ranks[i] > max_rank:
+            max_rank = ranks[i]
+
+    cdef vector[int] index = vector[int](max_rank + 1, -1)
+    for i in range(ranks.size()):
+        index[ranks[i]] = i
+    return index
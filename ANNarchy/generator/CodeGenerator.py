@@ -4,13 +4,14 @@
 """
 
 import time
+from textwrap import dedent
 import ANNarchy.core.Global as Global
 from ANNarchy.core.PopulationView import PopulationView
+from ANNarchy.core.Projection import Projection
 from ANNarchy.intern.Profiler import Profiler
 from ANNarchy.intern.ConfigManagement import get_global_config, _check_paradigm
 from ANNarchy.intern.GlobalObjects import GlobalObjectManager
 from ANNarchy.intern import Messages
-from ANNarchy.parser.Extraction import extract_functions
 
 from ANNarchy.generator.PyxGenerator import PyxGenerator
 from ANNarchy.generator.MonitorGenerator import MonitorGenerator
@@ -31,7 +32,7 @@ class CodeGenerator(object):
     OpenMP or sequential code is dependent on the number of
     threads.
     """
-    def __init__(self, annarchy_dir, populations, projections, net_id, cuda_config):
+    def __init__(self, annarchy_dir, populations, projections, net_id, cuda_config, task_scheduler=False):
         """
         Constructor initializes the PopulationGenerator and ProjectionGenerator
         class and stores the provided information for later use.
@@ -45,12 +46,19 @@ class CodeGenerator(object):
             * *projections*: list of projections
             * *cuda_config*: configuration dict for cuda. check the method
               _cuda_kernel_config for more details.
+            * *task_scheduler*: the single thread kernels are generated and the
+              simulation step is organized as a graph of OpenMP tasks (see
+              _body_task_graph).
         """
         self._net_id = net_id
         self._annarchy_dir = annarchy_dir
         self._populations = populations
         self._projections = projections
         self._cuda_config = cuda_config
+        self._task_scheduler = task_scheduler
+
+        # calls of the NUMA placement functions, filled by _generate_translation_units()
+        self._numa_placement_calls = ""
 
         # Profiling is optional, but if either Global.config["profiling"] set to True
         # or --profile was added on command line.
@@ -89,6 +97,9 @@ class CodeGenerator(object):
         self._pop_desc = []
         self._proj_desc = []
 
+        # C++ files which need to be compiled (besides the Cython extension)
+        self.translation_units = ['ANNarchy.cpp']
+
     def generate(self):
         """
         Generate code files and store them in target directory (located at
@@ -106,6 +117,9 @@ class CodeGenerator(object):
             * for each projection a seperate header file, contain semantic
               logic of a projection respectively synapse object (filename:
               proj<id>)
+            * for each population and projection a separate source file
+              containing the instance and the step functions (openMP only,
+              filename: pop<id>.cpp and proj<id>.cpp)
         """
         if Profiler().enabled:
             t0 = time.time()
@@ -134,15 +148,28 @@ class CodeGenerator(object):
 
         # Create all populations
         for pop in self._populations:
+            t_obj = time.time()
             self._pop_desc.append(self._popgen.header_struct(pop, self._annarchy_dir))
+            if Profiler().enabled:
+                Profiler().add_phase(t_obj, time.time(), "codegen", pop.name)
 
         # Create all projections
         for proj in self._projections:
+            t_obj = time.time()
             self._proj_desc.append(self._projgen.header_struct(proj, self._annarchy_dir))
+            if Profiler().enabled:
+                Profiler().add_phase(t_obj, time.time(), "codegen", proj.name)
+
+        # Time spent for the network (header, body and monitors)
+        t_net = time.time()
 
         # where all source files should take place
         source_dest = self._annarchy_dir+'/generate/net'+str(self._net_id)+'/'
 
+        # Move the step functions of each object into a separate file
+        if get_global_config('paradigm') == "openmp":
+            self._generate_translation_units(source_dest)
+
         # Generate header code for the analysed pops and projs
         if get_global_config('paradigm') == "openmp":
             with open(source_dest+'ANNarchy.h', 'w') as ofile:
@@ -176,9 +203,15 @@ class CodeGenerator(object):
         else:
             raise NotImplementedError
 
+        if Profiler().enabled:
+            Profiler().add_phase(t_net, time.time(), "codegen", "ANNarchy")
+
         # Generate cython code for the analysed pops and projs
+        t_pyx = time.time()
         with open(source_dest+'ANNarchyCore'+str(self._net_id)+'.pyx', 'w') as ofile:
             ofile.write(self._pyxgen.generate())
+        if Profiler().enabled:
+            Profiler().add_phase(t_pyx, time.time(), "cython", "generate")
 
         self._generate_file_overview(source_dest)
 
@@ -186,6 +219,210 @@ class CodeGenerator(object):
             t1 = time.time()
             Profiler().add_entry(t0, t1, "generate", "compile")
 
+    def _generate_translation_units(self, source_dest):
+        """
+        Generate one .cpp file per population and projection. Each file contains
+        the instance of the object and wrapper functions around the calls which
+        would otherwise be placed in singleStep(). As a result, the (inlined) update
+        methods of the objects are compiled in different translation units, which
+        can be processed in parallel by make.
+
+        The corresponding entries of the descriptor dictionaries are replaced by
+        calls of the wrapper functions, the wrappers are declared in ANNarchy.h.
+
+        Parameters:
+
+        * source_dest: path to folder where generated files are stored.
+        """
+        if get_global_config('num_threads') == 1:
+            args_decl = ""
+            args_call = ""
+        else:
+            args_decl = "const int tid, const int nt"
+            args_call = "tid, nt"
+
+        step_keys = ['compute_psp', 'rng_update', 'update', 'delay_update', 'post_event']
+
+        objects = [('pop', pop.id, desc) for pop, desc in zip(self._populations, self._pop_desc)]
+        objects += [('proj', proj.id, desc) for proj, desc in zip(self._projections, self._proj_desc)]
+
+        numa_placement = get_global_config('numa_placement') and get_global_config('num_threads') > 1
+
+        for (prefix, obj_id, desc), obj in zip(objects, list(self._populations) + list(self._projections)):
+            name = prefix + str(obj_id)
+
+            # Early exits if the object is inactive
+            if get_global_config('skip_inactive'):
+                step_functions, guards = self._activity_guards(obj)
+            else:
+                step_functions, guards = "", {}
+
+            # NUMA-aware placement of the data processed by each thread
+            placement = self._numa_placement(obj, name) if numa_placement else ""
+            if placement != "":
+                func_name = name + '_numa_placement'
+                args = "const int tid, const int nt, std::vector<long int>& bytes_per_node"
+                step_functions += BaseTemplate.omp_step_function_template % {
+                    'name': func_name,
+                    'args': args,
+                    'code': placement
+                }
+                desc['extern'] += "void %(name)s(%(args)s);\n" % {'name': func_name, 'args': args}
+                self._numa_placement_calls += "\t\t%(name)s(tid, global_num_threads, local_bytes);\n" % {'name': func_name}
+
+            for key in step_keys:
+                if key not in desc.keys() or desc[key].strip() == "":
+                    continue
+
+                func_name = name + '_' + key
+                step_functions += BaseTemplate.omp_step_function_template % {
+                    'name': func_name,
+                    'args': args_decl,
+                    'code': guards.get(key, "") + desc[key].rstrip()
+                }
+                desc['extern'] += "void %(name)s(%(args)s);\n" % {'name': func_name, 'args': args_decl}
+                desc[key] = "\t%(name)s(%(args)s);\n" % {'name': func_name, 'args': args_call}
+
+            # Registration of attribute updates (set_every, Schedule)
+            for sig in PyxGenerator._timed_update_signatures(obj):
+                step_functions += BaseTemplate.timed_update_template['all'] % sig
+                desc['extern'] += "void %(name)s_schedule_%(locality)s_%(ctype_name)s(const int schedule, const long int step, std::string name, %(cpp_type)s value);\n" % sig
+                if sig['locality'] == 'local' and prefix == 'pop':
+                    step_functions += BaseTemplate.timed_update_template['ranks'] % sig
+                    desc['extern'] += "void %(name)s_schedule_local_ranks_%(ctype_name)s(const int schedule, const long int step, std::string name, std::vector<int> ranks, std::vector<%(ctype)s> value);\n" % sig
+
+            with open(source_dest+name+'.cpp', 'w') as ofile:
+                ofile.write(BaseTemplate.omp_translation_unit_template % {
+                    'name': name,
+                    'instance': desc['instance'],
+                    'step_functions': step_functions
+                })
+
+            # the instance is now defined in the separate file
+            desc['instance'] = ""
+            self.translation_units.append(name+'.cpp')
+
+    def _numa_placement(self, obj, name):
+        """
+        NUMA-aware placement (setup(numa_placement=True)): code moving the data
+        processed by the thread *tid* to its memory node. The static partitions
+        of the OpenMP loops are reproduced by numa::place():
+
+        * populations: local attributes and weighted sums.
+        * LIL projections (rate-coded): rows of the connectivity and local attributes.
+        * LIL_P projections: the partition and the variable slices of the thread.
+
+        Other storage formats and specific objects are left unchanged.
+        """
+        code = ""
+        if obj._specific_template != {}:
+            return code
+
+        if isinstance(obj, Projection):
+            if obj._storage_format != "lil" or obj._storage_order != "post_to_pre":
+                return code
+
+            attributes = list(obj.synapse_type.description['local'])
+            if obj._has_single_weight() and 'w' in attributes:
+                attributes.remove('w')
+
+            if not obj._no_split_matrix:
+                # each partition is processed by one thread
+                code += "\tnuma::place(%(name)s.sub_matrices_[tid]->pre_rank, 0, 1, bytes_per_node);\n" % {'name': name}
+                for attr in attributes:
+                    code += "\tnuma::place(%(name)s.%(attr)s[tid], 0, 1, bytes_per_node);\n" % {'name': name, 'attr': attr}
+
+            elif obj.synapse_type.type == "rate":
+                # the rows are distributed over the threads
+                code += "\tnuma::place(%(name)s.pre_rank, tid, nt, bytes_per_node);\n" % {'name': name}
+                for attr in attributes:
+                    # quantized weights: the rows of integers are moved
+                    if attr == 'w' and obj._has_quantized_weights():
+                        attr = 'w.values()'
+                    code += "\tnuma::place(%(name)s.%(attr)s, tid, nt, bytes_per_node);\n" % {'name': name, 'attr': attr}
+
+        else:
+            attributes = list(obj.neuron_type.description['local'])
+            if obj.neuron_type.type == 'rate':
+                attributes += ['_sum_' + target for target in sorted(set(obj.targets))]
+            else:
+                attributes += ['g_' + target for target in sorted(set(obj.targets)) if 'g_' + target not in attributes]
+
+            for attr in attributes:
+                code += "\tnuma::place(%(name)s.%(attr)s, tid, nt, bytes_per_node);\n" % {'name': name, 'attr': attr}
+
+        return code
+
+    def _activity_guards(self, obj):
+        """
+        Activity-based skipping (setup(skip_inactive=True)): code placed at the
+        beginning of the functions called by singleStep() which returns early
+        when the object has nothing to compute:
+
+        * rate-coded projections (psp ``w*pre.r``, no delays) skip the weighted
+          sum while all presynaptic rates are zero.
+        * spiking projections (no delays, no continuous transmission) skip the
+          transmission while the presynaptic population emits no spike, and the
+          postsynaptic events while the postsynaptic population emits no spike.
+        * populations of passive neurons skip their update while they received
+          no input during the current and the previous step.
+
+        All threads evaluate the same conditions on data which is not modified
+        concurrently, the decisions are therefore consistent within the team.
+
+        Returns the declarations placed in the translation unit and a dictionary
+        associating the step function keys to the corresponding code.
+        """
+        guards = {}
+        declaration = ""
+        tpl = BaseTemplate.activity_guard_templates
+        float_prec = get_global_config('precision')
+
+        if obj._specific_template != {}:
+            return declaration, guards
+
+        if isinstance(obj, Projection):
+            pre = "pop%(id)s" % {'id': obj.pre.id}
+            post = "pop%(id)s" % {'id': obj.post.id}
+            no_delay = obj.max_delay <= 1
+
+            if obj.synapse_type.type == 'rate':
+                psp = obj.synapse_type.description['raw_psp'].replace(' ', '')
+                if no_delay and psp == "w*pre.r" and obj.synapse_type.operation == "sum":
+                    guards['compute_psp'] = tpl['silent_rate'] % {'pre': pre, 'float_prec': float_prec}
+            else:
+                continuous = 'raw_psp' in obj.synapse_type.description.keys()
+                if no_delay and not continuous and not obj.pre.neuron_type.axon_spike:
+                    guards['compute_psp'] = tpl['silent_spike'] % {'pre': pre}
+                guards['post_event'] = tpl['post_event'] % {'post': post}
+
+        elif obj.neuron_type.passive and len(obj.targets) > 0:
+            name = "pop%(id)s" % {'id': obj.id}
+            if obj.neuron_type.type == 'rate':
+                variables = ['_sum_' + target for target in sorted(set(obj.targets))]
+                no_spike = ""
+            elif obj.neuron_type.description['refractory'] or obj.neuron_type.axon_spike:
+                Messages._warning("Population", obj.name, ": passive neurons with a refractory period or axonal spikes are always updated.")
+                return declaration, guards
+            else:
+                variables = ['g_' + target for target in sorted(set(obj.targets))]
+                no_spike = " && %(name)s.spiked.empty()" % {'name': name}
+
+            no_input = " && ".join([tpl['no_input'] % {'name': name, 'var': var, 'float_prec': float_prec} for var in variables])
+            declaration = tpl['passive_decl'] % {
+                'name': name,
+                'threadprivate': "#pragma omp threadprivate(%(name)s_no_input)" % {'name': name} if get_global_config('num_threads') > 1 else ""
+            }
+            guards['update'] = tpl['passive'] % {
+                'name': name,
+                'no_input': no_input,
+                'no_spike': no_spike,
+                # the update modifies the inputs, all threads must have taken their decision before
+                'barrier': "    #pragma omp barrier" if get_global_config('num_threads') > 1 else ""
+            }
+
+        return declaration, guards
+
     def _generate_file_overview(self, source_dest):
         """
         Generate a logfile, where we log which Population/Projection object is stored in
@@ -352,6 +589,8 @@ class CodeGenerator(object):
         if GlobalObjectManager().number_functions() == 0:
             return ""
 
+        from ANNarchy.parser.Extraction import extract_functions
+
         # Attention CUDA: this definition will work only on host side.
         code = ""
         for _, func in GlobalObjectManager().get_functions():
@@ -556,14 +795,21 @@ void set_%(name)s(%(float_prec)s value) {
                 'post_event' : post_event,
                 'structural_plasticity': structural_plasticity,
                 'custom_constant': custom_constant,
-                'sp_spike_backward_view_update': sp_spike_backward_view_update
+                'sp_spike_backward_view_update': sp_spike_backward_view_update,
+                'numa_placement': self._numa_placement_calls,
+                'serialize_state': self._body_serialize_state()
             }
 
             # profiling
             base_dict.update(prof_dict)
 
             # complete code template
-            if get_global_config('num_threads') == 1:
+            if self._task_scheduler:
+                task_dependencies, task_graph = self._body_task_graph()
+                base_dict['task_dependencies'] = task_dependencies
+                base_dict['task_graph'] = task_graph
+                return BaseTemplate.omp_task_body_template % base_dict
+            elif get_global_config('num_threads') == 1:
                 return BaseTemplate.st_body_template % base_dict
             else:
                 return BaseTemplate.omp_body_template % base_dict
@@ -601,6 +847,7 @@ void set_%(name)s(%(float_prec)s value) {
                 custom_func += pop['custom_func']
             for proj in self._proj_desc:
                 custom_func += proj['custom_func']
+            from ANNarchy.parser.Extraction import extract_functions
             for _, func in GlobalObjectManager().get_functions():
                 custom_func += extract_functions(func, local_global=True)[0]['cpp'].replace("inline", "__device__") + '\n'
 
@@ -758,6 +1005,48 @@ void set_%(name)s(%(float_prec)s value) {
             'custom_constant': custom_constant
         }
 
+    def _body_serialize_state(self):
+        """
+        Define the code of serializeState(), which stores or restores the complete state of the
+        simulation (checkpoint(), restore()). The structure of the network is checked first, so
+        that a checkpoint of another network is rejected before any data is modified.
+        """
+        code = """
+    // Structure of the network, which has to be identical when the state is restored
+    ar.check(dt);
+    ar.check(rng.size());
+"""
+        for pop in self._populations:
+            code += "    ar.check(pop%(id)s.size);\n" % {'id': pop.id}
+        code += """    ar.check(recorders.size());
+    for (std::size_t i = 0; i < recorders.size(); i++)
+        ar.check(recorders[i] != nullptr);
+    timed_updates.serialize_state(ar);
+    if (!ar.good())
+        return false;
+
+    // Time and random number generators
+    ar(t);
+    ar(rng);
+    ar(rng_seed);
+
+    // Populations
+"""
+        for pop in self._populations:
+            code += "    pop%(id)s.serialize_state(ar);\n" % {'id': pop.id}
+
+        code += "\n    // Projections\n"
+        for proj in self._projections:
+            code += "    proj%(id)s.serialize_state(ar);\n" % {'id': proj.id}
+
+        code += """
+    // Recorded data
+    for (std::size_t i = 0; i < recorders.size(); i++) {
+        if (recorders[i])
+            recorders[i]->serialize_state(ar);
+    }"""
+        return code
+
     def _body_resetcomputesum_pop(self):
         """
         Rate-coded neurons sum up the received inputs in temporary variables.
@@ -803,6 +1092,87 @@ void set_%(name)s(%(float_prec)s value) {
 
         return creating + pruning + rebuild_in_cpp, rebuild_out_cpp
 
+    def _body_task_graph(self):
+        """
+        Organize the simulation step as OpenMP tasks (setup(task_scheduler=True)).
+
+        Each population and projection is updated by one task running the single
+        thread kernels. The data dependencies between the objects are expressed by
+        depend clauses on one token per object (and one per input buffer of the
+        populations), so that the OpenMP runtime executes independent objects
+        concurrently in place of the global barriers of singleStep().
+
+        Returns two strings:
+            * declaration of the dependency tokens
+            * code creating the tasks of one simulation step
+        """
+        tpl = BaseTemplate.omp_task_template
+
+        def task(code, depend):
+            return tpl % {'depend': depend, 'code': tabify(dedent(code.expandtabs(4)).strip(), 2)}
+
+        # Tokens: the population state, the inputs of a population and the projection state
+        declaration = ""
+        for pop in self._populations:
+            declaration += "char _dep_pop%(id)s, _dep_sum%(id)s;\n" % {'id': pop.id}
+        for proj in self._projections:
+            declaration += "char _dep_proj%(id)s;\n" % {'id': proj.id}
+        declaration += "char _dep_rng;\n"
+
+        code = ""
+
+        # Reset of the weighted sums
+        for pop in self._populations:
+            if pop.neuron_type.type != 'rate' or len(pop.targets) == 0:
+                continue
+            code += task(self._popgen.reset_computesum(pop), "depend(inout: _dep_sum%(id)s)" % {'id': pop.id})
+
+        # Presynaptic events: read the presynaptic population, write the inputs of the postsynaptic one
+        for proj, desc in zip(self._projections, self._proj_desc):
+            if desc['compute_psp'].strip() == "":
+                continue
+            code += task(desc['compute_psp'], "depend(in: _dep_pop%(pre)s) depend(inout: _dep_sum%(post)s, _dep_proj%(id)s)" % {
+                'id': proj.id, 'pre': proj.pre.id, 'post': proj.post.id})
+
+        # Recording of the target variables
+        if len(self._populations) > 0:
+            all_sums = ", ".join(["_dep_sum%(id)s" % {'id': pop.id} for pop in self._populations])
+            code += task("""
+for (unsigned int i=0; i < recorders.size(); i++) {
+    if (recorders[i])
+        recorders[i]->record_targets();
+}""", "depend(in: " + all_sums + ")")
+
+        # Random numbers are drawn from the same generator, the draws are therefore serialized
+        objects = [('pop', pop.id, desc) for pop, desc in zip(self._populations, self._pop_desc)]
+        objects += [('proj', proj.id, desc) for proj, desc in zip(self._projections, self._proj_desc)]
+        for prefix, obj_id, desc in objects:
+            if 'rng_update' in desc.keys() and desc['rng_update'].strip() != "":
+                code += task(desc['rng_update'], "depend(inout: _dep_rng, _dep_%(prefix)s%(id)s)" % {'prefix': prefix, 'id': obj_id})
+
+        # Neural variables, delayed outputs and global operations
+        for pop, desc in zip(self._populations, self._pop_desc):
+            pop_code = ""
+            for key in ['update', 'delay_update', 'gops_update']:
+                if key in desc.keys():
+                    pop_code += desc[key]
+            if pop_code.strip() == "":
+                continue
+            code += task(pop_code, "depend(inout: _dep_pop%(id)s, _dep_sum%(id)s)" % {'id': pop.id})
+
+        # Synaptic variables and postsynaptic events
+        for proj, desc in zip(self._projections, self._proj_desc):
+            proj_code = ""
+            for key in ['update', 'post_event']:
+                if key in desc.keys():
+                    proj_code += desc[key]
+            if proj_code.strip() == "":
+                continue
+            code += task(proj_code, "depend(in: _dep_pop%(pre)s, _dep_pop%(post)s) depend(inout: _dep_proj%(id)s)" % {
+                'id': proj.id, 'pre': proj.pre.id, 'post': proj.post.id})
+
+        return declaration, code
+
     def _body_def_glops(self):
         """
         Dependent on the used global operations we add pre-defined templates
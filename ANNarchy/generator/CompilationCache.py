@@ -0,0 +1,244 @@
+"""
+Content-addressed cache of compiled ANNarchyCore libraries shared between projects.
+
+:copyright: Copyright 2013 - now, see AUTHORS.
+:license: GPLv2, see LICENSE for details.
+"""
+
+import os
+import shutil
+import hashlib
+import subprocess
+import tempfile
+
+import ANNarchy
+from ANNarchy.intern.ConfigManagement import get_global_config, _cache_directory
+from ANNarchy.intern import Messages
+
+# Compiler version strings are requested only once per process
+_compiler_versions = {}
+
+def _library_directory():
+    "Sub-folder holding the cached shared libraries."
+    return os.path.join(_cache_directory(), 'lib')
+
+def _pch_directory():
+    "Sub-folder holding the precompiled headers."
+    return os.path.join(_cache_directory(), 'pch')
+
+def _compiler_version(compiler):
+    """
+    Returns the version string reported by the compiler (first line of *compiler --version*).
+    """
+    if compiler not in _compiler_versions:
+        try:
+            version = subprocess.run(
+                [compiler, '--version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=False
+            ).stdout.decode('UTF-8')
+        except OSError:
+            version = ""
+        _compiler_versions[compiler] = version
+
+    return _compiler_versions[compiler]
+
+def _hash_file(digest, filename):
+    "Updates the digest with the name and the content of a file."
+    digest.update(os.path.basename(filename).encode('UTF-8'))
+    with open(filename, 'rb') as rfile:
+        digest.update(rfile.read())
+
+def compute_cache_key(source_dir, compiler, add_sources=""):
+    """
+    Computes the key under which a library is stored in the cache.
+
+    The key is a hash over:
+
+    * the generated sources and the Makefile (which contains all compiler flags and include paths) in *source_dir*,
+    * the version of the C++ compiler,
+    * the ANNarchy release and the content of the ANNarchy headers,
+    * the Cython and Numpy versions,
+    * additional sources provided by the user.
+
+    :param source_dir: folder containing the generated code (annarchy/generate/net<id>).
+    :param compiler: C++ compiler used to build the library.
+    :param add_sources: additional source files provided to compile().
+    """
+    import numpy
+    import Cython
+
+    digest = hashlib.sha256()
+
+    # Environment
+    digest.update(ANNarchy.__release__.encode('UTF-8'))
+    digest.update(_compiler_version(compiler).encode('UTF-8'))
+    digest.update(numpy.__version__.encode('UTF-8'))
+    digest.update(Cython.__version__.encode('UTF-8'))
+
+    # Generated code and Makefile
+    for filename in sorted(os.listdir(source_dir)):
+        if filename.endswith(".log"):
+            continue
+        _hash_file(digest, os.path.join(source_dir, filename))
+
+    # ANNarchy headers (sparse matrix formats, thirdparty)
+    for folder in ['include', 'thirdparty']:
+        folder = os.path.join(ANNarchy.__path__[0], folder)
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith('.hpp'):
+                _hash_file(digest, os.path.join(folder, filename))
+
+    # User-defined sources
+    for filename in add_sources.split():
+        if os.path.isfile(filename):
+            _hash_file(digest, filename)
+        else:
+            digest.update(filename.encode('UTF-8'))
+
+    return digest.hexdigest()
+
+def _is_gcc(compiler):
+    "Returns True if *compiler* is the GNU C++ compiler (clang uses a different format for precompiled headers)."
+    version = _compiler_version(compiler)
+    return ('GCC' in version or 'g++' in version) and not 'clang' in version
+
+def precompiled_header(compiler, flags):
+    """
+    Returns the path of the precompiled header (``ANNarchyPCH.hpp.gch``) for the given compiler and flags.
+
+    Only the header is copied into the cache, the precompiled header itself is built by the Makefile
+    when it does not exist yet. Each combination of compiler version, compiler flags and ANNarchy headers
+    gets its own sub-folder, as GCC rejects precompiled headers built with different flags.
+
+    :param compiler: C++ compiler.
+    :param flags: compiler flags and include paths used for all translation units.
+    :returns: the path to the precompiled header, or None if it can not be used.
+    """
+    if not _is_gcc(compiler):
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(ANNarchy.__release__.encode('UTF-8'))
+    digest.update(_compiler_version(compiler).encode('UTF-8'))
+    digest.update(flags.encode('UTF-8'))
+    folder = os.path.join(ANNarchy.__path__[0], 'include')
+    for filename in sorted(os.listdir(folder)):
+        if filename.endswith('.hpp'):
+            _hash_file(digest, os.path.join(folder, filename))
+
+    pch_dir = os.path.join(_pch_directory(), digest.hexdigest())
+    header = os.path.join(pch_dir, 'ANNarchyPCH.hpp')
+    try:
+        if not os.path.isfile(header):
+            os.makedirs(pch_dir, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=pch_dir, suffix='.tmp')
+            os.close(fd)
+            shutil.copy(os.path.join(folder, 'ANNarchyPCH.hpp'), tmp_name)
+            os.replace(tmp_name, header)
+        # Mark the entry as recently used (the header itself must keep its time stamp for make)
+        os.utime(pch_dir)
+    except OSError as e:
+        Messages._warning('Unable to store the precompiled header in the cache:', e)
+        return None
+
+    return header + '.gch'
+
+def lookup(key, target):
+    """
+    Copies the cached library stored under *key* to *target*.
+
+    :returns: True if the library was found in the cache, False otherwise.
+    """
+    cached = os.path.join(_library_directory(), key + '.so')
+    if not os.path.isfile(cached):
+        return False
+
+    try:
+        shutil.copy(cached, target)
+        # Mark the entry as recently used
+        os.utime(cached)
+    except OSError:
+        return False
+
+    if get_global_config('verbose'):
+        Messages._print('Found compiled library in cache:', cached)
+
+    return True
+
+def store(key, library):
+    """
+    Adds the library to the cache under *key* and evicts the least recently
+    used entries if the cache exceeds ``setup(compilation_cache_size=...)``.
+    """
+    lib_dir = _library_directory()
+    try:
+        os.makedirs(lib_dir, exist_ok=True)
+
+        # Write into a temporary file first and rename afterwards, so that
+        # concurrent processes never load a partially written library.
+        fd, tmp_name = tempfile.mkstemp(dir=lib_dir, suffix='.tmp')
+        os.close(fd)
+        shutil.copy(library, tmp_name)
+        os.replace(tmp_name, os.path.join(lib_dir, key + '.so'))
+
+    except OSError as e:
+        Messages._warning('Unable to store the compiled library in the cache:', e)
+        return
+
+    _evict(get_global_config('compilation_cache_size') * 1024 * 1024)
+
+def _evict(max_size):
+    """
+    Removes the least recently used libraries and precompiled headers until the size of the cache
+    is below *max_size* (bytes).
+    """
+    entries = []
+
+    lib_dir = _library_directory()
+    for filename in os.listdir(lib_dir):
+        if not filename.endswith('.so'):
+            continue
+        try:
+            stat = os.stat(os.path.join(lib_dir, filename))
+        except OSError: # removed by another process
+            continue
+        entries.append((stat.st_mtime, stat.st_size, os.path.join(lib_dir, filename)))
+
+    # Precompiled headers: the time stamp of the folder marks the last use
+    pch_dir = _pch_directory()
+    if os.path.isdir(pch_dir):
+        for dirname in os.listdir(pch_dir):
+            try:
+                mtime = os.stat(os.path.join(pch_dir, dirname)).st_mtime
+                size = sum([os.path.getsize(os.path.join(pch_dir, dirname, f)) for f in os.listdir(os.path.join(pch_dir, dirname))])
+            except OSError:
+                continue
+            entries.append((mtime, size, os.path.join(pch_dir, dirname)))
+
+    total_size = sum([entry[1] for entry in entries])
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total_size -= size
+
+def clear_compile_cache():
+    """
+    Removes all compiled libraries, precompiled headers and analysed neuron/synapse descriptions from the compilation cache.
+
+    By default, ANNarchy stores each compiled network in ``~/.cache/ANNarchy`` so that identical networks
+    do not have to be recompiled, even when compiled from another directory. The location and the maximal size
+    of the cache can be set with ``setup(compilation_cache_dir=..., compilation_cache_size=...)``,
+    the cache can be disabled with ``setup(compilation_cache=False)``.
+    """
+    shutil.rmtree(_library_directory(), ignore_errors=True)
+    shutil.rmtree(_pch_directory(), ignore_errors=True)
+    shutil.rmtree(os.path.join(_cache_directory(), 'descriptions'), ignore_errors=True)
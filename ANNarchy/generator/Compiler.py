@@ -7,8 +7,10 @@ import os, sys, importlib
 import subprocess
 import shutil
 import multiprocessing
+import threading
 import time
 import json
+import ctypes
 import numpy as np
 
 # ANNarchy core informations
@@ -23,7 +25,7 @@ from ANNarchy.intern import Messages
 
 from ANNarchy.extensions.bold.NormProjection import _update_num_aff_connections
 from ANNarchy.generator.Template.MakefileTemplate import *
-from ANNarchy.generator.CodeGenerator import CodeGenerator
+from ANNarchy.generator import CompilationCache
 from ANNarchy.generator.Sanity import check_structure, check_experimental_features
 from ANNarchy.generator.Utils import check_cuda_version
 from ANNarchy.parser.report.Report import report
@@ -32,6 +34,9 @@ from ANNarchy.parser.report.Report import report
 # e.g. extra_libs = ['-lopencv_core', '-lopencv_video']
 extra_libs = []
 
+# Handles of the networks compiled with compile(asynchronous=True) which are not instantiated yet
+_pending_compilations = {}
+
 def _folder_management(annarchy_dir, profile_enabled, clean, net_id):
     """
     ANNarchy is provided as a python package. For compilation a local folder
@@ -84,6 +89,9 @@ def compile(
         silent=False,
         debug_build=False,
         profile_enabled=False,
+        asynchronous=False,
+        optimize=None,
+        pgo_warmup=None,
         net_id=0
     ):
     """
@@ -105,9 +113,18 @@ def compile(
     :param cuda_config: dictionary defining the CUDA configuration for each population and projection.
     :param annarchy_json: compiler flags etc can be stored in a .json file normally placed in the home directory (see comment below). With this flag one can directly assign a file location.
     :param silent: defines if status message like "Compiling... OK" should be printed.
+    :param asynchronous: if True, the generated code is compiled in the background and a ``CompilationHandle`` is returned immediately.
+        The network is instantiated by ``handle.wait()`` (or by the first call to ``simulate()``), which must be called from the main thread.
+        The network must not be modified in the meantime.
+    :param optimize: additional optimizations performed by GCC: 'lto' enables link-time optimization, 'pgo' adds profile-guided optimization.
+        With 'pgo', an instrumented library is compiled and simulated first (see ``pgo_warmup``), the final library is then optimized
+        using the collected profile (stored in ``annarchy/profile/``). Default: None.
+    :param pgo_warmup: simulation performed with the instrumented library when ``optimize='pgo'``: either a duration in milliseconds
+        or a function without arguments, e.g. ``lambda: ann.simulate(100.)``. The network is instantiated again afterwards,
+        so the warm-up has no influence on the final network. Default: 1000 simulation steps.
     """
     # Check if the network has already been compiled
-    if NetworkManager().is_compiled(net_id=net_id):
+    if NetworkManager().is_compiled(net_id=net_id) or net_id in _pending_compilations:
         Messages._print("""compile(): the network has already been compiled, doing nothing.
     If you are re-running a Jupyter notebook, you should call `clear()` right after importing ANNarchy in order to reset everything.""")
         return
@@ -151,6 +168,12 @@ def compile(
     # Clean
     clean = options.clean or clean # enforce rebuild
 
+    # Link-time and profile-guided optimization
+    if optimize not in [None, 'lto', 'pgo']:
+        Messages._error("compile(): optimize must be None, 'lto' or 'pgo'.")
+    if optimize == 'pgo' and asynchronous:
+        Messages._error("compile(): the warm-up simulation of optimize='pgo' can not be performed asynchronously.")
+
     # Populations to compile
     if populations is None: # Default network
         populations = NetworkManager().get_populations(net_id=net_id)
@@ -216,12 +239,32 @@ def compile(
         profile_enabled=profile_enabled,
         populations=populations,
         projections=projections,
+        optimize=optimize,
         net_id=net_id
     )
 
     # Code Generation
     compiler.generate()
 
+    # Build and simulate an instrumented library first
+    if compiler.optimize == 'pgo':
+        compiler.collect_profile(pgo_warmup, options.report)
+
+    # Compile in a background thread, the network is instantiated by CompilationHandle.wait()
+    if asynchronous:
+        handle = CompilationHandle(compiler, options.report)
+        _pending_compilations[net_id] = handle
+        return handle
+
+    # Compilation
+    compiler.build()
+
+    _instantiate_compiled_network(compiler, options.report)
+
+def _instantiate_compiled_network(compiler, report_filename):
+    """
+    Creates the Cython objects after a successful compilation.
+    """
     if get_global_config('verbose'):
         net_str = "" if compiler.net_id == 0 else str(compiler.net_id)+" "
         Messages._print('Construct network '+net_str+'...', end=" ")
@@ -236,8 +279,84 @@ def compile(
         Messages._print('OK')
 
     # Create a report if requested
-    if options.report is not None:
-        report(options.report)
+    if report_filename is not None:
+        report(report_filename)
+
+class CompilationHandle:
+    """
+    Handle on a network compiled in the background, returned by ``compile(asynchronous=True)``.
+
+    ```python
+    handle = ann.compile(asynchronous=True)
+
+    # Prepare the inputs while the network is compiled
+    data = load_dataset()
+
+    handle.wait() # instantiates the network
+    ann.simulate(1000.)
+    ```
+    """
+    def __init__(self, compiler, report_filename):
+        self._compiler = compiler
+        self._report_filename = report_filename
+        self._error = None
+        self._instantiated = False
+
+        self._thread = threading.Thread(target=self._build, daemon=True)
+        self._thread.start()
+
+    def _build(self):
+        "Executed in the background thread."
+        try:
+            self._compiler.build()
+        except BaseException as e: # re-raised in wait()
+            self._error = e
+
+    def done(self) -> bool:
+        """
+        Returns True when the compilation is finished (successfully or not).
+        """
+        return not self._thread.is_alive()
+
+    def wait(self, timeout:float=None) -> bool:
+        """
+        Waits for the end of the compilation and instantiates the network. Raises an exception if the compilation failed.
+
+        :param timeout: maximal waiting time in seconds (default: None, i.e. until the compilation is finished).
+        :returns: True if the network is ready, False if the timeout expired.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return False
+
+        if not self._instantiated:
+            self._instantiated = True
+            _pending_compilations.pop(self._compiler.net_id, None)
+            if self._error is not None:
+                raise self._error
+            _instantiate_compiled_network(self._compiler, self._report_filename)
+
+        return True
+
+    @property
+    def log(self) -> str:
+        """
+        Output of the compiler (``compile_stdout.log`` and ``compile_stderr.log``) as far as it is available.
+        """
+        build_dir = self._compiler.annarchy_dir + '/build/net' + str(self._compiler.net_id)
+        text = ""
+        for filename in ['compile_stdout.log', 'compile_stderr.log']:
+            if os.path.isfile(build_dir + '/' + filename):
+                with open(build_dir + '/' + filename, 'r') as rfile:
+                    text += rfile.read()
+        return text
+
+def _wait_for_compilation(net_id):
+    """
+    Waits for a pending asynchronous compilation of the network, if any.
+    """
+    if net_id in _pending_compilations:
+        _pending_compilations[net_id].wait()
 
 def python_environment():
     """
@@ -309,7 +428,7 @@ class Compiler(object):
     " Main class to generate C++ code efficiently"
 
     def __init__(self, annarchy_dir, clean, compiler, compiler_flags, add_sources, extra_libs, path_to_json, silent, cuda_config, debug_build,
-                 profile_enabled, populations, projections, net_id):
+                 profile_enabled, populations, projections, net_id, optimize=None):
 
         # Store arguments
         self.annarchy_dir = annarchy_dir
@@ -325,6 +444,13 @@ class Compiler(object):
         self.populations = populations
         self.projections = projections
         self.net_id = net_id
+        self.optimize = optimize
+
+        # Set by code_generation()
+        self.translation_units = ['ANNarchy.cpp']
+
+        # Profile-guided optimization: None, "generate" (instrumented library) or "use"
+        self.pgo_phase = None
 
         # Get user-defined config
         self.user_config = {
@@ -356,6 +482,18 @@ class Compiler(object):
 
             self.cuda_config['cuda_version'] = check_cuda_version(self.user_config['cuda']['compiler'])
 
+        # LTO and PGO rely on GCC-specific flags
+        if self.optimize is not None:
+            compiler = self.user_config['openmp']['compiler'] if self.compiler == "default" else self.compiler
+            if not _check_paradigm("openmp") or not CompilationCache._is_gcc(compiler):
+                Messages._warning("compile(): optimize='" + self.optimize + "' is only available for the openMP paradigm with GCC, it is ignored.")
+                self.optimize = None
+
+        # The instrumented and the optimized library must be loaded from different paths
+        if self.optimize == 'pgo' and (get_global_config('debug') or get_global_config('disable_shared_library_time_offset')):
+            Messages._warning("compile(): optimize='pgo' requires to reload the library, only link-time optimization is performed.")
+            self.optimize = 'lto'
+
     def generate(self):
         "Perform the code generation for the C++ code and create the Makefile."
         if Profiler().enabled or get_global_config('show_time'):
@@ -367,8 +505,16 @@ class Compiler(object):
             net_str = "" if self.net_id == 0 else str(self.net_id)+" "
             Messages._print('Code generation '+net_str+'...', end=" ", flush=True)
 
+        # Analysis of the neuron and synapse types (performed when the objects were created)
+        if Profiler().enabled:
+            self._report_analysis()
+
         # Check that everything is allright in the structure of the network.
+        if Profiler().enabled:
+            t_check = time.time()
         check_structure(self.populations, self.projections)
+        if Profiler().enabled:
+            Profiler().add_phase(t_check, time.time(), "check_structure")
 
         # check if the user access some new features, or old ones which changed.
         check_experimental_features(self.populations, self.projections)
@@ -380,7 +526,7 @@ class Compiler(object):
         self.generate_makefile()
 
         # Copy the files if needed
-        changed = self.copy_files()
+        self.changed = self.copy_files()
 
         # Code generation done
         if get_global_config('verbose'):
@@ -390,9 +536,51 @@ class Compiler(object):
             else:
                 Messages._print("OK (took "+str(t1-t0)+" seconds)", flush=True)
 
+        if Profiler().enabled:
+            self._t0 = t0
+
+    def _report_analysis(self):
+        """
+        Adds the analysis of each neuron/synapse type to the build report, under the name of the
+        first population/projection using it.
+        """
+        reported = []
+        for obj, model in [(pop, pop.neuron_type) for pop in self.populations] + [(proj, proj.synapse_type) for proj in self.projections]:
+            if id(model) in reported or not hasattr(model, '_analysis_times'):
+                continue
+            reported.append(id(model))
+            t_entry, t_escape = model._analysis_times
+            Profiler().add_phase(t_entry, t_escape, "parse", obj.name)
+
+    def build(self):
+        """
+        Compiles the generated code if something has changed (or retrieves the library from the cache)
+        and prepares the library for import. Does not depend on the Python objects of the network,
+        so it can be executed in a background thread.
+        """
         # Perform compilation if something has changed
-        if changed or not os.path.isfile(self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.so'):
-            self.compilation()
+        if self.changed or not os.path.isfile(self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.so'):
+            # An identical library might have been built before, potentially in another directory.
+            cache_key = None
+            # the profile used by PGO is not part of the key
+            if get_global_config('compilation_cache') and self.pgo_phase != "use":
+                cache_key = CompilationCache.compute_cache_key(
+                    self.annarchy_dir + '/generate/net' + str(self.net_id), self.compiler, self.add_sources)
+
+            if cache_key is not None and CompilationCache.lookup(cache_key, self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.so'):
+                with open(self.annarchy_dir + '/compilation', 'w') as wfile:
+                    wfile.write("1")
+
+                if not self.silent:
+                    msg = 'Compiling '
+                    if self.net_id > 0:
+                        msg += 'network ' + str(self.net_id)
+                    Messages._print(msg + '... OK (cached)')
+            else:
+                self.compilation()
+
+                if cache_key is not None:
+                    CompilationCache.store(cache_key, self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.so')
 
         if get_global_config('debug') or get_global_config('disable_shared_library_time_offset'):
             # In case of debugging or high-throughput simulations we want to
@@ -409,7 +597,67 @@ class Compiler(object):
         NetworkManager().set_compiled(net_id=self.net_id)
         if Profiler().enabled:
             t1 = time.time()
-            Profiler().update_entry(t0, t1, "overall", "compile")
+            Profiler().update_entry(self._t0, t1, "overall", "compile")
+
+    def collect_profile(self, warmup, report_filename):
+        """
+        Profile-guided optimization: compiles an instrumented library, performs the warm-up simulation
+        and stores the profile. The next call to build() creates the optimized library.
+
+        :param warmup: duration of the warm-up simulation in ms or a function performing it (default: 1000 steps).
+        :param report_filename: passed to _instantiate_compiled_network().
+        """
+        from ANNarchy.core import Simulate
+        from ANNarchy.generator.Template.BaseTemplate import profile_dump_template
+
+        if not self.silent:
+            Messages._print('Collecting the profile for PGO...')
+
+        profile_dir = self.annarchy_dir + '/profile/net' + str(self.net_id)
+        shutil.rmtree(profile_dir, True)
+        os.makedirs(profile_dir)
+
+        # The final network must not depend on the random numbers drawn by the warm-up
+        random_state = np.random.get_state()
+
+        # Instrumented library
+        self.pgo_phase = "generate"
+        with open(self.annarchy_dir + '/generate/net' + str(self.net_id) + '/ProfileDump.cpp', 'w') as wfile:
+            wfile.write(profile_dump_template)
+        self.generate_makefile()
+        self.changed = self.copy_files() or self.changed
+        self.build()
+        _instantiate_compiled_network(self, report_filename)
+
+        # Warm-up simulation
+        if callable(warmup):
+            warmup()
+        else:
+            duration = warmup if warmup is not None else 1000 * get_global_config('dt')
+            Simulate.simulate(duration, net_id=self.net_id)
+
+        # Write the profile and release the instrumented network
+        libpath = NetworkManager().get_code_directory(net_id=self.net_id) + '/ANNarchyCore' + str(self.net_id) + '.so'
+        ctypes.CDLL(libpath).ANNarchy_dump_profile()
+
+        for pop in self.populations:
+            pop._clear()
+            pop.cyInstance = None
+        for proj in self.projections:
+            proj._clear()
+            proj.cyInstance = None
+        for monitor in NetworkManager().get_monitors(net_id=self.net_id):
+            monitor.cyInstance = None
+        NetworkManager().set_cy_instance(net_id=self.net_id, instance=None)
+
+        np.random.set_state(random_state)
+
+        # The optimized library is compiled by the next call to build()
+        self.pgo_phase = "use"
+        os.remove(self.annarchy_dir + '/generate/net' + str(self.net_id) + '/ProfileDump.cpp')
+        self.generate_makefile()
+        self.copy_files()
+        self.changed = True
 
     def copy_files(self):
         " Copy the generated files in the build/ folder if needed."
@@ -482,25 +730,29 @@ class Compiler(object):
             if get_global_config('show_time') or Profiler().enabled:
                 t0 = time.time()
 
-        # Switch to the build directory
-        cwd = os.getcwd()
-        os.chdir(self.annarchy_dir + '/build/net'+ str(self.net_id))
+        # The build directory is only passed to make, the working directory of the
+        # process is not changed as the compilation might run in a background thread.
+        build_dir = self.annarchy_dir + '/build/net'+ str(self.net_id)
 
         # Start the compilation
         verbose = "> compile_stdout.log 2> compile_stderr.log" if not get_global_config('verbose') else ""
 
+        # Durations of the single targets, written by make when profiling
+        if Profiler().enabled and os.path.isfile(build_dir + '/compile_times.log'):
+            os.remove(build_dir + '/compile_times.log')
+
         # Start the compilation process
-        make_process = subprocess.Popen("make all -j4" + verbose, shell=True)
+        make_process = subprocess.Popen("make all -j" + str(_number_build_jobs()) + verbose, shell=True, cwd=build_dir)
 
         # Check for errors
         if make_process.wait() != 0:
-            with open('compile_stderr.log', 'r') as rfile:
+            with open(build_dir + '/compile_stderr.log', 'r') as rfile:
                 msg = rfile.read()
             with open(self.annarchy_dir + '/compilation', 'w') as wfile:
                 wfile.write("0")
             Messages._print(msg)
             try:
-                os.remove('ANNarchyCore'+str(self.net_id)+'.so')
+                os.remove(build_dir + '/ANNarchyCore'+str(self.net_id)+'.so')
             except:
                 pass
             Messages._error('Compilation failed.')
@@ -508,8 +760,8 @@ class Compiler(object):
             with open(self.annarchy_dir + '/compilation', 'w') as wfile:
                 wfile.write("1")
 
-        # Return to the current directory
-        os.chdir(cwd)
+        if Profiler().enabled:
+            self._report_build_times(build_dir + '/compile_times.log')
 
         if not self.silent:
             t1 = time.time()
@@ -522,6 +774,30 @@ class Compiler(object):
             if Profiler().enabled:
                 Profiler().add_entry(t0, t1, "compilation", "compile")
 
+    def _report_build_times(self, filename):
+        """
+        Adds the targets built by make (see the TIMINGS variable of the Makefile) to the build report:
+        Cython translation, compilation of each translation unit and link.
+        """
+        if not os.path.isfile(filename):  # not supported by the Makefile of this platform
+            return
+
+        with open(filename, 'r') as rfile:
+            for line in rfile:
+                try:
+                    target, t_entry, t_escape = line.split()
+                    t_entry, t_escape = float(t_entry), float(t_escape)
+                except ValueError:
+                    continue
+
+                basename, extension = os.path.splitext(target)
+                if extension == '.so':
+                    Profiler().add_phase(t_entry, t_escape, "link")
+                elif extension == '.o':
+                    Profiler().add_phase(t_entry, t_escape, "compile", basename + '.cpp')
+                elif extension == '.cpp':
+                    Profiler().add_phase(t_entry, t_escape, "cython", "translate")
+
     def generate_makefile(self):
         """
         Generate the Makefile.
@@ -555,10 +831,25 @@ class Compiler(object):
         if get_global_config('disable_parallel_rng') and _check_paradigm("openmp"):
             cpu_flags += " -D_DISABLE_PARALLEL_RNG "
 
+        # NUMA-aware placement of the data
+        if get_global_config('numa_placement') and _check_paradigm("openmp") and get_global_config('num_threads') > 1:
+            cpu_flags += " -D_NUMA_PLACEMENT "
+
         # Disable auto-vectorization
         if get_global_config('disable_SIMD_Eq') and _check_paradigm("openmp"):
             cpu_flags += " -fno-tree-vectorize"
 
+        # Link-time and profile-guided optimization
+        objects = [os.path.splitext(filename)[0] + '.o' for filename in self.translation_units]
+        if self.optimize is not None:
+            cpu_flags += " -flto=auto"
+        profile_dir = self.annarchy_dir + '/profile/net' + str(self.net_id)
+        if self.pgo_phase == "generate":
+            cpu_flags += " -fprofile-generate=" + profile_dir + " -fprofile-update=prefer-atomic"
+            objects.append('ProfileDump.o')
+        elif self.pgo_phase == "use":
+            cpu_flags += " -fprofile-use=" + profile_dir + " -fprofile-correction -Wno-missing-profile"
+
         # Cuda Library and Compiler
         #
         # hdin (22.03.2016): we should verify in the future, if compute_35 remains as best
@@ -626,9 +917,26 @@ class Compiler(object):
             # Windows: to test....
             Messages._warning("Compilation on windows is not supported yet. We recommend to use WSL on windows systems.")
 
+        # Optional compiler launcher, e.g. ccache
+        launcher = get_global_config('compiler_launcher')
+        launcher = launcher + " " if launcher else ""
+
+        # Precompiled header for the STL and the sparse matrix formats (GCC on linux only)
+        pch = ""
+        if makefile_template is linux_omp_template and get_global_config('precompiled_headers'):
+            pch_flags = " ".join([cpu_flags, omp_flag, python_include, numpy_include, annarchy_include, thirdparty_include, path_to_cython_ext])
+            pch = CompilationCache.precompiled_header(self.compiler, pch_flags) or ""
+
+        # Object files, one per generated translation unit
+        objects = " ".join(objects)
+
         # Gather all Makefile flags
         makefile_flags = {
             'compiler': self.compiler,
+            'launcher': launcher,
+            'objects': objects,
+            'pch': pch,
+            'timings': "compile_times.log" if Profiler().enabled else "",
             'add_sources': self.add_sources,
             'cpu_flags': cpu_flags,
             'cuda_gen': cuda_gen,
@@ -660,9 +968,39 @@ class Compiler(object):
         """
         Code generation dependent on paradigm
         """
-        generator = CodeGenerator(self.annarchy_dir, self.populations, self.projections, self.net_id, self.cuda_config)
-        generator.generate()
+        # The code generators are only imported when code has to be generated
+        from ANNarchy.generator.CodeGenerator import CodeGenerator
 
+        # The task scheduler runs the single thread kernels of the objects concurrently
+        num_threads = get_global_config('num_threads')
+        task_scheduler = _check_paradigm("openmp") and num_threads > 1 and get_global_config('task_scheduler')
+        if task_scheduler:
+            _update_global_config('num_threads', 1)
+
+        try:
+            generator = CodeGenerator(self.annarchy_dir, self.populations, self.projections, self.net_id, self.cuda_config, task_scheduler=task_scheduler)
+            generator.generate()
+        finally:
+            _update_global_config('num_threads', num_threads)
+
+        # Source files which need to be compiled by the Makefile
+        self.translation_units = generator.translation_units
+
+
+def _number_build_jobs():
+    """
+    Number of parallel jobs used by make. Either set by ``setup(build_jobs=...)``
+    or the number of cores available to the current process.
+    """
+    build_jobs = get_global_config('build_jobs')
+    if build_jobs is not None:
+        return max(1, int(build_jobs))
+
+    # respects the CPU affinity (e.g. batch systems), but not available on all platforms
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+
+    return multiprocessing.cpu_count()
 
 def load_cython_lib(libname, libpath):
     """
@@ -839,6 +1177,17 @@ def _instantiate(net_id, import_id=-1, cuda_config=None, user_config=None, core_
             Messages._print('Initializing projection', proj.name, 'from', proj.pre.name, 'to', proj.post.name, 'with target="', proj.target, '"')
         proj._init_attributes()
 
+    # Register the schedules of attribute updates
+    for obj in NetworkManager().get_populations(net_id=net_id) + NetworkManager().get_projections(net_id=net_id):
+        for schedule in obj._schedules:
+            schedule._instantiate(cython_module)
+
+    # Move the data processed by each thread to its memory node
+    if _check_paradigm("openmp") and get_global_config('numa_placement') and get_global_config('num_threads') > 1:
+        bytes_per_node = cython_module.numa_placement()
+        if get_global_config('verbose'):
+            Messages._print('NUMA placement:', ', '.join(['node %(node)s: %(mb).1f MB' % {'node': node, 'mb': nb/1024.**2} for node, nb in enumerate(bytes_per_node) if nb > 0]))
+
     # Start the monitors
     for monitor in NetworkManager().get_monitors(net_id=net_id):
         monitor._init_monitoring()
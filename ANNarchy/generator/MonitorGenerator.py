@@ -99,6 +99,7 @@ class MonitorGenerator(object):
         struct_code = ""
         size_in_bytes = ""
         clear_code = ""
+        serialize_code = ""
 
         # The post-synaptic potential for rate-code (weighted sum) as well
         # as the conductance variables are handled seperatly.
@@ -125,6 +126,7 @@ class MonitorGenerator(object):
                 init_code += template['local']['init'] % tar_dict
                 recording_target_code += template['local']['recording'] % tar_dict
                 clear_code += template['local']['clear'] % tar_dict
+                serialize_code += RecTemplate.serialize_recorded_data % tar_dict
         else:
             for target in targets:
                 tar_dict = {'id': pop.id, 'type' : get_global_config('precision'), 'name': 'g_'+target}
@@ -132,6 +134,7 @@ class MonitorGenerator(object):
                 init_code += template['local']['init'] % tar_dict
                 recording_target_code += template['local']['recording'] % tar_dict
                 clear_code += template['local']['clear'] % tar_dict
+                serialize_code += RecTemplate.serialize_recorded_data % tar_dict
 
                 # to skip this entry in the following loop
                 target_list.append('g_'+target)
@@ -158,6 +161,7 @@ class MonitorGenerator(object):
             recording_code += template[var['locality']]['recording'] % ids
             clear_code += template[var['locality']]['clear'] % ids
             size_in_bytes += template[var['locality']]['size_in_bytes'] % ids
+            serialize_code += RecTemplate.serialize_recorded_data % ids
 
         # Record spike events
         if pop.neuron_type.type == 'spike':
@@ -174,6 +178,7 @@ class MonitorGenerator(object):
             recording_code += base_tpl['record'][get_global_config('paradigm')] % rec_dict
             size_in_bytes += base_tpl['size_in_bytes'][get_global_config('paradigm')] % rec_dict
             clear_code += base_tpl['clear'][get_global_config('paradigm')] % rec_dict
+            serialize_code += RecTemplate.serialize_recorded_data % rec_dict
 
             # Record axon spike events
             if pop.neuron_type.axon_spike:
@@ -187,6 +192,7 @@ class MonitorGenerator(object):
                 struct_code += base_tpl['struct'] % rec_dict
                 init_code += base_tpl['init'] % rec_dict
                 recording_code += base_tpl['record'][get_global_config('paradigm')] % rec_dict
+                serialize_code += RecTemplate.serialize_recorded_data % rec_dict
 
         ids = {
             'id': pop.id,
@@ -195,7 +201,8 @@ class MonitorGenerator(object):
             'recording_code': recording_code,
             'recording_target_code': recording_target_code,
             'size_in_bytes': tabify(size_in_bytes, 2),
-            'clear_monitor_code': clear_code
+            'clear_monitor_code': clear_code,
+            'serialize_code': serialize_code
         }
         return tpl_code % ids
 
@@ -227,6 +234,7 @@ class MonitorGenerator(object):
         size_in_bytes_code = ""
         clear_code = ""
         struct_code = ""
+        serialize_code = ""
 
         attributes = []
         for var in proj.synapse_type.description['variables']:
@@ -254,6 +262,9 @@ class MonitorGenerator(object):
             # Memory requirement
             size_in_bytes_code += template[locality]['size_in_bytes'] % {'type' : var['ctype'], 'name': var['name']}
 
+            # Checkpointing of the recorded data
+            serialize_code += RecTemplate.serialize_recorded_data % {'name': var['name']}
+
             # Get the recording code
             recording_code += template[locality]['recording'] % {
                 'id': proj.id,
@@ -268,7 +279,8 @@ class MonitorGenerator(object):
             'recording_code': recording_code,
             'size_in_bytes_code': size_in_bytes_code,
             'clear_code': clear_code,
-            'struct_code': struct_code
+            'struct_code': struct_code,
+            'serialize_code': serialize_code
         }
 
         return template['struct'] % final_dict
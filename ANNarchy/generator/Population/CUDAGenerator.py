@@ -833,6 +833,9 @@ class CUDAGenerator(PopulationGenerator):
             * tuple of four code snippets (device_kernel, device_invoke, kernel_decl, host_call)
 
         """
+        if pop.update_period is not None:
+            Messages._error("Population", pop.name, ": update_period is not available on GPUs.")
+
         # Use pre-defined code template
         if 'update_variables' in pop._specific_template.keys():
             try:
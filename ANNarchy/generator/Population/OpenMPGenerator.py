@@ -8,7 +8,7 @@ from copy import deepcopy
 import ANNarchy
 
 from ANNarchy.generator.Template.GlobalOperationTemplate import global_operation_templates_omp_extern as global_op_extern_dict
-from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces
+from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces, counter_based_rng_stream
 from ANNarchy.core import Global
 from ANNarchy.intern.ConfigManagement import get_global_config
 from ANNarchy.intern import Messages
@@ -115,6 +115,7 @@ class OpenMPGenerator(PopulationGenerator):
         # Memory management
         size_in_bytes = self._size_in_bytes(pop)
         clear_container = self._clear_container(pop)
+        serialize_state = self._serialize_state(pop)
 
         # Profiling
         if self._prof_gen:
@@ -211,7 +212,8 @@ class OpenMPGenerator(PopulationGenerator):
             'update_global_ops': update_global_ops,
             'stop_condition': stop_condition,
             'size_in_bytes': size_in_bytes,
-            'clear_container': clear_container
+            'clear_container': clear_container,
+            'serialize_state': serialize_state
         }
 
         # remove right-trailing spaces
@@ -311,15 +313,15 @@ class OpenMPGenerator(PopulationGenerator):
 
                 if attr['locality'] == "local":
                     declare_code += """
-    std::deque< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
                 else:
                     declare_code += """
-    std::deque< %(type)s > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< %(type)s > _delayed_%(name)s; """ % attr_dict
         else:
             # Spiking networks should only exchange spikes
             declare_code += """
     // Delays for spike population
-    std::deque< std::vector<int> > _delayed_spike;
+    RingBuffer< std::vector<int> > _delayed_spike;
 """
             for var in pop.delayed_variables:
                 attr = self._get_attr(pop, var)
@@ -327,10 +329,10 @@ class OpenMPGenerator(PopulationGenerator):
 
                 if attr['locality'] == "local":
                     declare_code += """
-    std::deque< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
                 else:
                     declare_code += """
-    std::deque< %(type)s > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< %(type)s > _delayed_%(name)s; """ % attr_dict
 
         # Initialization
         init_code = """
@@ -353,18 +355,18 @@ class OpenMPGenerator(PopulationGenerator):
         # Delaying spike events is done differently
         if pop.neuron_type.type == 'spike':
             init_code += """
-        _delayed_spike = std::deque< std::vector<int> >(max_delay, std::vector<int>());"""
+        _delayed_spike = RingBuffer< std::vector<int> >(max_delay, std::vector<int>());"""
 
             update_code += """
             #pragma omp single
             {
                 _delayed_spike.push_front(spiked);
-                _delayed_spike.pop_back();
             }
 """
             reset_code += """
-        _delayed_spike.clear();
-        _delayed_spike = std::deque< std::vector<int> >(max_delay, std::vector<int>());"""
+        for ( int i = 0; i < _delayed_spike.size(); i++ ) {
+            _delayed_spike[i].clear();
+        }"""
 
             resize_code += """
         _delayed_spike.resize(max_delay, std::vector<int>());
@@ -590,17 +592,23 @@ class OpenMPGenerator(PopulationGenerator):
         if len(pop.neuron_type.description['random_distributions']) == 0:
             return ""
 
-        if get_global_config('disable_parallel_rng'):
+        # The counter-based generators do not depend on the thread drawing the values
+        counter_based = get_global_config('counter_based_rng')
+
+        if get_global_config('disable_parallel_rng') and not counter_based:
             use_parallel_rng = False
         else:
             use_parallel_rng = True
 
         rng_code = self._templates['rng']['omp_code_seq'] if not use_parallel_rng else self._templates['rng']['omp_code_par']
 
+        # setup(vectorized_rng=True): the local variables are filled in blocks, one block per thread
+        block_rng = get_global_config('vectorized_rng') and not counter_based
+
         local_code = ""
         global_code = ""
         rng_dist_code = ""
-        for rd in pop.neuron_type.description['random_distributions']:
+        for rd_idx, rd in enumerate(pop.neuron_type.description['random_distributions']):
 
             rng_dist_code += self._templates['rng']['dist_decl'] % {
                 'rd_name': rd['name'],
@@ -611,7 +619,20 @@ class OpenMPGenerator(PopulationGenerator):
                 }
             }
 
-            if rd['locality'] == 'local':
+            if counter_based:
+                update_ids = {'rd_name': rd['name'], 'stream': counter_based_rng_stream(pop.id, rd_idx)}
+                if rd['locality'] == 'local':
+                    local_code += self._templates['rng'][rd['locality']]['update_counter'] % update_ids
+                else:
+                    global_code += self._templates['rng'][rd['locality']]['update_counter'] % update_ids
+
+            elif rd['locality'] == 'local' and block_rng:
+                if not use_parallel_rng:
+                    local_code += self._templates['rng'][rd['locality']]['update_block'] % {'rd_name': rd['name'], 'begin': 0, 'size': "size", 'index': 0} + "\n"
+                else:
+                    local_code += self._templates['rng'][rd['locality']]['update_block'] % {'rd_name': rd['name'], 'begin': "begin", 'size': "end - begin", 'index': "tid"} + "\n"
+
+            elif rd['locality'] == 'local':
                 if not use_parallel_rng:
                     local_code += self._templates['rng'][rd['locality']]['update'] % {'id': pop.id, 'rd_name': rd['name'], 'index': 0}
                 else:
@@ -627,7 +648,17 @@ class OpenMPGenerator(PopulationGenerator):
             %(update_rng_global)s
             }""" % {'update_rng_global': tabify(global_code,1)}
 
-            if len(local_code.strip()) > 0:
+            if len(local_code.strip()) > 0 and block_rng:
+                local_code = """\t\t\t// local attributes, a block of neurons per thread
+            {
+                int chunk = (size + omp_get_num_threads() - 1) / omp_get_num_threads();
+                int begin = std::min(size, tid * chunk);
+                int end = std::min(size, begin + chunk);
+%(update_rng_local)s
+            }
+            #pragma omp barrier""" % {'update_rng_local': tabify(local_code.strip('\n'), 4)}
+
+            elif len(local_code.strip()) > 0:
                 local_code = """\t\t\t// local attributes
             #pragma omp for
             for (int i = 0; i < size; i++) {
@@ -635,7 +666,11 @@ class OpenMPGenerator(PopulationGenerator):
             }""" % {'update_rng_local': local_code}
 
         else:
-            if len(local_code.strip()) > 0:
+            if len(local_code.strip()) > 0 and block_rng:
+                local_code = """\t\t\t\t// local attributes
+%(update_rng_local)s""" % {'update_rng_local': tabify(local_code.strip('\n'), 4)}
+
+            elif len(local_code.strip()) > 0:
                 local_code = """\t\t\t\t// local attributes
                 for (int i = 0; i < size; i++) {
                 %(update_rng_local)s
@@ -737,6 +772,9 @@ class OpenMPGenerator(PopulationGenerator):
         } // active
 """ % {'code': code}
 
+        # slow populations are not updated at each step
+        final_code = self._update_period(pop, final_code)
+
         # if profiling enabled, annotate with profiling code
         if self._prof_gen:
             final_code = self._prof_gen.annotate_update_neuron(pop, final_code)
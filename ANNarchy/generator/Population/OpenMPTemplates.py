@@ -18,12 +18,14 @@ population_header = """/*
 #include "ANNarchy.h"
 #include <random>
 #include "randutils.hpp"
+#include "RingBuffer.hpp"
 %(include_additional)s
 %(include_profile)s
 extern %(float_prec)s dt;
 extern long int t;
 extern int global_num_threads;
 extern std::vector<std::mt19937> rng;
+extern long int rng_seed;
 %(extern_global_operations)s
 %(struct_additional)s
 ///////////////////////////////////////////////////////////////
@@ -135,6 +137,12 @@ struct PopStruct%(id)s{
     void clear() {
 %(clear_container)s
     }
+
+    // Checkpointing: stores or restores the state of the population (see Checkpoint.hpp)
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+%(serialize_state)s
+    }
 };
 """
 
@@ -297,13 +305,17 @@ attribute_cpp_init = {
 attribute_delayed = {
     'local': {
         'init': """
-        _delayed_%(name)s = std::deque< std::vector< %(type)s > >(max_delay, std::vector< %(type)s >(size, 0.0));""",
+        _delayed_%(name)s = RingBuffer< std::vector< %(type)s > >(max_delay, std::vector< %(type)s >(size, 0.0));""",
 
         'update': """
         #pragma omp single
         {
-            _delayed_%(name)s.push_front(%(name)s);
-            _delayed_%(name)s.pop_back();
+            _delayed_%(name)s.advance();
+        }
+        // the oldest vector became the most recent one, it is overwritten in parallel
+        #pragma omp for
+        for (int i = 0; i < size; i++) {
+            _delayed_%(name)s[0][i] = %(name)s[i];
         }
 """,
         'reset' : """
@@ -317,12 +329,11 @@ attribute_delayed = {
     },
     'global':{
         'init': """
-        _delayed_%(name)s = std::deque< %(type)s >(max_delay, 0.0);""",
+        _delayed_%(name)s = RingBuffer< %(type)s >(max_delay, 0.0);""",
         'update': """
         #pragma omp single
         {
             _delayed_%(name)s.push_front(%(name)s);
-            _delayed_%(name)s.pop_back();
         }
 """,
         'reset' : """
@@ -349,12 +360,15 @@ cpp_11_rng = {
         'decl': "std::vector<%(type)s> %(rd_name)s ;",
         'init': "%(rd_name)s = std::vector<%(type)s>(size, 0.0);",
         'update': "%(rd_name)s[i] = dist_%(rd_name)s(rng[%(index)s]);",
+        'update_counter': "%(rd_name)s[i] = counter_based_draw(dist_%(rd_name)s, rng_seed, %(stream)s, t, i);",
+        'update_block': "fill_random_block(%(rd_name)s.data() + %(begin)s, %(size)s, dist_%(rd_name)s, rng[%(index)s]);",
         'clear': "%(rd_name)s.clear();\n%(rd_name)s.shrink_to_fit();"
     },
     'global': {
         'decl': "%(type)s %(rd_name)s;",
         'init': "%(rd_name)s = 0.0;",
         'update': "%(rd_name)s = dist_%(rd_name)s(rng[0]);",
+        'update_counter': "%(rd_name)s = counter_based_draw(dist_%(rd_name)s, rng_seed, %(stream)s, t, 0);",
         'clear': ""
     },
     'omp_code_seq': """
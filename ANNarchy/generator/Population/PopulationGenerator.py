@@ -3,6 +3,8 @@
 :license: GPLv2, see LICENSE for details.
 """
 
+import re
+
 from ANNarchy.intern.ConfigManagement import get_global_config, _check_paradigm
 from ANNarchy.generator.Utils import tabify
 
@@ -53,6 +55,32 @@ class PopulationGenerator(object):
         "Implemented by child class"
         raise NotImplementedError
 
+    def _update_period(self, pop, code):
+        """
+        Multi-rate integration (Population(update_period=...)): the update code
+        of the neural variables is only executed every *period* steps, and the
+        ODEs are integrated with the step size period*dt.
+        """
+        if pop.update_period is None:
+            return code
+
+        period = round(pop.update_period / get_global_config('dt'))
+        if period <= 1:
+            return code
+
+        # replace the step size, but not in the current time (double(t)*dt)
+        code = code.replace("double(t)*dt", "double(t)*__time_dt__")
+        code = re.sub(r'([^\w]+)dt([^\w]+)', r'\1_dt\2', code)
+        code = code.replace("double(t)*__time_dt__", "double(t)*dt")
+
+        return """
+        // Multi-rate integration: the neurons are updated every %(period)s steps
+        if ( t %% %(period)s == 0L ) {
+            const %(float_prec)s _dt = %(period)s * dt;
+%(code)s
+        }
+""" % {'period': period, 'float_prec': get_global_config('precision'), 'code': tabify(code, 1)}
+
     def _generate_decl_and_acc(self, pop):
         """
         Data exchange between Python and ANNarchyCore library is done by specific 
@@ -441,6 +469,72 @@ _spike_history.shrink_to_fit();
         code = tabify(code, 2)
         return code
 
+    def _serialize_state(self, pop):
+        """
+        Generate the code storing or restoring the state of the C++ object *pop* (checkpoint(), restore()). The
+        archive deduces the type of each member (see Checkpoint.hpp), so only their names are listed.
+
+        Specific populations extend the resulting code template with the 'serialize_additional' field or replace
+        it with the 'serialize_state' field of the _specific_template.
+        """
+        if 'serialize_state' in pop._specific_template.keys():
+            return pop._specific_template['serialize_state']
+
+        from ANNarchy.generator.Utils import tabify
+        members = []
+
+        # Parameters and variables
+        for attr in pop.neuron_type.description['parameters'] + pop.neuron_type.description['variables']:
+            if attr['name'] not in members:
+                members.append(attr['name'])
+
+        # Spike-specific data
+        if pop.neuron_type.description['type'] == 'spike':
+            members += ['last_spike', 'spiked']
+
+            # Conductances which are not declared as variables (see _generate_decl_and_acc)
+            try:
+                all_targets = set(pop.neuron_type.description['targets'] + pop.targets)
+            except TypeError:
+                all_targets = set(pop.neuron_type.description['targets'] + pop.targets[0])
+            for target in sorted(list(all_targets)):
+                if 'g_'+target not in members:
+                    members.append('g_'+target)
+
+            if pop.neuron_type.refractory or pop.refractory:
+                members += ['refractory', 'refractory_remaining', 'in_ref']
+
+            if pop.neuron_type.axon_spike:
+                members.append('axonal')
+
+            # Mean firing rate
+            members += ['_spike_history', '_mean_fr_window', '_mean_fr_rate']
+
+        # Delayed variables
+        if pop.max_delay > 1:
+            if pop.neuron_type.type == 'spike':
+                members.append('_delayed_spike')
+            for var in pop.delayed_variables:
+                members.append('_delayed_'+var)
+
+        # Global operations
+        for op in pop.global_operations:
+            members.append('_%(function)s_%(variable)s' % op)
+
+        # Random variables
+        for dist in pop.neuron_type.description['random_distributions']:
+            members.append(dist['name'])
+
+        code = ""
+        for name in members:
+            code += "ar(%(name)s);\n" % {'name': name}
+
+        # Members of specific populations (e.g. the internal time of a TimedArray)
+        if 'serialize_additional' in pop._specific_template.keys():
+            code += pop._specific_template['serialize_additional']
+
+        return tabify(code, 2)
+
     def _generate_default_get_set(self, pop):
         """
         Generate a get/set template for all attributes in the given population
@@ -8,7 +8,7 @@ from copy import deepcopy
 import ANNarchy
 
 from ANNarchy.generator.Template.GlobalOperationTemplate import global_operation_templates_st_extern as global_op_extern_dict
-from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces
+from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces, counter_based_rng_stream
 from ANNarchy.core import Global
 from ANNarchy.intern.ConfigManagement import get_global_config
 from ANNarchy.intern import Messages
@@ -115,6 +115,7 @@ class SingleThreadGenerator(PopulationGenerator):
         # Memory management
         size_in_bytes = self._size_in_bytes(pop)
         clear_container = self._clear_container(pop)
+        serialize_state = self._serialize_state(pop)
 
         # Profiling
         if self._prof_gen:
@@ -211,7 +212,8 @@ class SingleThreadGenerator(PopulationGenerator):
             'update_global_ops': update_global_ops,
             'stop_condition': stop_condition,
             'size_in_bytes': size_in_bytes,
-            'clear_container': clear_container
+            'clear_container': clear_container,
+            'serialize_state': serialize_state
         }
 
         # remove right-trailing spaces
@@ -306,15 +308,15 @@ class SingleThreadGenerator(PopulationGenerator):
 
                 if attr['locality'] == "local":
                     declare_code += """
-    std::deque< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
                 else:
                     declare_code += """
-    std::deque< %(type)s > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< %(type)s > _delayed_%(name)s; """ % attr_dict
         else:
             # Spiking networks should only exchange spikes
             declare_code += """
     // Delays for spike population
-    std::deque< std::vector<int> > _delayed_spike;
+    RingBuffer< std::vector<int> > _delayed_spike;
 """
             for var in pop.delayed_variables:
                 attr = self._get_attr(pop, var)
@@ -322,10 +324,10 @@ class SingleThreadGenerator(PopulationGenerator):
 
                 if attr['locality'] == "local":
                     declare_code += """
-    std::deque< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< std::vector< %(type)s > > _delayed_%(name)s; """ % attr_dict
                 else:
                     declare_code += """
-    std::deque< %(type)s > _delayed_%(name)s; """ % attr_dict
+    RingBuffer< %(type)s > _delayed_%(name)s; """ % attr_dict
 
         # Initialization
         init_code = """
@@ -348,15 +350,15 @@ class SingleThreadGenerator(PopulationGenerator):
         # Delaying spike events is done differently
         if pop.neuron_type.type == 'spike':
             init_code += """
-        _delayed_spike = std::deque< std::vector<int> >(max_delay, std::vector<int>());"""
+        _delayed_spike = RingBuffer< std::vector<int> >(max_delay, std::vector<int>());"""
 
             update_code += """
             _delayed_spike.push_front(spiked);
-            _delayed_spike.pop_back();
 """
             reset_code += """
-        _delayed_spike.clear();
-        _delayed_spike = std::deque< std::vector<int> >(max_delay, std::vector<int>());"""
+        for ( int i = 0; i < _delayed_spike.size(); i++ ) {
+            _delayed_spike[i].clear();
+        }"""
 
             resize_code += """
         _delayed_spike.resize(max_delay, std::vector<int>());
@@ -555,12 +557,15 @@ class SingleThreadGenerator(PopulationGenerator):
         if len(pop.neuron_type.description['random_distributions']) == 0:
             return ""
 
-        rng_code = self._templates['rng']['update']
+        # The counter-based generators draw the values element-wise
+        block_rng = get_global_config('vectorized_rng') and not get_global_config('counter_based_rng')
+
+        rng_code = self._templates['rng']['update'] if not block_rng else self._templates['rng']['update_block']
 
         local_code = ""
         global_code = ""
         rng_dist_code = ""
-        for rd in pop.neuron_type.description['random_distributions']:
+        for rd_idx, rd in enumerate(pop.neuron_type.description['random_distributions']):
             rng_dist_code += self._templates['rng']['dist_decl'] % {
                 'rd_name': rd['name'],
                 'rd_init': rd['definition'] % {
@@ -570,8 +575,18 @@ class SingleThreadGenerator(PopulationGenerator):
                 }
             }
 
-            if rd['locality'] == 'local':
-                local_code += self._templates['rng'][rd['locality']]['update'] % {'id': pop.id, 'rd_name': rd['name'], 'index': 0}
+            if get_global_config('counter_based_rng'):
+                update_ids = {'rd_name': rd['name'], 'stream': counter_based_rng_stream(pop.id, rd_idx)}
+                if rd['locality'] == 'local':
+                    local_code += self._templates['rng'][rd['locality']]['update_counter'] % update_ids
+                else:
+                    global_code += self._templates['rng'][rd['locality']]['update_counter'] % update_ids
+
+            elif rd['locality'] == 'local':
+                if block_rng:
+                    local_code += tabify(self._templates['rng'][rd['locality']]['update_block'] % {'rd_name': rd['name']}, 3) + "\n"
+                else:
+                    local_code += self._templates['rng'][rd['locality']]['update'] % {'id': pop.id, 'rd_name': rd['name'], 'index': 0}
             else:
                 global_code += self._templates['rng'][rd['locality']]['update'] % {'id': pop.id, 'rd_name': rd['name']}
 
@@ -670,6 +685,9 @@ class SingleThreadGenerator(PopulationGenerator):
         } // active
 """ % code_dict
 
+        # slow populations are not updated at each step
+        code = self._update_period(pop, code)
+
         # if profiling enabled, annotate with profiling code
         if self._prof_gen:
             code = self._prof_gen.annotate_update_neuron(pop, code)
@@ -18,12 +18,14 @@ population_header = """/*
 
 #include "ANNarchy.h"
 #include <random>
+#include "RingBuffer.hpp"
 
 %(include_additional)s
 %(include_profile)s
 extern %(float_prec)s dt;
 extern long int t;
 extern std::vector<std::mt19937> rng;
+extern long int rng_seed;
 %(extern_global_operations)s
 %(struct_additional)s
 ///////////////////////////////////////////////////////////////
@@ -124,6 +126,12 @@ struct PopStruct%(id)s{
 #endif
 %(clear_container)s
     }
+
+    // Checkpointing: stores or restores the state of the population (see Checkpoint.hpp)
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+%(serialize_state)s
+    }
 };
 """
 
@@ -284,11 +292,10 @@ attribute_cpp_init = {
 attribute_delayed = {
     'local': {
         'init': """
-        _delayed_%(name)s = std::deque< std::vector< %(type)s > >(max_delay, std::vector< %(type)s >(size, 0.0));""",
+        _delayed_%(name)s = RingBuffer< std::vector< %(type)s > >(max_delay, std::vector< %(type)s >(size, 0.0));""",
 
         'update': """
         _delayed_%(name)s.push_front(%(name)s);
-        _delayed_%(name)s.pop_back();
 """,
         'reset' : """
         for ( int i = 0; i < _delayed_%(name)s.size(); i++ ) {
@@ -301,10 +308,9 @@ attribute_delayed = {
     },
     'global':{
         'init': """
-        _delayed_%(name)s = std::deque< %(type)s >(max_delay, 0.0);""",
+        _delayed_%(name)s = RingBuffer< %(type)s >(max_delay, 0.0);""",
         'update': """
         _delayed_%(name)s.push_front(%(name)s);
-        _delayed_%(name)s.pop_back();
 """,
         'reset' : """
         for ( int i = 0; i < _delayed_%(name)s.size(); i++ ) {
@@ -330,12 +336,15 @@ cpp_11_rng = {
         'decl': "std::vector<%(type)s> %(rd_name)s ;",
         'init': "%(rd_name)s = std::vector<%(type)s>(size, 0.0);",
         'update': "%(rd_name)s[i] = dist_%(rd_name)s(rng[%(index)s]);",
+        'update_counter': "%(rd_name)s[i] = counter_based_draw(dist_%(rd_name)s, rng_seed, %(stream)s, t, i);",
+        'update_block': "fill_random_block(%(rd_name)s.data(), size, dist_%(rd_name)s, rng[0]);",
         'clear': "%(rd_name)s.clear();\n%(rd_name)s.shrink_to_fit();"
     },
     'global': {
         'decl': "%(type)s %(rd_name)s;",
         'init': "%(rd_name)s = 0.0;",
         'update': "%(rd_name)s = dist_%(rd_name)s(rng[0]);",
+        'update_counter': "%(rd_name)s = counter_based_draw(dist_%(rd_name)s, rng_seed, %(stream)s, t, 0);",
         'clear': ""
     },
     'update': """
@@ -346,6 +355,14 @@ cpp_11_rng = {
 %(update_rng_local)s
             }
         }
+    """,
+    # setup(vectorized_rng=True): the local variables are filled for all neurons at once
+    'update_block': """
+        if (_active) {
+%(rng_dist)s
+%(update_rng_global)s
+%(update_rng_local)s
+        }
     """
 }
 
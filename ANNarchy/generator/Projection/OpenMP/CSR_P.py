@@ -144,26 +144,18 @@ delay = {
         'declare': """
     std::vector<int> delay;
     int max_delay;
-    int idx_delay;
-    std::vector< std::vector< std::vector< int > > > _delayed_spikes;
+    std::vector<EventRingBuffer> _delayed_events; // one ring buffer per thread
 """,
         'init': """
     delay = init_matrix_variable<int>(1);
     update_variable_all<int>(delay, delays);
 
-    idx_delay = 0;
     max_delay = %(pre_prefix)smax_delay;
+    _delayed_events = std::vector<EventRingBuffer>(global_num_threads, EventRingBuffer(max_delay));
 """,
         'reset': """
-        while(!_delayed_spikes.empty()) {
-            auto elem = _delayed_spikes.back();
-            elem.clear();
-            _delayed_spikes.pop_back();
-        }
-
-        idx_delay = 0;
-        max_delay =  %(pre_prefix)smax_delay ;
-        _delayed_spikes = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >()) );        
+        max_delay = %(pre_prefix)smax_delay;
+        _delayed_events = std::vector<EventRingBuffer>(global_num_threads, EventRingBuffer(max_delay));
 """,
         'pyx_struct':
 """
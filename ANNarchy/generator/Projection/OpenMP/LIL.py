@@ -96,6 +96,17 @@ cpp_11_rng = {
 """,
     'local': """
         %(rd_name)s[i][j] = dist_%(rd_name)s(rng[0]);
+""",
+    # counter-based generators (setup(counter_based_rng=True)), the synapses are shared between the threads
+    'template_counter': """#pragma omp for
+for (%(idx_type)s i = 0; i < post_rank.size(); i++) {
+    for (%(idx_type)s j = 0; j < pre_rank[i].size(); j++) {
+    %(local_rng)s
+    }
+}
+""",
+    'local_counter': """
+        %(rd_name)s[i][j] = counter_based_draw(dist_%(rd_name)s, rng_seed, %(stream)s, t, (static_cast<std::uint64_t>(post_rank[i]) << 32) | pre_rank[i][j]);
 """
 }
 
@@ -169,27 +180,18 @@ delay = {
         'declare': """
     std::vector<std::vector<int>> delay;
     int max_delay;
-    int idx_delay;
-    std::vector< std::vector< std::vector< int > > > _delayed_spikes;
+    std::vector<EventRingBuffer> _delayed_events; // one ring buffer per thread
 """,
         'init': """
     delay = init_matrix_variable<int>(1);
     update_matrix_variable_all<int>(delay, delays);
 
-    idx_delay = 0;
-    max_delay = %(pre_prefix)smax_delay ;
-    _delayed_spikes = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >()) );
+    max_delay = %(pre_prefix)smax_delay;
+    _delayed_events = std::vector<EventRingBuffer>(global_num_threads, EventRingBuffer(max_delay));
 """,
         'reset': """
-        while(!_delayed_spikes.empty()) {
-            auto elem = _delayed_spikes.back();
-            elem.clear();
-            _delayed_spikes.pop_back();
-        }
-
-        idx_delay = 0;
-        max_delay = %(pre_prefix)smax_delay ;
-        _delayed_spikes = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >()) );
+        max_delay = %(pre_prefix)smax_delay;
+        _delayed_events = std::vector<EventRingBuffer>(global_num_threads, EventRingBuffer(max_delay));
 """,
         'pyx_struct':
 """
@@ -1090,66 +1092,48 @@ spiking_summation_variable_delay = """
 // Event-based summation
 if (_transmission && %(post_prefix)s_active){
 
+    // Each thread stores the events of its share of the spikes in its own ring buffer
+    auto& delayed_events = _delayed_events[tid];
+
     // Iterate over the spikes emitted during the last step in the pre population
-    #pragma omp for
+    #pragma omp for nowait
     for(int idx_spike=0; idx_spike<%(pre_prefix)sspiked.size(); idx_spike++){
 
         // Get the rank of the pre-synaptic neuron which spiked
         int rk_pre = %(pre_prefix)sspiked[idx_spike];
         // List of post neurons receiving connections
-        std::vector< std::pair<int, int> > rks_post = inv_pre_rank[rk_pre];
-
-        // Iterate over the post neurons
-        for(int x=0; x<rks_post.size(); x++){
-            // Index of the post neuron in the connectivity matrix
-            int i = rks_post[x].first ;
-            // Index of the pre neuron in the connecivity matrix
-            int j = rks_post[x].second ;
-            // Delay of that connection
-            int d = delay[i][j]-1;
-            // Index in the ring buffer
-            int modulo_delay = (idx_delay + d) %% max_delay;
-            // Add the spike in the ring buffer
-            #pragma omp critical
-            {
-                _delayed_spikes[modulo_delay][i].push_back(j);
-            }
+        auto rks_post = inv_pre_rank.find(rk_pre);
+        if (rks_post == inv_pre_rank.end())
+            continue;
+
+        // Store the events in the ring buffer, according to the delay of each connection
+        for (auto it = rks_post->second.cbegin(); it != rks_post->second.cend(); it++) {
+            delayed_events.push(delay[it->first][it->second]-1, it->first, it->second);
         }
     }
 
-    #pragma omp barrier
-
-    // Iterate over all post neurons having received spikes in the previous steps
-    for (int i=0; i<_delayed_spikes[idx_delay].size(); i++){
-        #pragma omp for
-        for (int _idx_j=0; _idx_j<_delayed_spikes[idx_delay][i].size(); _idx_j++){
-            // Pre-synaptic index in the connectivity matrix
-            int j = _delayed_spikes[idx_delay][i][_idx_j];
+    // Iterate over the events arriving at the current step
+    for (int _idx_e = 0; _idx_e < delayed_events.num_events(); _idx_e++) {
+        // Index of the post neuron in the connectivity matrix
+        int i = delayed_events.row_index(_idx_e);
+        // Index of the pre neuron in the connecivity matrix
+        int j = delayed_events.column_index(_idx_e);
 
-            // Event-driven integration
-            %(event_driven)s
-            // Update conductance
-            #pragma omp critical
-            {
-            %(g_target)s
-            }
-            // Synaptic plasticity: pre-events
-            %(pre_event)s
-        }
-        // Empty the current list of the ring buffer
-        #pragma omp single
+        // Event-driven integration
+        %(event_driven)s
+        // Update conductance
+        #pragma omp critical
         {
-            _delayed_spikes[idx_delay][i].clear();
+        %(g_target)s
         }
+        // Synaptic plasticity: pre-events
+        %(pre_event)s
     }
 
-    #pragma omp barrier
+    // Empty the current slot and move to the next step
+    delayed_events.advance();
 
-    #pragma omp single
-    {
-        // Increment the index of the ring buffer
-        idx_delay = (idx_delay + 1) %% max_delay;
-    }
+    #pragma omp barrier
 } // active
 """
 
@@ -186,8 +186,7 @@ delay = {
     // Nonuniform spiking delays
     std::vector<std::vector<std::vector<int>>> delay;
     int max_delay;
-    int idx_delay;
-    std::vector< std::vector< std::vector< std::vector< int > > > > _delayed_spikes;
+    std::vector<EventRingBuffer> _delayed_events; // one ring buffer per thread
 
     std::vector<std::vector<int>> get_delay() {
         return get_matrix_variable_all<int, std::vector<std::vector<int>>>(delay);
@@ -200,33 +199,12 @@ delay = {
         delay = init_matrix_variable<int, std::vector<std::vector<int>>>(1);
         update_matrix_variable_all<int>(delay, delays);
 
-        idx_delay = 0;
-        max_delay = %(pre_prefix)smax_delay ;
-        _delayed_spikes = std::vector< std::vector< std::vector< std::vector< int > > > >(global_num_threads, std::vector< std::vector< std::vector< int > > >());
-        for (int tid = 0; tid < global_num_threads; tid++) {
-            _delayed_spikes[tid] = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(sub_matrices_[tid]->post_rank.size(), std::vector< int >() ) );
-        }
-    #ifdef _DEBUG
-        std::cout << "Inited _delayed_spikes[" << global_num_threads << "][" << max_delay << "] and " << std::endl;
-        for (int tid = 0; tid < global_num_threads; tid++) {
-            std::cout << "   _delayed_spikes[" << tid << "][:] with vectors of size = " << _delayed_spikes[tid][0].size() << " element(s) " << std::endl;
-        }
-    #endif
+        max_delay = %(pre_prefix)smax_delay;
+        _delayed_events = std::vector<EventRingBuffer>(global_num_threads, EventRingBuffer(max_delay));
 """,
         'reset': """
-        while(!_delayed_spikes.empty()) {
-            auto elem = _delayed_spikes.back();
-            elem.clear();
-            _delayed_spikes.pop_back();
-        }
-
-        idx_delay = 0;
-        max_delay = %(pre_prefix)smax_delay ;
-        _delayed_spikes = std::vector< std::vector< std::vector< std::vector< int > > > >(global_num_threads, std::vector< std::vector< std::vector< int > > >());
-        for (int tid = 0; tid < global_num_threads; tid++) {
-            _delayed_spikes[tid] = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(sub_matrices_[tid]->post_rank.size(), std::vector< int >() ) );
-        }
-
+        max_delay = %(pre_prefix)smax_delay;
+        _delayed_events = std::vector<EventRingBuffer>(global_num_threads, EventRingBuffer(max_delay));
 """,
         'pyx_struct':
 """
@@ -533,56 +511,44 @@ spiking_summation_variable_delay = """
 // Event-based summation
 if (_transmission && %(post_prefix)s_active){
 
+    // Ring buffer of the sub-matrix processed by this thread
+    auto& delayed_events = _delayed_events[tid];
+
     // Iterate over the spikes emitted during the last step in the pre population
     for(int idx_spike=0; idx_spike<%(pre_prefix)sspiked.size(); idx_spike++){
 
         // Get the rank of the pre-synaptic neuron which spiked
         int rk_pre = %(pre_prefix)sspiked[idx_spike];
         // List of post neurons receiving connections
-        auto rks_post_beg = (sub_matrices_[tid]->inv_pre_rank[rk_pre]).begin();
-        auto rks_post_end = (sub_matrices_[tid]->inv_pre_rank[rk_pre]).end();
-
-        // Iterate over the post neurons
-        for (auto rks_post_it = rks_post_beg; rks_post_it != rks_post_end; rks_post_it++){
-            // Index of the post neuron in the connectivity matrix
-            int i = rks_post_it->first ;
-            // Index of the pre neuron in the connecivity matrix
-            int j = rks_post_it->second ;
-            // Delay of that connection
-            int d = delay[tid][i][j]-1;
-            // Index in the ring buffer
-            int modulo_delay = (idx_delay + d) %% max_delay;
-            // Add the spike in the ring buffer
-            _delayed_spikes[tid][modulo_delay][i].push_back(j);
+        auto rks_post = sub_matrices_[tid]->inv_pre_rank.find(rk_pre);
+        if (rks_post == sub_matrices_[tid]->inv_pre_rank.end())
+            continue;
+
+        // Store the events in the ring buffer, according to the delay of each connection
+        for (auto it = rks_post->second.cbegin(); it != rks_post->second.cend(); it++) {
+            delayed_events.push(delay[tid][it->first][it->second]-1, it->first, it->second);
         }
     }
 
-    #pragma omp barrier
-
-    // Iterate over all post neurons having received spikes in the previous steps
-    for (int i=0; i<_delayed_spikes[tid][idx_delay].size(); i++){
+    // Iterate over the events arriving at the current step
+    for (int _idx_e = 0; _idx_e < delayed_events.num_events(); _idx_e++) {
+        // Index of the post neuron in the connectivity matrix
+        int i = delayed_events.row_index(_idx_e);
+        // Index of the pre neuron in the connecivity matrix
+        int j = delayed_events.column_index(_idx_e);
+
+        // Event-driven integration
+        %(event_driven)s
+        // Update conductance
+        %(g_target)s
+        // Synaptic plasticity: pre-events
+        %(pre_event)s
+    }
 
-        for (int _idx_j=0; _idx_j<_delayed_spikes[tid][idx_delay][i].size(); _idx_j++){
-            // Pre-synaptic index in the connectivity matrix
-            int j = _delayed_spikes[tid][idx_delay][i][_idx_j];
+    // Empty the current slot and move to the next step
+    delayed_events.advance();
 
-            // Event-driven integration
-            %(event_driven)s
-            // Update conductance
-            %(g_target)s
-            // Synaptic plasticity: pre-events
-            %(pre_event)s
-        }
-        // Empty the current list of the ring buffer
-        _delayed_spikes[tid][idx_delay][i].clear();
-    }
     #pragma omp barrier
-
-    // Increment the index of the ring buffer
-    #pragma omp single
-    {
-        idx_delay = (idx_delay + 1) %% max_delay;
-    }
 } // active
 """
 
@@ -17,7 +17,7 @@ from ANNarchy.generator.Projection.ProjectionGenerator import ProjectionGenerato
 from ANNarchy.generator.Projection.OpenMP import *
 
 # Useful functions
-from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces, check_avx_instructions, determine_idx_type_for_projection
+from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces, check_avx_instructions, determine_idx_type_for_projection, counter_based_rng_stream
 
 import re
 from copy import deepcopy
@@ -136,6 +136,7 @@ class OpenMPGenerator(ProjectionGenerator):
         # Memory management
         size_in_bytes = self._size_in_bytes(proj)
         clear_container = self._clear_container(proj)
+        serialize_state = self._serialize_state(proj)
 
         # Structural plasiticity
         creating = self.creating(proj)
@@ -219,6 +220,7 @@ class OpenMPGenerator(ProjectionGenerator):
             'access_additional': access_additional,
             'size_in_bytes': size_in_bytes,
             'clear_container': clear_container,
+            'serialize_state': serialize_state,
             'sparse_format': sparse_matrix_format,
             'sparse_format_args': sparse_matrix_args,
             'float_prec': get_global_config('precision'),
@@ -513,9 +515,10 @@ class OpenMPGenerator(ProjectionGenerator):
         # Dictionary of keywords to transform the parsed equations
         ids = deepcopy(self._template_ids)
 
-        # Use specialized code templates?
-        if isinstance(proj.synapse_type, DefaultRateCodedSynapse) or \
-           proj.synapse_type.description['psp']['eq']=="w*pre.r":
+        # Use specialized code templates? They assume that the weights are stored with the global precision.
+        if (isinstance(proj.synapse_type, DefaultRateCodedSynapse) or \
+           proj.synapse_type.description['psp']['eq']=="w*pre.r") and \
+           proj._get_attribute_cpp_type('w') == get_global_config('precision') and not proj._has_quantized_weights():
 
             simd_type = None
 
@@ -1357,11 +1360,21 @@ _last_event%(local_index)s = t;
         semiglobal_code=""
         local_code=""
 
-        for rd in proj.synapse_type.description['random_distributions']:
+        # The counter-based generators are only available for the LIL format
+        counter_based = get_global_config('counter_based_rng') and 'local_counter' in self._templates["rng_update"].keys()
+
+        for rd_idx, rd in enumerate(proj.synapse_type.description['random_distributions']):
             if rd['name'] in proj.synapse_type.description["local"]:
-                local_code += self._templates["rng_update"][rd["locality"]] % {'rd_name': rd['name']}
+                if counter_based:
+                    local_code += self._templates["rng_update"]["local_counter"] % {
+                        'rd_name': rd['name'],
+                        'stream': counter_based_rng_stream(proj.id, rd_idx, projection=True)
+                    }
+                else:
+                    local_code += self._templates["rng_update"][rd["locality"]] % {'rd_name': rd['name']}
 
-        return tabify(self._templates["rng_update"]["template"] % {
+        template = self._templates["rng_update"]["template_counter" if counter_based else "template"]
+        return tabify(template % {
             'global_rng': global_code,
             'semiglobal_rng': semiglobal_code,
             'local_rng': local_code,
@@ -1506,58 +1519,18 @@ _last_event%(local_index)s = t;
         if proj.uniform_delay >= 0:
             return "", ""
 
-        if proj._no_split_matrix:
-            update_delay_code = """
-        // No need to do anything if the new max delay is smaller than the old one
-        if(d <= max_delay)
-            return;
-
-        // Update delays
-        int prev_max = max_delay;
-        max_delay = d;
-        int add_steps = d - prev_max;
-
-    #ifdef _DEBUG
-        std::cout << "Delayed arrays was " << _delayed_spikes.size() << std::endl;
-    #endif
-
-        // Insert as many empty vectors as need at the current pointer position
-        _delayed_spikes.insert(_delayed_spikes.begin() + idx_delay, add_steps, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >() ));
-
-        // The delay index has to be updated
-        idx_delay = (idx_delay + add_steps) % max_delay;
-"""
-        else:
-            update_delay_code = """
+        update_delay_code = """
         // No need to do anything if the new max delay is smaller than the old one
         if(d <= max_delay)
             return;
 
         // Update delays
-        int prev_max = max_delay;
         max_delay = d;
-        int add_steps = d - prev_max;
-
-    #ifdef _DEBUG
-        std::cout << "Delayed arrays was " << std::endl;
-        for (int tid = 0; tid < global_num_threads; tid++)
-            std::cout << _delayed_spikes.size() << " for thread " << tid << std::endl;
-    #endif
 
-        // Insert as many empty vectors as need at the current pointer position
+        // Insert as many empty slots as needed at the current position of each ring buffer
         for (int tid = 0; tid < global_num_threads; tid++) {
-            _delayed_spikes[tid].insert(_delayed_spikes[tid].begin() + idx_delay, add_steps, std::vector< std::vector< int > >(sub_matrices_[tid]->post_rank.size(), std::vector< int >() ));
+            _delayed_events[tid].resize(max_delay);
         }
-
-        // The delay index has to be updated
-        idx_delay = (idx_delay + add_steps) % max_delay;
-
-    #ifdef _DEBUG
-        std::cout << "Delayed arrays is now " << _delayed_spikes.size() << std::endl;
-        std::cout << "Idx " << idx_delay << std::endl;
-        for(int i = 0; i< max_delay; i++)
-            std::cout << _delayed_spikes[i][0].size() << std::endl;
-    #endif
 """
 
         reset_ring_buffer_code = self._templates['delay']['nonuniform_spiking']['reset'] % self._template_ids
@@ -10,7 +10,7 @@ from ANNarchy.extensions.convolution import Transpose
 from ANNarchy.intern.ConfigManagement import get_global_config, _check_paradigm, _check_precision
 
 # Useful functions
-from ANNarchy.generator.Utils import tabify, determine_idx_type_for_projection, cpp_connector_available
+from ANNarchy.generator.Utils import tabify, determine_idx_type_for_projection, cpp_connector_available, cpp_pattern_available, generic_cpp_patterns, counter_based_rng_stream
 
 class ProjectionGenerator(object):
     """
@@ -475,9 +475,90 @@ class ProjectionGenerator(object):
         return true;
     }
 """
+            # The pattern is created by the generic C++ implementation and passed to init_from_lil()
+            if cpp_pattern_available(proj):
+                connector_call += self._generic_pattern_init(proj)
 
         return connector_call
 
+    def _generic_pattern_init(self, proj):
+        """
+        The connectivity patterns without format-specific implementation are created by LILPattern
+        (ConnectivityPatterns.hpp) and passed to init_from_lil(), which is available for any format and
+        storage order. The weights and delays are drawn in C++ as well.
+        """
+        pattern = generic_cpp_patterns[proj.connector_name]
+
+        ranks = "std::vector<%(idx_type)s> post_ranks, std::vector<%(idx_type)s> pre_ranks"
+        geometries = "std::vector<int> pre_geometry, std::vector<int> post_geometry"
+        pattern_args = {
+            'one_to_one': (ranks, "post_ranks, pre_ranks"),
+            'all_to_all': (ranks + ", bool allow_self_connections", "post_ranks, pre_ranks, allow_self_connections"),
+            'fixed_probability': (ranks + ", double p, bool allow_self_connections", "post_ranks, pre_ranks, p, allow_self_connections"),
+            'fixed_number_pre': (ranks + ", unsigned int number, bool allow_self_connections", "post_ranks, pre_ranks, number, allow_self_connections"),
+            'fixed_number_post': (ranks + ", unsigned int number, bool allow_self_connections", "post_ranks, pre_ranks, number, allow_self_connections"),
+            'gaussian': (geometries + ", float amp, float sigma, double limit, bool allow_self_connections", "pre_geometry, post_geometry, amp, sigma, limit, allow_self_connections"),
+            'dog': (geometries + ", float amp_pos, float sigma_pos, float amp_neg, float sigma_neg, double limit, bool allow_self_connections", "pre_geometry, post_geometry, amp_pos, sigma_pos, amp_neg, sigma_neg, limit, allow_self_connections"),
+        }
+        signature, call = pattern_args[pattern]
+
+        def clip_bounds(dist):
+            "lower and upper bound of the drawn values as C++ literals"
+            lower = "-std::numeric_limits<double>::infinity()" if getattr(dist, 'min', None) is None or isinstance(dist, ANNRandom.Uniform) else "%(min)s" % {'min': float(dist.min)}
+            upper = "std::numeric_limits<double>::infinity()" if getattr(dist, 'max', None) is None or isinstance(dist, ANNRandom.Uniform) else "%(max)s" % {'max': float(dist.max)}
+            return lower, upper
+
+        def std_distribution(dist, prefix):
+            "STL distribution corresponding to *dist*, the arguments are passed by Projection._connect()"
+            if isinstance(dist, ANNRandom.DiscreteUniform):
+                return "std::uniform_int_distribution<int>(static_cast<int>(%(p)s_dist_arg1), static_cast<int>(%(p)s_dist_arg2))" % {'p': prefix}
+            stl_names = {
+                ANNRandom.Uniform: "uniform_real_distribution",
+                ANNRandom.Normal: "normal_distribution",
+                ANNRandom.LogNormal: "lognormal_distribution"
+            }
+            return "std::%(name)s<double>(%(p)s_dist_arg1, %(p)s_dist_arg2)" % {'name': stl_names[type(dist)], 'p': prefix}
+
+        # Weights, the distance-based patterns compute their own values
+        if pattern in ['gaussian', 'dog']:
+            init_values = ""
+        else:
+            signature += ", double w_dist_arg1, double w_dist_arg2"
+            if proj.connector_weight_dist is None:
+                init_values = "pattern.constant_values(w_dist_arg1);"
+            else:
+                lower, upper = clip_bounds(proj.connector_weight_dist)
+                init_values = "pattern.random_values(%(dist)s, %(lower)s, %(upper)s);" % {'dist': std_distribution(proj.connector_weight_dist, "w"), 'lower': lower, 'upper': upper}
+
+        # Delays in ms, stored in steps. The pattern is created before dt is set in the C++ core.
+        signature += ", double d_dist_arg1, double d_dist_arg2"
+        if proj.connector_delay_dist is None:
+            init_delays = "pattern.constant_delays(d_dist_arg1, %(dt)s);" % {'dt': float(get_global_config('dt'))}
+        else:
+            lower, upper = clip_bounds(proj.connector_delay_dist)
+            init_delays = "pattern.random_delays(%(dist)s, %(lower)s, %(upper)s, %(dt)s);" % {'dist': std_distribution(proj.connector_delay_dist, "d"), 'lower': lower, 'upper': upper, 'dt': float(get_global_config('dt'))}
+
+        return """
+    // %(connector_name)s pattern created in C++ (ConnectivityPatterns.hpp)
+    bool %(pattern)s_pattern(%(signature)s) {
+        LILPattern<%%(idx_type)s, %%(float_prec)s> pattern(rng_seed, %(stream)s);
+        pattern.%(pattern)s(%(call)s);
+        %(init_values)s
+        %(init_delays)s
+
+        bool requires_sorting = pattern.requires_sorting();
+        return init_from_lil(std::move(pattern.post_rank), std::move(pattern.pre_rank), std::move(pattern.values), std::move(pattern.delays), requires_sorting);
+    }
+""" % {
+            'connector_name': proj.connector_name,
+            'pattern': pattern,
+            'signature': signature,
+            'stream': counter_based_rng_stream(proj.id, 0, projection=True),
+            'call': call,
+            'init_values': init_values,
+            'init_delays': init_delays
+        }
+
     def _declaration_accessors(self, proj, single_matrix):
         """
         Generate declaration and accessor code for variables/parameters of the projection.
@@ -681,6 +762,8 @@ class ProjectionGenerator(object):
 
                 if _check_paradigm("cuda") and locality=="global":
                     declare_parameters_variables += decl_template[locality][attr_type] % ids
+                elif ids['name'] == "w" and proj._has_quantized_weights():
+                    declare_parameters_variables += self._templates['quantized_weights']['decl'] % {'qtype': proj._weight_quantization, 'type': ids['type']}
                 else:
                     declare_parameters_variables += decl_template[locality] % ids
                 attributes.append(var['name'])
@@ -843,7 +926,7 @@ class ProjectionGenerator(object):
                         if _check_paradigm("cuda"):
                             init_code += "\ngpu_w = init_matrix_variable_gpu<%(float_prec)s>(w);"
 
-                        weight_code = tabify(init_code % {'float_prec': get_global_config('precision')}, 2)
+                        weight_code = tabify(init_code % {'float_prec': var['ctype']}, 2)
 
                     # Init_from_lil
                     else:
@@ -857,10 +940,18 @@ class ProjectionGenerator(object):
                             'attr_type': attr_type,
                             'float_prec': get_global_config('precision')
                         }
+                        if var['ctype'] != get_global_config('precision'):
+                            # the weights are stored with another precision (mixed-precision), the values
+                            # received from the connector are converted first.
+                            weight_code += tabify(self._templates['weight_conversion'] % {'type': var['ctype']}, 2)
+                            values = "w_values"
+                        else:
+                            values = "values"
+
                         if proj._storage_format=="dense":
-                            weight_code += tabify("for (%(idx_type)s row_idx = 0; row_idx < row_indices.size(); row_idx++) {\n\tupdate_matrix_variable_row<%(float_prec)s>(w, row_indices[row_idx], values[row_idx]);\n}" % {'idx_type': 'int', 'float_prec': get_global_config('precision')}, 2)
+                            weight_code += tabify("for (%(idx_type)s row_idx = 0; row_idx < row_indices.size(); row_idx++) {\n\tupdate_matrix_variable_row<%(float_prec)s>(w, row_indices[row_idx], %(values)s[row_idx]);\n}" % {'idx_type': 'int', 'float_prec': var['ctype'], 'values': values}, 2)
                         else:
-                            weight_code += tabify("update_matrix_variable_all<%(float_prec)s>(w, values);" % {'float_prec': get_global_config('precision')}, 2)
+                            weight_code += tabify("update_matrix_variable_all<%(float_prec)s>(w, %(values)s);" % {'float_prec': var['ctype'], 'values': values}, 2)
                         if _check_paradigm("cuda"):
                             weight_code += tabify("\nw_host_to_device = true;", 2)
 
@@ -1009,7 +1100,10 @@ max_delay = -1;""" % {'id_pre': proj.pre.id, 'rng_init': rng_init}, 2)
             if attr['name'] == "w" and proj._has_single_weight():
                 locality = "global"
 
-            code += self._templates['attribute_cpp_size'][locality] % ids
+            if attr['name'] == "w" and proj._has_quantized_weights():
+                code += self._templates['quantized_weights']['size']
+            else:
+                code += self._templates['attribute_cpp_size'][locality] % ids
 
         return code
 
@@ -1050,6 +1144,56 @@ max_delay = -1;""" % {'id_pre': proj.pre.id, 'rng_init': rng_init}, 2)
         return code
 
 
+    def _serialize_state(self, proj):
+        """
+        Generate the code storing or restoring the state of the C++ object *proj* (checkpoint(), restore()). The
+        archive deduces the type of each member (see Checkpoint.hpp), so only their names are listed. The connectivity
+        is not part of the state, it is restored by the Python side as for load().
+
+        Specific projections extend the resulting code template with the 'serialize_additional' field or replace
+        it with the 'serialize_state' field of the _specific_template.
+        """
+        if 'serialize_state' in proj._specific_template.keys():
+            return proj._specific_template['serialize_state']
+
+        members = []
+
+        # Parameters and variables, unless the declarations were overwritten by a SpecificProjection
+        if 'declare_parameters_variables' not in proj._specific_template.keys():
+            for attr in proj.synapse_type.description['parameters'] + proj.synapse_type.description['variables']:
+                if attr['name'] not in members:
+                    members.append(attr['name'])
+
+        # Last pre- or post-synaptic event of event-driven variables
+        has_event_driven = False
+        for var in proj.synapse_type.description['variables']:
+            if var['method'] == 'event-driven':
+                has_event_driven = True
+                break
+        if has_event_driven and 'declare_event_driven' not in proj._specific_template.keys():
+            if '_last_event' in self._templates['event_driven']['declare']:
+                members.append('_last_event')
+
+        # Pending events of spiking synapses with non-uniform delays
+        if proj.max_delay > 1 and proj.uniform_delay <= 1 and proj.synapse_type.type == "spike":
+            if '_delayed_events' in self._templates['delay']['nonuniform_spiking']['declare']:
+                members.append('_delayed_events')
+
+        # Random variables
+        if 'declare_rng' not in proj._specific_template.keys():
+            for dist in proj.synapse_type.description['random_distributions']:
+                members.append(dist['name'])
+
+        code = ""
+        for name in members:
+            code += "        ar(%(name)s);\n" % {'name': name}
+
+        # Members of specific projections
+        if 'serialize_additional' in proj._specific_template.keys():
+            code += proj._specific_template['serialize_additional']
+
+        return code
+
 ######################################
 ### Code generation
 ######################################
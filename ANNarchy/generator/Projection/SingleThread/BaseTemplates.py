@@ -19,6 +19,7 @@ extern %(float_prec)s dt;
 extern long int t;
 %(struct_additional)s
 extern std::vector<std::mt19937> rng;
+extern long int rng_seed;
 
 /////////////////////////////////////////////////////////////////////////////
 // proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s
@@ -133,6 +134,12 @@ struct ProjStruct%(id_proj)s : %(sparse_format)s {
     #endif
 %(clear_container)s
     }
+
+    // Checkpointing: stores or restores the state of the projection (see Checkpoint.hpp)
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+%(serialize_state)s
+    }
 };
 """
 
@@ -378,9 +385,42 @@ cpp_11_rng = {
     }
 }
 
+# Conversion of the weights received by init_from_lil() if they are
+# stored with another precision than the global one (mixed-precision).
+#
+# Parameters:
+#
+#    type: storage type of the weights
+weight_conversion = """
+std::vector< std::vector< %(type)s > > w_values(values.size());
+for (std::size_t row_idx = 0; row_idx < values.size(); row_idx++)
+    w_values[row_idx] = std::vector< %(type)s >(values[row_idx].begin(), values[row_idx].end());
+"""
+
+# Weights stored as integers with one scale per row (quantized weights, LIL only).
+# The initialization and the accessors are the same as for other local variables
+# (see the overloads in LILMatrix.hpp).
+#
+# Parameters:
+#
+#    qtype: integer type used for the storage
+#    type: data type of the dequantized values
+quantized_weights = {
+    'decl': """
+    // Local parameter w (quantized)
+    QuantizedMatrix< %(qtype)s, %(type)s > w;
+""",
+    'size': """
+        // Local parameter w (quantized)
+        size_in_bytes += w.size_in_bytes();
+"""
+}
+
 single_thread_templates = {
     'projection_header': projection_header,
     'attr_acc': attribute_acc,
     'accessor_template': attribute_template,
-    'rng': cpp_11_rng
+    'rng': cpp_11_rng,
+    'weight_conversion': weight_conversion,
+    'quantized_weights': quantized_weights
 }
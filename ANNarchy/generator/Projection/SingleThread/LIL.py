@@ -93,6 +93,10 @@ for(int i = 0; i < post_rank.size(); i++) {
 """,
     'local': """
         %(rd_name)s[i][j] = dist_%(rd_name)s(rng[0]);
+""",
+    # counter-based generators (setup(counter_based_rng=True))
+    'local_counter': """
+        %(rd_name)s[i][j] = counter_based_draw(dist_%(rd_name)s, rng_seed, %(stream)s, t, (static_cast<std::uint64_t>(post_rank[i]) << 32) | pre_rank[i][j]);
 """
 }
 
@@ -167,27 +171,18 @@ delay = {
         'declare': """
     std::vector<std::vector<int>> delay;
     int max_delay;
-    int idx_delay;
-    std::vector< std::vector< std::vector< int > > > _delayed_spikes;
+    EventRingBuffer _delayed_events;
 """,
         'init': """
     delay = init_matrix_variable<int>(1);
     update_matrix_variable_all<int>(delay, delays);
 
-    idx_delay = 0;
-    max_delay = %(pre_prefix)smax_delay ;
-    _delayed_spikes = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >()) );
+    max_delay = %(pre_prefix)smax_delay;
+    _delayed_events = EventRingBuffer(max_delay);
 """,
         'reset': """
-        while(!_delayed_spikes.empty()) {
-            auto elem = _delayed_spikes.back();
-            elem.clear();
-            _delayed_spikes.pop_back();
-        }
-
-        idx_delay = 0;
-        max_delay = %(pre_prefix)smax_delay ;
-        _delayed_spikes = std::vector< std::vector< std::vector< int > > >(max_delay, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >()) );
+        max_delay = %(pre_prefix)smax_delay;
+        _delayed_events = EventRingBuffer(max_delay);
 """,
         'pyx_struct':
 """
@@ -957,42 +952,33 @@ if (_transmission && %(post_prefix)s_active){
         // Get the rank of the pre-synaptic neuron which spiked
         int rk_pre = %(pre_prefix)sspiked[idx_spike];
         // List of post neurons receiving connections
-        std::vector< std::pair<int, int> > rks_post = inv_pre_rank[rk_pre];
-
-        // Iterate over the post neurons
-        for(int x=0; x<rks_post.size(); x++){
-            // Index of the post neuron in the connectivity matrix
-            int i = rks_post[x].first ;
-            // Index of the pre neuron in the connecivity matrix
-            int j = rks_post[x].second ;
-            // Delay of that connection
-            int d = delay[i][j]-1;
-            // Index in the ring buffer
-            int modulo_delay = (idx_delay + d) %% max_delay;
-            // Add the spike in the ring buffer
-            _delayed_spikes[modulo_delay][i].push_back(j);
+        auto rks_post = inv_pre_rank.find(rk_pre);
+        if (rks_post == inv_pre_rank.end())
+            continue;
+
+        // Store the events in the ring buffer, according to the delay of each connection
+        for (auto it = rks_post->second.cbegin(); it != rks_post->second.cend(); it++) {
+            _delayed_events.push(delay[it->first][it->second]-1, it->first, it->second);
         }
     }
 
-    // Iterate over all post neurons having received spikes in the previous steps
-    for (int i=0; i<_delayed_spikes[idx_delay].size(); i++){
-        for (int _idx_j=0; _idx_j<_delayed_spikes[idx_delay][i].size(); _idx_j++){
-            // Pre-synaptic index in the connectivity matrix
-            int j = _delayed_spikes[idx_delay][i][_idx_j];
-
-            // Event-driven integration
-            %(event_driven)s
-            // Update conductance
-            %(g_target)s
-            // Synaptic plasticity: pre-events
-            %(pre_event)s
-        }
-        // Empty the current list of the ring buffer
-        _delayed_spikes[idx_delay][i].clear();
+    // Iterate over the events arriving at the current step
+    for (int _idx_e = 0; _idx_e < _delayed_events.num_events(); _idx_e++) {
+        // Index of the post neuron in the connectivity matrix
+        int i = _delayed_events.row_index(_idx_e);
+        // Index of the pre neuron in the connecivity matrix
+        int j = _delayed_events.column_index(_idx_e);
+
+        // Event-driven integration
+        %(event_driven)s
+        // Update conductance
+        %(g_target)s
+        // Synaptic plasticity: pre-events
+        %(pre_event)s
     }
 
-    // Increment the index of the ring buffer
-    idx_delay = (idx_delay + 1) %% max_delay;
+    // Empty the current slot and move to the next step
+    _delayed_events.advance();
 
 } // active
 """
@@ -17,7 +17,7 @@ from ANNarchy.generator.Projection.ProjectionGenerator import ProjectionGenerato
 from ANNarchy.generator.Projection.SingleThread import *
 
 # Useful functions
-from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces, check_avx_instructions, determine_idx_type_for_projection
+from ANNarchy.generator.Utils import generate_equation_code, tabify, remove_trailing_spaces, check_avx_instructions, determine_idx_type_for_projection, counter_based_rng_stream
 
 import re
 from copy import deepcopy
@@ -132,6 +132,7 @@ class SingleThreadGenerator(ProjectionGenerator):
         # Memory management
         size_in_bytes = self._size_in_bytes(proj)
         clear_container = self._clear_container(proj)
+        serialize_state = self._serialize_state(proj)
 
         # Structural plasiticity
         creating = self.creating(proj)
@@ -203,6 +204,7 @@ class SingleThreadGenerator(ProjectionGenerator):
             'access_additional': access_additional,
             'size_in_bytes': size_in_bytes,
             'clear_container': clear_container,
+            'serialize_state': serialize_state,
             'float_prec': get_global_config('precision'),
             'creating': creating,
             'pruning': pruning
@@ -458,9 +460,11 @@ class SingleThreadGenerator(ProjectionGenerator):
         ids = deepcopy(self._template_ids)
 
         # For a default continous transmission we can use a hand-written
-        # AVX implementation or unrolled versions of the BSR
-        if isinstance(proj.synapse_type, DefaultRateCodedSynapse) or \
-                      proj.synapse_type.description['psp']['eq']=="w*pre.r":
+        # AVX implementation or unrolled versions of the BSR (only if the
+        # weights are stored with the global precision)
+        if (isinstance(proj.synapse_type, DefaultRateCodedSynapse) or \
+                      proj.synapse_type.description['psp']['eq']=="w*pre.r") and \
+                      proj._get_attribute_cpp_type('w') == get_global_config('precision') and not proj._has_quantized_weights():
 
             simd_type = None
 
@@ -1249,9 +1253,18 @@ _last_event%(local_index)s = t;
         semiglobal_code=""
         local_code=""
 
-        for rd in proj.synapse_type.description['random_distributions']:
+        # The counter-based generators are only available for the LIL format
+        counter_based = get_global_config('counter_based_rng') and 'local_counter' in self._templates["rng_update"].keys()
+
+        for rd_idx, rd in enumerate(proj.synapse_type.description['random_distributions']):
             if rd['name'] in proj.synapse_type.description["local"]:
-                local_code += self._templates["rng_update"][rd["locality"]] % {'rd_name': rd['name']}
+                if counter_based:
+                    local_code += self._templates["rng_update"]["local_counter"] % {
+                        'rd_name': rd['name'],
+                        'stream': counter_based_rng_stream(proj.id, rd_idx, projection=True)
+                    }
+                else:
+                    local_code += self._templates["rng_update"][rd["locality"]] % {'rd_name': rd['name']}
 
         return tabify(self._templates["rng_update"]["template"] % {
             'global_rng': global_code,
@@ -1396,22 +1409,10 @@ _last_event%(local_index)s = t;
             return;
 
         // Update delays
-        int prev_max = max_delay;
         max_delay = d;
-        int add_steps = d - prev_max;
-
-        // std::cout << "Delayed arrays was " << _delayed_spikes.size() << std::endl;
-
-        // Insert as many empty vectors as need at the current pointer position
-        _delayed_spikes.insert(_delayed_spikes.begin() + idx_delay, add_steps, std::vector< std::vector< int > >(post_rank.size(), std::vector< int >() ));
-
-        // The delay index has to be updated
-        idx_delay = (idx_delay + add_steps) % max_delay;
 
-        // std::cout << "Delayed arrays is now " << _delayed_spikes.size() << std::endl;
-        // std::cout << "Idx " << idx_delay << std::endl;
-        // for(int i = 0; i< max_delay; i++)
-        //     std::cout << _delayed_spikes[i][0].size() << std::endl;
+        // Insert as many empty slots as needed at the current position of the ring buffer
+        _delayed_events.resize(max_delay);
 """
 
         reset_ring_buffer_code = self._templates['delay']['nonuniform_spiking']['reset'] % self._template_ids
@@ -22,7 +22,7 @@ from ANNarchy.generator.Population import CUDATemplates as cuda_templates
 from ANNarchy.generator.Projection.SingleThread import *
 from ANNarchy.generator.Projection.OpenMP import *
 from ANNarchy.generator.Projection.CUDA import *
-from ANNarchy.generator.Utils import tabify, determine_idx_type_for_projection, cpp_connector_available
+from ANNarchy.generator.Utils import tabify, determine_idx_type_for_projection, cpp_connector_available, cpp_pattern_available, generic_cpp_patterns
 
 class PyxGenerator(object):
     """
@@ -413,6 +413,9 @@ def _set_%(name)s(%(float_prec)s value):
         if 'export_additional' in pop._specific_template.keys():
             export_additional = pop._specific_template['export_additional']
 
+        # Registration of attribute updates (set_every)
+        export_timed_updates, _ = PyxGenerator._timed_update_wrapper(pop)
+
         # Finalize the code
         return PyxTemplate.pop_pyx_struct % {
             'id': pop.id, 'name': pop.name,
@@ -421,7 +424,7 @@ def _set_%(name)s(%(float_prec)s value):
             'export_functions': export_functions,
             'export_mean_fr': export_mean_fr,
             'export_additional': export_additional,
-        }
+        } + export_timed_updates
 
 
     @staticmethod
@@ -474,6 +477,10 @@ def _set_%(name)s(%(float_prec)s value):
         if 'wrapper_access_additional' in pop._specific_template.keys():
             wrapper_access_additional = pop._specific_template['wrapper_access_additional']
 
+        # Registration of attribute updates (set_every)
+        _, wrapper_timed_updates = PyxGenerator._timed_update_wrapper(pop)
+        wrapper_access_parameters_variables += wrapper_timed_updates
+
         # Finalize the code
         return PyxTemplate.pop_pyx_wrapper % {
             'id': pop.id, 'name': pop.name,
@@ -692,6 +699,11 @@ def _set_%(name)s(%(float_prec)s value):
             export_connector = tabify("bool fixed_number_pre_pattern(vector[%(idx_type)s], vector[%(idx_type)s], %(idx_type)s, %(float_prec)s, %(float_prec)s, %(float_prec)s, %(float_prec)s)", 2)
         else:
             export_connector = tabify("bool init_from_lil(vector[%(idx_type)s], vector[vector[%(idx_type)s]], vector[vector[%(float_prec)s]], vector[vector[int]], bool)", 2)
+            if cpp_pattern_available(proj):
+                export_connector += "\n" + tabify("bool %(pattern)s_pattern(%(args)s)" % {
+                    'pattern': generic_cpp_patterns[proj.connector_name],
+                    'args': ", ".join(arg_type for arg_type, _ in PyxGenerator._generic_pattern_args(proj))
+                }, 2)
 
         # Data types, only of interest if "only_int_idx_type" configuration flag is false
         idx_types = determine_idx_type_for_projection(proj)
@@ -738,7 +750,35 @@ def _set_%(name)s(%(float_prec)s value):
             'export_structural_plasticity': structural_plasticity,
             'export_additional': proj._specific_template['export_additional'] if 'export_additional' in proj._specific_template.keys() else "",
             'export_cuda_launch_config': export_cuda_launch_config
-        }
+        } + PyxGenerator._timed_update_wrapper(proj)[0]
+
+    @staticmethod
+    def _generic_pattern_args(proj):
+        """
+        Types and names of the arguments of the connectivity patterns created by the generic C++
+        implementation (see ProjectionGenerator._generic_pattern_init()).
+        """
+        pattern = generic_cpp_patterns[proj.connector_name]
+
+        if pattern in ['gaussian', 'dog']:
+            args = [("vector[int]", "pre_geometry"), ("vector[int]", "post_geometry")]
+            if pattern == 'gaussian':
+                args += [("float", "amp"), ("float", "sigma")]
+            else:
+                args += [("float", "amp_pos"), ("float", "sigma_pos"), ("float", "amp_neg"), ("float", "sigma_neg")]
+            args += [("double", "limit"), ("bool", "allow_self_connections")]
+        else:
+            args = [("vector[%(idx_type)s]", "post_ranks"), ("vector[%(idx_type)s]", "pre_ranks")]
+            if pattern == 'fixed_probability':
+                args += [("double", "p")]
+            elif pattern in ['fixed_number_pre', 'fixed_number_post']:
+                args += [("unsigned int", "number")]
+            if pattern != 'one_to_one':
+                args += [("bool", "allow_self_connections")]
+            args += [("double", "w_dist_arg1"), ("double", "w_dist_arg2")]
+
+        args += [("double", "d_dist_arg1"), ("double", "d_dist_arg2")]
+        return args
 
     @staticmethod
     def _proj_wrapper(proj):
@@ -859,6 +899,12 @@ def _set_%(name)s(%(float_prec)s value):
     def init_from_lil(self, post_rank, pre_rank, w, delay, requires_sorting):
         return proj%(id_proj)s.init_from_lil(post_rank, pre_rank, w, delay, requires_sorting)
 """ % {'id_proj': proj.id}
+            if cpp_pattern_available(proj):
+                arg_names = ", ".join(arg_name for _, arg_name in PyxGenerator._generic_pattern_args(proj))
+                wrapper_connector_call += """
+    def %(pattern)s(self, %(args)s):
+        return proj%(id_proj)s.%(pattern)s_pattern(%(args)s)
+""" % {'id_proj': proj.id, 'pattern': generic_cpp_patterns[proj.connector_name], 'args': arg_names}
 
         wrapper_args = ""
         wrapper_init = tabify("pass",3)
@@ -888,6 +934,10 @@ def _set_%(name)s(%(float_prec)s value):
         if 'wrapper_access_additional' in proj._specific_template.keys():
             additional_declarations = proj._specific_template['wrapper_access_additional']
 
+        # Registration of attribute updates (set_every)
+        _, wrapper_timed_updates = PyxGenerator._timed_update_wrapper(proj)
+        wrapper_access_parameters_variables += wrapper_timed_updates
+
         # CUDA configuration update
         wrapper_cuda_launch_config = ""
         if _check_paradigm("cuda"):
@@ -1284,6 +1334,76 @@ cdef class ProjRecorder%(id)s_wrapper:
 #######################################################################
 ############## Helpers   ##############################################
 #######################################################################
+    @staticmethod
+    def _timed_update_signatures(obj):
+        """
+        Helper method used for the attribute updates registered by set_every() or Schedule: returns
+        one entry per locality and data type of the attributes. The registration functions
+        are generated by CodeGenerator._generate_translation_units() (openMP only).
+
+        Objects providing their own accessors are not supported.
+        """
+        if not _check_paradigm("openmp") or isinstance(obj, Transpose):
+            return []
+        if 'export_parameters_variables' in obj._specific_template.keys():
+            return []
+
+        if isinstance(obj, Projection):
+            value_types = {
+                'local': ("std::vector<std::vector<%(ctype)s>>", "vector[vector[%(ctype)s]]"),
+                'semiglobal': ("std::vector<%(ctype)s>", "vector[%(ctype)s]"),
+                'global': ("%(ctype)s", "%(ctype)s")
+            }
+            name = "proj"+str(obj.id)
+        else:
+            value_types = {
+                'local': ("std::vector<%(ctype)s>", "vector[%(ctype)s]"),
+                'global': ("%(ctype)s", "%(ctype)s")
+            }
+            name = "pop"+str(obj.id)
+
+        signatures = []
+        for locality, ctypes in PyxGenerator._get_datatypes(obj).items():
+            for ctype in ctypes:
+                signatures.append({
+                    'name': name,
+                    'locality': locality,
+                    'ctype': ctype,
+                    'ctype_name': ctype.replace(" ", "_"),
+                    'all': "" if locality == "global" else "_all",
+                    'cpp_type': value_types[locality][0] % {'ctype': ctype},
+                    'pyx_type': value_types[locality][1] % {'ctype': ctype},
+                })
+
+        return signatures
+
+    @staticmethod
+    def _timed_update_wrapper(obj):
+        """
+        Generates the export of the registration functions and the corresponding
+        methods of the Python wrapper (see set_every() and Schedule).
+        """
+        export = ""
+        schedule = ""
+        schedule_ranks = ""
+        for sig in PyxGenerator._timed_update_signatures(obj):
+            export += PyxTemplate.pyx_timed_update_export['all'] % sig
+            schedule += PyxTemplate.pyx_timed_update_case['all'] % sig
+
+            # PopulationView
+            if sig['locality'] == 'local' and not isinstance(obj, Projection):
+                export += PyxTemplate.pyx_timed_update_export['ranks'] % sig
+                schedule_ranks += PyxTemplate.pyx_timed_update_case['ranks'] % sig
+
+        if schedule == "":
+            return "", ""
+
+        wrapper = PyxTemplate.pyx_timed_update_wrapper['all'] % {'schedule': schedule}
+        if schedule_ranks != "":
+            wrapper += PyxTemplate.pyx_timed_update_wrapper['ranks'] % {'schedule': schedule_ranks}
+
+        return export, wrapper
+
     @staticmethod
     def _get_datatypes(obj):
         """
@@ -30,6 +30,15 @@ omp_header_template = """#pragma once
     #include <immintrin.h>
 #endif
 
+// Counter-based random number generator (setup(counter_based_rng=True))
+#include "Philox.hpp"
+
+// Block generation of the random variables (setup(vectorized_rng=True))
+#include "RandomBlocks.hpp"
+
+// Connectivity patterns created in C++ for any storage format
+#include "ConnectivityPatterns.hpp"
+
 /*
  * Built-in functions
  *
@@ -71,6 +80,15 @@ omp_header_template = """#pragma once
  */
 %(proj_ptr)s
 
+/*
+ * Complete state of the simulation (checkpoint(), restore())
+ *
+ */
+#include "Checkpoint.hpp"
+
+std::string getState();
+bool setState(const std::string &state);
+
 /*
  * Recorders
  *
@@ -82,6 +100,18 @@ int addRecorder(Monitor* recorder);
 Monitor* getRecorder(int id);
 void removeRecorder(Monitor* recorder);
 
+/*
+ * Attribute updates registered for future steps (set_every, Schedule)
+ *
+ */
+#include "TimedUpdates.hpp"
+
+void clearTimedUpdates();
+int pendingTimedUpdates();
+void applyTimedUpdates();
+int addSchedule(const long int period);
+void restartSchedule(const int schedule);
+
 /*
  * Simulation methods
  *
@@ -116,6 +146,12 @@ void setDt(const %(float_prec)s dt_);
  */
 void setNumberThreads(int threads, std::vector<int> core_list);
 
+/*
+ * NUMA-aware placement of the data, returns the number of bytes located on each memory node
+ *
+ */
+std::vector<long int> numaPlacement();
+
 /*
  * Seed for the RNG
  *
@@ -136,6 +172,7 @@ st_body_template = """
 %(float_prec)s dt;
 long int t;
 std::vector<std::mt19937> rng;
+long int rng_seed;
 
 // Custom constants
 %(custom_constant)s
@@ -149,6 +186,16 @@ std::vector<std::mt19937> rng;
 // Global operations
 %(glops_def)s
 
+/*
+ * Attribute updates registered for future steps (set_every, Schedule)
+ */
+TimedUpdates timed_updates;
+void clearTimedUpdates() { timed_updates.clear(); }
+int pendingTimedUpdates() { return timed_updates.pending(); }
+void applyTimedUpdates() { timed_updates.apply(t); }
+int addSchedule(const long int period) { return timed_updates.add_schedule(t, period); }
+void restartSchedule(const int schedule) { timed_updates.restart(schedule, t); }
+
 /*
  * Recorders
  */
@@ -294,6 +341,7 @@ void singleStep()
     // Increase internal time
     ////////////////////////////////
     t++;
+    timed_updates.apply(t);
 
 %(prof_step_post)s
 }
@@ -308,6 +356,9 @@ void run(const int nbSteps) {
     // apply changes implied by structural plasticity (spike only)
 %(sp_spike_backward_view_update)s
 
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
     // perform the simulation
     for(int i=0; i<nbSteps; i++) {
         singleStep();
@@ -322,6 +373,9 @@ void step() {
     // apply changes implied by structural plasticity (spike only)
 %(sp_spike_backward_view_update)s
 
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
     // perform a single step (size dt)
     singleStep();
 %(prof_run_post)s
@@ -332,6 +386,9 @@ int run_until(const int steps, std::vector<int> populations, bool or_and)
     // apply changes implied by structural plasticity (spike only)
 %(sp_spike_backward_view_update)s
 
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
     // perform the simulation until the condition is satisfied
 %(run_until)s
 }
@@ -349,6 +406,9 @@ void setSeed(const long int seed, const int num_sources, const bool use_seed_seq
     if (num_sources > 1)
         std::cerr << "WARNING - ANNarchy::setSeed(): num_sources should be 1 for single thread code." << std::endl;
 
+    // key of the counter-based generators (setup(counter_based_rng=True))
+    rng_seed = seed;
+
     rng.clear();
 
     rng.push_back(std::mt19937(seed));
@@ -375,10 +435,41 @@ void destroy_cpp_instances() {
  * Access to time and dt
  */
 long int getTime() {return t;}
-void setTime(const long int t_) { t=t_;}
+void setTime(const long int t_) { t=t_; timed_updates.restart(-1, t_); }
 %(float_prec)s getDt() { return dt;}
 void setDt(const %(float_prec)s dt_) { dt=dt_;}
 
+/*
+ * Complete state of the simulation (checkpoint(), restore())
+ */
+template<typename Archive>
+bool serializeState(Archive &ar) {
+%(serialize_state)s
+    return ar.good();
+}
+
+std::string getState() {
+    std::ostringstream os(std::ios::out | std::ios::binary);
+    StateWriter ar(os);
+    serializeState(ar);
+    return os.str();
+}
+
+bool setState(const std::string &state) {
+    // a truncated or corrupted state is detected while reading, the previous state is then restored
+    std::string previous_state = getState();
+
+    std::istringstream is(state, std::ios::in | std::ios::binary);
+    StateReader ar(is);
+    if (serializeState(ar))
+        return true;
+
+    std::istringstream previous(previous_state, std::ios::in | std::ios::binary);
+    StateReader rollback(previous);
+    serializeState(rollback);
+    return false;
+}
+
 /*
  * Number of threads
  *
@@ -411,6 +502,16 @@ void setNumberThreads(const int threads, const std::vector<int> core_list)
     }
 #endif
 }
+
+/*
+ * NUMA-aware placement of the data
+ *
+ */
+std::vector<long int> numaPlacement()
+{
+    // without effect on single thread simulation code
+    return std::vector<long int>();
+}
 """
 
 omp_body_template = """
@@ -429,6 +530,7 @@ omp_body_template = """
 %(float_prec)s dt;
 long int t;
 std::vector<std::mt19937> rng;
+long int rng_seed;
 
 // number openMP threads
 int global_num_threads = -1;
@@ -445,6 +547,16 @@ int global_num_threads = -1;
 // Global operations
 %(glops_def)s
 
+/*
+ * Attribute updates registered for future steps (set_every, Schedule)
+ */
+TimedUpdates timed_updates;
+void clearTimedUpdates() { timed_updates.clear(); }
+int pendingTimedUpdates() { return timed_updates.pending(); }
+void applyTimedUpdates() { timed_updates.apply(t); }
+int addSchedule(const long int period) { return timed_updates.add_schedule(t, period); }
+void restartSchedule(const int schedule) { timed_updates.restart(schedule, t); }
+
 /*
  * Recorders
  */
@@ -635,6 +747,7 @@ void singleStep(const int tid, const int nt)
     #pragma omp single
     {
         t++;
+        timed_updates.apply(t);
     } // implicit barrier
 
 %(prof_step_post)s
@@ -658,6 +771,9 @@ void run(const int nbSteps) {
     // apply changes implied by structural plasticity (spike only)
 %(sp_spike_backward_view_update)s
 
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
     // perform the simulation
     #pragma omp parallel num_threads(global_num_threads)
     {
@@ -678,6 +794,9 @@ void step() {
     // apply changes implied by structural plasticity (spike only)
 %(sp_spike_backward_view_update)s
 
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
     // perform a single step (size dt)
     #pragma omp parallel num_threads(global_num_threads)
     {
@@ -693,6 +812,9 @@ int run_until(const int steps, std::vector<int> populations, bool or_and)
     // apply changes implied by structural plasticity (spike only)
 %(sp_spike_backward_view_update)s
 
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
     // perform the simulation until the condition is satisfied
 %(run_until)s
 }
@@ -710,6 +832,9 @@ void setSeed(const long int seed, const int num_sources, const bool use_seed_seq
 #ifdef _DEBUG
     std::cout << "setSeed(): " << seed << ", " << num_sources << ", " << std::string((use_seed_seq) ? "true" : "false") << std::endl;
 #endif
+    // key of the counter-based generators (setup(counter_based_rng=True))
+    rng_seed = seed;
+
     rng.clear();
 
     if (num_sources == 1) {
@@ -757,10 +882,41 @@ void destroy_cpp_instances() {
  * Access to time and dt
  */
 long int getTime() {return t;}
-void setTime(const long int t_) { t=t_;}
+void setTime(const long int t_) { t=t_; timed_updates.restart(-1, t_); }
 %(float_prec)s getDt() { return dt;}
 void setDt(const %(float_prec)s dt_) { dt=dt_;}
 
+/*
+ * Complete state of the simulation (checkpoint(), restore())
+ */
+template<typename Archive>
+bool serializeState(Archive &ar) {
+%(serialize_state)s
+    return ar.good();
+}
+
+std::string getState() {
+    std::ostringstream os(std::ios::out | std::ios::binary);
+    StateWriter ar(os);
+    serializeState(ar);
+    return os.str();
+}
+
+bool setState(const std::string &state) {
+    // a truncated or corrupted state is detected while reading, the previous state is then restored
+    std::string previous_state = getState();
+
+    std::istringstream is(state, std::ios::in | std::ios::binary);
+    StateReader ar(is);
+    if (serializeState(ar))
+        return true;
+
+    std::istringstream previous(previous_state, std::ios::in | std::ios::binary);
+    StateReader rollback(previous);
+    serializeState(rollback);
+    return false;
+}
+
 /*
  * Number of threads
  *
@@ -796,6 +952,470 @@ void setNumberThreads(const int threads, const std::vector<int> core_list)
     }
 #endif
 }
+
+/*
+ * NUMA-aware placement of the data (setup(numa_placement=True)): each thread moves the
+ * data it processes to its memory node.
+ *
+ */
+std::vector<long int> numaPlacement()
+{
+    std::vector<long int> bytes_per_node;
+
+    #pragma omp parallel num_threads(global_num_threads)
+    {
+        int tid = omp_get_thread_num();
+        std::vector<long int> local_bytes;
+%(numa_placement)s
+        #pragma omp critical
+        {
+            if (local_bytes.size() > bytes_per_node.size())
+                bytes_per_node.resize(local_bytes.size(), 0);
+            for (std::size_t n = 0; n < local_bytes.size(); n++)
+                bytes_per_node[n] += local_bytes[n];
+        }
+    }
+
+    return bytes_per_node;
+}
+"""
+
+# Used instead of omp_body_template with setup(task_scheduler=True): the objects are
+# updated by the single thread kernels, the tasks are created by CodeGenerator._body_task_graph().
+omp_task_body_template = """
+#include "ANNarchy.h"
+#include "randutils.hpp"
+
+#ifdef __linux__
+#include <sched.h>
+#endif
+
+%(prof_include)s
+
+/*
+ * Internal data
+ *
+ */
+%(float_prec)s dt;
+long int t;
+std::vector<std::mt19937> rng;
+long int rng_seed;
+
+// number openMP threads
+int global_num_threads = -1;
+
+// Custom constants
+%(custom_constant)s
+
+// Populations
+%(pop_ptr)s
+
+// Projections
+%(proj_ptr)s
+
+// Global operations
+%(glops_def)s
+
+// Dependency tokens of the tasks
+%(task_dependencies)s
+
+/*
+ * Attribute updates registered for future steps (set_every, Schedule)
+ */
+TimedUpdates timed_updates;
+void clearTimedUpdates() { timed_updates.clear(); }
+int pendingTimedUpdates() { return timed_updates.pending(); }
+void applyTimedUpdates() { timed_updates.apply(t); }
+int addSchedule(const long int period) { return timed_updates.add_schedule(t, period); }
+void restartSchedule(const int schedule) { timed_updates.restart(schedule, t); }
+
+/*
+ * Recorders
+ */
+std::vector<Monitor*> recorders;
+int addRecorder(Monitor* recorder){
+    int found = -1;
+
+    for (unsigned int i=0; i<recorders.size(); i++) {
+        if (recorders[i] == nullptr) {
+            found = i;
+            break;
+        }
+    }
+
+    if (found != -1) {
+        // fill a previously cleared slot
+        recorders[found] = recorder;
+        return found;
+    } else {
+        recorders.push_back(recorder);
+        return recorders.size() - 1;
+    }
+}
+Monitor* getRecorder(int id) {
+    if (id < recorders.size())
+        return recorders[id];
+    else
+        return nullptr;
+}
+void removeRecorder(Monitor* recorder){
+    for (unsigned int i=0; i<recorders.size(); i++){
+        if (recorders[i] == recorder) {
+            delete recorders[i];
+            recorders[i] = nullptr;
+            break;
+        }
+    }
+}
+
+/*
+ *  Simulation methods
+ */
+// Step method. Generated by ANNarchy.
+//
+// The update of each population and projection is a task which depends on
+// the tasks of the connected objects, so that independent objects are
+// processed concurrently instead of being separated by barriers.
+void singleStep()
+{
+#ifdef _TRACE_SIMULATION_STEPS
+    std::cout << "Create the tasks of step " << t << " ..." << std::endl;
+#endif
+%(task_graph)s
+
+    // All tasks of the step must be completed
+    #pragma omp taskwait
+
+    ////////////////////////////////
+    // Structural plasticity
+    ////////////////////////////////
+%(structural_plasticity)s
+
+    ////////////////////////////////
+    // Recording neural / synaptic variables
+    ////////////////////////////////
+    for (unsigned int i=0; i < recorders.size(); i++){
+        if (recorders[i]) {
+            #pragma omp task firstprivate(i)
+            recorders[i]->record();
+        }
+    }
+
+    #pragma omp taskwait
+
+    ////////////////////////////////
+    // Increase internal time
+    ////////////////////////////////
+    t++;
+    timed_updates.apply(t);
+
+#ifdef _TRACE_SIMULATION_STEPS
+    std::cout << "--- simulation step " << t << " completed ---" << std::endl;
+#endif
+}
+
+// Simulate the network for the given number of steps,
+// called from python
+void run(const int nbSteps) {
+#ifdef _TRACE_SIMULATION_STEPS
+    std::cout << "Perform simulation for " << nbSteps << " steps." << std::endl;
+#endif
+    // apply changes implied by structural plasticity (spike only)
+%(sp_spike_backward_view_update)s
+
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
+    // one thread creates the tasks, all threads of the team execute them
+    #pragma omp parallel num_threads(global_num_threads)
+    {
+        #pragma omp single
+        {
+            for (int i=0; i<nbSteps; i++) {
+                singleStep();
+            }
+        }
+    }
+}
+
+// Simulate the network for a single steps,
+// called from python
+void step() {
+    // apply changes implied by structural plasticity (spike only)
+%(sp_spike_backward_view_update)s
+
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
+    // perform a single step (size dt)
+    #pragma omp parallel num_threads(global_num_threads)
+    {
+        #pragma omp single
+        {
+            singleStep();
+        }
+    }
+}
+
+int run_until(const int steps, std::vector<int> populations, bool or_and)
+{
+    // apply changes implied by structural plasticity (spike only)
+%(sp_spike_backward_view_update)s
+
+    // apply the attribute updates registered for the current step (set_every, Schedule)
+    timed_updates.apply(t);
+
+    // perform the simulation until the condition is satisfied
+%(run_until)s
+}
+
+/*
+ *  Initialization methods
+ */
+// Initialize the internal data and the random numbers generator
+void initialize(const %(float_prec)s _dt) {
+%(initialize)s
+}
+
+// Change the seed of the RNG
+void setSeed(const long int seed, const int num_sources, const bool use_seed_seq){
+#ifdef _DEBUG
+    std::cout << "setSeed(): " << seed << ", " << num_sources << ", " << std::string((use_seed_seq) ? "true" : "false") << std::endl;
+#endif
+    // key of the counter-based generators (setup(counter_based_rng=True))
+    rng_seed = seed;
+
+    rng.clear();
+
+    if (num_sources == 1) {
+        rng.push_back(std::mt19937(seed));
+    } else {
+        if (use_seed_seq) {
+            std::seed_seq seq{seed};
+            std::vector<std::uint32_t> seeds(num_sources);
+            seq.generate(seeds.begin(), seeds.end());
+
+            for (auto it = seeds.begin(); it != seeds.end(); it++) {
+                rng.push_back(std::mt19937(*it));
+            }
+        } else {
+            // Using seed initialization of M.E. O'Neill (randutils)
+            std::vector<std::uint32_t> seeds(num_sources);
+            randutils::auto_seed_256 seeder;
+            seeder.generate(seeds.begin(), seeds.end());
+
+            for (auto it = seeds.begin(); it != seeds.end(); it++) {
+                rng.push_back(std::mt19937(*it));
+            }
+        }
+    }
+
+    rng.shrink_to_fit();
+}
+
+/*
+ *  Life-time management
+ */
+void create_cpp_instances() {
+#ifdef _DEBUG
+    std::cout << "Instantiate C++ objects ..." << std::endl;
+#endif
+}
+
+void destroy_cpp_instances() {
+#ifdef _DEBUG
+    std::cout << "Destroy C++ objects ..." << std::endl;
+#endif
+}
+
+/*
+ * Access to time and dt
+ */
+long int getTime() {return t;}
+void setTime(const long int t_) { t=t_; timed_updates.restart(-1, t_); }
+%(float_prec)s getDt() { return dt;}
+void setDt(const %(float_prec)s dt_) { dt=dt_;}
+
+/*
+ * Complete state of the simulation (checkpoint(), restore())
+ */
+template<typename Archive>
+bool serializeState(Archive &ar) {
+%(serialize_state)s
+    return ar.good();
+}
+
+std::string getState() {
+    std::ostringstream os(std::ios::out | std::ios::binary);
+    StateWriter ar(os);
+    serializeState(ar);
+    return os.str();
+}
+
+bool setState(const std::string &state) {
+    // a truncated or corrupted state is detected while reading, the previous state is then restored
+    std::string previous_state = getState();
+
+    std::istringstream is(state, std::ios::in | std::ios::binary);
+    StateReader ar(is);
+    if (serializeState(ar))
+        return true;
+
+    std::istringstream previous(previous_state, std::ios::in | std::ios::binary);
+    StateReader rollback(previous);
+    serializeState(rollback);
+    return false;
+}
+
+/*
+ * Number of threads
+ *
+ */
+void setNumberThreads(const int threads, const std::vector<int> core_list)
+{
+#ifdef _DEBUG
+    std::cout << "Set new number of threads:" << threads << std::endl;
+    if (!core_list.empty()) {
+        std::cout << "Use thread placement: [";
+        for (auto it = core_list.begin(); it != core_list.end(); it++) std::cout << *it << " ";
+        std::cout << "]";
+    }
+#endif
+
+    // set worker set size
+    global_num_threads = threads;
+
+#ifdef __linux__
+    // set a cpu mask to prevent moving of threads
+    cpu_set_t mask;
+
+    // no CPUs selected
+    CPU_ZERO(&mask);
+
+    // no proc_bind
+    for(auto it = core_list.begin(); it != core_list.end(); it++)
+        CPU_SET(*it, &mask);
+    const int set_result = sched_setaffinity(0, sizeof(cpu_set_t), &mask);
+#else
+    if (!core_list.empty()) {
+        std::cout << "WARNING: manipulation of CPU masks is only available for linux systems." << std::endl;
+    }
+#endif
+}
+
+/*
+ * NUMA-aware placement of the data
+ *
+ */
+std::vector<long int> numaPlacement()
+{
+    // without effect on the task scheduler, the objects are not bound to a thread
+    return std::vector<long int>();
+}
+"""
+
+# A task of the graph created by CodeGenerator._body_task_graph()
+omp_task_template = """
+    #pragma omp task %(depend)s
+    {
+%(code)s
+    }
+"""
+
+# Each population/projection is compiled in its own translation unit which
+# holds the instance and the step functions called from singleStep(). This
+# allows make to compile the objects in parallel.
+omp_translation_unit_template = """/*
+ * %(name)s.cpp
+ *
+ * Generated by ANNarchy.
+ */
+#include "ANNarchy.h"
+#include "NUMA.hpp"
+
+// Instance
+%(instance)s
+// Functions called by singleStep()
+%(step_functions)s
+"""
+
+# Registration of an attribute update applied by the C++ core at the given step (set_every)
+# or by a schedule (Schedule, the step is then relative to the start of the schedule). The
+# value is copied into the closure stored by timed_updates.
+timed_update_template = {
+    'all': """
+void %(name)s_schedule_%(locality)s_%(ctype_name)s(const int schedule, const long int step, std::string name, %(cpp_type)s value) {
+    timed_updates.add(schedule, step, [name, value]() { %(name)s.set_%(locality)s_attribute%(all)s_%(ctype_name)s(name, value); });
+}
+""",
+    # subset of the neurons (PopulationView)
+    'ranks': """
+void %(name)s_schedule_local_ranks_%(ctype_name)s(const int schedule, const long int step, std::string name, std::vector<int> ranks, std::vector<%(ctype)s> value) {
+    timed_updates.add(schedule, step, [name, ranks, value]() {
+        for (std::size_t i = 0; i < ranks.size(); i++)
+            %(name)s.set_local_attribute_%(ctype_name)s(name, ranks[i], value[i]);
+    });
+}
+"""
+}
+
+omp_step_function_template = """
+void %(name)s(%(args)s) {
+%(code)s
+}
+"""
+
+# Activity-based skipping (setup(skip_inactive=True)): early exits of the functions
+# called by singleStep(), see CodeGenerator._activity_guards().
+activity_guard_templates = {
+    'silent_rate': """
+    // skip the transmission while the presynaptic population is silent
+    if (std::none_of(%(pre)s.r.begin(), %(pre)s.r.end(), [](%(float_prec)s r){ return r != 0.0; }))
+        return;
+""",
+    'silent_spike': """
+    // skip the transmission while the presynaptic population emits no spike
+    if (%(pre)s.spiked.empty())
+        return;
+""",
+    'post_event': """
+    // skip the postsynaptic events while the postsynaptic population emits no spike
+    if (%(post)s.spiked.empty())
+        return;
+""",
+    # the flag is written by all threads of the team, each thread needs its own copy
+    'passive_decl': """
+// passive neurons: no input was received during the previous step
+static bool %(name)s_no_input = false;
+%(threadprivate)s
+""",
+    'passive': """
+    // passive neurons keep their state while they receive no input
+    bool _no_input = %(no_input)s;
+    bool _skip = _no_input && %(name)s_no_input%(no_spike)s;
+    %(name)s_no_input = _no_input;
+%(barrier)s
+    if (_skip)
+        return;
+""",
+    'no_input': "std::none_of(%(name)s.%(var)s.begin(), %(name)s.%(var)s.end(), [](%(float_prec)s v){ return v != 0.0; })"
+}
+
+# Linked into the instrumented library of compile(optimize='pgo'). The gcov runtime writes
+# the profile only when the library is unloaded, which does not happen before the optimized
+# library is loaded by the same process.
+profile_dump_template = """/*
+ * ProfileDump.cpp
+ *
+ * Generated by ANNarchy.
+ */
+extern "C" {
+    void __gcov_dump(void);
+
+    void ANNarchy_dump_profile(void) {
+        __gcov_dump();
+    }
+}
 """
 
 omp_run_until_template = {
@@ -915,6 +1535,7 @@ cuda_header_template = """#ifndef __ANNARCHY_H__
  * Recorders
  *
  */
+#include "Checkpoint.hpp"
 #include "Recorder.h"
 
 extern std::vector<Monitor*> recorders;
@@ -6,17 +6,53 @@ MAKEFILE templates.
 """
 
 # Linux, Seq or OMP
+#
+# Each translation unit is compiled separately, so make can process them in parallel.
+#
+# If PCH is set, the STL and the sparse matrix formats (ANNarchy/include/ANNarchyPCH.hpp) are
+# precompiled once in the compilation cache and force-included in the generated sources. The
+# Cython module is compiled without it, as Python.h must be included first.
+#
+# If TIMINGS is set (profiling), the start and end time of each target are appended to this file.
 linux_omp_template = """# Makefile generated by ANNarchy
-all:
-\t%(cython)s -%(py_major)s --cplus %(cython_ext)s -D ANNarchyCore%(net_id)s.pyx
-\t%(compiler)s %(cpu_flags)s -std=c++14 -fPIC -shared %(openmp)s \\
-        *.cpp  %(add_sources)s -o ANNarchyCore%(net_id)s.so \\
-        %(python_include)s -I%(numpy_include)s -I%(annarchy_include)s -I%(thirdparty_include)s \\
-        %(cython_ext)s \\
-        %(python_lib)s \\
-        %(python_libpath)s %(extra_libs)s
+CXX = %(launcher)s%(compiler)s
+CXXFLAGS = %(cpu_flags)s -std=c++14 -fPIC %(openmp)s
+INCLUDES = %(python_include)s -I%(numpy_include)s -I%(annarchy_include)s -I%(thirdparty_include)s %(cython_ext)s
+LIBS = %(python_lib)s %(python_libpath)s %(extra_libs)s
+
+OBJECTS = %(objects)s ANNarchyCore%(net_id)s.o
+PCH = %(pch)s
+TIMINGS = %(timings)s
+
+all: ANNarchyCore%(net_id)s.so
 \tmv ANNarchyCore%(net_id)s.so ../..
 
+ifneq ($(PCH),)
+PCH_FLAGS = -Winvalid-pch -include $(basename $(PCH))
+
+# Written to a temporary file first, as other builds might use the same header
+$(PCH): $(basename $(PCH))
+\t$(CXX) $(CXXFLAGS) -x c++-header $< -o $@.$$$$ $(INCLUDES) && mv -f $@.$$$$ $@
+endif
+
+ifneq ($(TIMINGS),)
+START = t0=$$(date +%%s.%%N);
+STOP = && echo "$@ $$t0 $$(date +%%s.%%N)" >> $(TIMINGS)
+endif
+
+ANNarchyCore%(net_id)s.cpp: ANNarchyCore%(net_id)s.pyx
+\t$(START) %(cython)s -%(py_major)s --cplus %(cython_ext)s -D ANNarchyCore%(net_id)s.pyx $(STOP)
+
+ANNarchyCore%(net_id)s.o: ANNarchyCore%(net_id)s.cpp Makefile $(wildcard *.h) $(wildcard *.hpp)
+\t$(START) $(CXX) $(CXXFLAGS) -c $< -o $@ $(INCLUDES) $(STOP)
+
+%%.o: %%.cpp Makefile $(wildcard *.h) $(wildcard *.hpp) $(PCH)
+\t$(START) $(CXX) $(CXXFLAGS) $(PCH_FLAGS) -c $< -o $@ $(INCLUDES) $(STOP)
+
+ANNarchyCore%(net_id)s.so: $(OBJECTS)
+\t$(START) $(CXX) $(CXXFLAGS) -shared $(OBJECTS) %(add_sources)s -o $@ \\
+        $(INCLUDES) $(LIBS) $(STOP)
+
 clean:
 \trm -rf *.o
 \trm -rf *.so
@@ -43,16 +79,26 @@ clean:
 
 # OSX, with clang, Seq only
 osx_clang_template = """# Makefile generated by ANNarchy
-all:
-\t%(cython)s -%(py_major)s --cplus %(cython_ext)s -D ANNarchyCore%(net_id)s.pyx
-\t%(compiler)s -stdlib=libc++ -std=c++14 -dynamiclib -flat_namespace %(cpu_flags)s -fpermissive %(openmp)s \\
-        *.cpp -o ANNarchyCore%(net_id)s.so \\
-        %(python_include)s -I%(numpy_include)s -I%(annarchy_include)s \\
-        %(cython_ext)s \\
-        %(python_lib)s \\
-        %(python_libpath)s  %(extra_libs)s
+CXX = %(launcher)s%(compiler)s
+CXXFLAGS = -stdlib=libc++ -std=c++14 %(cpu_flags)s -fpermissive %(openmp)s
+INCLUDES = %(python_include)s -I%(numpy_include)s -I%(annarchy_include)s %(cython_ext)s
+LIBS = %(python_lib)s %(python_libpath)s %(extra_libs)s
+
+OBJECTS = %(objects)s ANNarchyCore%(net_id)s.o
+
+all: ANNarchyCore%(net_id)s.so
 \tmv ANNarchyCore%(net_id)s.so ../..
 
+ANNarchyCore%(net_id)s.cpp: ANNarchyCore%(net_id)s.pyx
+\t%(cython)s -%(py_major)s --cplus %(cython_ext)s -D ANNarchyCore%(net_id)s.pyx
+
+%%.o: %%.cpp Makefile $(wildcard *.h) $(wildcard *.hpp)
+\t$(CXX) $(CXXFLAGS) -c $< -o $@ $(INCLUDES)
+
+ANNarchyCore%(net_id)s.so: $(OBJECTS)
+\t$(CXX) $(CXXFLAGS) -dynamiclib -flat_namespace $(OBJECTS) %(add_sources)s -o $@ \\
+        $(INCLUDES) $(LIBS)
+
 clean:
 \trm -rf *.o
 \trm -rf *.so
@@ -60,16 +106,26 @@ clean:
 
 # OSX, with gcc, OpenMP
 osx_gcc_template = """# Makefile generated by ANNarchy
-all:
-\t%(cython)s -%(py_major)s --cplus %(cython_ext)s -D ANNarchyCore%(net_id)s.pyx
-\t%(compiler)s -std=c++14 -dynamiclib -flat_namespace %(cpu_flags)s -fpermissive %(openmp)s \\
-        *.cpp -o ANNarchyCore%(net_id)s.so \\
-        %(python_include)s -I%(numpy_include)s -I%(annarchy_include)s  -I%(thirdparty_include)s \\
-        %(cython_ext)s \\
-        %(python_lib)s \\
-        %(python_libpath)s  %(extra_libs)s
+CXX = %(launcher)s%(compiler)s
+CXXFLAGS = -std=c++14 %(cpu_flags)s -fpermissive %(openmp)s
+INCLUDES = %(python_include)s -I%(numpy_include)s -I%(annarchy_include)s -I%(thirdparty_include)s %(cython_ext)s
+LIBS = %(python_lib)s %(python_libpath)s %(extra_libs)s
+
+OBJECTS = %(objects)s ANNarchyCore%(net_id)s.o
+
+all: ANNarchyCore%(net_id)s.so
 \tmv ANNarchyCore%(net_id)s.so ../..
 
+ANNarchyCore%(net_id)s.cpp: ANNarchyCore%(net_id)s.pyx
+\t%(cython)s -%(py_major)s --cplus %(cython_ext)s -D ANNarchyCore%(net_id)s.pyx
+
+%%.o: %%.cpp Makefile $(wildcard *.h) $(wildcard *.hpp)
+\t$(CXX) $(CXXFLAGS) -c $< -o $@ $(INCLUDES)
+
+ANNarchyCore%(net_id)s.so: $(OBJECTS)
+\t$(CXX) $(CXXFLAGS) -dynamiclib -flat_namespace $(OBJECTS) %(add_sources)s -o $@ \\
+        $(INCLUDES) $(LIBS)
+
 clean:
 \trm -rf *.o
 \trm -rf *.so
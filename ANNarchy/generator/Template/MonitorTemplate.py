@@ -35,16 +35,34 @@ public:
     virtual long int size_in_bytes() = 0;
     virtual void clear() = 0;
 
+    // Checkpointing (see Checkpoint.hpp): the derived classes add the recorded data
+    virtual void serialize_state(StateWriter &ar) { serialize_attributes(ar); }
+    virtual void serialize_state(StateReader &ar) { serialize_attributes(ar); }
+
     // Attributes
     bool partial;
     std::vector<int> ranks;
     int period_;
     int period_offset_;
     long int offset_;
+
+protected:
+    template<typename Archive>
+    void serialize_attributes(Archive &ar) {
+        ar.check(ranks.size());
+        ar(period_);
+        ar(period_offset_);
+        ar(offset_);
+    }
 };
 %(record_classes)s
 """
 
+# Checkpointing of the recorded data (see Checkpoint.hpp), identical for all localities
+serialize_recorded_data = """
+        ar(this->%(name)s);
+        ar(this->record_%(name)s);"""
+
 omp_population = {
     'template': """
 class PopRecorder%(id)s : public Monitor
@@ -105,6 +123,13 @@ public:
         removeRecorder(this);
     }
 
+    void serialize_state(StateWriter &ar) { serialize_attributes(ar); serialize_data(ar); }
+    void serialize_state(StateReader &ar) { serialize_attributes(ar); serialize_data(ar); }
+
+    template<typename Archive>
+    void serialize_data(Archive &ar) {
+%(serialize_code)s
+    }
 
 %(struct_code)s
 };
@@ -357,6 +382,14 @@ public:
 %(clear_code)s
     }
 
+    void serialize_state(StateWriter &ar) { serialize_attributes(ar); serialize_data(ar); }
+    void serialize_state(StateReader &ar) { serialize_attributes(ar); serialize_data(ar); }
+
+    template<typename Archive>
+    void serialize_data(Archive &ar) {
+%(serialize_code)s
+    }
+
 %(struct_code)s
 };
 """,
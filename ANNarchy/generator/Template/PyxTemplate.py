@@ -156,10 +156,51 @@ pyx_device_specific={
 # Set number of threads
 def set_number_threads(int n, core_list):
     setNumberThreads(n, core_list)
+
+# NUMA-aware placement of the data
+def numa_placement():
+    return numaPlacement()
+
+# Attribute updates registered by set_every() and Schedule
+def clear_timed_updates():
+    clearTimedUpdates()
+
+def pending_timed_updates():
+    return pendingTimedUpdates()
+
+def apply_timed_updates():
+    applyTimedUpdates()
+
+def add_schedule(long period):
+    return addSchedule(period)
+
+def restart_schedule(int schedule):
+    restartSchedule(schedule)
+
+# Complete state of the simulation (checkpoint() and restore())
+def get_state():
+    return getState()
+
+def set_state(bytes state):
+    return setState(state)
 """,
         'export': """
     # Number of threads
     void setNumberThreads(int, vector[int])
+
+    # NUMA-aware placement of the data
+    vector[long] numaPlacement()
+
+    # Attribute updates registered by set_every() and Schedule
+    void clearTimedUpdates()
+    int pendingTimedUpdates()
+    void applyTimedUpdates()
+    int addSchedule(long)
+    void restartSchedule(int)
+
+    # Complete state of the simulation
+    string getState()
+    bool setState(string)
 """
     },
     'cuda': {
@@ -494,6 +535,42 @@ pyx_proj_attribute_wrapper = {
 """
 }
 
+# Registration of attribute updates applied by the C++ core (set_every)
+pyx_timed_update_export = {
+    'all': """
+    void %(name)s_schedule_%(locality)s_%(ctype_name)s(int, long, string, %(pyx_type)s)
+""",
+    'ranks': """
+    void %(name)s_schedule_local_ranks_%(ctype_name)s(int, long, string, vector[int], vector[%(ctype)s])
+"""
+}
+
+pyx_timed_update_case = {
+    'all': """
+        if locality == "%(locality)s" and ctype == "%(ctype)s":
+            %(name)s_schedule_%(locality)s_%(ctype_name)s(schedule, step, cpp_string, value)
+""",
+    'ranks': """
+        if ctype == "%(ctype)s":
+            %(name)s_schedule_local_ranks_%(ctype_name)s(schedule, step, cpp_string, ranks, value)
+"""
+}
+
+pyx_timed_update_wrapper = {
+    'all': """
+    # Attribute updates applied at the given step (relative to the start of the schedule if schedule >= 0)
+    def schedule_attribute(self, schedule, step, name, locality, value, ctype):
+        cpp_string = name.encode('utf-8')
+%(schedule)s
+""",
+    'ranks': """
+    # Updates of a subset of the neurons (PopulationView)
+    def schedule_attribute_ranks(self, schedule, step, name, ranks, value, ctype):
+        cpp_string = name.encode('utf-8')
+%(schedule)s
+"""
+}
+
 pyx_profiler_template = """# Profiling
 cdef extern from "Profiling.h":
     cdef cppclass Profiling:
@@ -289,61 +289,97 @@ def cpp_connector_available(connector_name, desired_format, storage_order):
     Checks if a CPP implementation is available for the desired connection pattern
     (*connector_name*) and the target sparse matrix format (*desired_format*). Please
     note that not all formats are available for *pre_to_post* storage order.
+
+    On CPUs, the patterns are created by the generic implementation for all formats
+    (see cpp_pattern_available()).
     """
     # The user disabled this feature
     if not get_global_config('use_cpp_connectors'):
         return False
 
+    if _check_paradigm("openmp"):
+        return False
+
     cpp_patterns = {
-        'st': {
-            'post_to_pre': {
-                "lil": ["Random", "Random Convergent", "All-to-All"],
-                "csr": ["Random", "Random Convergent"],
-                "coo": [],
-                "hyb": [],
-                "ell": [],
-                "dense": ["Random"]
-            },
-            'pre_to_post': {
-                "csr": ["Random", "Random Convergent"]
-            }
-        },
-        'omp': {
-            'post_to_pre': {
-                "lil": ["Random"],
-                "csr": [],
-                "coo": [],
-                "ell": []
-            },
-            'pre_to_post': {
-                "csr": ["Random"]
-            }
-        },
-        'cuda': {
-            'post_to_pre': {
-                "csr": ["Random", "Random Convergent"],
-                "coo": [],
-                "ellr": ["Random", "Random Convergent"],
-                "dense": ["Random"]
-            }
+        'post_to_pre': {
+            "csr": ["Random", "Random Convergent"],
+            "coo": [],
+            "ellr": ["Random", "Random Convergent"],
+            "dense": ["Random"]
         }
     }
 
-    if _check_paradigm("openmp"):
-        paradigm = "st" if get_global_config('num_threads') == 1 else "omp"
-    else:
-        paradigm = "cuda"
-
     try:
-        return connector_name in cpp_patterns[paradigm][storage_order][desired_format]
+        return connector_name in cpp_patterns[storage_order][desired_format]
 
     except KeyError:
         # Fall back to Python construction
         return False
 
+# Connectivity patterns implemented by ConnectivityPatterns.hpp
+generic_cpp_patterns = {
+    "One-to-One": "one_to_one",
+    "All-to-All": "all_to_all",
+    "Random": "fixed_probability",
+    "Random Convergent": "fixed_number_pre",
+    "Random Divergent": "fixed_number_post",
+    "Gaussian": "gaussian",
+    "Difference-of-Gaussian": "dog",
+}
+
+def cpp_pattern_available(proj):
+    """
+    Checks if the connectivity pattern of *proj* is created by the generic C++ implementation
+    (ConnectivityPatterns.hpp), which initializes any format and storage order through init_from_lil().
+
+    The deterministic patterns (one-to-one and all-to-all with constant weights and delays, gaussian and
+    dog with constant delays) are identical to the Cython implementations and are always created in C++.
+    The patterns or values drawn from random distributions are only created in C++ if the user enabled
+    _optimization_flags(use_cpp_connectors=True), as they differ from the ones drawn by numpy.
+    """
+    from ANNarchy.core.Random import Uniform, DiscreteUniform, Normal, LogNormal
+
+    if not _check_paradigm("openmp"):
+        return False
+
+    if proj.connector_name not in generic_cpp_patterns.keys():
+        return False
+
+    # Batched networks replicate the connectivity of the first instance
+    if proj._batch > 1:
+        return False
+
+    weight_dist = proj.connector_weight_dist if proj.connector_name not in ["Gaussian", "Difference-of-Gaussian"] else None
+    delay_dist = proj.connector_delay_dist
+
+    if weight_dist is not None and type(weight_dist) not in [Uniform, Normal, LogNormal]:
+        return False
+    if delay_dist is not None and type(delay_dist) not in [Uniform, DiscreteUniform, Normal]:
+        return False
+
+    if proj.connector_name in ["Gaussian", "Difference-of-Gaussian"]:
+        pre_dim = 1 if isinstance(proj.pre.geometry, int) else len(proj.pre.geometry)
+        post_dim = 1 if isinstance(proj.post.geometry, int) else len(proj.post.geometry)
+        if pre_dim != post_dim:
+            return False
+
+    deterministic = proj.connector_name in ["One-to-One", "All-to-All", "Gaussian", "Difference-of-Gaussian"] and \
+                    weight_dist is None and delay_dist is None
+
+    return deterministic or get_global_config('use_cpp_connectors')
+
 #####################################################################
 #   Code formatting
 #####################################################################
+def counter_based_rng_stream(obj_id, index, projection=False):
+    """
+    Returns the stream identifying the random variable *index* (position in the description,
+    or one of the connectivity patterns, index > 0xF0) of a population or projection for the
+    counter-based generators (setup(counter_based_rng=True)).
+    """
+    stream = (0x80000000 if projection else 0) | (obj_id << 8) | index
+    return str(stream) + "u"
+
 def indentLine(line, spaces=1):
     return (' ' * 4 * spaces) + line
 
@@ -1 +1,2 @@
 from .Compiler import compile
+from .CompilationCache import clear_compile_cache
@@ -0,0 +1,69 @@
+/*
+ *    ANNarchyPCH.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * Precompiled header: the STL and the CPU sparse matrix formats are parsed once per
+ * combination of compiler and compiler flags and reused by all generated translation
+ * units (see Compiler.generate_makefile()). It must not contain network-specific code.
+ */
+#include <string>
+#include <vector>
+#include <algorithm>
+#include <map>
+#include <deque>
+#include <queue>
+#include <iostream>
+#include <sstream>
+#include <fstream>
+#include <iomanip>
+#include <memory>
+#include <chrono>
+#include <cstdlib>
+#include <stdlib.h>
+#include <string.h>
+#include <cmath>
+#include <math.h>
+#include <random>
+#include <cassert>
+#ifdef _OPENMP
+    #include <omp.h>
+#endif
+#ifdef __x86_64__
+    #include <immintrin.h>
+#endif
+
+// Sparse matrix formats
+#include "helper_functions.hpp"
+#include "LILMatrix.hpp"
+#include "LILInvMatrix.hpp"
+#include "CSRMatrix.hpp"
+#include "CSRCMatrix.hpp"
+#include "CSRCMatrixT.hpp"
+#include "DiaMatrix.hpp"
+#include "BSRMatrix.hpp"
+#include "BSRInvMatrix.hpp"
+#include "ELLMatrix.hpp"
+#include "ELLRMatrix.hpp"
+#include "SELLMatrix.hpp"
+#include "DenseMatrix.hpp"
+#include "DenseMatrixOffsets.hpp"
+#include "PartitionedMatrix.hpp"
@@ -0,0 +1,262 @@
+/*
+ *    Checkpoint.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <cstddef>
+#include <deque>
+#include <istream>
+#include <map>
+#include <ostream>
+#include <queue>
+#include <random>
+#include <sstream>
+#include <string>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+/**
+ *  @brief      Binary archives used to store and restore the complete state of a network (checkpoint(), restore()).
+ *  @details    The generated populations, projections and recorders implement a single method
+ *
+ *                  template<typename Archive> void serialize_state(Archive &ar) { ar(r); ar(_delayed_r); ... }
+ *
+ *              which is called with a StateWriter by getState() and with a StateReader by setState(), so that both
+ *              directions read and write the members in the same order. The archives support the arithmetic types,
+ *              the STL containers used by the generated code (vector, deque, queue, map, pair, string), the random
+ *              number generators and all classes providing a serialize_state() method (e.g. RingBuffer).
+ *
+ *              The data is stored in the native binary representation: a checkpoint can only be restored on the
+ *              same architecture, by a network generated with the same description.
+ */
+class StateWriter {
+    std::ostream &os_;
+
+public:
+    explicit StateWriter(std::ostream &os): os_(os) {}
+
+    template<typename T>
+    void operator()(T &value) { write(value); }
+
+    /**
+     *  @brief      stores a value which has to be identical when the state is restored (e.g. the size of a population).
+     */
+    template<typename T>
+    void check(const T value) { write(value); }
+
+    bool good() const { return os_.good(); }
+
+private:
+    template<typename T>
+    typename std::enable_if<std::is_arithmetic<T>::value>::type write(const T &value) {
+        os_.write(reinterpret_cast<const char*>(&value), sizeof(T));
+    }
+
+    template<typename T>
+    auto write(T &value) -> decltype(value.serialize_state(*this), void()) {
+        value.serialize_state(*this);
+    }
+
+    template<typename T>
+    typename std::enable_if<std::is_arithmetic<T>::value>::type write(std::vector<T> &values) {
+        write(values.size());
+        os_.write(reinterpret_cast<const char*>(values.data()), values.size() * sizeof(T));
+    }
+
+    template<typename T>
+    typename std::enable_if<!std::is_arithmetic<T>::value>::type write(std::vector<T> &values) {
+        write(values.size());
+        for (auto it = values.begin(); it != values.end(); it++)
+            write(*it);
+    }
+
+    void write(std::vector<bool> &values) {
+        write(values.size());
+        for (std::size_t i = 0; i < values.size(); i++)
+            write(static_cast<char>(values[i]));
+    }
+
+    template<typename T>
+    void write(std::deque<T> &values) {
+        write(values.size());
+        for (auto it = values.begin(); it != values.end(); it++)
+            write(*it);
+    }
+
+    template<typename T>
+    void write(std::queue<T> &values) {
+        // std::queue does not provide iterators
+        std::queue<T> copy(values);
+        write(copy.size());
+        while (!copy.empty()) {
+            write(copy.front());
+            copy.pop();
+        }
+    }
+
+    template<typename K, typename V>
+    void write(std::map<K, V> &values) {
+        write(values.size());
+        for (auto it = values.begin(); it != values.end(); it++) {
+            K key = it->first;
+            write(key);
+            write(it->second);
+        }
+    }
+
+    template<typename T1, typename T2>
+    void write(std::pair<T1, T2> &value) {
+        write(value.first);
+        write(value.second);
+    }
+
+    void write(std::string &value) {
+        write(value.size());
+        os_.write(value.data(), value.size());
+    }
+
+    void write(std::mt19937 &value) {
+        std::ostringstream state;
+        state << value;
+        std::string str = state.str();
+        write(str);
+    }
+};
+
+class StateReader {
+    std::istream &is_;
+    bool match_;        ///< false if one of the check() values differs
+
+public:
+    explicit StateReader(std::istream &is): is_(is), match_(true) {}
+
+    template<typename T>
+    void operator()(T &value) { read(value); }
+
+    /**
+     *  @brief      reads a value stored with StateWriter::check() and compares it to the current one.
+     */
+    template<typename T>
+    void check(const T value) {
+        T stored;
+        read(stored);
+        if (stored != value)
+            match_ = false;
+    }
+
+    /**
+     *  @brief      true if the complete state could be read and matches the current network.
+     */
+    bool good() const { return match_ && !is_.fail(); }
+
+private:
+    template<typename T>
+    typename std::enable_if<std::is_arithmetic<T>::value>::type read(T &value) {
+        is_.read(reinterpret_cast<char*>(&value), sizeof(T));
+    }
+
+    template<typename T>
+    auto read(T &value) -> decltype(value.serialize_state(*this), void()) {
+        value.serialize_state(*this);
+    }
+
+    std::size_t read_size() {
+        std::size_t size = 0;
+        read(size);
+        // a corrupted or truncated state must not trigger a huge allocation
+        if (is_.fail() || !match_) {
+            match_ = false;
+            return 0;
+        }
+        return size;
+    }
+
+    template<typename T>
+    typename std::enable_if<std::is_arithmetic<T>::value>::type read(std::vector<T> &values) {
+        values.resize(read_size());
+        is_.read(reinterpret_cast<char*>(values.data()), values.size() * sizeof(T));
+    }
+
+    template<typename T>
+    typename std::enable_if<!std::is_arithmetic<T>::value>::type read(std::vector<T> &values) {
+        values.resize(read_size());
+        for (auto it = values.begin(); it != values.end(); it++)
+            read(*it);
+    }
+
+    void read(std::vector<bool> &values) {
+        values.resize(read_size());
+        for (std::size_t i = 0; i < values.size(); i++) {
+            char value = 0;
+            read(value);
+            values[i] = (value != 0);
+        }
+    }
+
+    template<typename T>
+    void read(std::deque<T> &values) {
+        values.resize(read_size());
+        for (auto it = values.begin(); it != values.end(); it++)
+            read(*it);
+    }
+
+    template<typename T>
+    void read(std::queue<T> &values) {
+        std::queue<T> empty;
+        values.swap(empty);
+        std::size_t size = read_size();
+        for (std::size_t i = 0; i < size; i++) {
+            T value;
+            read(value);
+            values.push(value);
+        }
+    }
+
+    template<typename K, typename V>
+    void read(std::map<K, V> &values) {
+        values.clear();
+        std::size_t size = read_size();
+        for (std::size_t i = 0; i < size; i++) {
+            K key;
+            read(key);
+            read(values[key]);
+        }
+    }
+
+    template<typename T1, typename T2>
+    void read(std::pair<T1, T2> &value) {
+        read(value.first);
+        read(value.second);
+    }
+
+    void read(std::string &value) {
+        value.resize(read_size());
+        is_.read(&value[0], value.size());
+    }
+
+    void read(std::mt19937 &value) {
+        std::string str;
+        read(str);
+        std::istringstream state(str);
+        state >> value;
+    }
+};
@@ -0,0 +1,471 @@
+/*
+ *    ConnectivityPatterns.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <limits>
+#include <random>
+#include <unordered_set>
+#include <vector>
+
+#include "Philox.hpp"
+
+/**
+ *  @brief      Connectivity patterns created in C++ for any storage format and storage order.
+ *  @details    The class creates the same structure as the Cython class LILConnectivity (post_rank, pre_rank, values
+ *              and delays in steps, no empty rows), which is then passed to the init_from_lil() method of the
+ *              projection. The rows are created in parallel if OpenMP is enabled.
+ *
+ *              Each row draws its random numbers from its own counter-based generator (Philox4x32), keyed by the
+ *              seed of the network, the stream of the projection and the rank of the neuron. The pattern does
+ *              therefore not depend on the number of threads. The lowest 8 bits of the stream select the
+ *              connectivity (0xFD), the weights (0xFE) or the delays (0xFF).
+ *
+ *              The deterministic patterns (one-to-one, all-to-all, gaussian and dog) are identical to the ones
+ *              created by the Cython implementations.
+ *
+ *  @tparam     IT          data type of the indices
+ *  @tparam     VT          data type of the weights
+ */
+template<typename IT, typename VT>
+class LILPattern {
+    long int seed_;
+    std::uint32_t stream_;
+
+    /**
+     *  @brief      calls row_function(i) for each row i, in parallel if OpenMP is enabled.
+     */
+    template<typename F>
+    static void for_each_row(const std::size_t num_rows, F row_function) {
+    #ifdef _OPENMP
+        #pragma omp parallel for schedule(dynamic, 16)
+    #endif
+        for (long int i = 0; i < static_cast<long int>(num_rows); i++)
+            row_function(static_cast<std::size_t>(i));
+    }
+
+    /**
+     *  @brief      draws k distinct positions in [0, n) in ascending order.
+     */
+    static std::vector<std::size_t> sample_positions(const std::size_t n, const std::size_t k, Philox4x32 &gen) {
+        std::vector<std::size_t> positions;
+        positions.reserve(k);
+
+        if (k >= n) {
+            for (std::size_t j = 0; j < n; j++)
+                positions.push_back(j);
+        } else if (4 * k >= n) {
+            // selection sampling (Knuth, algorithm S)
+            std::uniform_real_distribution<double> unif(0.0, 1.0);
+            for (std::size_t j = 0; j < n && positions.size() < k; j++) {
+                if (static_cast<double>(n - j) * unif(gen) < static_cast<double>(k - positions.size()))
+                    positions.push_back(j);
+            }
+        } else {
+            // Floyd's algorithm
+            std::unordered_set<std::size_t> selected;
+            selected.reserve(2 * k);
+            for (std::size_t j = n - k; j < n; j++) {
+                std::size_t t = std::uniform_int_distribution<std::size_t>(0, j)(gen);
+                if (!selected.insert(t).second)
+                    selected.insert(j);
+            }
+            positions.assign(selected.begin(), selected.end());
+            std::sort(positions.begin(), positions.end());
+        }
+        return positions;
+    }
+
+    /**
+     *  @brief      normalized coordinates along each axis of a geometry, rounded as by Coordinates.pyx
+     *              (single precision for 2 and 3 dimensions).
+     */
+    static std::vector< std::vector<double> > normalized_axes(const std::vector<int> &geometry) {
+        const bool single_precision = (geometry.size() == 2 || geometry.size() == 3);
+
+        std::vector< std::vector<double> > axes(geometry.size());
+        for (std::size_t d = 0; d < geometry.size(); d++) {
+            axes[d].assign(geometry[d], 0.0);
+            if (geometry[d] < 2)
+                continue;
+            for (int c = 0; c < geometry[d]; c++) {
+                const double norm = static_cast<double>(c) / static_cast<double>(geometry[d] - 1);
+                axes[d][c] = single_precision ? static_cast<float>(norm) : norm;
+            }
+        }
+        return axes;
+    }
+
+    /**
+     *  @brief      squared distance beyond which scale * exp(-d / denominator) <= threshold, with a margin for the
+     *              rounding errors. The distance is not bounded if one of the parameters is not positive.
+     */
+    static double cutoff_distance(const double scale, const double denominator, const double threshold) {
+        if (!(scale > 0.0 && denominator > 0.0 && threshold > 0.0))
+            return std::numeric_limits<double>::infinity();
+        return denominator * (std::max(0.0, std::log(scale / threshold)) + 1e-6) + 1e-6;
+    }
+
+    /**
+     *  @brief      creates one row per post-synaptic neuron with the synapses for which profile(distance) returns true.
+     *  @details    Only the pre-synaptic neurons closer than the cutoff distance (squared) are visited, they form a
+     *              box in the grid of the pre-synaptic population which is iterated in ascending rank order. The
+     *              squared distance is accumulated over the dimensions in single precision as by Coordinates.pyx.
+     */
+    template<typename F>
+    void distance_pattern(const std::vector<int> &pre_geometry, const std::vector<int> &post_geometry, const double max_distance, const bool allow_self_connections, F profile) {
+        const std::size_t dim = pre_geometry.size();
+        const std::size_t last = dim - 1;
+        const auto pre_axes = normalized_axes(pre_geometry);
+        const auto post_axes = normalized_axes(post_geometry);
+        const double radius = std::sqrt(max_distance);
+
+        std::size_t post_size = 1;
+        for (auto g: post_geometry)
+            post_size *= g;
+
+        post_rank.resize(post_size);
+        pre_rank.resize(post_size);
+        values.resize(post_size);
+
+        for_each_row(post_size, [&](const std::size_t post) {
+            post_rank[post] = static_cast<IT>(post);
+
+            // normalized coordinates of the post-synaptic neuron
+            std::vector<double> post_coord(dim);
+            std::size_t rest = post;
+            for (long int d = post_geometry.size() - 1; d >= 0; d--) {
+                if (d < static_cast<long int>(dim))
+                    post_coord[d] = post_axes[d][rest % post_geometry[d]];
+                rest /= post_geometry[d];
+            }
+
+            // box of the pre-synaptic neurons within the cutoff distance
+            std::vector<int> lower(dim, 0), upper(dim);
+            for (std::size_t d = 0; d < dim; d++) {
+                upper[d] = pre_geometry[d] - 1;
+                if (std::isinf(max_distance) || pre_geometry[d] < 2)
+                    continue;
+                const double low = std::ceil((post_coord[d] - radius) * (pre_geometry[d] - 1)) - 1.0;
+                const double high = std::floor((post_coord[d] + radius) * (pre_geometry[d] - 1)) + 1.0;
+                if (low > lower[d])
+                    lower[d] = static_cast<int>(low);
+                if (high < upper[d])
+                    upper[d] = static_cast<int>(high);
+                if (lower[d] > upper[d])
+                    return;
+            }
+
+            // partial[d]: distance accumulated over the dimensions before d
+            std::vector<int> index(lower);
+            std::vector<float> partial(dim, 0.0);
+            for (std::size_t d = 0; d < last; d++) {
+                const double diff = pre_axes[d][index[d]] - post_coord[d];
+                partial[d+1] = static_cast<float>(static_cast<double>(partial[d]) + diff * diff);
+            }
+
+            VT value;
+            while (true) {
+                std::size_t base_rank = 0;
+                for (std::size_t d = 0; d < last; d++)
+                    base_rank = (base_rank + index[d]) * pre_geometry[d+1];
+
+                for (int c = lower[last]; c <= upper[last]; c++) {
+                    const std::size_t pre = base_rank + c;
+                    if (!allow_self_connections && pre == post)
+                        continue;
+                    const double diff = pre_axes[last][c] - post_coord[last];
+                    const float distance = static_cast<float>(static_cast<double>(partial[last]) + diff * diff);
+                    if (profile(distance, value)) {
+                        pre_rank[post].push_back(static_cast<IT>(pre));
+                        values[post].push_back(value);
+                    }
+                }
+
+                // next line of the box
+                long int d = static_cast<long int>(last) - 1;
+                for (; d >= 0; d--) {
+                    if (++index[d] <= upper[d])
+                        break;
+                    index[d] = lower[d];
+                }
+                if (d < 0)
+                    break;
+                for (std::size_t k = d; k < last; k++) {
+                    const double diff = pre_axes[k][index[k]] - post_coord[k];
+                    partial[k+1] = static_cast<float>(static_cast<double>(partial[k]) + diff * diff);
+                }
+            }
+        });
+        remove_empty_rows();
+    }
+
+    /**
+     *  @brief      removes the rows without synapses, as LILConnectivity.push_back().
+     */
+    void remove_empty_rows() {
+        std::size_t num_rows = 0;
+        for (std::size_t i = 0; i < pre_rank.size(); i++) {
+            if (pre_rank[i].empty())
+                continue;
+            if (num_rows != i) {
+                post_rank[num_rows] = post_rank[i];
+                pre_rank[num_rows] = std::move(pre_rank[i]);
+                if (!values.empty())
+                    values[num_rows] = std::move(values[i]);
+            }
+            num_rows++;
+        }
+        post_rank.resize(num_rows);
+        pre_rank.resize(num_rows);
+        if (!values.empty())
+            values.resize(num_rows);
+    }
+
+    /**
+     *  @brief      position of rank in ranks, or -1.
+     */
+    static long int find_rank(const std::vector<IT> &ranks, const IT rank) {
+        auto it = std::find(ranks.begin(), ranks.end(), rank);
+        return (it == ranks.end()) ? -1 : static_cast<long int>(it - ranks.begin());
+    }
+
+public:
+    std::vector<IT> post_rank;
+    std::vector< std::vector<IT> > pre_rank;
+    std::vector< std::vector<VT> > values;
+    std::vector< std::vector<int> > delays;
+
+    /**
+     *  @param[in]  seed    seed of the network (rng_seed)
+     *  @param[in]  stream  stream of the projection, the lowest 8 bits are set by the class
+     */
+    LILPattern(const long int seed, const std::uint32_t stream): seed_(seed), stream_(stream & 0xFFFFFF00u) {}
+
+    /**
+     *  @brief      true if the rows are not ordered by ascending post-synaptic rank.
+     */
+    bool requires_sorting() const {
+        return !std::is_sorted(post_rank.begin(), post_rank.end());
+    }
+
+    /*
+     *  Connectivity patterns
+     */
+    void one_to_one(const std::vector<IT> &post_ranks, const std::vector<IT> &pre_ranks) {
+        const std::size_t num_rows = std::min(post_ranks.size(), pre_ranks.size());
+        post_rank.assign(post_ranks.begin(), post_ranks.begin() + num_rows);
+        pre_rank.resize(num_rows);
+        for (std::size_t i = 0; i < num_rows; i++)
+            pre_rank[i] = std::vector<IT>(1, pre_ranks[i]);
+    }
+
+    void all_to_all(const std::vector<IT> &post_ranks, const std::vector<IT> &pre_ranks, const bool allow_self_connections) {
+        post_rank = post_ranks;
+        pre_rank.resize(post_ranks.size());
+
+        for_each_row(post_ranks.size(), [&](const std::size_t i) {
+            pre_rank[i] = pre_ranks;
+            if (!allow_self_connections) {
+                auto it = std::find(pre_rank[i].begin(), pre_rank[i].end(), post_ranks[i]);
+                if (it != pre_rank[i].end())
+                    pre_rank[i].erase(it);
+            }
+        });
+        remove_empty_rows();
+    }
+
+    void fixed_probability(const std::vector<IT> &post_ranks, const std::vector<IT> &pre_ranks, const double probability, const bool allow_self_connections) {
+        post_rank = post_ranks;
+        pre_rank.resize(post_ranks.size());
+
+        const std::size_t n = pre_ranks.size();
+        for_each_row(post_ranks.size(), [&](const std::size_t i) {
+            Philox4x32 gen(seed_, stream_ | 0xFDu, 0, post_ranks[i]);
+            std::vector<IT> &row = pre_rank[i];
+
+            if (probability >= 1.0) {
+                row = pre_ranks;
+            } else if (probability > 0.0) {
+                // the gaps between two synapses are geometrically distributed
+                std::uniform_real_distribution<double> unif(0.0, 1.0);
+                const double log_q = std::log1p(-probability);
+                std::size_t j = 0;
+                while (true) {
+                    const double skip = std::floor(std::log(1.0 - unif(gen)) / log_q);
+                    if (skip >= static_cast<double>(n - j))
+                        break;
+                    j += static_cast<std::size_t>(skip);
+                    row.push_back(pre_ranks[j]);
+                    j++;
+                }
+            }
+
+            if (!allow_self_connections)
+                row.erase(std::remove(row.begin(), row.end(), post_ranks[i]), row.end());
+            std::sort(row.begin(), row.end());
+        });
+        remove_empty_rows();
+    }
+
+    void fixed_number_pre(const std::vector<IT> &post_ranks, const std::vector<IT> &pre_ranks, const std::size_t number, const bool allow_self_connections) {
+        post_rank = post_ranks;
+        pre_rank.resize(post_ranks.size());
+
+        for_each_row(post_ranks.size(), [&](const std::size_t i) {
+            Philox4x32 gen(seed_, stream_ | 0xFDu, 0, post_ranks[i]);
+
+            // the post-synaptic neuron is removed from the candidates
+            const long int self = allow_self_connections ? -1 : find_rank(pre_ranks, post_ranks[i]);
+            const std::size_t num_candidates = pre_ranks.size() - (self >= 0 ? 1 : 0);
+
+            std::vector<IT> &row = pre_rank[i];
+            for (auto pos: sample_positions(num_candidates, number, gen)) {
+                if (self >= 0 && static_cast<long int>(pos) >= self)
+                    pos++;
+                row.push_back(pre_ranks[pos]);
+            }
+            std::sort(row.begin(), row.end());
+        });
+        remove_empty_rows();
+    }
+
+    void fixed_number_post(const std::vector<IT> &post_ranks, const std::vector<IT> &pre_ranks, const std::size_t number, const bool allow_self_connections) {
+        // post-synaptic targets of each pre-synaptic neuron
+        std::vector< std::vector<std::size_t> > targets(pre_ranks.size());
+        for_each_row(pre_ranks.size(), [&](const std::size_t j) {
+            Philox4x32 gen(seed_, stream_ | 0xFDu, 0, pre_ranks[j]);
+
+            const long int self = allow_self_connections ? -1 : find_rank(post_ranks, pre_ranks[j]);
+            const std::size_t num_candidates = post_ranks.size() - (self >= 0 ? 1 : 0);
+
+            targets[j] = sample_positions(num_candidates, number, gen);
+            if (self >= 0) {
+                for (auto &pos: targets[j]) {
+                    if (static_cast<long int>(pos) >= self)
+                        pos++;
+                }
+            }
+        });
+
+        // transposition, the pre-synaptic neurons are ordered as pre_ranks in each row
+        std::vector<std::size_t> row_sizes(post_ranks.size(), 0);
+        for (auto &row: targets)
+            for (auto pos: row)
+                row_sizes[pos]++;
+
+        post_rank = post_ranks;
+        pre_rank.resize(post_ranks.size());
+        for (std::size_t i = 0; i < post_ranks.size(); i++)
+            pre_rank[i].reserve(row_sizes[i]);
+        for (std::size_t j = 0; j < pre_ranks.size(); j++) {
+            for (auto pos: targets[j])
+                pre_rank[pos].push_back(pre_ranks[j]);
+            std::vector<std::size_t>().swap(targets[j]);
+        }
+        remove_empty_rows();
+    }
+
+    /**
+     *  @brief      gaussian profile amp * exp(-d^2 / (2 sigma^2)) over the normalized coordinates, same precision as LILConnectivity.gaussian().
+     *              Only the neurons within the distance where the profile falls below limit * amp are visited.
+     */
+    void gaussian(const std::vector<int> &pre_geometry, const std::vector<int> &post_geometry, const float amp, const float sigma, const double limit, const bool allow_self_connections) {
+        const double denominator = 2.0 * powf(sigma, 2.0);
+        const double threshold = limit * static_cast<double>(amp);
+        const double max_distance = cutoff_distance(amp, denominator, threshold);
+        distance_pattern(pre_geometry, post_geometry, max_distance, allow_self_connections, [&](const float distance, VT &value) {
+            const float v = amp * std::exp(static_cast<double>(-distance) / denominator);
+            value = static_cast<VT>(v);
+            return static_cast<double>(v) > threshold;
+        });
+    }
+
+    /**
+     *  @brief      difference-of-gaussians profile over the normalized coordinates, same precision as LILConnectivity.dog().
+     */
+    void dog(const std::vector<int> &pre_geometry, const std::vector<int> &post_geometry, const float amp_pos, const float sigma_pos, const float amp_neg, const float sigma_neg, const double limit, const bool allow_self_connections) {
+        const double denominator_pos = 2.0 * powf(sigma_pos, 2.0);
+        const double denominator_neg = 2.0 * powf(sigma_neg, 2.0);
+        const double threshold = limit * std::fabs(static_cast<double>(amp_pos - amp_neg));
+        // |amp_pos * exp(-d/den_pos) - amp_neg * exp(-d/den_neg)| <= (|amp_pos| + |amp_neg|) * exp(-d/max(den_pos, den_neg))
+        const double max_distance = cutoff_distance(std::fabs(amp_pos) + std::fabs(amp_neg), std::max(denominator_pos, denominator_neg), threshold);
+        distance_pattern(pre_geometry, post_geometry, max_distance, allow_self_connections, [&](const float distance, VT &value) {
+            const float v = amp_pos * std::exp(static_cast<double>(-distance) / denominator_pos) - amp_neg * std::exp(static_cast<double>(-distance) / denominator_neg);
+            value = static_cast<VT>(v);
+            return std::fabs(static_cast<double>(v)) > threshold;
+        });
+    }
+
+    /*
+     *  Weights and delays
+     */
+    void constant_values(const VT value) {
+        values.resize(pre_rank.size());
+        for_each_row(pre_rank.size(), [&](const std::size_t i) {
+            values[i] = std::vector<VT>(pre_rank[i].size(), value);
+        });
+    }
+
+    /**
+     *  @brief      weights drawn from dist and clipped to [min, max] as RandomDistribution.get_values().
+     */
+    template<typename Dist>
+    void random_values(const Dist &dist, const double min, const double max) {
+        values.resize(pre_rank.size());
+        for_each_row(pre_rank.size(), [&](const std::size_t i) {
+            Philox4x32 gen(seed_, stream_ | 0xFEu, 0, post_rank[i]);
+            Dist row_dist(dist);
+            values[i].resize(pre_rank[i].size());
+            for (std::size_t j = 0; j < pre_rank[i].size(); j++)
+                values[i][j] = static_cast<VT>(std::min(max, std::max(min, static_cast<double>(row_dist(gen)))));
+        });
+    }
+
+    /**
+     *  @brief      uniform delay in ms, stored in steps with a single value per row as LILConnectivity.push_back().
+     */
+    void constant_delays(const double delay, const double dt) {
+        const int steps = static_cast<int>(std::nearbyint(delay / dt));
+        delays.assign(pre_rank.size(), std::vector<int>(1, steps));
+    }
+
+    /**
+     *  @brief      delays in ms drawn from dist and clipped to [min, max], stored in steps.
+     */
+    template<typename Dist>
+    void random_delays(const Dist &dist, const double min, const double max, const double dt) {
+        delays.resize(pre_rank.size());
+        for_each_row(pre_rank.size(), [&](const std::size_t i) {
+            Philox4x32 gen(seed_, stream_ | 0xFFu, 0, post_rank[i]);
+            Dist row_dist(dist);
+            delays[i].resize(pre_rank[i].size());
+            for (std::size_t j = 0; j < pre_rank[i].size(); j++) {
+                const double d = std::min(max, std::max(min, static_cast<double>(row_dist(gen))));
+                delays[i][j] = static_cast<int>(std::nearbyint(d / dt));
+            }
+        });
+    }
+};
@@ -181,7 +181,8 @@ public:
     /**
      *  @see LILMatrix::fixed_number_pre_pattern()
      */
-    void fixed_number_pre_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, unsigned int nnz_per_row, std::mt19937& rng) {
+    template<typename RNG>
+    void fixed_number_pre_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, unsigned int nnz_per_row, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "LILInvMatrix::fixed_number_pre_pattern():" << std::endl;
     #endif
@@ -195,7 +196,8 @@ public:
     /**
      *  @see LILMatrix::fixed_probability_pattern()
      */
-    void fixed_probability_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, double p, bool allow_self_connections, std::mt19937& rng) {
+    template<typename RNG>
+    void fixed_probability_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, double p, bool allow_self_connections, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "LILInvMatrix::fixed_probability_pattern():" << std::endl;
     #endif
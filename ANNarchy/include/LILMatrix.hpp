@@ -24,6 +24,8 @@
 #pragma once
 
 #include "helper_functions.hpp"
+#include "QuantizedMatrix.hpp"
+#include "Philox.hpp"
 
 /**
  *  @brief      Implementation of the *list-in-list* (LIL) sparse matrix format.
@@ -358,9 +360,10 @@ public:
      *  @param[in]  post_ranks  list of row indices of all rows which contain at least on elements to be accounted.
      *  @param[in]  pre_ranks   list of list, where the i-th sub-vector should contain a list of potential connection candidates for the i-th post-synaptic neuron.
      *  @param[in]  nnz_per_row number of pre-synaptic neurons which should be randomly selected from the list.
-     *  @param[in]  rng         a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng         a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      */
-    bool fixed_number_pre_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, IT nnz_per_row, std::mt19937& rng) {
+    template<typename RNG>
+    bool fixed_number_pre_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, IT nnz_per_row, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "LILMatrix::fixed_number_pre_pattern()" << std::endl;
         std::cout << " rows: " << post_ranks.size() << std::endl;
@@ -369,8 +372,17 @@ public:
         post_rank = post_ranks;
         pre_rank = std::vector< std::vector<IT> >(post_rank.size(), std::vector<IT>());
 
+        // the rows drawn by a counter-based generator must not depend on the previous rows
+        std::vector<IT> candidates;
+        if (is_counter_based<RNG>::value)
+            candidates = pre_ranks;
+
         // for each row we select a subset of the provided pre ranks
         for(auto lil_idx = 0; lil_idx < post_ranks.size(); lil_idx++) {
+            rng_seek_row(rng, post_ranks[lil_idx]);
+            if (is_counter_based<RNG>::value)
+                pre_ranks = candidates;
+
             // shuffle indices (source vector is modified!)
             std::shuffle(pre_ranks.begin(), pre_ranks.end(), rng);
 
@@ -391,9 +403,10 @@ public:
      *  @param[in]  post_ranks  list of row indices of all rows which contain at least on elements to be accounted.
      *  @param[in]  pre_ranks   list of list, where the i-th sub-vector should contain a list of potential connection candidates for the i-th post-synaptic neuron.
      *  @param[in]  p           probability for a connection being set between two neurons.
-     *  @param[in]  rng         a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng         a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      */
-    bool fixed_probability_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, double p, bool allow_self_connections, std::mt19937& rng) {
+    template<typename RNG>
+    bool fixed_probability_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, double p, bool allow_self_connections, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "LILMatrix::fixed_probability_pattern()" << std::endl;
         std::cout << " rows: " << post_ranks.size() << std::endl;
@@ -408,6 +421,7 @@ public:
         for(auto lil_idx = 0; lil_idx < post_ranks.size(); lil_idx++) {
             // only relevant if allow_self_connections == false
             IT rk_post = post_ranks[lil_idx];
+            rng_seek_row(rng, rk_post);
 
             // over all possible connections
             for(auto it=pre_ranks.begin(); it != pre_ranks.end(); it++) {
@@ -450,17 +464,18 @@ public:
      *  @tparam     VT      data type of the variable.
      *  @param[in]  a       minimum of the distribution
      *  @param[in]  b       maximum of the distribution
-     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      *  @returns    A STL object filled with the default values according to LILMatrix::pre_rank
      */
-    template <typename VT>
-    std::vector<std::vector<VT>> init_matrix_variable_uniform(VT a, VT b, std::mt19937& rng) {
+    template <typename VT, typename RNG>
+    std::vector<std::vector<VT>> init_matrix_variable_uniform(VT a, VT b, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with Uniform(" << a << ", " << b << ")" << std::endl;
     #endif
         std::uniform_real_distribution<VT> dis (a,b);
         auto new_variable = std::vector< std::vector<VT> >(post_rank.size(), std::vector<VT>());
         for (auto post = 0; post < post_rank.size(); post++) {
+            rng_seek_row(rng, post_rank[post]);
             new_variable[post] = std::vector<VT>(pre_rank[post].size(), 0.0);
             std::generate(new_variable[post].begin(), new_variable[post].end(), [&]{ return dis(rng); });
         }
@@ -473,18 +488,19 @@ public:
      *  @tparam     VT      data type of the variable (should be an Integer-like data type).
      *  @param[in]  a       minimum of the distribution
      *  @param[in]  b       maximum of the distribution
-     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      *  @todo       Maybe we could use template specialization instead of a seperate function
      *  @returns    A STL object filled with the default values according to LILMatrix::pre_rank
      */
-    template <typename VT>
-    std::vector<std::vector<VT>> init_matrix_variable_discrete_uniform(VT a, VT b, std::mt19937& rng) {
+    template <typename VT, typename RNG>
+    std::vector<std::vector<VT>> init_matrix_variable_discrete_uniform(VT a, VT b, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with discrete Uniform(" << a << ", " << b << ")" << std::endl;
     #endif
         std::uniform_int_distribution<VT> dis (a,b);
         auto new_variable = std::vector< std::vector<VT> >(post_rank.size(), std::vector<VT>());
         for (auto post = 0; post < post_rank.size(); post++) {
+            rng_seek_row(rng, post_rank[post]);
             new_variable[post] = std::vector<VT>(pre_rank[post].size(), 0.0);
             std::generate(new_variable[post].begin(), new_variable[post].end(), [&]{ return dis(rng); });
         }
@@ -497,17 +513,18 @@ public:
      *  @tparam     VT      data type of the variable (should be an Integer-like data type).
      *  @param[in]  mean    mean of the distribution
      *  @param[in]  sigma   sigma of the distribution
-     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      *  @returns    A STL object filled with the default values according to LILMatrix::pre_rank
      */
-    template <typename VT>
-    std::vector<std::vector<VT>> init_matrix_variable_normal(VT mean, VT sigma, std::mt19937& rng) {
+    template <typename VT, typename RNG>
+    std::vector<std::vector<VT>> init_matrix_variable_normal(VT mean, VT sigma, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with normal distribution (" << mean << ", " << sigma << ")" << std::endl;
     #endif
         std::normal_distribution<VT> dis (mean, sigma);
         auto new_variable = std::vector< std::vector<VT> >(post_rank.size(), std::vector<VT>());
         for (auto post = 0; post < post_rank.size(); post++) {
+            rng_seek_row(rng, post_rank[post]);
             new_variable[post] = std::vector<VT>(pre_rank[post].size(), 0.0);
             std::generate(new_variable[post].begin(), new_variable[post].end(), [&]{ return dis(rng); });
         }
@@ -520,17 +537,18 @@ public:
      *  @tparam     VT      data type of the variable (should be an Integer-like data type).
      *  @param[in]  mean    mean of the distribution
      *  @param[in]  sigma   sigma of the distribution
-     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      *  @returns    A STL object filled with the default values according to LILMatrix::pre_rank
      */
-    template <typename VT>
-    std::vector<std::vector<VT>> init_matrix_variable_log_normal(VT mean, VT sigma, std::mt19937& rng) {
+    template <typename VT, typename RNG>
+    std::vector<std::vector<VT>> init_matrix_variable_log_normal(VT mean, VT sigma, RNG& rng) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with log-normal distribution (" << mean << ", " << sigma << ")" << std::endl;
     #endif
         std::lognormal_distribution<VT> dis (mean, sigma);
         auto new_variable = std::vector< std::vector<VT> >(post_rank.size(), std::vector<VT>());
         for (auto post = 0; post < post_rank.size(); post++) {
+            rng_seek_row(rng, post_rank[post]);
             new_variable[post] = std::vector<VT>(pre_rank[post].size(), 0.0);
             std::generate(new_variable[post].begin(), new_variable[post].end(), [&]{ return dis(rng); });
         }
@@ -544,19 +562,20 @@ public:
      *  @tparam     VT      data type of the variable (should be an Integer-like data type).
      *  @param[in]  mean    mean of the distribution
      *  @param[in]  sigma   sigma of the distribution
-     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary)
+     *  @param[in]  rng     a merseanne twister generator (need to be seeded in prior if necessary) or a counter-based generator restarted for each row
      *  @param[in]  min     minimum border
      *  @param[in]  max     maximum border
      *  @returns    A STL object filled with the default values according to LILMatrix::pre_rank
      */
-    template <typename VT>
-    std::vector<std::vector<VT>> init_matrix_variable_log_normal_clip(VT mean, VT sigma, std::mt19937& rng, VT min, VT max) {
+    template <typename VT, typename RNG>
+    std::vector<std::vector<VT>> init_matrix_variable_log_normal_clip(VT mean, VT sigma, RNG& rng, VT min, VT max) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with log-normal distribution (" << mean << ", " << sigma << ") clipped to [" << min << "," << max << "]" << std::endl;
     #endif
         std::lognormal_distribution<VT> dis (mean, sigma);
         auto new_variable = std::vector< std::vector<VT> >(post_rank.size(), std::vector<VT>());
         for (auto post = 0; post < post_rank.size(); post++) {
+            rng_seek_row(rng, post_rank[post]);
             new_variable[post] = std::vector<VT>(pre_rank[post].size(), 0.0);
             for (auto it = new_variable[post].begin(); it != new_variable[post].end(); it++) {
                 VT tmp = dis(rng);
@@ -681,6 +700,63 @@ public:
         return static_cast<VT>(0.0); // should not happen
     }
 
+    /**
+     *  @details    Accessors for the variables stored as quantized values (see QuantizedMatrix). The values
+     *              are quantized again at each update of a row and dequantized for the read-out.
+     *  @tparam     VT          data type of the dequantized values.
+     *  @tparam     QT          integer type of the stored values.
+     */
+    template <typename VT, typename QT>
+    inline void update_matrix_variable(QuantizedMatrix<QT, VT> &variable, const IT lil_idx, const IT col_idx, const VT value) {
+        auto row = variable.get_row(lil_idx);
+        for (auto idx = 0; idx < pre_rank[lil_idx].size(); idx++) {
+            if (pre_rank[lil_idx][idx] == col_idx) {
+                row[idx] = value;
+            }
+        }
+        variable.set_row(lil_idx, row);
+    }
+
+    template <typename VT, typename QT>
+    inline void update_matrix_variable_row(QuantizedMatrix<QT, VT> &variable, const IT lil_idx, const std::vector<VT> values) {
+        assert( (lil_idx < variable.size()) );
+        assert( (values.size() == pre_rank[lil_idx].size()) );
+
+        variable.set_row(lil_idx, values);
+    }
+
+    template <typename VT, typename QT>
+    inline void update_matrix_variable_all(QuantizedMatrix<QT, VT> &variable, const std::vector< std::vector<VT> > &data) {
+        assert( (data.size() == post_rank.size()) );
+
+        variable = data;
+    }
+
+    template <typename VT, typename QT>
+    inline std::vector< std::vector < VT > > get_matrix_variable_all(const QuantizedMatrix<QT, VT> &variable) {
+        return variable.get_all();
+    }
+
+    template <typename VT, typename QT>
+    inline std::vector< VT > get_matrix_variable_row(const QuantizedMatrix<QT, VT> &variable, const IT &lil_idx) {
+        assert ( (lil_idx < variable.size()) );
+
+        return variable.get_row(lil_idx);
+    }
+
+    template <typename VT, typename QT>
+    inline VT get_matrix_variable(const QuantizedMatrix<QT, VT> &variable, const IT &lil_idx, const IT &col_idx) {
+        assert ( (lil_idx < variable.size()) );
+
+        for (auto idx = 0; idx < pre_rank[lil_idx].size(); idx++) {
+            if (pre_rank[lil_idx][idx] == col_idx) {
+                return variable[lil_idx][idx];
+            }
+        }
+
+        return static_cast<VT>(0.0); // should not happen
+    }
+
     /**
      *  @brief      Initialize a vector variable
      *  @details    Variables marked as 'semiglobal' stored in a vector of the size of LILMatrix::post_rank
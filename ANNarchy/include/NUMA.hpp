@@ -0,0 +1,126 @@
+/*
+ *    NUMA.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+#ifdef __linux__
+#include <unistd.h>
+#include <sys/syscall.h>
+#endif
+
+/**
+ *  @brief      NUMA-aware placement of the memory (setup(numa_placement=True)).
+ *  @details    The containers are allocated and initialized by the master thread, so all their pages
+ *              reside on the memory node of the master thread (first-touch policy). After the network
+ *              is initialized, each thread moves the pages of the elements it processes in the static
+ *              OpenMP partitions to its own memory node, which has the same effect as a first-touch by
+ *              that thread. The move_pages system call is used directly, so that libnuma is not required.
+ *              On other systems or if the call fails, the memory is left where it is.
+ */
+namespace numa {
+
+    /**
+     *  @brief      memory node of the calling thread, 0 if it can not be determined.
+     */
+    inline int current_node() {
+    #if defined(__linux__) && defined(SYS_getcpu)
+        unsigned int cpu = 0, node = 0;
+        if (syscall(SYS_getcpu, &cpu, &node, nullptr) == 0)
+            return static_cast<int>(node);
+    #endif
+        return 0;
+    }
+
+    /**
+     *  @brief      Moves the pages covering [begin, begin+bytes) to the given node (node >= 0) or only queries their
+     *              location (node < 0). The number of bytes located on each node is added to bytes_per_node.
+     */
+    inline void move(const void* begin, std::size_t bytes, int node, std::vector<long int>& bytes_per_node) {
+        if (begin == nullptr || bytes == 0)
+            return;
+
+    #if defined(__linux__) && defined(SYS_move_pages)
+        const std::uintptr_t page_size = static_cast<std::uintptr_t>(sysconf(_SC_PAGESIZE));
+        std::uintptr_t first = reinterpret_cast<std::uintptr_t>(begin) & ~(page_size-1);
+        std::uintptr_t last = reinterpret_cast<std::uintptr_t>(begin) + bytes;
+
+        std::vector<void*> pages;
+        for (std::uintptr_t p = first; p < last; p += page_size)
+            pages.push_back(reinterpret_cast<void*>(p));
+
+        std::vector<int> nodes(pages.size(), node);
+        std::vector<int> status(pages.size(), -1);
+        long res = syscall(SYS_move_pages, 0, pages.size(), pages.data(), (node < 0) ? nullptr : nodes.data(), status.data(), 0);
+        if (res < 0)
+            return;
+
+        for (auto it = status.begin(); it != status.end(); it++) {
+            if (*it < 0)
+                continue;   // e.g. page not yet touched or busy
+            if (static_cast<std::size_t>(*it) >= bytes_per_node.size())
+                bytes_per_node.resize(*it + 1, 0);
+            bytes_per_node[*it] += page_size;
+        }
+    #endif
+    }
+
+    /**
+     *  @brief      Range of the static OpenMP partition of n elements processed by thread tid.
+     */
+    inline void static_chunk(std::size_t n, int tid, int nt, std::size_t& begin, std::size_t& end) {
+        std::size_t q = n / nt;
+        std::size_t r = n % nt;
+        if (static_cast<std::size_t>(tid) < r) {
+            begin = tid * (q + 1);
+            end = begin + q + 1;
+        } else {
+            begin = tid * q + r;
+            end = begin + q;
+        }
+    }
+
+    /**
+     *  @brief      Places the static partition of thread tid of a vector on the memory node of the calling thread.
+     */
+    template<typename T>
+    void place(std::vector<T>& vec, int tid, int nt, std::vector<long int>& bytes_per_node) {
+        std::size_t begin, end;
+        static_chunk(vec.size(), tid, nt, begin, end);
+        if (begin < end)
+            move(vec.data() + begin, (end - begin) * sizeof(T), current_node(), bytes_per_node);
+    }
+
+    /**
+     *  @brief      Places the rows of the static partition of thread tid on the memory node of the calling thread.
+     */
+    template<typename T>
+    void place(std::vector< std::vector<T> >& vec, int tid, int nt, std::vector<long int>& bytes_per_node) {
+        std::size_t begin, end;
+        static_chunk(vec.size(), tid, nt, begin, end);
+        int node = current_node();
+        for (std::size_t i = begin; i < end; i++)
+            move(vec[i].data(), vec[i].size() * sizeof(T), node, bytes_per_node);
+    }
+}
@@ -187,6 +187,28 @@ public:
         // determine partitions
         divide_post_ranks(post_ranks, num_partitions);
 
+    #if defined(_NUMA_PLACEMENT) and defined(_OPENMP)
+        // each partition is created by the thread which processes it later (first-touch)
+        bool all_success = true;
+        #pragma omp parallel num_threads(num_partitions)
+        {
+            int tid = omp_get_thread_num();
+            auto slice = slices_[tid];
+            auto post_rank_slice = std::vector<IT>(post_ranks.begin()+slice.first, post_ranks.begin()+slice.second);
+            auto pre_rank_slice = std::vector< std::vector<IT> >(pre_ranks.begin()+slice.first, pre_ranks.begin()+slice.second);
+
+            bool success = sub_matrices_[tid]->init_matrix_from_lil(post_rank_slice, pre_rank_slice, false);
+            if (!success) {
+                #pragma omp critical
+                {
+                    std::cerr << "Failed to initialize partition " << tid << std::endl;
+                    all_success = false;
+                }
+            }
+        }
+        if (!all_success)
+            return false;
+    #else
         auto slice_it = slices_.begin();
         int part_idx = 0;
         for(; slice_it != slices_.end(); slice_it++, part_idx++) {
@@ -201,6 +223,7 @@ public:
                 return false;
             }
         }
+    #endif
 
     #ifdef _DEBUG
         std::cout << "PartitionedMatrix: created " << num_partitions << " partitions with partition borders:" << std::endl;
@@ -294,7 +317,8 @@ public:
     //
     //  ANNarchy connectivity patterns
     //
-    void fixed_number_pre_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, unsigned int nnz_per_row, std::vector<std::mt19937>& rng, const unsigned int num_partitions) {
+    template<typename RNG>
+    void fixed_number_pre_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, unsigned int nnz_per_row, std::vector<RNG>& rng, const unsigned int num_partitions) {
     #ifdef _DEBUG
         std::cout << "ParallelLIL::fixed_number_pre_pattern():" << std::endl;
     #endif
@@ -324,7 +348,8 @@ public:
     #endif
     }
 
-    void fixed_probability_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, double p, bool allow_self_connections, std::vector<std::mt19937>& rng, const unsigned int num_partitions) {
+    template<typename RNG>
+    void fixed_probability_pattern(std::vector<IT> post_ranks, std::vector<IT> pre_ranks, double p, bool allow_self_connections, std::vector<RNG>& rng, const unsigned int num_partitions) {
     #ifdef _DEBUG
         std::cout << "ParallelLIL::fixed_probability_pattern():" << std::endl;
     #endif
@@ -364,16 +389,26 @@ public:
      */
     template <typename VT, typename PART_TYPE>
     std::vector< PART_TYPE > init_matrix_variable(VT default_value) {
+    #if defined(_NUMA_PLACEMENT) and defined(_OPENMP)
+        // each slice is allocated by the thread which processes it later (first-touch)
+        auto new_variable = std::vector< PART_TYPE >(num_partitions_);
+        #pragma omp parallel num_threads(num_partitions_)
+        {
+            int tid = omp_get_thread_num();
+            new_variable[tid] = std::move(sub_matrices_[tid]->init_matrix_variable(default_value));
+        }
+    #else
         auto new_variable = std::vector< PART_TYPE >();
         for(auto it = sub_matrices_.begin(); it != sub_matrices_.end(); it++) {
             new_variable.push_back((*it)->init_matrix_variable(default_value));
         }
+    #endif
 
         return new_variable;
     }
 
-    template <typename VT, typename PART_TYPE>
-    std::vector< PART_TYPE > init_matrix_variable_uniform(VT a, VT b, std::vector<std::mt19937>& rng) {
+    template <typename VT, typename PART_TYPE, typename RNG>
+    std::vector< PART_TYPE > init_matrix_variable_uniform(VT a, VT b, std::vector<RNG>& rng) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with Uniform(" << a << ", " << b << ")" << std::endl;
     #endif
@@ -395,8 +430,8 @@ public:
     #endif
     }
 
-    template <typename VT, typename PART_TYPE>
-    std::vector< PART_TYPE > init_matrix_variable_normal(VT mean, VT sigma, std::vector<std::mt19937>& rng) {
+    template <typename VT, typename PART_TYPE, typename RNG>
+    std::vector< PART_TYPE > init_matrix_variable_normal(VT mean, VT sigma, std::vector<RNG>& rng) {
     #ifdef _DEBUG
         std::cout << "Initialize variable with Normal(" << mean << ", " << sigma << ")" << std::endl;
     #endif
@@ -0,0 +1,149 @@
+/*
+ *    Philox.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <array>
+#include <cstdint>
+#include <limits>
+#include <type_traits>
+#include <vector>
+
+/**
+ *  @brief      Counter-based random number generator Philox4x32-10 (setup(counter_based_rng=True)).
+ *  @details    Salmon et al. (2011) Parallel random numbers: as easy as 1, 2, 3. The generated numbers only depend on
+ *              the key and on the counter, not on the previously drawn numbers. The generator used for a random
+ *              variable is therefore created for each draw from:
+ *
+ *                  - the key: the seed of the network and a stream identifying the random variable (e.g. population
+ *                    id and index of the variable)
+ *                  - the counter: the index of the neuron or synapse and the current simulation step.
+ *
+ *              so that the drawn values are independent of the number of threads and of the order of the draws.
+ *
+ *              The class fulfills the UniformRandomBitGenerator requirements and can be used with the STL
+ *              distributions. A generator yields 2^32 blocks of four 32-bit values.
+ */
+class Philox4x32 {
+    std::array<std::uint32_t, 4> counter_;  ///< block, index (low, high), step
+    std::array<std::uint32_t, 2> key_;      ///< seed, stream
+    std::array<std::uint32_t, 4> output_;   ///< current block of random values
+    unsigned int idx_;                      ///< next value in output_
+
+    static inline void mulhilo(const std::uint32_t a, const std::uint32_t b, std::uint32_t &hi, std::uint32_t &lo) {
+        const std::uint64_t product = static_cast<std::uint64_t>(a) * static_cast<std::uint64_t>(b);
+        hi = static_cast<std::uint32_t>(product >> 32);
+        lo = static_cast<std::uint32_t>(product);
+    }
+
+    void generate() {
+        std::array<std::uint32_t, 4> c = counter_;
+        std::array<std::uint32_t, 2> k = key_;
+        std::uint32_t hi0, lo0, hi1, lo1;
+
+        for (int round = 0; round < 10; round++) {
+            mulhilo(0xD2511F53, c[0], hi0, lo0);
+            mulhilo(0xCD9E8D57, c[2], hi1, lo1);
+            c = {hi1 ^ c[1] ^ k[0], lo1, hi0 ^ c[3] ^ k[1], lo0};
+            k[0] += 0x9E3779B9;
+            k[1] += 0xBB67AE85;
+        }
+
+        output_ = c;
+        counter_[0]++;
+        idx_ = 0;
+    }
+
+public:
+    typedef std::uint32_t result_type;
+
+    /**
+     *  @param[in]  seed    seed of the network (rng_seed)
+     *  @param[in]  stream  identifier of the random variable or connection pattern
+     *  @param[in]  step    current simulation step
+     *  @param[in]  index   rank of the neuron, or (post_rank << 32 | pre_rank) for a synapse
+     */
+    Philox4x32(const long int seed, const std::uint32_t stream, const long int step, const std::uint64_t index) {
+        const std::uint64_t s = static_cast<std::uint64_t>(seed);
+        key_ = {static_cast<std::uint32_t>(s) ^ static_cast<std::uint32_t>(s >> 32), stream};
+        counter_ = {0, static_cast<std::uint32_t>(index), static_cast<std::uint32_t>(index >> 32), static_cast<std::uint32_t>(step)};
+        idx_ = 4;
+    }
+
+    static constexpr result_type min() { return 0; }
+    static constexpr result_type max() { return std::numeric_limits<result_type>::max(); }
+
+    inline result_type operator()() {
+        if (idx_ == 4)
+            generate();
+        return output_[idx_++];
+    }
+
+    /**
+     *  @brief      restarts the generator for another index, e.g. for each row of a connectivity matrix.
+     */
+    void seek(const std::uint64_t index) {
+        counter_[0] = 0;
+        counter_[1] = static_cast<std::uint32_t>(index);
+        counter_[2] = static_cast<std::uint32_t>(index >> 32);
+        idx_ = 4;
+    }
+};
+
+/**
+ *  @brief      Draws a value of the distribution *dist* for the given neuron or synapse at the given step.
+ *  @details    The distribution is copied, so that values cached by the distribution (e.g. std::normal_distribution)
+ *              are not reused by the next draw.
+ */
+template<typename Dist>
+inline typename Dist::result_type counter_based_draw(Dist dist, const long int seed, const std::uint32_t stream, const long int step, const std::uint64_t index) {
+    Philox4x32 gen(seed, stream, step, index);
+    return dist(gen);
+}
+
+/**
+ *  @brief      Generators used by the connectivity patterns created in C++, one per thread as for std::mt19937.
+ */
+inline std::vector<Philox4x32> counter_based_sources(const long int seed, const std::uint32_t stream, const int num_sources) {
+    return std::vector<Philox4x32>(num_sources, Philox4x32(seed, stream, 0, 0));
+}
+
+/**
+ *  @brief      true if the generator is counter-based.
+ */
+template<typename RNG>
+struct is_counter_based : std::false_type {};
+
+template<>
+struct is_counter_based<Philox4x32> : std::true_type {};
+
+/**
+ *  @brief      Called by the connectivity patterns before each row of the matrix.
+ *  @details    The counter-based generator is restarted for the row, so that the row does not depend on the number of
+ *              threads which create the matrix. The other generators (std::mt19937) are not modified.
+ */
+template<typename RNG>
+inline void rng_seek_row(RNG &rng, const std::uint64_t row) {}
+
+template<>
+inline void rng_seek_row<Philox4x32>(Philox4x32 &rng, const std::uint64_t row) {
+    rng.seek(row);
+}
@@ -0,0 +1,153 @@
+/*
+ *    QuantizedMatrix.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <limits>
+#include <vector>
+
+/**
+ *  @brief      Local variable of a LIL matrix stored as integers with one scale per row (Projection(weight_dtype='int8'), quantized weights).
+ *  @details    Each row is quantized symmetrically: scale_[i] = max_j |w_ij| / max(QT) and values_[i][j] = round(w_ij / scale_[i]).
+ *
+ *              The container can be read like a std::vector< std::vector<VT> >: w[i][j] returns the dequantized value scale_[i] * values_[i][j],
+ *              so that the generated psp kernels are unchanged. The values can not be modified element-wise, the container is only filled by
+ *              assigning a std::vector< std::vector<VT> > or by the LILMatrix::update_matrix_variable*() methods, which quantize again the
+ *              concerned rows. It is therefore restricted to non-plastic synapses.
+ *
+ *  @tparam     QT          integer type used for the storage (int8_t or int16_t)
+ *  @tparam     VT          data type of the dequantized values (float or double)
+ */
+template<typename QT, typename VT>
+class QuantizedMatrix {
+    std::vector< std::vector<QT> > values_;     ///< quantized values, same structure as LILMatrix::pre_rank
+    std::vector<VT> scale_;                     ///< scale of each row
+
+    void quantize_row(const std::size_t lil_idx, const std::vector<VT> &row) {
+        VT max_abs = static_cast<VT>(0.0);
+        for (auto it = row.begin(); it != row.end(); it++)
+            max_abs = std::max(max_abs, static_cast<VT>(std::abs(*it)));
+
+        scale_[lil_idx] = max_abs / static_cast<VT>(std::numeric_limits<QT>::max());
+
+        values_[lil_idx].resize(row.size());
+        for (std::size_t j = 0; j < row.size(); j++)
+            values_[lil_idx][j] = (scale_[lil_idx] > 0) ? static_cast<QT>(std::lround(row[j] / scale_[lil_idx])) : 0;
+    }
+
+public:
+    /**
+     *  @brief      Read-only view on a row returning dequantized values.
+     */
+    class Row {
+        const QT* values_;
+        const VT scale_;
+    public:
+        Row(const QT* values, const VT scale): values_(values), scale_(scale) {}
+
+        inline VT operator[](const std::size_t j) const {
+            return scale_ * static_cast<VT>(values_[j]);
+        }
+    };
+
+    QuantizedMatrix() {}
+
+    QuantizedMatrix& operator=(const std::vector< std::vector<VT> > &values) {
+        values_.resize(values.size());
+        scale_.resize(values.size());
+        for (std::size_t i = 0; i < values.size(); i++)
+            quantize_row(i, values[i]);
+        return *this;
+    }
+
+    inline Row operator[](const std::size_t lil_idx) const {
+        return Row(values_[lil_idx].data(), scale_[lil_idx]);
+    }
+
+    std::size_t size() const { return values_.size(); }
+
+    /**
+     *  @brief      replaces the values of a row.
+     */
+    void set_row(const std::size_t lil_idx, const std::vector<VT> &row) {
+        quantize_row(lil_idx, row);
+    }
+
+    /**
+     *  @brief      returns the dequantized values of a row.
+     */
+    std::vector<VT> get_row(const std::size_t lil_idx) const {
+        std::vector<VT> row(values_[lil_idx].size());
+        for (std::size_t j = 0; j < row.size(); j++)
+            row[j] = scale_[lil_idx] * static_cast<VT>(values_[lil_idx][j]);
+        return row;
+    }
+
+    /**
+     *  @brief      returns the dequantized values.
+     */
+    std::vector< std::vector<VT> > get_all() const {
+        std::vector< std::vector<VT> > values(values_.size());
+        for (std::size_t i = 0; i < values_.size(); i++)
+            values[i] = get_row(i);
+        return values;
+    }
+
+    /**
+     *  @brief      quantized values, e. g. for the NUMA-aware placement.
+     */
+    std::vector< std::vector<QT> >& values() { return values_; }
+
+    // Container interface used by the generated clear() method
+    typename std::vector< std::vector<QT> >::iterator begin() { return values_.begin(); }
+    typename std::vector< std::vector<QT> >::iterator end() { return values_.end(); }
+
+    void clear() {
+        values_.clear();
+        scale_.clear();
+    }
+
+    void shrink_to_fit() {
+        values_.shrink_to_fit();
+        scale_.shrink_to_fit();
+    }
+
+    std::size_t size_in_bytes() const {
+        std::size_t size_in_bytes = sizeof(QuantizedMatrix<QT, VT>);
+        size_in_bytes += sizeof(std::vector<QT>) * values_.capacity();
+        for (auto it = values_.cbegin(); it != values_.cend(); it++)
+            size_in_bytes += it->capacity() * sizeof(QT);
+        size_in_bytes += scale_.capacity() * sizeof(VT);
+        return size_in_bytes;
+    }
+
+    /**
+     *  @brief      Stores or restores the quantized values (see Checkpoint.hpp).
+     */
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+        ar(values_);
+        ar(scale_);
+    }
+};
@@ -0,0 +1,187 @@
+/*
+ *    RingBuffer.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <cstddef>
+#include <vector>
+
+/**
+ *  @brief      Fixed-size queue of the past values of a population variable.
+ *  @details    Replaces a std::deque on which push_front() and pop_back() are called at each step:
+ *              the elements are allocated once and the most recent one is overwritten by the oldest.
+ *              The element accessed by operator[](0) is the most recent one, operator[](size()-1)
+ *              the oldest one, as for the deque.
+ */
+template<typename T>
+class RingBuffer {
+    std::vector<T> buffer_;
+    std::size_t head_;      ///< position of the most recent element in buffer_
+
+public:
+    RingBuffer() : head_(0) {}
+
+    /**
+     *  @brief      Creates a buffer of n copies of value.
+     */
+    RingBuffer(std::size_t n, const T& value) : buffer_(n, value), head_(0) {}
+
+    std::size_t size() const { return buffer_.size(); }
+
+    /**
+     *  @brief      Access to the element enqueued k steps ago (0 being the most recent).
+     */
+    inline T& operator[](std::size_t k) {
+        std::size_t idx = head_ + k;
+        return buffer_[idx < buffer_.size() ? idx : idx - buffer_.size()];
+    }
+
+    inline const T& operator[](std::size_t k) const {
+        std::size_t idx = head_ + k;
+        return buffer_[idx < buffer_.size() ? idx : idx - buffer_.size()];
+    }
+
+    /**
+     *  @brief      The oldest element becomes the most recent one and is returned, so that it can be overwritten.
+     */
+    inline T& advance() {
+        head_ = (head_ == 0) ? buffer_.size() - 1 : head_ - 1;
+        return buffer_[head_];
+    }
+
+    /**
+     *  @brief      Drops the oldest element and enqueues value, without allocation if T is a std::vector of the same size.
+     */
+    inline void push_front(const T& value) {
+        advance() = value;
+    }
+
+    /**
+     *  @brief      Changes the number of stored elements. The order is preserved, new (oldest) elements are copies of value.
+     */
+    void resize(std::size_t n, const T& value) {
+        std::vector<T> ordered;
+        ordered.reserve(n);
+        for (std::size_t k = 0; k < n; k++)
+            ordered.push_back(k < buffer_.size() ? (*this)[k] : value);
+        buffer_.swap(ordered);
+        head_ = 0;
+    }
+
+    /**
+     *  @brief      Stores or restores the buffer (see Checkpoint.hpp).
+     */
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+        ar(buffer_);
+        ar(head_);
+    }
+};
+
+/**
+ *  @brief      Circular buffer of the synaptic events of a spiking projection with non-uniform delays.
+ *  @details    Each of the max_delay slots stores the events which have to be processed at the same step
+ *              as two flat arrays holding the indices (i, j) of the synapse in the connectivity matrix,
+ *              e.g. the row (post-synaptic neuron) and column (pre-synaptic neuron) of a LIL matrix. The arrays of a slot are cleared after processing
+ *              but keep their capacity, so no memory is allocated once the largest number of events per
+ *              step has been reached.
+ */
+class EventRingBuffer {
+    std::vector< std::vector<int> > row_;
+    std::vector< std::vector<int> > column_;
+    int idx_;               ///< slot of the current step
+
+public:
+    EventRingBuffer() : idx_(0) {}
+
+    EventRingBuffer(int max_delay) : row_(max_delay), column_(max_delay), idx_(0) {}
+
+    int size() const { return static_cast<int>(row_.size()); }
+
+    /**
+     *  @brief      Stores the event of synapse (i, j) which has to be processed in d steps (0 being the current step).
+     */
+    inline void push(int d, int i, int j) {
+        int slot = idx_ + d;
+        if (slot >= size())
+            slot -= size();
+        row_[slot].push_back(i);
+        column_[slot].push_back(j);
+    }
+
+    /**
+     *  @brief      Number of events of the current step.
+     */
+    inline int num_events() const { return static_cast<int>(row_[idx_].size()); }
+
+    /**
+     *  @brief      Row index of the k-th event of the current step.
+     */
+    inline int row_index(int k) const { return row_[idx_][k]; }
+
+    /**
+     *  @brief      Column index of the k-th event of the current step.
+     */
+    inline int column_index(int k) const { return column_[idx_][k]; }
+
+    /**
+     *  @brief      Empties the slot of the current step and moves to the next one.
+     */
+    inline void advance() {
+        row_[idx_].clear();
+        column_[idx_].clear();
+        idx_ = (idx_ + 1 == size()) ? 0 : idx_ + 1;
+    }
+
+    /**
+     *  @brief      Increases the number of slots. The pending events keep their remaining delay.
+     */
+    void resize(int max_delay) {
+        if (max_delay <= size())
+            return;
+
+        int add_steps = max_delay - size();
+        row_.insert(row_.begin() + idx_, add_steps, std::vector<int>());
+        column_.insert(column_.begin() + idx_, add_steps, std::vector<int>());
+        idx_ += add_steps;
+    }
+
+    /**
+     *  @brief      Removes all pending events.
+     */
+    void clear() {
+        for (int slot = 0; slot < size(); slot++) {
+            row_[slot].clear();
+            column_[slot].clear();
+        }
+        idx_ = 0;
+    }
+
+    /**
+     *  @brief      Stores or restores the pending events (see Checkpoint.hpp).
+     */
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+        ar(row_);
+        ar(column_);
+        ar(idx_);
+    }
+};
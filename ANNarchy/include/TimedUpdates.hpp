@@ -0,0 +1,183 @@
+/*
+ *    TimedUpdates.hpp
+ *
+ *    This file is part of ANNarchy.
+ *
+ *    Copyright (C) 2024  Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>,
+ *    Julien Vitay <julien.vitay@gmail.com>
+ *
+ *    This program is free software: you can redistribute it and/or modify
+ *    it under the terms of the GNU General Public License as published by
+ *    the Free Software Foundation, either version 3 of the License, or
+ *    (at your option) any later version.
+ *
+ *    ANNarchy is distributed in the hope that it will be useful,
+ *    but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ *    GNU General Public License for more details.
+ *
+ *    You should have received a copy of the GNU General Public License
+ *    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+#pragma once
+
+#include <algorithm>
+#include <functional>
+#include <map>
+#include <vector>
+
+/**
+ *  @brief      Time-indexed buffer of updates of an attribute (see Schedule).
+ *  @details    The k-th update is applied when the time relative to the start of the schedule reaches
+ *              schedule_[k]. If a period is set, the relative time restarts at 0 after period_ steps,
+ *              allowing to cycle over the updates as for the TimedArray.
+ */
+class ScheduledUpdates {
+    std::vector<long int> schedule_;                    ///< steps relative to start_, sorted
+    std::vector<std::function<void()>> updates_;        ///< update applied at the corresponding step
+    long int period_;                                   ///< cycling period in steps, -1 if no cycling
+    long int start_;                                    ///< step at which the schedule (re-)started
+    long int last_t_;                                   ///< last step for which apply() was called
+
+public:
+    ScheduledUpdates(const long int start, const long int period):
+        period_(period), start_(start), last_t_(-1) {}
+
+    void add(const long int step, std::function<void()> update) {
+        auto pos = std::upper_bound(schedule_.begin(), schedule_.end(), step) - schedule_.begin();
+        schedule_.insert(schedule_.begin() + pos, step);
+        updates_.insert(updates_.begin() + pos, update);
+    }
+
+    void restart(const long int t) {
+        start_ = t;
+        last_t_ = -1;
+    }
+
+    inline void apply(const long int t) {
+        // apply() is called at the start of run() and after the increment of t
+        if (t == last_t_ || t < start_)
+            return;
+        last_t_ = t;
+
+        long int rel_t = t - start_;
+        if (period_ > 0)
+            rel_t %= period_;
+
+        auto it = std::lower_bound(schedule_.begin(), schedule_.end(), rel_t);
+        for (; it != schedule_.end() && *it == rel_t; it++)
+            updates_[it - schedule_.begin()]();
+    }
+
+    /**
+     *  @brief      Stores or restores the progress of the schedule (see Checkpoint.hpp), the updates are registered again by Python.
+     */
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+        ar(start_);
+        ar(last_t_);
+    }
+};
+
+/**
+ *  @brief      Attribute updates registered for a given simulation step (see set_every) and the
+ *              scheduled updates (see Schedule).
+ *  @details    The updates are applied by one thread once the internal time reached their step,
+ *              i. e. before the computations of this step start. Updates registered for the same
+ *              step are applied in the order of their registration.
+ *
+ *              The container is not modified during the parallel region: the applied updates are
+ *              only skipped by cursor_ and removed from the container at the next call to add().
+ */
+class TimedUpdates {
+    std::multimap<long int, std::function<void()>> updates_;
+    std::multimap<long int, std::function<void()>>::iterator cursor_;   ///< first update which was not applied yet
+    std::vector<ScheduledUpdates> schedules_;
+
+public:
+    TimedUpdates() {
+        cursor_ = updates_.end();
+    }
+
+    /**
+     *  @brief      registers an update which should be applied at the beginning of the given step. If schedule
+     *              is the index of a schedule, the step is relative to the start of this schedule.
+     */
+    void add(const int schedule, const long int step, std::function<void()> update) {
+        if (schedule >= 0) {
+            schedules_[schedule].add(step, update);
+            return;
+        }
+
+        // remove the already applied updates
+        updates_.erase(updates_.begin(), cursor_);
+
+        updates_.emplace(step, update);
+        cursor_ = updates_.begin();
+    }
+
+    /**
+     *  @brief      creates a new schedule starting at the given step, returns its index.
+     */
+    int add_schedule(const long int start, const long int period) {
+        schedules_.push_back(ScheduledUpdates(start, period));
+        return static_cast<int>(schedules_.size()) - 1;
+    }
+
+    /**
+     *  @brief      the time of the given schedule (all schedules if negative) restarts at step t.
+     */
+    void restart(const int schedule, const long int t) {
+        if (schedule >= 0) {
+            schedules_[schedule].restart(t);
+        } else {
+            for (auto it = schedules_.begin(); it != schedules_.end(); it++)
+                it->restart(t);
+        }
+    }
+
+    /**
+     *  @brief      applies all updates registered up to the given step (not thread-safe, to be called by one thread).
+     */
+    inline void apply(const long int t) {
+        while (cursor_ != updates_.end() && cursor_->first <= t) {
+            cursor_->second();
+            cursor_++;
+        }
+
+        for (auto it = schedules_.begin(); it != schedules_.end(); it++)
+            it->apply(t);
+    }
+
+    /**
+     *  @brief      removes all registered updates, the schedules are kept.
+     */
+    void clear() {
+        updates_.clear();
+        cursor_ = updates_.end();
+    }
+
+    /**
+     *  @brief      number of updates which were not applied yet.
+     */
+    std::size_t pending() {
+        return std::distance(cursor_, updates_.end());
+    }
+
+    /**
+     *  @brief      Stores or restores the progress of the schedules (see Checkpoint.hpp). The updates registered
+     *              by set_every() are not stored: they are relative to the time of the call and have to be registered
+     *              again after the state was restored.
+     */
+    template<typename Archive>
+    void serialize_state(Archive &ar) {
+        ar.check(schedules_.size());
+        if (!ar.good())
+            return;
+        for (auto it = schedules_.begin(); it != schedules_.end(); it++)
+            it->serialize_state(ar);
+    }
+};
+
+// global instance, defined in ANNarchy.cpp
+extern TimedUpdates timed_updates;
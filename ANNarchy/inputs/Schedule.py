@@ -0,0 +1,121 @@
+"""
+:copyright: Copyright 2013 - now, see AUTHORS.
+:license: GPLv2, see LICENSE for details.
+"""
+
+import numpy as np
+
+from ANNarchy.core.Population import Population
+from ANNarchy.core.PopulationView import PopulationView
+from ANNarchy.core.Projection import Projection
+from ANNarchy.core.Simulate import _attribute_update
+from ANNarchy.intern.NetworkManager import NetworkManager
+from ANNarchy.intern.ConfigManagement import get_global_config, _check_paradigm
+from ANNarchy.intern import Messages
+
+class Schedule :
+    """
+    Sets an attribute of a population, population view or projection to predefined values at predefined times.
+
+    Contrary to ``TimedArray``, which is a dedicated population providing inputs through its firing rate ``r``, ``Schedule`` can be applied to any parameter or variable of an existing object. The updates are registered once in the C++ core and applied at the beginning of the corresponding simulation steps, without returning to Python:
+
+    ```python
+    pop = ann.Population(100, neuron)
+
+    inputs = np.random.uniform(0.0, 1.0, (10, pop.size))
+    sched = ann.Schedule(pop, 'I', inputs, schedule=10., period=100.)
+
+    ann.compile()
+
+    ann.simulate(1000.)
+    ```
+
+    ``I`` takes the value ``inputs[0]`` during the first 10 ms, ``inputs[1]`` during the next 10 ms, etc. As for ``TimedArray``, ``schedule`` is either the interval between two values (default: every step) or a list of times, and ``period`` allows to cycle over the values (default: no cycling, the attribute keeps the last value).
+
+    Each value can be a single value or an array of the size of the attribute (see ``set_every``). For a ``PopulationView``, the values of local attributes are only set for the neurons of the view.
+
+    The times are relative to the compilation of the network, or to the creation of the schedule if the network is already compiled. The ``reset()`` method (as well as a global ``reset()``) restarts the schedule at the current time.
+
+    Only available for CPU simulations.
+
+    :param obj: population, population view or projection.
+    :param attribute: name of the parameter or variable.
+    :param values: list or array of values, the first axis corresponds to time.
+    :param schedule: either a single value or a list of time points where the values should be set. Default: every timestep.
+    :param period: time when the schedule restarts, allowing cycling over the values. Default: no cycling (-1.).
+    """
+
+    def __init__(self, obj:Population | PopulationView | Projection, attribute:str, values, schedule:float=0., period:float=-1., net_id:int=0) -> None:
+
+        if not _check_paradigm("openmp"):
+            Messages._error("Schedule: the attribute updates are only available for CPU simulations.")
+
+        if not isinstance(obj, (Population, PopulationView, Projection)):
+            Messages._error("Schedule: the object must be a Population, a PopulationView or a Projection.")
+
+        self.obj = obj
+        self.target = obj.population if isinstance(obj, PopulationView) else obj
+
+        if not attribute in self.target.attributes:
+            Messages._error("Schedule:", self.target.name, "has no attribute", attribute)
+
+        self.attribute = attribute
+        self.values = values
+        self.period = period
+        self.net_id = net_id
+
+        # Check the schedule
+        if isinstance(schedule, (int, float)):
+            if float(schedule) <= 0.0:
+                schedule = get_global_config('dt')
+
+            self.schedule = [ float(schedule*i) for i in range(len(values))]
+        else:
+            self.schedule = schedule
+
+        if len(self.schedule) > len(self.values):
+            Messages._error('Schedule: the length of the schedule parameter cannot exceed the number of values.')
+
+        if len(self.schedule) < len(self.values):
+            Messages._warning('Schedule: the length of the schedule parameter is smaller than the number of values (more data than time points). Make sure it is what you expect.')
+
+        # Index of the schedule in the C++ core
+        self._id = None
+
+        self.target._schedules.append(self)
+        if self.target.initialized:
+            self._instantiate(NetworkManager().cy_instance(net_id=net_id))
+
+    def _instantiate(self, cython_module):
+        """
+        Creates the schedule in the C++ core and registers the updates.
+        """
+        if self.target.cyInstance is None or not hasattr(self.target.cyInstance, "schedule_attribute"):
+            Messages._error("Schedule: the attributes of", self.target.name, "can not be updated by the C++ core.")
+
+        dt = get_global_config('dt')
+        period = int(round(self.period/dt)) if self.period > 0 else -1
+        self._id = cython_module.add_schedule(period)
+
+        for n, time in enumerate(self.schedule):
+            step = int(round(time/dt))
+            try:
+                if isinstance(self.obj, PopulationView) and self.attribute in self.target.neuron_type.description['local']:
+                    ctype = self.target._get_attribute_cpp_type(self.attribute)
+                    value = np.full(self.obj.size, self.values[n]) if np.ndim(self.values[n]) == 0 else np.array(self.values[n]).reshape(self.obj.size)
+                    self.target.cyInstance.schedule_attribute_ranks(self._id, step, self.attribute, self.obj.ranks, value, ctype)
+                else:
+                    locality, value, ctype = _attribute_update(self.target, self.attribute, self.values[n])
+                    self.target.cyInstance.schedule_attribute(self._id, step, self.attribute, locality, value, ctype)
+
+            except Exception as e:
+                Messages._debug(e)
+                Messages._error("Schedule: the value", n, "of", self.target.name + "." + self.attribute, "does not have the right size.")
+
+    def reset(self) -> None:
+        """
+        Restarts the schedule at the current time.
+        """
+        if self._id is None:
+            return
+        NetworkManager().cy_instance(net_id=self.net_id).restart_schedule(self._id)
@@ -148,6 +148,13 @@ class SpikeSourceArray(SpecificPopulation):
         this->recompute_spike_times();
 """ 
 
+        self._specific_template['serialize_additional'] = """
+ar(spike_times);
+ar(next_spike);
+ar(idx_next_spike);
+ar(_t);
+"""
+
         self._specific_template['reset_additional'] = """
         _t = 0;
         this->recompute_spike_times();
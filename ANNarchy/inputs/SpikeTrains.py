@@ -277,6 +277,11 @@ class HomogeneousCorrelatedSpikeTrains(SpecificPopulation):
         int get_period()
 """ % {'float_prec': get_global_config('precision')}
 
+        self._specific_template['serialize_additional'] = """
+ar(_t);
+ar(_block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -417,6 +422,11 @@ class HomogeneousCorrelatedSpikeTrains(SpecificPopulation):
         int get_period()
 """ % {'float_prec': get_global_config('precision')}
 
+        self._specific_template['serialize_additional'] = """
+ar(_t);
+ar(_block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -205,6 +205,11 @@ class TimedArray(SpecificPopulation):
         int get_period()
 """ % {'float_prec': get_global_config('precision')}
 
+        self._specific_template['serialize_additional'] = """
+ar(_t);
+ar(_block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -312,6 +317,11 @@ class TimedArray(SpecificPopulation):
         int get_period()
 """ % {'float_prec': get_global_config('precision')}
 
+        self._specific_template['serialize_additional'] = """
+ar(_t);
+ar(_block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -738,6 +748,11 @@ class TimedPoissonPopulation(SpecificPopulation):
         int get_period()
 """ % {'float_prec': get_global_config('precision')}
 
+        self._specific_template['serialize_additional'] = """
+ar(_t);
+ar(_block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -855,6 +870,11 @@ class TimedPoissonPopulation(SpecificPopulation):
         int get_period()
 """ % {'float_prec': get_global_config('precision')}
 
+        self._specific_template['serialize_additional'] = """
+ar(_t);
+ar(_block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -4,6 +4,7 @@ from .PoissonPopulation import PoissonPopulation
 from .SpikeSourceArray import SpikeSourceArray
 from .SpikeTrains import HomogeneousCorrelatedSpikeTrains
 from .TimedArray import TimedArray, TimedPoissonPopulation
+from .Schedule import Schedule
 
 # SpecificProjecion inheritances
 from .CurrentInjection import CurrentInjection
@@ -12,6 +13,6 @@ from .DecodingProjection import DecodingProjection
 __all__ = [
     'InputArray',
     'PoissonPopulation', 'SpikeSourceArray', 'TimedArray',
-    'HomogeneousCorrelatedSpikeTrains', 'TimedPoissonPopulation',
+    'HomogeneousCorrelatedSpikeTrains', 'TimedPoissonPopulation', 'Schedule',
     'DecodingProjection', 'CurrentInjection'
 ]
\ No newline at end of file
@@ -3,6 +3,7 @@
 :license: GPLv2, see LICENSE for details.
 """
 
+import os
 from typing import Union
 from numpy import random
 
@@ -39,6 +40,11 @@ class ConfigManager:
                 # Parallel processing
                 num_threads = 1,
                 visible_cores = [],
+                task_scheduler = False,
+                skip_inactive = False,
+                numa_placement = False,
+                counter_based_rng = False,
+                vectorized_rng = False,
                 paradigm = 'openmp',
                 # Logging
                 verbose = False,
@@ -60,6 +66,13 @@ class ConfigManager:
                 # Profiling
                 profiling = False,
                 profile_out = None,
+                # Compilation
+                compilation_cache = True,
+                compilation_cache_dir = None,
+                compilation_cache_size = 1024,
+                build_jobs = None,
+                compiler_launcher = None,
+                precompiled_headers = True,
                 # Other
                 debug = False,
                 disable_shared_library_time_offset = False
@@ -114,8 +127,19 @@ def setup(**keyValueArgs):
     * num_threads: number of treads used by openMP (overrides the environment variable ``OMP_NUM_THREADS`` when set, default = None).
     * visible_cores: allows a fine-grained control which cores are useable for the created threads (default = [] for no limitation).
                      It can be used to limit created openMP threads to a physical socket.
+    * task_scheduler: if True and num_threads > 1, each population/projection is updated by a single thread and independent objects are processed concurrently as OpenMP tasks ordered by their data dependencies, instead of sharing all objects between the threads separated by barriers (default: False).
+    * skip_inactive: if True, the transmission of projections whose presynaptic population is silent (all rates equal to zero, no spike emitted) and the update of populations of passive neurons which receive no input are skipped (default: False, CPUs only).
+    * numa_placement: if True and num_threads > 1, the data processed by each thread (neural variables, rows of LIL/LIL_P matrices) is moved to the memory node of this thread after the network is initialized, and the partitions of LIL_P matrices are initialized by the threads processing them (default: False, OpenMP only).
+    * counter_based_rng: if True, the random variables of the neuron and synapse equations, as well as the connectivity patterns created in C++, are drawn from a counter-based generator (Philox4x32-10) keyed by the seed, the object, the neuron or synapse index and the current step. The drawn values do not depend on the number of threads and are drawn in parallel (default: False, CPUs only).
+    * vectorized_rng: if True, the random variables of the neuron equations are drawn in blocks for all neurons: the uniform, normal, log-normal and exponential distributions are computed from blocks of 32-bit integers by vectorizable transformations (Box-Muller for the normal distributions). The drawn values differ from the default ones for the same seed. Ignored if counter_based_rng is True (default: False, CPUs only).
     * structural_plasticity: allows synapses to be dynamically added/removed during the simulation (default: False).
     * seed: the seed (integer) to be used in the random number generators (default = -1 is equivalent to time(NULL)).
+    * compilation_cache: if True (default), compiled libraries and analysed neuron/synapse descriptions are stored in a cache shared by all projects, so that identical networks are not compiled twice and unchanged models are not parsed again.
+    * compilation_cache_dir: location of the compilation cache (default: None, i.e. ``~/.cache/ANNarchy``).
+    * compilation_cache_size: maximal size of the compilation cache in MB (default: 1024). The least recently used libraries are removed first.
+    * build_jobs: number of parallel jobs used to compile the generated code (default: None, i.e. the number of available cores).
+    * compiler_launcher: command prefixed to the compiler calls, e.g. "ccache" (default: None).
+    * precompiled_headers: if True (default), the STL and the sparse matrix formats are precompiled once per compiler and compiler flags and stored in the compilation cache (GCC on linux only).
 
     The following parameters are mainly for debugging and profiling, and should be ignored by most users:
 
@@ -171,9 +195,10 @@ def _optimization_flags(**keyValueArgs):
     * use_seed_seq: If parallel RNGs are used the single generators need to be initialized. By default (use_seed_seq == True) we use
                     the STL seed sequence to generate a list of seeds from the given master seed (*seed* argument). If set to False,
                     we use an improved version of the sequence generator proposed by M.E. O'Neill (https://www.pcg-random.org/posts/simple-portable-cpp-seed-entropy.html)
-    * use_cpp_connectors:   For some of the default connectivity methods of ANNarchy we offer a CPP-side construction of the pattern to improve the
-                            initialization time (default=False). For maximum performance the disable_parallel_rng should be set to False to allow
-                            a parallel construction of the pattern.
+    * use_cpp_connectors:   For the default connectivity methods of ANNarchy we offer a CPP-side construction of the pattern to improve the
+                            initialization time (default=False). On CPUs, the patterns are created in parallel for all storage formats, the
+                            weights can be drawn from Uniform, Normal and LogNormal and the delays from Uniform, DiscreteUniform and Normal
+                            distributions. The deterministic patterns (constant weights and delays) are always created on the CPP side.
     * disable_split_matrix: determines if projections can use thread-local allocation. If set to *True* (default) no thread local allocation is allowed.
                             This equals the behavior of ANNarchy until 4.7. If set to *False* the code generator can use sliced versions if they
                             are available.
@@ -206,22 +231,10 @@ def _optimization_flags(**keyValueArgs):
         # Update global config
         _update_global_config(key, keyValueArgs[key])
 
-        # Warning: use_cpp_connectors and disable_parallel_rng should be both activated
         if key == "use_cpp_connectors":
             if get_global_config(key) == True:
                 Messages._warning("use_cpp_connectors is an experimental feature, we greatly appreciate bug reports.")
 
-                # check if the key is in the update list
-                if 'disable_parallel_rng' in keyValueArgs.keys():
-                    if keyValueArgs['disable_parallel_rng']:
-                        Messages._warning("If 'use_cpp_connectors' is enabled, the 'disable_parallel_rng' flag should be disabled for maximum efficiency.")
-                # is it enabled by default?
-                elif get_global_config('disable_parallel_rng'):
-                    Messages._warning("If 'use_cpp_connectors' is enabled, the 'disable_parallel_rng' flag should be disabled for maximum efficiency.")
-                # no conflict
-                else:
-                    pass
-
 #############################################
 # Globally available functions (internal)
 #############################################
@@ -240,6 +253,17 @@ def _update_global_config(key: str, value: Union[str,float,bool]) -> None:
     """
     return ConfigManager().set_value_by_key(key, value)
 
+def _cache_directory() -> str:
+    """
+    Returns the root directory of the caches shared by all projects, i. e. the value
+    of ``setup(compilation_cache_dir=...)`` or ``~/.cache/ANNarchy``.
+    """
+    cache_dir = get_global_config('compilation_cache_dir')
+    if cache_dir is None:
+        cache_dir = os.path.join(os.environ.get('XDG_CACHE_HOME', '~/.cache'), 'ANNarchy')
+
+    return os.path.abspath(os.path.expanduser(cache_dir))
+
 def _check_paradigm(paradigm):
     """
     Returns True when the provided paradigm is currently used.
@@ -5,7 +5,7 @@
 
 import time
 import csv
-import matplotlib.pylab as plt
+import json
 
 from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config, _check_paradigm
 from ANNarchy.intern import Messages
@@ -53,6 +53,7 @@ class Profiler :
         # initialize measurement
         self._basetime = time.time()
         self._entries = []
+        self._phases = []               # (phase, object, t_entry, t_escape), see add_phase()
         self._cpp_profiler = None       # set during Compiler._instantiate()
         self.add_entry( self._basetime, self._basetime, "initialized" )
 
@@ -79,6 +80,26 @@ class Profiler :
 
         self._entries.append( (t_entry, t_escape, label, group) )
 
+    def add_phase( self, t_entry, t_escape, phase, obj=None, group="compile" ):
+        """
+        Add a phase of compile() to the timeline and to the build report (see get_build_report()).
+
+        :param t_entry: entry time point of the phase
+        :param t_escape: escape time point of the phase
+        :param phase: name of the phase, e.g. "parse", "codegen", "compile", "link" or "instantiate"
+        :param obj: object concerned by the phase (population, projection or translation unit), None if the phase is global
+        *:param group: which group does the phase belong to (default="compile"). The phase is omitted in the label when it is the group.
+        """
+        self._phases.append( (phase, obj, t_entry, t_escape) )
+
+        if obj is None:
+            label = phase
+        elif phase == group:
+            label = obj
+        else:
+            label = phase + " " + obj
+        self.add_entry( t_entry, t_escape, label, group )
+
     def update_entry( self, t_entry, t_escape, label, group ):
         """
         The profile entries are a list of tuples. Therefore such an entry can
@@ -105,6 +126,7 @@ class Profiler :
         Clear all recorded time points.
         """
         self._entries.clear()
+        self._phases.clear()
 
     def print_profile(self):
         """
@@ -182,10 +204,53 @@ class Profiler :
                 measurement[label] = t_end
         return measurement
 
+    def get_build_report(self):
+        """
+        Returns the duration (in seconds) of each phase of compile() as a dictionary. Global phases
+        (e.g. "check_structure" or "link") are stored as a float, the other phases (e.g. "parse",
+        "codegen", "compile" or "instantiate") as a dictionary of the concerned objects:
+
+        ```python
+        {
+            'check_structure': 0.002,
+            'parse': {'pop0': 0.8, 'proj0': 0.3},
+            'codegen': {'pop0': 0.01, 'proj0': 0.02, 'ANNarchy': 0.01},
+            'cython': {'generate': 0.01, 'translate': 1.2},
+            'compile': {'pop0.cpp': 2.1, 'proj0.cpp': 3.4, 'ANNarchy.cpp': 2.5, 'ANNarchyCore0.cpp': 6.0},
+            'link': 0.2,
+            'instantiate': {'pop0': 0.001, 'proj0': 0.005},
+        }
+        ```
+
+        Phases which were skipped (e.g. the compilation of a cached library) are not reported.
+        """
+        report = {}
+        for phase, obj, t_start, t_end in self._phases:
+            if obj is None:
+                report[phase] = report.get(phase, 0.0) + (t_end - t_start)
+            else:
+                durations = report.setdefault(phase, {})
+                durations[obj] = durations.get(obj, 0.0) + (t_end - t_start)
+        return report
+
+    def store_build_report(self, filename=None):
+        """
+        Store the build report (see get_build_report()) as a .json file.
+
+        :param filename: path of the file (default: build_report.json in the profile_out folder).
+        """
+        if filename is None:
+            filename = get_global_config('profile_out') + '/build_report.json'
+
+        with open(filename, 'w') as wfile:
+            json.dump(self.get_build_report(), wfile, indent=4)
+
     def show_timeline(self, store_graph=False):
         """
         Visualize the timeline.
         """
+        import matplotlib.pylab as plt
+
         f, ax = plt.subplots()
 
         scale_param = 1.0 # origin data is in second
@@ -98,6 +98,12 @@ def analyse_synapse(synapse):
     parameters = extract_parameters(synapse.parameters, synapse.extra_values)
     variables = extract_variables(synapse.equations)
 
+    # Attributes declared with the flag float are stored in single precision
+    # (mixed-precision), the computations use the global precision
+    for var in parameters + variables:
+        if 'float' in var['flags'] and var['ctype'] == 'double':
+            var['ctype'] = 'float'
+
     # Extract functions
     functions = extract_functions(synapse.functions, False)
 
@@ -0,0 +1,157 @@
+"""
+Persistent cache of the analysed neuron and synapse descriptions.
+
+Analysing a model (sympy parsing, ODE standardisation, C++ code generation of the equations) is
+by far the most expensive step before code generation. As the result only depends on the model
+definition and a few global settings, it is stored on disk and reused by subsequent runs.
+
+:copyright: Copyright 2013 - now, see AUTHORS.
+:license: GPLv2, see LICENSE for details.
+"""
+
+import os
+import pickle
+import hashlib
+import tempfile
+
+import ANNarchy
+from ANNarchy.intern.ConfigManagement import get_global_config, _cache_directory
+from ANNarchy.intern.GlobalObjects import GlobalObjectManager
+from ANNarchy.intern import Messages
+
+# Attributes of Neuron/Synapse objects which are read by analyse_neuron()/analyse_synapse()
+_model_attributes = [
+    'type', 'parameters', 'equations', 'functions', 'extra_values',
+    # Neuron
+    'spike', 'axon_spike', 'reset', 'axon_reset', 'refractory',
+    # Synapse
+    'psp', 'operation', 'pre_spike', 'post_spike', 'pre_axon_spike', 'pruning', 'creating',
+]
+
+# Hash of the parser sources, computed once per process
+_parser_digest = None
+
+class _ConstantReference:
+    """
+    Placeholder for a ``Constant`` used as initial value. Constants can not be pickled (they derive
+    from float and require a name), and the live object must be used after loading anyway.
+    """
+    def __init__(self, name):
+        self.name = name
+
+def _description_directory():
+    "Sub-folder of the cache holding the descriptions."
+    return os.path.join(_cache_directory(), 'descriptions')
+
+def _parser_sources_digest():
+    """
+    Returns the hash of the parser sources, so that the cache is invalidated by any change of the parser.
+    """
+    global _parser_digest
+    if _parser_digest is None:
+        digest = hashlib.sha256()
+        digest.update(ANNarchy.__release__.encode('UTF-8'))
+        parser_dir = os.path.dirname(os.path.abspath(__file__))
+        sources = [os.path.join(parser_dir, f) for f in sorted(os.listdir(parser_dir)) if f.endswith('.py')]
+        sources.append(os.path.join(os.path.dirname(parser_dir), 'core', 'Random.py'))
+        for filename in sources:
+            with open(filename, 'rb') as rfile:
+                digest.update(rfile.read())
+        _parser_digest = digest.hexdigest()
+
+    return _parser_digest
+
+def compute_key(model):
+    """
+    Computes the key of a Neuron/Synapse description. The key is a hash over:
+
+    * the class of the model and its definition (equations, parameters, functions, ...),
+    * the numerical method and the floating point precision,
+    * the global constants and functions,
+    * the ANNarchy release and the parser sources.
+    """
+    digest = hashlib.sha256()
+    digest.update(_parser_sources_digest().encode('UTF-8'))
+    digest.update(type(model).__module__.encode('UTF-8'))
+    digest.update(type(model).__qualname__.encode('UTF-8'))
+    for attribute in _model_attributes:
+        digest.update((attribute + '=' + repr(getattr(model, attribute, None)) + ';').encode('UTF-8'))
+
+    for key in ['precision', 'method', 'paradigm']:
+        digest.update(str(get_global_config(key)).encode('UTF-8'))
+    digest.update(repr(GlobalObjectManager().list_constants()).encode('UTF-8'))
+    digest.update(repr(GlobalObjectManager().get_functions()).encode('UTF-8'))
+
+    return digest.hexdigest()
+
+def _replace(obj, func):
+    "Applies *func* to all leaves of the nested dictionaries/lists/tuples in *obj*."
+    if isinstance(obj, dict):
+        return {key: _replace(value, func) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_replace(value, func) for value in obj]
+    if isinstance(obj, tuple):
+        return tuple(_replace(value, func) for value in obj)
+    return func(obj)
+
+def _to_reference(obj):
+    from ANNarchy.core.Constant import Constant
+    return _ConstantReference(obj.name) if isinstance(obj, Constant) else obj
+
+def _from_reference(obj):
+    if isinstance(obj, _ConstantReference):
+        constant = GlobalObjectManager().get_constant(obj.name)
+        if constant is None:
+            raise KeyError(obj.name)
+        return constant
+    return obj
+
+def load(key):
+    """
+    Returns the description stored under *key*, or None if it is not in the cache.
+    """
+    filename = os.path.join(_description_directory(), key + '.pickle')
+    try:
+        with open(filename, 'rb') as rfile:
+            description = pickle.load(rfile)
+        return _replace(description, _from_reference)
+    except Exception: # missing or unreadable entry
+        return None
+
+def store(key, description):
+    """
+    Stores the description under *key*. Descriptions which can not be pickled (e.g. because of
+    user-defined objects in ``extra_values``) are silently not cached.
+    """
+    desc_dir = _description_directory()
+    try:
+        data = pickle.dumps(_replace(description, _to_reference), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return
+
+    try:
+        os.makedirs(desc_dir, exist_ok=True)
+        # Write into a temporary file and rename it to avoid partial reads by concurrent processes
+        fd, tmp_name = tempfile.mkstemp(dir=desc_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as wfile:
+            wfile.write(data)
+        os.replace(tmp_name, os.path.join(desc_dir, key + '.pickle'))
+    except OSError as e:
+        if get_global_config('verbose'):
+            Messages._warning('Unable to store the model description in the cache:', e)
+
+def analyse(model, analyse_function):
+    """
+    Returns the description of *model* (Neuron or Synapse), either from the cache or by calling
+    *analyse_function* (``analyse_neuron()`` or ``analyse_synapse()``).
+    """
+    if not get_global_config('compilation_cache'):
+        return analyse_function(model)
+
+    key = compute_key(model)
+    description = load(key)
+    if description is None:
+        description = analyse_function(model)
+        store(key, description)
+
+    return description
@@ -1,2 +1,9 @@
-from .AnalyseNeuron import analyse_neuron
-from .AnalyseSynapse import analyse_synapse
+# The analysers depend on sympy, which is only imported when a model is analysed for the first time.
+def __getattr__(name):
+    if name == 'analyse_neuron':
+        from .AnalyseNeuron import analyse_neuron
+        return analyse_neuron
+    if name == 'analyse_synapse':
+        from .AnalyseSynapse import analyse_synapse
+        return analyse_synapse
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
@@ -1,5 +1,21 @@
 import unittest
+from .test_ActivitySkipping import test_ActivitySkipping
+from .test_AsynchronousCompile import test_AsynchronousCompile
+from .test_BatchedNetwork import test_BatchedNetwork
+from .test_BuildReport import test_BuildReport
+from .test_Checkpoint import test_Checkpoint
+from .test_CompilationCache import test_CompilationCache
+from .test_CounterBasedRNG import test_CounterBasedRNG
+from .test_DescriptionCache import test_DescriptionCache
+from .test_ImportTime import test_ImportTime
 from .test_IO import test_IO_Rate, test_IO_Spiking
+from .test_NUMAPlacement import test_NUMAPlacement
+from .test_Optimize import test_Optimize
+from .test_ParallelConnectors import test_ParallelConnectors
 from .test_Record import test_Record
 from .test_Report import test_Report_Rate, test_Report_Spiking
+from .test_Schedule import test_Schedule
+from .test_TaskScheduler import test_TaskScheduler
 from .test_TimedArray import test_TimedArray, test_TimedArrayUpdate
+from .test_TimedUpdates import test_TimedUpdates
+from .test_VectorizedRNG import test_VectorizedRNG
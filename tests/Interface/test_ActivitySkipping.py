@@ -0,0 +1,119 @@
+"""
+
+    test_ActivitySkipping.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, Neuron, Network, Projection, Population, SpikeSourceArray
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+input_neuron = Neuron(
+    parameters="baseline = 0.0",
+    equations="r = baseline"
+)
+
+relay_neuron = Neuron(
+    equations="r = sum(exc)",
+    passive=True
+)
+
+counting_neuron = Neuron(
+    equations="v += g_exc",
+    spike="v > 1000.0",
+    reset="v = 0.0",
+    passive=True
+)
+
+class test_ActivitySkipping(unittest.TestCase):
+    """
+    Test the activity-based skipping of silent projections and passive populations
+    (setup(skip_inactive=True)).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile a rate-coded chain of relay neurons and a spiking counter.
+        """
+        cls.prev_skip_inactive = get_global_config('skip_inactive')
+        _update_global_config('skip_inactive', True)
+
+        inp = Population(3, input_neuron)
+        relay = Population(2, relay_neuron)
+        out = Population(1, relay_neuron)
+        proj1 = Projection(inp, relay, "exc")
+        proj1.connect_all_to_all(1.0)
+        proj2 = Projection(relay, out, "exc")
+        proj2.connect_all_to_all(1.0)
+
+        src = SpikeSourceArray(spike_times=[[2.0], [2.0, 5.0]])
+        counter = Population(2, counting_neuron)
+        proj3 = Projection(src, counter, "exc")
+        proj3.connect_all_to_all(1.0)
+
+        cls.test_net = Network()
+        cls.test_net.add([inp, relay, out, proj1, proj2, src, counter, proj3])
+        cls.test_net.compile(silent=True)
+
+        cls.net_inp = cls.test_net.get(inp)
+        cls.net_relay = cls.test_net.get(relay)
+        cls.net_out = cls.test_net.get(out)
+        cls.net_counter = cls.test_net.get(counter)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        _update_global_config('skip_inactive', cls.prev_skip_inactive)
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the
+        network after every test.
+        """
+        self.test_net.reset()
+
+    def test_rate_relay(self):
+        """
+        The relay neurons follow their inputs when they start and stop.
+        """
+        self.test_net.simulate(5)
+        numpy.testing.assert_allclose(self.net_out.r, [0.0])
+
+        self.net_inp.baseline = 1.0
+        self.test_net.simulate(3)
+        numpy.testing.assert_allclose(self.net_relay.r, [3.0, 3.0])
+        numpy.testing.assert_allclose(self.net_out.r, [6.0])
+
+        self.net_inp.baseline = 0.0
+        self.test_net.simulate(1)
+        numpy.testing.assert_allclose(self.net_relay.r, [3.0, 3.0])
+        self.test_net.simulate(5)
+        numpy.testing.assert_allclose(self.net_relay.r, [0.0, 0.0])
+        numpy.testing.assert_allclose(self.net_out.r, [0.0])
+
+    def test_spiking_counter(self):
+        """
+        The passive neurons integrate all incoming spikes.
+        """
+        self.test_net.simulate(10)
+        numpy.testing.assert_allclose(self.net_counter.v, [3.0, 3.0])
@@ -0,0 +1,76 @@
+"""
+
+    test_AsynchronousCompile.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import unittest
+import numpy
+
+from ANNarchy import clear, Monitor, Neuron, Network, Population
+
+neuron = Neuron(
+    equations="r = t"
+)
+
+pop1 = Population(3, neuron)
+m = Monitor(pop1, 'r')
+
+class test_AsynchronousCompile(unittest.TestCase):
+    """
+    This class tests the compilation of a network in the background with
+    *compile(asynchronous=True)*.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Start the compilation of the network for this test, without waiting for it.
+        """
+        cwd = os.getcwd()
+        cls.test_net = Network()
+        cls.test_net.add([pop1, m])
+        cls.handle = cls.test_net.compile(silent=True, asynchronous=True)
+        cls.cwd_unchanged = (cwd == os.getcwd())
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        del cls.test_net
+        clear()
+
+    def test_handle(self):
+        """
+        The handle reports the end of the compilation and gives access to the build log.
+        """
+        self.assertTrue(self.cwd_unchanged)
+        self.assertTrue(self.handle.wait())
+        self.assertTrue(self.handle.done())
+        self.assertIsInstance(self.handle.log, str)
+
+    def test_simulate(self):
+        """
+        *simulate()* waits for the compilation and instantiates the network.
+        """
+        self.test_net.reset()
+        self.test_net.simulate(5)
+        numpy.testing.assert_allclose(self.test_net.get(m).get('r')[:, 0], [0.0, 1.0, 2.0, 3.0, 4.0])
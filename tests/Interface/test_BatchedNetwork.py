@@ -0,0 +1,109 @@
+"""
+
+    test_BatchedNetwork.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, Monitor, Neuron, Network, Projection, Population
+from ANNarchy.intern.Messages import ANNarchyException
+
+input_neuron = Neuron(
+    parameters="baseline = 0.0",
+    equations="r = baseline"
+)
+
+output_neuron = Neuron(
+    equations="r = sum(exc)"
+)
+
+class test_BatchedNetwork(unittest.TestCase):
+    """
+    Test the simulation of several instances of a network in a single library (Network(batch=...)).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile a network with four instances of two populations connected all-to-all.
+        """
+        pop1 = Population(3, input_neuron)
+        pop2 = Population(2, output_neuron)
+        proj = Projection(pop1, pop2, "exc")
+        proj.connect_all_to_all(1.0, force_multiple_weights=True)
+        m = Monitor(pop2, 'r')
+
+        cls.test_net = Network(batch=4)
+        cls.test_net.add([pop1, pop2, proj, m])
+        cls.test_net.compile(silent=True)
+
+        cls.net_pop1 = cls.test_net.get(pop1)
+        cls.net_pop2 = cls.test_net.get(pop2)
+        cls.net_proj = cls.test_net.get(proj)
+        cls.net_m = cls.test_net.get(m)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the
+        network after every test.
+        """
+        self.test_net.reset()
+
+    def test_geometry(self):
+        """
+        The populations gain a leading batch dimension and the connectivity is replicated.
+        """
+        self.assertEqual(self.net_pop1.geometry, (4, 3))
+        self.assertEqual(self.net_pop2.r.shape, (4, 2))
+        self.assertEqual(self.net_proj.nb_synapses, 4 * 6)
+        self.assertEqual(self.net_proj.dendrite(5).pre_ranks, [6, 7, 8])
+
+    def test_independent_instances(self):
+        """
+        Each instance only receives inputs from its own pre-synaptic population.
+        """
+        self.net_pop1.baseline = numpy.repeat([1.0, 2.0, 3.0, 4.0], 3)
+        self.test_net.simulate(2)
+
+        numpy.testing.assert_allclose(self.net_pop2.r, [[3.0, 3.0], [6.0, 6.0], [9.0, 9.0], [12.0, 12.0]])
+
+        data = self.net_m.get('r')
+        self.assertEqual(data.shape, (2, 4, 2))
+        numpy.testing.assert_allclose(data[-1], self.net_pop2.r)
+
+    def test_global_variables(self):
+        """
+        Models with global variables can not be batched.
+        """
+        pop = Population(1, Neuron(equations="""
+            x = t : population
+            r = x
+        """))
+        with self.assertRaises(ANNarchyException):
+            Network(batch=2).add(pop)
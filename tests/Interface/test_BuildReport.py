@@ -0,0 +1,88 @@
+"""
+
+    test_BuildReport.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import json
+import os
+import tempfile
+import unittest
+from shutil import rmtree
+
+from ANNarchy import clear, Network, Neuron, Population, Projection
+from ANNarchy.intern.ConfigManagement import _update_global_config
+from ANNarchy.intern.Profiler import Profiler
+
+neuron = Neuron(
+    parameters="tau = 10.0",
+    equations="tau * dr/dt + r = sum(exc)"
+)
+
+pop1 = Population(5, neuron)
+proj = Projection(pop1, pop1, 'exc')
+proj.connect_all_to_all(weights=0.1)
+
+class test_BuildReport(unittest.TestCase):
+    """
+    This class tests the duration of the phases of *compile()* reported by
+    the Profiler when profiling is enabled.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test with profiling enabled.
+        """
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.test_net = Network()
+        cls.test_net.add([pop1, proj])
+        cls.test_net.compile(silent=True, profile_enabled=True)
+        _update_global_config('profile_out', cls.tmp_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network and disable profiling.
+        """
+        del cls.test_net
+        clear()
+        rmtree(cls.tmp_dir)
+
+    def test_report(self):
+        """
+        All phases are reported, per object where applicable.
+        """
+        report = Profiler().get_build_report()
+
+        for phase in ['check_structure', 'link']:
+            self.assertIsInstance(report[phase], float)
+        for phase in ['codegen', 'instantiate']:
+            self.assertTrue({pop1.name, proj.name} <= set(report[phase].keys()))
+        self.assertEqual(set(report['cython'].keys()), {'generate', 'translate'})
+        self.assertTrue({pop1.name + '.cpp', proj.name + '.cpp'} <= set(report['compile'].keys()))
+
+    def test_store(self):
+        """
+        The report is stored as a .json file.
+        """
+        filename = os.path.join(self.tmp_dir, 'report.json')
+        Profiler().store_build_report(filename)
+        with open(filename, 'r') as rfile:
+            self.assertEqual(json.load(rfile), Profiler().get_build_report())
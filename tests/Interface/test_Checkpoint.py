@@ -0,0 +1,163 @@
+"""
+
+    test_Checkpoint.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import io
+import os
+import pickle
+from shutil import rmtree
+import unittest
+from unittest.mock import patch
+import numpy
+
+from ANNarchy import clear, Izhikevich, Monitor, Network, Neuron, \
+    PoissonPopulation, Population, Projection, SpikeSourceArray, TimedArray, \
+    Uniform
+from ANNarchy.intern.Messages import ANNarchyException
+
+noisy_neuron = Neuron(
+    parameters="tau = 10.0",
+    equations="tau * dr/dt + r = sum(exc) + Uniform(0.0, 1.0)"
+)
+
+class test_Checkpoint(unittest.TestCase):
+    """
+    Test the checkpointing of the complete simulation state: a restored
+    simulation must continue exactly as the original one (random numbers,
+    delayed outputs, refractory periods, inputs and recordings).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        rate1 = Population(10, noisy_neuron)
+        rate2 = Population(10, noisy_neuron)
+        spiking = Population(10, Izhikevich)
+        spiking.refractory = 2.0
+        timed = TimedArray(rates=numpy.random.random((5, 10)), schedule=3.0)
+        sources = SpikeSourceArray([[1.0, 2.0, 30.0, 45.0]]*10)
+        poisson = PoissonPopulation(10, rates=100.0)
+
+        proj1 = Projection(rate1, rate2, 'exc')
+        proj1.connect_all_to_all(0.1, delays=Uniform(1.0, 3.0))
+        proj2 = Projection(poisson, spiking, 'exc')
+        proj2.connect_all_to_all(5.0, delays=2.0)
+        proj3 = Projection(timed, rate2, 'exc')
+        proj3.connect_one_to_one(1.0, delays=2.0)
+        proj4 = Projection(sources, spiking, 'exc')
+        proj4.connect_one_to_one(10.0)
+
+        m_rate = Monitor(rate2, 'r')
+        m_spike = Monitor(spiking, ['v', 'spike'])
+
+        cls.test_net = Network()
+        cls.test_net.add([rate1, rate2, spiking, timed, sources, poisson,
+                          proj1, proj2, proj3, proj4, m_rate, m_spike])
+        cls.test_net.compile(silent=True)
+
+        cls.net_m_rate = cls.test_net.get(m_rate)
+        cls.net_m_spike = cls.test_net.get(m_spike)
+
+        cls.savefolder = '_checkpoint/'
+        os.mkdir(cls.savefolder)
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Delete the save folder and the network after all tests were run. """
+        rmtree(cls.savefolder)
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """ Reset the network and empty the monitors before every test. """
+        self.test_net.reset()
+        self.net_m_rate.get()
+        self.net_m_spike.get()
+
+    def get_recordings(self):
+        return self.net_m_rate.get('r'), self.net_m_spike.get('v'), \
+            self.net_m_spike.get('spike')
+
+    def test_restore(self):
+        """
+        The simulation restored from a checkpoint is identical to the original one.
+        """
+        filename = self.savefolder + "net.data"
+
+        self.test_net.simulate(20.0)
+        with patch('sys.stdout', new=io.StringIO()): # suppress print
+            self.test_net.checkpoint(filename)
+        self.test_net.simulate(40.0)
+        r, v, spikes = self.get_recordings()
+
+        # Modify the state before restoring it
+        self.test_net.simulate(13.0)
+        self.test_net.restore(filename)
+        self.assertEqual(self.test_net.get_current_step(), 20)
+
+        self.test_net.simulate(40.0)
+        r_restored, v_restored, spikes_restored = self.get_recordings()
+
+        self.assertEqual(r_restored.shape, (60, 10))
+        numpy.testing.assert_array_equal(r_restored, r)
+        numpy.testing.assert_array_equal(v_restored, v)
+        self.assertEqual(spikes_restored, spikes)
+        self.assertGreater(sum(len(t) for t in spikes.values()), 0)
+
+    def test_restore_compressed(self):
+        """
+        The checkpoint can be compressed.
+        """
+        filename = self.savefolder + "net.data.gz"
+
+        self.test_net.simulate(10.0)
+        with patch('sys.stdout', new=io.StringIO()): # suppress print
+            self.test_net.checkpoint(filename)
+        self.test_net.simulate(10.0)
+        r, v, _ = self.get_recordings()
+
+        self.test_net.restore(filename)
+        self.test_net.simulate(10.0)
+        r_restored, v_restored, _ = self.get_recordings()
+
+        numpy.testing.assert_array_equal(r_restored, r)
+        numpy.testing.assert_array_equal(v_restored, v)
+
+    def test_invalid_checkpoint(self):
+        """
+        A corrupted checkpoint or a file created by save() are rejected.
+        """
+        filename = self.savefolder + "invalid.data"
+
+        with patch('sys.stdout', new=io.StringIO()): # suppress print
+            self.test_net.checkpoint(filename)
+        with open(filename, 'rb') as f:
+            data = pickle.load(f)
+        data['state'] = data['state'][:len(data['state'])//2]
+        with open(filename, 'wb') as f:
+            pickle.dump(data, f)
+
+        with self.assertRaises(ANNarchyException):
+            self.test_net.restore(filename)
+
+        with patch('sys.stdout', new=io.StringIO()): # suppress print
+            self.test_net.save(filename)
+        with self.assertRaises(ANNarchyException):
+            self.test_net.restore(filename)
@@ -0,0 +1,129 @@
+"""
+
+    test_CompilationCache.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import tempfile
+import unittest
+from shutil import rmtree
+
+from ANNarchy import clear_compile_cache
+from ANNarchy.generator import CompilationCache
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+class test_CompilationCache(unittest.TestCase):
+    """
+    Test the storage, lookup and eviction of compiled libraries in the
+    compilation cache.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Redirect the cache into a temporary folder and create a fake
+        folder of generated code.
+        """
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.prev_cache_dir = get_global_config('compilation_cache_dir')
+        cls.prev_cache_size = get_global_config('compilation_cache_size')
+        _update_global_config('compilation_cache_dir', cls.tmp_dir + '/cache')
+
+        cls.source_dir = cls.tmp_dir + '/generate'
+        os.mkdir(cls.source_dir)
+        with open(cls.source_dir + '/ANNarchy.cpp', 'w') as wfile:
+            wfile.write("int main() { return 0; }")
+        with open(cls.source_dir + '/Makefile', 'w') as wfile:
+            wfile.write("all:\n")
+
+        cls.library = cls.tmp_dir + '/ANNarchyCore0.so'
+        with open(cls.library, 'wb') as wfile:
+            wfile.write(b'\0' * 600 * 1024)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Restore the previous configuration.
+        """
+        _update_global_config('compilation_cache_dir', cls.prev_cache_dir)
+        _update_global_config('compilation_cache_size', cls.prev_cache_size)
+        rmtree(cls.tmp_dir)
+
+    def setUp(self):
+        """
+        Start each test with an empty cache.
+        """
+        _update_global_config('compilation_cache_size', self.prev_cache_size)
+        clear_compile_cache()
+
+    def test_key_depends_on_sources(self):
+        """
+        The key is stable for identical sources and changes with the sources.
+        """
+        key = CompilationCache.compute_cache_key(self.source_dir, "g++")
+        self.assertEqual(key, CompilationCache.compute_cache_key(self.source_dir, "g++"))
+
+        with open(self.source_dir + '/pop0.hpp', 'w') as wfile:
+            wfile.write("#pragma once")
+        self.assertNotEqual(key, CompilationCache.compute_cache_key(self.source_dir, "g++"))
+        os.remove(self.source_dir + '/pop0.hpp')
+
+    def test_store_and_lookup(self):
+        """
+        A stored library can be retrieved under the same key only.
+        """
+        key = CompilationCache.compute_cache_key(self.source_dir, "g++")
+        target = self.tmp_dir + '/copy.so'
+
+        self.assertFalse(CompilationCache.lookup(key, target))
+        CompilationCache.store(key, self.library)
+        self.assertTrue(CompilationCache.lookup(key, target))
+        self.assertEqual(os.path.getsize(target), 600 * 1024)
+        self.assertFalse(CompilationCache.lookup('0'*64, target))
+
+        clear_compile_cache()
+        self.assertFalse(CompilationCache.lookup(key, target))
+
+    def test_eviction(self):
+        """
+        The least recently used entries are removed if the cache is too large.
+        """
+        # 1 MB can hold only one of the libraries (600 kB each)
+        _update_global_config('compilation_cache_size', 1)
+        CompilationCache.store('a'*64, self.library)
+        os.utime(CompilationCache._library_directory() + '/' + 'a'*64 + '.so', (0, 0))
+        CompilationCache.store('b'*64, self.library)
+
+        self.assertEqual(os.listdir(CompilationCache._library_directory()), ['b'*64 + '.so'])
+
+    def test_precompiled_header(self):
+        """
+        The precompiled header is stored per compiler flags and removed with the cache.
+        """
+        if not CompilationCache._is_gcc("g++"):
+            self.skipTest("precompiled headers are only used with GCC")
+
+        pch = CompilationCache.precompiled_header("g++", "-O2")
+        self.assertTrue(pch.startswith(CompilationCache._pch_directory()))
+        self.assertTrue(pch.endswith('ANNarchyPCH.hpp.gch'))
+        self.assertTrue(os.path.isfile(pch[:-4]))
+
+        self.assertEqual(pch, CompilationCache.precompiled_header("g++", "-O2"))
+        self.assertNotEqual(pch, CompilationCache.precompiled_header("g++", "-O3"))
+
+        clear_compile_cache()
+        self.assertFalse(os.path.isdir(CompilationCache._pch_directory()))
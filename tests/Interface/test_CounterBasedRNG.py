@@ -0,0 +1,132 @@
+"""
+
+    test_CounterBasedRNG.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import Monitor, Network, Neuron, Population, Projection, Synapse
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+noisy_neuron = Neuron(
+    equations="""
+        noise = Uniform(0.0, 1.0)
+        r = Normal(0.0, 1.0)
+        g = Uniform(0.0, 1.0) : population
+    """
+)
+
+noisy_synapse = Synapse(
+    equations="x = Uniform(0.0, 1.0)"
+)
+
+class test_CounterBasedRNG(unittest.TestCase):
+    """
+    The values drawn by the counter-based generators
+    (setup(counter_based_rng=True)) only depend on the seed, the random
+    variable, the neuron or synapse and the simulation step.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        cls.prev_counter_based_rng = get_global_config('counter_based_rng')
+        _update_global_config('counter_based_rng', True)
+
+        pop = Population(100, noisy_neuron)
+        proj = Projection(pop, pop, 'exc', noisy_synapse)
+        proj.connect_fixed_probability(0.1, 1.0)
+
+        m = Monitor(pop, ['noise', 'r', 'g'])
+
+        cls.test_net = Network()
+        cls.test_net.add([pop, proj, m])
+        cls.test_net.compile(silent=True)
+
+        cls.net_pop = cls.test_net.get(pop)
+        cls.net_proj = cls.test_net.get(proj)
+        cls.net_m = cls.test_net.get(m)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        _update_global_config('counter_based_rng', cls.prev_counter_based_rng)
+        del cls.test_net
+
+    def setUp(self):
+        """
+        Restore the initial state and the seed before each test.
+        """
+        self.test_net.reset()
+        self.test_net.set_current_step(0)
+        self.test_net.set_seed(42)
+        self.net_m.get()
+
+    def simulate_steps(self, nb_steps):
+        "Simulates *nb_steps* steps and returns the recordings and the synaptic values."
+        self.test_net.simulate(nb_steps)
+        data = self.net_m.get()
+        data['x'] = numpy.concatenate(self.net_proj.x)
+        return data
+
+    def test_distributions(self):
+        """
+        The drawn values follow the requested distributions and differ between
+        neurons and steps.
+        """
+        data = self.simulate_steps(20)
+
+        self.assertTrue(numpy.all(data['noise'] >= 0.0))
+        self.assertTrue(numpy.all(data['noise'] < 1.0))
+        self.assertAlmostEqual(numpy.mean(data['noise']), 0.5, delta=0.05)
+        self.assertAlmostEqual(numpy.mean(data['r']), 0.0, delta=0.1)
+        self.assertAlmostEqual(numpy.std(data['r']), 1.0, delta=0.1)
+
+        self.assertGreater(len(numpy.unique(data['noise'])), 1900)
+        self.assertGreater(len(numpy.unique(data['g'])), 15)
+        self.assertGreater(len(numpy.unique(data['x'])), 0.9 * len(data['x']))
+
+    def test_replay(self):
+        """
+        Simulating again the same steps draws the same values, although the
+        generators were used in between.
+        """
+        first = self.simulate_steps(10)
+
+        self.test_net.set_current_step(0)
+        second = self.simulate_steps(10)
+
+        for var in ['noise', 'r', 'g', 'x']:
+            numpy.testing.assert_allclose(first[var], second[var])
+
+    def test_seed(self):
+        """
+        Another seed draws other values.
+        """
+        first = self.simulate_steps(10)
+
+        self.test_net.set_current_step(0)
+        self.test_net.set_seed(43)
+        second = self.simulate_steps(10)
+
+        self.assertFalse(numpy.allclose(first['noise'], second['noise']))
+        self.assertFalse(numpy.allclose(first['x'], second['x']))
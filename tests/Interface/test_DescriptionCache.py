@@ -0,0 +1,88 @@
+"""
+
+    test_DescriptionCache.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import tempfile
+import unittest
+from shutil import rmtree
+
+from ANNarchy import clear_compile_cache, Constant, Neuron
+from ANNarchy.parser import DescriptionCache
+from ANNarchy.parser.AnalyseNeuron import analyse_neuron
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+class test_DescriptionCache(unittest.TestCase):
+    """
+    Test the persistent cache of analysed neuron/synapse descriptions.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Redirect the cache into a temporary folder.
+        """
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.prev_cache_dir = get_global_config('compilation_cache_dir')
+        _update_global_config('compilation_cache_dir', cls.tmp_dir)
+
+        cls.tau = Constant('tau_description_cache', 10.0)
+        cls.neuron = Neuron(
+            parameters = "baseline = tau_description_cache",
+            equations = "tau_description_cache * dr/dt + r = baseline : init=tau_description_cache"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Restore the previous configuration.
+        """
+        _update_global_config('compilation_cache_dir', cls.prev_cache_dir)
+        rmtree(cls.tmp_dir)
+
+    def setUp(self):
+        """
+        Start each test with an empty cache.
+        """
+        clear_compile_cache()
+
+    def test_key(self):
+        """
+        The key depends on the model definition and the precision.
+        """
+        key = DescriptionCache.compute_key(self.neuron)
+        self.assertEqual(key, DescriptionCache.compute_key(self.neuron))
+        self.assertNotEqual(key, DescriptionCache.compute_key(Neuron(equations="r = 1.0")))
+
+        prev_precision = get_global_config('precision')
+        _update_global_config('precision', 'float')
+        self.assertNotEqual(key, DescriptionCache.compute_key(self.neuron))
+        _update_global_config('precision', prev_precision)
+
+    def test_analyse_uses_cache(self):
+        """
+        The second analysis is loaded from the cache and refers to the live constants.
+        """
+        self.assertIsNone(DescriptionCache.load(DescriptionCache.compute_key(self.neuron)))
+
+        description = DescriptionCache.analyse(self.neuron, analyse_neuron)
+        cached = DescriptionCache.analyse(self.neuron, lambda model: self.fail("description was analysed twice"))
+
+        self.assertEqual(cached['parameters'][0]['name'], 'baseline')
+        self.assertIs(cached['parameters'][0]['init'], self.tau)
+        self.assertIs(cached['variables'][0]['init'], self.tau)
+        self.assertEqual(cached['variables'][0]['cpp'], description['variables'][0]['cpp'])
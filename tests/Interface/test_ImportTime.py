@@ -0,0 +1,68 @@
+"""
+
+    test_ImportTime.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import subprocess
+import sys
+import unittest
+
+# Modules which should only be imported when they are needed
+heavy_modules = ['sympy', 'scipy', 'matplotlib', 'tensorboardX', 'tensorflow', 'tqdm',
+                 'ANNarchy.parser.Equation', 'ANNarchy.parser.report.LatexParser']
+
+class test_ImportTime(unittest.TestCase):
+    """
+    Guards the start-up time of ANNarchy: ``import ANNarchy`` must not import
+    the parser (sympy), the report generator, matplotlib or scipy.
+    """
+    def _import_in_subprocess(self, code):
+        "Runs *code* in a fresh interpreter after importing ANNarchy and returns stdout."
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import ANNarchy\n' + code],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+        )
+        return result.stdout.decode('UTF-8'), result.stderr.decode('UTF-8')
+
+    def test_no_heavy_imports(self):
+        """
+        None of the heavy modules is loaded by ``import ANNarchy``.
+        """
+        stdout, _ = self._import_in_subprocess(
+            "import sys\nprint(' '.join(m for m in %(modules)s if m in sys.modules))" % {'modules': heavy_modules}
+        )
+        self.assertEqual(stdout.splitlines()[-1].strip(), "")
+
+    def test_import_time(self):
+        """
+        Benchmark of ``import ANNarchy``: the cumulated import time reported by ``python -X importtime``
+        must stay well below the import time of sympy alone.
+        """
+        _, stderr = self._import_in_subprocess("import sympy")
+
+        cumulated = {}
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            fields = line[len('import time:'):].split('|')
+            try:
+                cumulated[fields[2].strip()] = int(fields[1])
+            except ValueError: # header line
+                continue
+
+        self.assertLess(cumulated['ANNarchy'] - cumulated.get('numpy', 0), cumulated['sympy'])
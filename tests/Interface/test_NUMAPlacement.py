@@ -0,0 +1,110 @@
+"""
+
+    test_NUMAPlacement.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, Monitor, Neuron, Network, Projection, Population, Synapse
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+input_neuron = Neuron(
+    parameters="baseline = 0.0",
+    equations="r = baseline * (1.0 + sin(t/10.0))"
+)
+
+output_neuron = Neuron(
+    equations="10.0 * dr/dt + r = sum(exc)"
+)
+
+hebb = Synapse(
+    equations="100.0 * dw/dt = pre.r * post.r"
+)
+
+spiking_neuron = Neuron(
+    parameters="I = 0.0",
+    equations="10.0 * dv/dt = - v + I + g_exc",
+    spike="v > 1.0",
+    reset="v = 0.0"
+)
+
+class test_NUMAPlacement(unittest.TestCase):
+    """
+    The NUMA-aware placement of the data (setup(numa_placement=True)) must not
+    change the results of the simulation.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the same network twice, with and without the NUMA placement. The
+        spiking projection is large enough to be stored as partitioned matrix.
+        """
+        cls.prev_numa_placement = get_global_config('numa_placement')
+        cls.prev_disable_split_matrix = get_global_config('disable_split_matrix')
+        _update_global_config('disable_split_matrix', False)
+
+        inp = Population(5, input_neuron)
+        inp.baseline = numpy.linspace(0.1, 0.5, 5)
+        out = Population(4, output_neuron)
+        rate_proj = Projection(inp, out, "exc", hebb)
+        rate_proj.connect_all_to_all(0.1)
+
+        src = Population(10, spiking_neuron)
+        src.I = numpy.linspace(1.0, 2.0, 10)
+        tgt = Population(150, spiking_neuron)
+        spike_proj = Projection(src, tgt, "exc")
+        spike_proj.connect_all_to_all(0.05)
+
+        m_rate = Monitor(out, 'r')
+        m_spike = Monitor(tgt, ['v', 'spike'])
+
+        cls.networks = []
+        for numa_placement in [False, True]:
+            _update_global_config('numa_placement', numa_placement)
+            net = Network()
+            net.add([inp, out, rate_proj, src, tgt, spike_proj, m_rate, m_spike])
+            net.compile(silent=True)
+            cls.networks.append((net, net.get(rate_proj), net.get(spike_proj), net.get(m_rate), net.get(m_spike)))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the networks.
+        """
+        _update_global_config('numa_placement', cls.prev_numa_placement)
+        _update_global_config('disable_split_matrix', cls.prev_disable_split_matrix)
+        del cls.networks
+        clear()
+
+    def test_same_results(self):
+        """
+        Neural and synaptic variables as well as the emitted spikes are identical.
+        """
+        results = []
+        for net, rate_proj, spike_proj, m_rate, m_spike in self.networks:
+            net.simulate(50)
+            results.append((m_rate.get('r'), m_spike.get('v'), m_spike.get('spike'),
+                            numpy.array(rate_proj.w), spike_proj.nb_synapses))
+
+        default, numa = results
+        numpy.testing.assert_allclose(numa[0], default[0])
+        numpy.testing.assert_allclose(numa[1], default[1])
+        self.assertEqual(numa[2], default[2])
+        numpy.testing.assert_allclose(numa[3], default[3])
+        self.assertEqual(numa[4], default[4])
@@ -0,0 +1,74 @@
+"""
+
+    test_Optimize.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import unittest
+import numpy
+
+from ANNarchy import clear, Monitor, Neuron, Network, Population, Projection
+
+neuron = Neuron(
+    parameters="tau = 10.0",
+    equations="tau * dr/dt + r = sum(exc) + t"
+)
+
+pop1 = Population(3, neuron)
+proj = Projection(pop1, pop1, 'exc')
+proj.connect_all_to_all(weights=0.1)
+m = Monitor(pop1, 'r')
+
+class test_Optimize(unittest.TestCase):
+    """
+    This class tests the profile-guided optimization performed by
+    *compile(optimize='pgo')*.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test, the warm-up simulation is recorded.
+        """
+        cls.test_net = Network()
+        cls.test_net.add([pop1, proj, m])
+        cls.test_net.compile(silent=True, optimize='pgo', pgo_warmup=10.)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        del cls.test_net
+        clear()
+
+    def test_profile(self):
+        """
+        The profile of the instrumented library is stored in the annarchy folder.
+        """
+        profile_dir = 'annarchy/profile/net' + str(self.test_net.id)
+        self.assertTrue(any(f.endswith('.gcda') for f in os.listdir(profile_dir)))
+
+    def test_simulate(self):
+        """
+        The optimized network starts from the initial state, the warm-up is not recorded.
+        """
+        self.test_net.simulate(3)
+        numpy.testing.assert_allclose(self.test_net.get(m).get('r')[:, 0], [0.0, 0.1, 0.292])
@@ -0,0 +1,103 @@
+"""
+
+    test_ParallelConnectors.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import Neuron, Normal, Population, Projection, Uniform
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+neuron = Neuron(equations="r = 1.0")
+
+class test_ParallelConnectors(unittest.TestCase):
+    """
+    The Cython connectors create the rows in parallel, each row draws from its
+    own random stream: the connectivity only depends on the seed, not on the
+    number of threads.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Define the projections, the connectivity is created by each test.
+        """
+        cls.prev_num_threads = get_global_config('num_threads')
+
+        pop = Population(300, neuron)
+
+        proj1 = Projection(pop, pop, "all")
+        proj1.connect_all_to_all(weights=Uniform(0.0, 1.0))
+
+        proj2 = Projection(pop, pop, "prob")
+        proj2.connect_fixed_probability(0.1, weights=Normal(0.0, 1.0), delays=Uniform(1.0, 3.0))
+
+        proj3 = Projection(pop, pop, "pre")
+        proj3.connect_fixed_number_pre(20, weights=Uniform(0.0, 1.0))
+
+        proj4 = Projection(pop, pop, "post")
+        proj4.connect_fixed_number_post(20, weights=1.0, delays=Uniform(1.0, 3.0))
+
+        cls.projs = [proj1, proj2, proj3, proj4]
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Restore the number of threads.
+        """
+        _update_global_config('num_threads', cls.prev_num_threads)
+
+    @staticmethod
+    def connectivity(proj, num_threads, seed=42):
+        "Creates the LIL connectivity of proj with the given number of threads."
+        _update_global_config('num_threads', num_threads)
+        numpy.random.seed(seed)
+        lil = proj._connection_method(*((proj.pre, proj.post,) + proj._connection_args))
+        return [(post, list(pre), list(w), list(d)) for post, pre, w, d in zip(lil.post_rank, lil.pre_rank, lil.w, lil.delay)]
+
+    def test_num_threads(self):
+        """
+        The ranks, weights and delays do not depend on the number of threads.
+        """
+        for proj in self.projs:
+            self.assertEqual(self.connectivity(proj, 1), self.connectivity(proj, 4))
+
+    def test_seed(self):
+        """
+        The random patterns depend on the seed of numpy.
+        """
+        for proj in self.projs[1:]:
+            self.assertNotEqual(self.connectivity(proj, 4, seed=1), self.connectivity(proj, 4, seed=2))
+
+    def test_patterns(self):
+        """
+        No self-connections, no duplicates and the requested number of synapses.
+        """
+        for proj in self.projs:
+            rows = self.connectivity(proj, 4)
+            pairs = [(post, pre) for post, pre_ranks, _, _ in rows for pre in pre_ranks]
+            self.assertEqual(len(pairs), len(set(pairs)))
+            self.assertTrue(all(post != pre for post, pre in pairs))
+
+            if proj.target == "all":
+                self.assertEqual(len(pairs), 300 * 299)
+            elif proj.target == "pre":
+                self.assertTrue(all(len(pre_ranks) == 20 for _, pre_ranks, _, _ in rows))
+            elif proj.target == "post":
+                nb_efferent = numpy.bincount([pre for _, pre in pairs], minlength=300)
+                numpy.testing.assert_array_equal(nb_efferent, 20)
@@ -0,0 +1,149 @@
+"""
+
+    test_Schedule.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, Monitor, Network, Neuron, Population, Projection, \
+    Schedule, Synapse
+from ANNarchy.intern.Messages import ANNarchyException
+
+input_neuron = Neuron(
+    parameters="""
+        I = 0.0
+        J = 0.0
+        g = 0.0 : population
+    """,
+    equations="""
+        rI = I
+        rJ = J
+        rg = g : population
+        r = 0.0
+    """
+)
+
+constant_neuron = Neuron(
+    equations="r = 1.0"
+)
+
+output_neuron = Neuron(
+    equations="r = sum(exc)"
+)
+
+weight_synapse = Synapse(
+    parameters="w = 0.0"
+)
+
+class test_Schedule(unittest.TestCase):
+    """
+    Test the scheduled attribute updates applied by the C++ core (Schedule).
+    Each test schedules a different attribute, as the schedules are kept
+    until the end of the network.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        inp = Population(4, input_neuron)
+        cst = Population(3, constant_neuron)
+        out = Population(1, output_neuron)
+        proj = Projection(cst, out, "exc", weight_synapse)
+        proj.connect_all_to_all(0.0)
+
+        m_inp = Monitor(inp, ['rI', 'rJ', 'rg'])
+        m_out = Monitor(out, 'r')
+
+        cls.test_net = Network()
+        cls.test_net.add([inp, cst, out, proj, m_inp, m_out])
+        cls.test_net.compile(silent=True)
+
+        cls.net_inp = cls.test_net.get(inp)
+        cls.net_proj = cls.test_net.get(proj)
+        cls.net_m_inp = cls.test_net.get(m_inp)
+        cls.net_m_out = cls.test_net.get(m_out)
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Delete class and clear. """
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the
+        network after every test.
+        """
+        self.test_net.reset()
+
+    def test_local_period(self):
+        """
+        Values set at a fixed interval and cycled over.
+        """
+        Schedule(self.net_inp, 'I', [[1.0, 2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0]], schedule=2.0, period=6.0, net_id=self.test_net.id)
+
+        self.test_net.simulate(10)
+        numpy.testing.assert_allclose(self.net_m_inp.get('rI')[:, 0], [1, 1, 5, 5, 5, 5, 1, 1, 5, 5])
+        numpy.testing.assert_allclose(self.net_inp.I, [5.0, 6.0, 7.0, 8.0])
+
+        # a global reset restarts the schedules
+        self.test_net.reset()
+        self.test_net.simulate(3)
+        numpy.testing.assert_allclose(self.net_m_inp.get('rI')[:, 3], [4, 4, 8])
+
+    def test_population_view(self):
+        """
+        Only the neurons of the view are modified.
+        """
+        Schedule(self.net_inp[1:3], 'J', [1.0, [2.0, 3.0]], schedule=[0.0, 3.0], net_id=self.test_net.id)
+
+        self.test_net.simulate(5)
+        J = self.net_m_inp.get('rJ')
+        numpy.testing.assert_allclose(J[:, 0], [0, 0, 0, 0, 0])
+        numpy.testing.assert_allclose(J[:, 1], [1, 1, 1, 2, 2])
+        numpy.testing.assert_allclose(J[:, 2], [1, 1, 1, 3, 3])
+        numpy.testing.assert_allclose(J[:, 3], [0, 0, 0, 0, 0])
+
+    def test_global_reset(self):
+        """
+        The times become relative to the call to reset().
+        """
+        sched = Schedule(self.net_inp, 'g', [10.0, 20.0, 30.0], schedule=[1.0, 2.0, 4.0], net_id=self.test_net.id)
+
+        self.test_net.simulate(3)
+        sched.reset()
+        self.test_net.simulate(3)
+        numpy.testing.assert_allclose(self.net_m_inp.get('rg'), [0, 10, 20, 20, 10, 20])
+
+    def test_projection(self):
+        """
+        A single value is applied to all synapses.
+        """
+        Schedule(self.net_proj, 'w', [0.5, 1.0], schedule=5.0, net_id=self.test_net.id)
+
+        self.test_net.simulate(10)
+        numpy.testing.assert_allclose(self.net_m_out.get('r')[:, 0], [0.0] + [1.5] * 4 + [3.0] * 5)
+
+    def test_schedule_too_long(self):
+        """
+        The schedule can not contain more times than values.
+        """
+        with self.assertRaises(ANNarchyException):
+            Schedule(self.net_inp, 'I', [1.0, 2.0], schedule=[0.0, 1.0, 2.0], net_id=self.test_net.id)
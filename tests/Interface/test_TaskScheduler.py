@@ -0,0 +1,103 @@
+"""
+
+    test_TaskScheduler.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, Monitor, Neuron, Network, Projection, Population, Synapse
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+input_neuron = Neuron(
+    parameters="baseline = 0.0",
+    equations="r = baseline * (1.0 + sin(t/10.0))"
+)
+
+output_neuron = Neuron(
+    equations="10.0 * dr/dt + r = sum(exc)"
+)
+
+hebb = Synapse(
+    equations="100.0 * dw/dt = pre.r * post.r"
+)
+
+spiking_neuron = Neuron(
+    parameters="I = 0.0",
+    equations="10.0 * dv/dt = - v + I + g_exc",
+    spike="v > 1.0",
+    reset="v = 0.0"
+)
+
+class test_TaskScheduler(unittest.TestCase):
+    """
+    The task scheduler (setup(task_scheduler=True)) must compute the same results as
+    the default scheduling of the objects.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the same network twice, with and without the task scheduler.
+        """
+        inp = Population(5, input_neuron)
+        inp.baseline = numpy.linspace(0.1, 0.5, 5)
+        out = Population(4, output_neuron)
+        rate_proj = Projection(inp, out, "exc", hebb)
+        rate_proj.connect_all_to_all(0.1)
+
+        src = Population(10, spiking_neuron)
+        src.I = numpy.linspace(1.0, 2.0, 10)
+        tgt = Population(5, spiking_neuron)
+        spike_proj = Projection(src, tgt, "exc")
+        spike_proj.connect_all_to_all(0.2, delays=2.0)
+
+        m_rate = Monitor(out, 'r')
+        m_spike = Monitor(tgt, ['v', 'spike'])
+
+        cls.prev_task_scheduler = get_global_config('task_scheduler')
+        cls.networks = []
+        for task_scheduler in [False, True]:
+            _update_global_config('task_scheduler', task_scheduler)
+            net = Network()
+            net.add([inp, out, rate_proj, src, tgt, spike_proj, m_rate, m_spike])
+            net.compile(silent=True)
+            cls.networks.append((net, net.get(rate_proj), net.get(m_rate), net.get(m_spike)))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the networks.
+        """
+        _update_global_config('task_scheduler', cls.prev_task_scheduler)
+        del cls.networks
+        clear()
+
+    def test_same_results(self):
+        """
+        Neural and synaptic variables as well as the emitted spikes are identical.
+        """
+        results = []
+        for net, proj, m_rate, m_spike in self.networks:
+            net.simulate(50)
+            results.append((m_rate.get('r'), m_spike.get('v'), m_spike.get('spike'), numpy.array(proj.w)))
+
+        default, tasks = results
+        numpy.testing.assert_allclose(tasks[0], default[0])
+        numpy.testing.assert_allclose(tasks[1], default[1])
+        self.assertEqual(tasks[2], default[2])
+        numpy.testing.assert_allclose(tasks[3], default[3])
@@ -0,0 +1,127 @@
+"""
+
+    test_TimedUpdates.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, clear_all_callbacks, every, Monitor, Network, Neuron, \
+    Population, Projection, set_every, Synapse
+from ANNarchy.intern.NetworkManager import NetworkManager
+
+input_neuron = Neuron(
+    parameters="""
+        I = 0.0
+        g = 0.0 : population
+    """,
+    equations="r = I + g"
+)
+
+output_neuron = Neuron(
+    equations="r = sum(exc)"
+)
+
+weight_synapse = Synapse(
+    parameters="w = 0.0"
+)
+
+class test_TimedUpdates(unittest.TestCase):
+    """
+    Test the attribute updates applied by the C++ core (set_every).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        inp = Population(3, input_neuron)
+        out = Population(1, output_neuron)
+        proj = Projection(inp, out, "exc", weight_synapse)
+        proj.connect_all_to_all(0.0)
+
+        m_inp = Monitor(inp, 'r')
+        m_out = Monitor(out, 'r')
+
+        cls.test_net = Network()
+        cls.test_net.add([inp, out, proj, m_inp, m_out])
+        cls.test_net.compile(silent=True)
+
+        cls.net_inp = cls.test_net.get(inp)
+        cls.net_proj = cls.test_net.get(proj)
+        cls.net_m_inp = cls.test_net.get(m_inp)
+        cls.net_m_out = cls.test_net.get(m_out)
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Delete class and clear. """
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the
+        network after every test.
+        """
+        self.test_net.reset()
+
+    def tearDown(self):
+        """
+        Remove the updates declared by the test.
+        """
+        clear_all_callbacks(net_id=self.test_net.id)
+
+    def test_population_updates(self):
+        """
+        Local values are taken from a list, global ones from a function of n.
+        """
+        set_every(self.net_inp, 'I', [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], period=5.0, net_id=self.test_net.id)
+        set_every(self.net_inp, 'g', lambda n: 10.0 * n, period=5.0, offset=2.0, net_id=self.test_net.id)
+
+        self.test_net.simulate(12)
+        numpy.testing.assert_allclose(self.net_m_inp.get('r')[:, 0], [1, 1, 1, 1, 1, 4, 4, 14, 14, 14, 14, 14])
+        numpy.testing.assert_allclose(self.net_inp.I, [4.0, 5.0, 6.0])
+
+        # the updates restart at each call to simulate()
+        self.test_net.simulate(5)
+        numpy.testing.assert_allclose(self.net_m_inp.get('r')[:, 0], [11, 11, 1, 1, 1])
+        self.assertEqual(NetworkManager().cy_instance(net_id=self.test_net.id).pending_timed_updates(), 0)
+
+    def test_projection_updates(self):
+        """
+        A single value is applied to all synapses.
+        """
+        self.net_inp.I = 1.0
+        set_every(self.net_proj, 'w', [0.5, 1.0], period=5.0, net_id=self.test_net.id)
+
+        self.test_net.simulate(10)
+        numpy.testing.assert_allclose(self.net_m_out.get('r')[:, 0], [0.0] + [1.5] * 4 + [3.0] * 5)
+
+    def test_python_callbacks(self):
+        """
+        The updates are applied before the Python callbacks of the same step.
+        """
+        set_every(self.net_inp, 'I', [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], period=5.0, net_id=self.test_net.id)
+
+        seen = []
+        @every(period=5.0, net_id=self.test_net.id)
+        def read_input(n):
+            seen.append(self.net_inp.I[0])
+
+        self.test_net.simulate(10)
+        self.assertEqual(seen, [1.0, 4.0])
@@ -0,0 +1,127 @@
+"""
+
+    test_VectorizedRNG.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import Monitor, Network, Neuron, PoissonPopulation, Population
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+noisy_neuron = Neuron(
+    equations="""
+        r = Uniform(-1.0, 3.0)
+        n = Normal(2.0, 0.5)
+        ln = LogNormal(0.0, 0.5)
+        e = Exponential(2.0)
+        d = DiscreteUniform(0, 4)
+        g = Uniform(0.0, 1.0) : population
+    """
+)
+
+class test_VectorizedRNG(unittest.TestCase):
+    """
+    The random variables drawn in blocks (setup(vectorized_rng=True)) follow
+    the requested distributions.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test. The size of the population is odd
+        and spans several blocks.
+        """
+        cls.prev_vectorized_rng = get_global_config('vectorized_rng')
+        _update_global_config('vectorized_rng', True)
+
+        pop = Population(1001, noisy_neuron)
+        poisson = PoissonPopulation(1001, rates=50.0)
+
+        m = Monitor(pop, ['r', 'n', 'ln', 'e', 'd', 'g'])
+        m_spike = Monitor(poisson, 'spike')
+
+        cls.test_net = Network()
+        cls.test_net.add([pop, poisson, m, m_spike])
+        cls.test_net.compile(silent=True)
+
+        cls.net_m = cls.test_net.get(m)
+        cls.net_m_spike = cls.test_net.get(m_spike)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        _update_global_config('vectorized_rng', cls.prev_vectorized_rng)
+        del cls.test_net
+
+    def setUp(self):
+        """
+        Simulate 20 steps, the recordings are used by all tests.
+        """
+        self.test_net.reset()
+        self.test_net.set_seed(42)
+        self.net_m.get()
+        self.net_m_spike.get()
+        self.test_net.simulate(20)
+
+    def test_distributions(self):
+        """
+        Mean, standard deviation and bounds of the drawn values.
+        """
+        data = self.net_m.get()
+
+        self.assertTrue(numpy.all(data['r'] >= -1.0))
+        self.assertTrue(numpy.all(data['r'] < 3.0))
+        self.assertAlmostEqual(numpy.mean(data['r']), 1.0, delta=0.05)
+        self.assertAlmostEqual(numpy.std(data['r']), 4.0/numpy.sqrt(12.0), delta=0.05)
+
+        self.assertAlmostEqual(numpy.mean(data['n']), 2.0, delta=0.02)
+        self.assertAlmostEqual(numpy.std(data['n']), 0.5, delta=0.02)
+
+        self.assertTrue(numpy.all(data['ln'] > 0.0))
+        self.assertAlmostEqual(numpy.mean(numpy.log(data['ln'])), 0.0, delta=0.02)
+        self.assertAlmostEqual(numpy.std(numpy.log(data['ln'])), 0.5, delta=0.02)
+
+        self.assertTrue(numpy.all(data['e'] > 0.0))
+        self.assertAlmostEqual(numpy.mean(data['e']), 0.5, delta=0.02)
+
+        numpy.testing.assert_array_equal(numpy.unique(data['d']), [0, 1, 2, 3, 4])
+
+        self.assertGreater(len(numpy.unique(data['g'])), 15)
+
+    def test_all_neurons(self):
+        """
+        All neurons, including the last one of an odd-sized block, receive new
+        values in each step.
+        """
+        data = self.net_m.get()
+
+        for var in ['r', 'n', 'ln', 'e']:
+            self.assertTrue(numpy.all(numpy.diff(data[var], axis=0) != 0.0))
+            self.assertTrue(numpy.all(numpy.diff(data[var], axis=1) != 0.0))
+
+    def test_poisson(self):
+        """
+        The firing rate of the Poisson population is not modified.
+        """
+        spikes = self.net_m_spike.get('spike')
+        nb_spikes = sum(len(times) for times in spikes.values())
+
+        # 1001 neurons firing at 50 Hz during 20 ms
+        self.assertAlmostEqual(nb_spikes / 1001.0, 1.0, delta=0.1)
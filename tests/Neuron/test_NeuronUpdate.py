@@ -24,6 +24,7 @@ import unittest
 import numpy
 
 from ANNarchy import clear, Monitor, Network, Neuron, Population, set_seed
+from ANNarchy.intern.Messages import ANNarchyException
 set_seed(seed=1)
 
 class test_NeuronUpdate(unittest.TestCase):
@@ -134,3 +135,66 @@ class test_NeuronUpdate(unittest.TestCase):
 
         r = self.net_m.get('r')
         numpy.testing.assert_allclose(r[:,0], [1, 1, 2, 3, 3])
+
+class test_NeuronUpdatePeriod(unittest.TestCase):
+    """
+    Test the multi-rate integration of populations (Population(update_period=...)).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        slow_eq = Neuron(
+            equations="""
+                dr/dt = 1.0
+                last_update = t
+            """
+        )
+
+        slow_pop = Population(3, slow_eq, update_period=5.0)
+        fast_pop = Population(3, slow_eq)
+
+        m = Monitor(slow_pop, 'r')
+
+        cls.test_net = Network()
+        cls.test_net.add([slow_pop, fast_pop, m])
+        cls.test_net.compile(silent=True)
+
+        cls.net_slow_pop = cls.test_net.get(slow_pop)
+        cls.net_fast_pop = cls.test_net.get(fast_pop)
+        cls.net_m = cls.test_net.get(m)
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Delete class and clear. """
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the
+        network after every test.
+        """
+        self.test_net.reset() # network reset
+
+    def test_update_period(self):
+        """
+        The slow population is updated every 5 steps with a step size of 5 ms.
+        """
+        self.test_net.simulate(12)
+
+        numpy.testing.assert_allclose(self.net_fast_pop.r, [12.0, 12.0, 12.0])
+        numpy.testing.assert_allclose(self.net_slow_pop.r, [15.0, 15.0, 15.0])
+        numpy.testing.assert_allclose(self.net_slow_pop.last_update, [10.0, 10.0, 10.0])
+
+        r = self.net_m.get('r')
+        numpy.testing.assert_allclose(r[:,0], [5]*5 + [10]*5 + [15]*2)
+
+    def test_spiking_not_allowed(self):
+        """
+        Spiking neurons are updated at each step.
+        """
+        spiking_eq = Neuron(equations="v = 0.0", spike="v > 1.0")
+        with self.assertRaises(ANNarchyException):
+            Population(3, spiking_eq, update_period=5.0)
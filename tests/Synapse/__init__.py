@@ -9,6 +9,7 @@ from .test_RateCustomConnectivity import (test_CustomConnectivityNoDelay,
                                           test_CustomConnectivityUniformDelay)
 from .test_Dendrite import test_DendriteDefaultSynapse, test_DendriteModifiedSynapse
 from .test_Projection import test_Projection
+from .test_ConnectivityPatterns import test_ConnectivityPatterns, test_RandomConnectivityPatterns
 
 # Operations
 from .test_RateSynapse import test_Locality, test_AccessPSP, test_ModifiedPSP
@@ -31,6 +32,7 @@ if _check_paradigm('openmp'):
     from .test_StructuralPlasticityEnvironment import test_StructuralPlasticityEnvironment
     from .test_Convolution import test_Convolution
     from .test_Pooling import test_Pooling
+    from .test_MixedPrecision import test_MixedPrecision, test_QuantizedWeights
 
 # Contains mapping which formats are allowed for which operation
 from .storage_formats import single_thread, open_mp, cuda, p2p
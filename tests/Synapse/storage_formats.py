@@ -36,6 +36,9 @@ single_thread = {
     "test_CustomConnectivityUniformDelay":      ["lil", "csr", "ell"],
     "test_CustomConnectivityNonUniformDelay":   ["lil", "csr", "ell"],
     "test_Projection":                          ["lil", "csr"],
+    # from test_ConnectivityPatterns.py
+    "test_ConnectivityPatterns":                ["lil", "csr", "ell"],
+    "test_RandomConnectivityPatterns":          ["lil", "csr"],
     # test_ContinuousUpdate.py
     "test_RateCodedContinuousUpdate":           ["lil", "csr", "dense"],
     "test_SpikingContinuousUpdate":             ["lil", "csr"],
@@ -60,6 +63,8 @@ single_thread = {
     "test_SpikeTransmissionNoDelay":            ["lil", "csr", "dense"],
     "test_SpikeTransmissionUniformDelay":       ["lil", "csr"],
     "test_SpikeTransmissionNonUniformDelay":    ["lil"],
+    # from test_MixedPrecision
+    "test_MixedPrecision":                      ["lil", "csr", "dense"],
     # SpecificProjections
     # "test_Convolution":         ["lil", "csr", "ell"],
     # "test_Pooling":             ["lil", "csr", "ell"],
@@ -76,6 +81,9 @@ open_mp = {
     "test_CustomConnectivityUniformDelay":      ["lil", "csr", "ell"],
     "test_CustomConnectivityNonUniformDelay":   ["lil", "csr", "ell"],
     "test_Projection":                          ["lil", "csr"],
+    # from test_ConnectivityPatterns.py
+    "test_ConnectivityPatterns":                ["lil", "csr", "ell"],
+    "test_RandomConnectivityPatterns":          ["lil", "csr"],
     # from test_ContinuousUpdate.py
     "test_RateCodedContinuousUpdate":           ["lil", "csr", "dense"],
     "test_SpikingContinuousUpdate":             ["lil", "csr"],
@@ -100,6 +108,8 @@ open_mp = {
     "test_SpikeTransmissionNoDelay":            ["lil", "csr"],
     "test_SpikeTransmissionUniformDelay":       ["lil", "csr"],
     "test_SpikeTransmissionNonUniformDelay":    ["lil"],
+    # from test_MixedPrecision
+    "test_MixedPrecision":                      ["lil", "csr", "dense"],
     # SpecificProjections
     # "test_Convolution":         ["lil", "csr", "ell"],
     # "test_Pooling":             ["lil", "csr", "ell"],
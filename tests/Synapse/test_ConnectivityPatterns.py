@@ -0,0 +1,228 @@
+"""
+
+    test_ConnectivityPatterns.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import numpy
+
+from ANNarchy import (DiscreteUniform, LogNormal, Network, Neuron, Normal,
+                      Population, Projection, Uniform)
+from ANNarchy.intern.ConfigManagement import get_global_config, _update_global_config
+
+neuron = Neuron(equations="r = 1.0")
+
+class test_ConnectivityPatterns():
+    """
+    The deterministic patterns are created in C++ for any storage format and
+    are identical to the ones created by the Cython implementations.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        pop1 = Population((6, 6), neuron)
+        pop2 = Population((6, 6), neuron)
+
+        proj1 = Projection(pop1, pop2[3:20], "one")
+        proj1.connect_one_to_one(weights=0.5, force_multiple_weights=True,
+                                 storage_format=cls.storage_format,
+                                 storage_order=cls.storage_order)
+
+        proj2 = Projection(pop1, pop1, "all")
+        proj2.connect_all_to_all(weights=0.3, delays=2.0, force_multiple_weights=True,
+                                 storage_format=cls.storage_format,
+                                 storage_order=cls.storage_order)
+
+        proj3 = Projection(pop1, pop2, "gaussian")
+        proj3.connect_gaussian(amp=1.0, sigma=0.2, storage_format=cls.storage_format)
+
+        proj4 = Projection(pop1, pop1, "dog")
+        proj4.connect_dog(amp_pos=1.0, sigma_pos=0.2, amp_neg=0.5, sigma_neg=0.5,
+                          storage_format=cls.storage_format)
+
+        cls.test_net = Network()
+        cls.test_net.add([pop1, pop2, proj1, proj2, proj3, proj4])
+        cls.test_net.compile(silent=True)
+
+        cls.test_projs = [cls.test_net.get(proj) for proj in [proj1, proj2, proj3, proj4]]
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        del cls.test_net
+
+    def test_patterns(self):
+        """
+        The post-synaptic ranks, pre-synaptic ranks and weights are the ones of
+        the LIL structure created by the Cython implementation.
+        """
+        for proj in self.test_projs:
+            lil = proj._connection_method(*((proj.pre, proj.post,) + proj._connection_args))
+
+            self.assertEqual(list(proj.post_ranks), list(lil.post_rank))
+            for dendrite, pre_ranks, w in zip(proj.dendrites, lil.pre_rank, lil.w):
+                self.assertEqual(list(dendrite.pre_ranks), list(pre_ranks))
+                numpy.testing.assert_allclose(dendrite.w, w)
+
+    def test_cutoff(self):
+        """
+        Only the neurons within the cutoff distance are visited: the gaussian
+        and dog patterns still contain exactly the pairs whose weight exceeds
+        the limit.
+        """
+        coords = numpy.array([(x/5., y/5.) for x in range(6) for y in range(6)])
+        distances = numpy.sum((coords[:, None, :] - coords[None, :, :])**2, axis=2)
+
+        gaussian = numpy.exp(-distances/(2.0*0.2**2))
+        dog = numpy.exp(-distances/(2.0*0.2**2)) - 0.5 * numpy.exp(-distances/(2.0*0.5**2))
+
+        # no self-connections within pop1
+        numpy.fill_diagonal(dog, 0.0)
+
+        for proj, values, threshold in [(self.test_projs[2], gaussian, 0.01), (self.test_projs[3], dog, 0.005)]:
+            connected = numpy.zeros(values.shape, dtype=bool)
+            for dendrite in proj.dendrites:
+                connected[dendrite.post_rank, dendrite.pre_ranks] = True
+
+            numpy.testing.assert_array_equal(connected, numpy.abs(values) > threshold)
+
+    def test_delays(self):
+        """
+        The uniform delay is converted into steps.
+        """
+        self.assertEqual(self.test_projs[1].max_delay, 2)
+        for dendrite in self.test_projs[1].dendrites:
+            numpy.testing.assert_allclose(dendrite.delay, 2.0)
+
+class test_RandomConnectivityPatterns():
+    """
+    The random patterns, weights and delays are created in C++ with
+    _optimization_flags(use_cpp_connectors=True) and follow the requested
+    statistics.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        cls.prev_use_cpp_connectors = get_global_config('use_cpp_connectors')
+        _update_global_config('use_cpp_connectors', True)
+
+        pop = Population(200, neuron)
+
+        proj1 = Projection(pop, pop, "pre")
+        proj1.connect_fixed_number_pre(20, weights=Normal(0.5, 0.1, min=0.2, max=0.8),
+                                       storage_format=cls.storage_format,
+                                       storage_order=cls.storage_order)
+
+        proj2 = Projection(pop, pop, "post")
+        proj2.connect_fixed_number_post(20, weights=Uniform(0.0, 1.0),
+                                        storage_format=cls.storage_format,
+                                        storage_order=cls.storage_order)
+
+        proj3 = Projection(pop, pop, "prob")
+        proj3.connect_fixed_probability(0.1, weights=LogNormal(0.0, 0.5),
+                                        storage_format=cls.storage_format,
+                                        storage_order=cls.storage_order)
+
+        proj4 = Projection(pop, pop, "delay")
+        proj4.connect_one_to_one(weights=1.0, delays=DiscreteUniform(1, 3),
+                                 storage_format=cls.storage_format,
+                                 storage_order=cls.storage_order)
+
+        cls.test_net = Network()
+        cls.test_net.add([pop, proj1, proj2, proj3, proj4])
+        cls.test_net.compile(silent=True)
+
+        cls.test_proj1 = cls.test_net.get(proj1)
+        cls.test_proj2 = cls.test_net.get(proj2)
+        cls.test_proj3 = cls.test_net.get(proj3)
+        cls.test_proj4 = cls.test_net.get(proj4)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        _update_global_config('use_cpp_connectors', cls.prev_use_cpp_connectors)
+        del cls.test_net
+
+    @staticmethod
+    def synapses(proj):
+        "Returns the pairs (post, pre) and the weights of all synapses."
+        pairs = [(dendrite.post_rank, pre) for dendrite in proj.dendrites for pre in dendrite.pre_ranks]
+        weights = numpy.concatenate([dendrite.w for dendrite in proj.dendrites])
+        return pairs, weights
+
+    def check_synapses(self, proj):
+        "No self-connections, no duplicates."
+        pairs, _ = self.synapses(proj)
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertTrue(all(post != pre for post, pre in pairs))
+
+    def test_fixed_number_pre(self):
+        """
+        Each post-synaptic neuron receives the same number of synapses, the
+        weights are clipped.
+        """
+        self.check_synapses(self.test_proj1)
+
+        self.assertEqual(len(self.test_proj1.post_ranks), 200)
+        for dendrite in self.test_proj1.dendrites:
+            self.assertEqual(dendrite.size, 20)
+
+        _, weights = self.synapses(self.test_proj1)
+        self.assertTrue(numpy.all(weights >= 0.2))
+        self.assertTrue(numpy.all(weights <= 0.8))
+        self.assertAlmostEqual(numpy.mean(weights), 0.5, delta=0.02)
+
+    def test_fixed_number_post(self):
+        """
+        Each pre-synaptic neuron sends the same number of synapses.
+        """
+        self.check_synapses(self.test_proj2)
+
+        pairs, weights = self.synapses(self.test_proj2)
+        nb_efferent = numpy.bincount([pre for _, pre in pairs], minlength=200)
+        numpy.testing.assert_array_equal(nb_efferent, 20)
+
+        self.assertTrue(numpy.all(weights >= 0.0))
+        self.assertTrue(numpy.all(weights < 1.0))
+        self.assertAlmostEqual(numpy.mean(weights), 0.5, delta=0.03)
+
+    def test_fixed_probability(self):
+        """
+        The number of synapses follows the probability.
+        """
+        self.check_synapses(self.test_proj3)
+
+        # 200 * 199 candidates, standard deviation about 60 synapses
+        self.assertAlmostEqual(self.test_proj3.nb_synapses, 3980, delta=300)
+
+        _, weights = self.synapses(self.test_proj3)
+        self.assertAlmostEqual(numpy.mean(numpy.log(weights)), 0.0, delta=0.05)
+
+    def test_delays(self):
+        """
+        The delays are drawn in ms and converted into steps.
+        """
+        delays = numpy.concatenate([dendrite.delay for dendrite in self.test_proj4.dendrites])
+        numpy.testing.assert_array_equal(numpy.unique(delays), [1.0, 2.0, 3.0])
@@ -0,0 +1,214 @@
+"""
+
+    test_MixedPrecision.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import clear, Network, Neuron, Population, Projection, Synapse
+from ANNarchy.intern.Messages import ANNarchyException
+
+class test_MixedPrecision(unittest.TestCase):
+    """
+    Test the storage of the weights in single precision, while the
+    post-synaptic potentials are accumulated in double precision
+    (Projection(weight_dtype=...) and the flag float).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        input_neuron = Neuron(
+            parameters="baseline = 0.0",
+            equations="r = baseline"
+        )
+
+        output_neuron = Neuron(
+            equations="r = sum(exc)"
+        )
+
+        float_synapse = Synapse(
+            parameters="w = 0.0 : float"
+        )
+
+        rng = numpy.random.default_rng(seed=42)
+        cls.weights = rng.uniform(0.0, 1.0, (3, 5))
+        cls.baseline = rng.uniform(0.0, 1.0, 5)
+
+        pre = Population(5, input_neuron)
+        post_double = Population(3, output_neuron)
+        post_float = Population(3, output_neuron)
+        post_flag = Population(3, output_neuron)
+
+        proj_double = Projection(pre, post_double, "exc")
+        proj_double.connect_from_matrix(cls.weights, storage_format=cls.storage_format, storage_order=cls.storage_order)
+
+        proj_float = Projection(pre, post_float, "exc", weight_dtype='float32')
+        proj_float.connect_from_matrix(cls.weights, storage_format=cls.storage_format, storage_order=cls.storage_order)
+
+        proj_flag = Projection(pre, post_flag, "exc", float_synapse)
+        proj_flag.connect_from_matrix(cls.weights, storage_format=cls.storage_format, storage_order=cls.storage_order)
+
+        cls.test_net = Network()
+        cls.test_net.add([pre, post_double, post_float, post_flag, proj_double, proj_float, proj_flag])
+        cls.test_net.compile(silent=True)
+
+        cls.net_pre = cls.test_net.get(pre)
+        cls.net_post_double = cls.test_net.get(post_double)
+        cls.net_post_float = cls.test_net.get(post_float)
+        cls.net_post_flag = cls.test_net.get(post_flag)
+        cls.net_proj_double = cls.test_net.get(proj_double)
+        cls.net_proj_float = cls.test_net.get(proj_float)
+        cls.net_proj_flag = cls.test_net.get(proj_flag)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        In our *setUp()* function we call *reset()* to reset the network before
+        every test.
+        """
+        self.test_net.reset()
+
+    def test_weights(self):
+        """
+        The weights are rounded to single precision.
+        """
+        numpy.testing.assert_array_equal(self.net_proj_float.w, self.weights.astype(numpy.float32))
+        numpy.testing.assert_array_equal(self.net_proj_flag.w, self.weights.astype(numpy.float32))
+        numpy.testing.assert_array_equal(self.net_proj_double.w, self.weights)
+
+    def test_psp(self):
+        """
+        The weighted sum is computed in double precision.
+        """
+        self.net_pre.baseline = self.baseline
+        self.test_net.simulate(2)
+
+        expected = numpy.dot(self.weights.astype(numpy.float32).astype(numpy.float64), self.baseline)
+        numpy.testing.assert_allclose(self.net_post_float.r, expected, rtol=1e-12)
+        numpy.testing.assert_allclose(self.net_post_flag.r, expected, rtol=1e-12)
+        numpy.testing.assert_allclose(self.net_post_double.r, numpy.dot(self.weights, self.baseline), rtol=1e-12)
+
+    def test_set_weights(self):
+        """
+        The values are converted by the accessors.
+        """
+        self.net_proj_float.w = 0.1
+        numpy.testing.assert_array_equal(self.net_proj_float.w, numpy.full((3, 5), numpy.float32(0.1)))
+
+        # restore the weights for the other tests
+        self.net_proj_float.w = list(self.weights)
+        numpy.testing.assert_array_equal(self.net_proj_float.w, self.weights.astype(numpy.float32))
+
+    def test_save_dtype(self):
+        """
+        The saved weights keep the single precision.
+        """
+        self.assertEqual(self.net_proj_float._data()['w'].dtype, numpy.float32)
+
+class test_QuantizedWeights(unittest.TestCase):
+    """
+    Test the storage of non-plastic weights as integers with one scale
+    per post-synaptic neuron (Projection(weight_dtype='int8')).
+    """
+    @classmethod
+    def setUpClass(cls):
+        """
+        Compile the network for this test
+        """
+        input_neuron = Neuron(
+            parameters="baseline = 0.0",
+            equations="r = baseline"
+        )
+
+        output_neuron = Neuron(
+            equations="r = sum(exc)"
+        )
+
+        rng = numpy.random.default_rng(seed=42)
+        cls.weights = rng.uniform(-1.0, 1.0, (3, 5))
+        cls.baseline = rng.uniform(0.0, 1.0, 5)
+
+        pre = Population(5, input_neuron)
+        post_int8 = Population(3, output_neuron)
+        post_int16 = Population(3, output_neuron)
+
+        proj_int8 = Projection(pre, post_int8, "exc", weight_dtype='int8')
+        proj_int8.connect_from_matrix(cls.weights, storage_format="lil")
+
+        proj_int16 = Projection(pre, post_int16, "exc", weight_dtype='int16')
+        proj_int16.connect_from_matrix(cls.weights, storage_format="lil")
+
+        cls.test_net = Network()
+        cls.test_net.add([pre, post_int8, post_int16, proj_int8, proj_int16])
+        cls.test_net.compile(silent=True)
+
+        cls.net_pre = cls.test_net.get(pre)
+        cls.net_post_int8 = cls.test_net.get(post_int8)
+        cls.net_proj_int8 = cls.test_net.get(proj_int8)
+        cls.net_proj_int16 = cls.test_net.get(proj_int16)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        All tests of this class are done. We can destroy the network.
+        """
+        del cls.test_net
+        clear()
+
+    def setUp(self):
+        """
+        In our *setUp()* function we call *reset()* to reset the network before
+        every test.
+        """
+        self.test_net.reset()
+
+    def test_weights(self):
+        """
+        The quantization error is at most half a quantization step of the row.
+        """
+        for proj, qmax in [(self.net_proj_int8, 127), (self.net_proj_int16, 32767)]:
+            step = numpy.max(numpy.abs(self.weights), axis=1) / qmax
+            error = numpy.abs(numpy.array(proj.w) - self.weights)
+            self.assertTrue(numpy.all(error <= 0.5 * step[:, None] + 1e-12))
+
+    def test_psp(self):
+        """
+        The weighted sum uses the dequantized weights.
+        """
+        self.net_pre.baseline = self.baseline
+        self.test_net.simulate(2)
+
+        numpy.testing.assert_allclose(self.net_post_int8.r, numpy.dot(numpy.array(self.net_proj_int8.w), self.baseline), rtol=1e-12)
+
+    def test_plastic_synapse(self):
+        """
+        Quantized weights are only available for non-plastic synapses.
+        """
+        pop = Population(3, Neuron(equations="r = 0.0"))
+        with self.assertRaises(ANNarchyException):
+            Projection(pop, pop, "exc", Synapse(equations="w = 0.0"), weight_dtype='int8')
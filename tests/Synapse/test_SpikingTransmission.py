@@ -237,3 +237,16 @@ class test_SpikeTransmissionNonUniformDelay():
         # 1st neuron gets 2 events at t==2, 2 events at t==3 and 1 event at t==4
         # 2nd neuron gets 1 event at t==2, 2 events at t==3, and 2 evets at t==4
         numpy.testing.assert_allclose(g_exc_data, [[0., 0.], [0., 0.], [2., 1.], [2., 2.], [1., 2.]])
+
+    def test_increased_max_delay(self):
+        """
+        Increasing the maximal delay during the simulation must keep the events
+        which are already stored in the ring buffer.
+        """
+        self.test_proj._set_delay([[5.0, 5.0, 5.0, 5.0, 5.0], [1.0, 1.0, 1.0, 1.0, 1.0]])
+        self.test_net.simulate(3)
+        # the events of the 1st neuron are still pending
+        self.test_proj._set_delay([[12.0, 12.0, 12.0, 12.0, 12.0], [12.0, 12.0, 12.0, 12.0, 12.0]])
+        self.test_net.simulate(5)
+        g_exc_data = self.test_g_exc_m.get('g_exc')
+        numpy.testing.assert_allclose(g_exc_data, [[0., 0.], [0., 0.], [0., 5.], [0., 0.], [0., 0.], [0., 0.], [5., 0.], [0., 0.]])
@@ -0,0 +1,16 @@
+/*
+ * pop0.cpp
+ *
+ * Generated by ANNarchy.
+ */
+#include "ANNarchy.h"
+
+// Instance
+PopStruct0 pop0;
+
+// Functions called by singleStep()
+
+void pop0_update() {
+	pop0.update();
+}
+
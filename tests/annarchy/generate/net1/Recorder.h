@@ -0,0 +1,129 @@
+#pragma once
+extern long int t;
+
+int addRecorder(class Monitor* recorder);
+Monitor* getRecorder(int id);
+void removeRecorder(class Monitor* recorder);
+
+/*
+ * Recorders
+ *
+ */
+class Monitor
+{
+public:
+    Monitor(std::vector<int> ranks, int period, int period_offset, long int offset) {
+        this->ranks = ranks;
+        this->period_ = period;
+        this->period_offset_ = period_offset;
+        this->offset_ = offset;
+        if(this->ranks.size() ==1 && this->ranks[0]==-1) // All neurons should be recorded
+            this->partial = false;
+        else
+            this->partial = true;
+    };
+
+    virtual ~Monitor() = default;
+
+    virtual void record() = 0;
+    virtual void record_targets() = 0;
+    virtual long int size_in_bytes() = 0;
+    virtual void clear() = 0;
+
+    // Attributes
+    bool partial;
+    std::vector<int> ranks;
+    int period_;
+    int period_offset_;
+    long int offset_;
+};
+
+class PopRecorder0 : public Monitor
+{
+protected:
+    PopRecorder0(std::vector<int> ranks, int period, int period_offset, long int offset)
+        : Monitor(ranks, period, period_offset, offset)
+    {
+    #ifdef _DEBUG
+        std::cout << "PopRecorder0 (" << this << ") instantiated." << std::endl;
+    #endif
+
+        this->r = std::vector< std::vector< double > >();
+        this->record_r = false; 
+    }
+
+public:
+    ~PopRecorder0() {
+    #ifdef _DEBUG
+        std::cout << "PopRecorder0::~PopRecorder0() - this = " << this << std::endl;
+    #endif
+    }
+
+    static int create_instance(std::vector<int> ranks, int period, int period_offset, long int offset) {
+        auto new_recorder = new PopRecorder0(ranks, period, period_offset, offset);
+        auto id = addRecorder(static_cast<Monitor*>(new_recorder));
+    #ifdef _DEBUG
+        std::cout << "PopRecorder0 (" << new_recorder << ") received list position (ID) = " << id << std::endl;
+    #endif
+        return id;
+    }
+
+    static PopRecorder0* get_instance(int id) {
+        return static_cast<PopRecorder0*>(getRecorder(id));
+    }
+
+    void record() {
+    #ifdef _TRACE_SIMULATION_STEPS
+        std::cout << "PopRecorder0::record()" << std::endl;
+    #endif
+
+        if(this->record_r && ( (t - this->offset_) % this->period_ == this->period_offset_ )){
+            if(!this->partial)
+                this->r.push_back(pop0.r);
+            else{
+                std::vector<double> tmp = std::vector<double>();
+                for (unsigned int i=0; i<this->ranks.size(); i++){
+                    tmp.push_back(pop0.r[this->ranks[i]]);
+                }
+                this->r.push_back(tmp);
+            }
+        }
+    }
+
+    void record_targets() {
+
+    }
+
+    long int size_in_bytes() {
+        long int size_in_bytes = 0;
+        
+        // local variable r
+        size_in_bytes += sizeof(std::vector<double>) * r.capacity();
+        for(auto it=r.begin(); it!= r.end(); it++) {
+            size_in_bytes += it->capacity() * sizeof(double);
+        }
+        return size_in_bytes;
+    }
+
+    void clear() {
+    #ifdef _DEBUG
+        std::cout << "PopRecorder0::clear() - this = " << this << std::endl;
+    #endif
+
+        for(auto it = this->r.begin(); it != this->r.end(); it++) {
+            it->clear();
+            it->shrink_to_fit();
+        }
+        this->r.clear();
+    
+
+        removeRecorder(this);
+    }
+
+
+
+    // Local variable r
+    std::vector< std::vector< double > > r ;
+    bool record_r ; 
+};
+
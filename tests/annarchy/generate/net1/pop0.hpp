@@ -0,0 +1,209 @@
+/*
+ *  ANNarchy-version: 4.8.0
+ */
+#pragma once
+
+#include "ANNarchy.h"
+#include <random>
+
+
+
+extern double dt;
+extern long int t;
+extern std::vector<std::mt19937> rng;
+
+
+///////////////////////////////////////////////////////////////
+// Main Structure for the population of id 0 (pop0)
+///////////////////////////////////////////////////////////////
+struct PopStruct0{
+
+    int size; // Number of neurons
+    bool _active; // Allows to shut down the whole population
+    int max_delay; // Maximum number of steps to store for delayed synaptic transmission
+
+    // Access functions used by cython wrapper
+    int get_size() { return size; }
+    void set_size(int s) { size  = s; }
+    int get_max_delay() { return max_delay; }
+    void set_max_delay(int d) { max_delay  = d; }
+    bool is_active() { return _active; }
+    void set_active(bool val) { _active = val; }
+
+
+
+    // Neuron specific parameters and variables
+
+    // Local variable r
+    std::vector< double > r;
+
+    // Random numbers
+
+
+
+
+
+    // Access methods to the parameters and variables
+
+    std::vector<double> get_local_attribute_all_double(std::string name) {
+
+        // Local variable r
+        if ( name.compare("r") == 0 ) {
+            return r;
+        }
+
+
+        // should not happen
+        std::cerr << "PopStruct0::get_local_attribute_all_double: " << name << " not found" << std::endl;
+        return std::vector<double>();
+    }
+
+    double get_local_attribute_double(std::string name, int rk) {
+        assert( (rk < size) );
+
+        // Local variable r
+        if ( name.compare("r") == 0 ) {
+            return r[rk];
+        }
+
+
+        // should not happen
+        std::cerr << "PopStruct0::get_local_attribute_double: " << name << " not found" << std::endl;
+        return static_cast<double>(0.0);
+    }
+
+    void set_local_attribute_all_double(std::string name, std::vector<double> value) {
+        assert( (value.size() == size) );
+
+        // Local variable r
+        if ( name.compare("r") == 0 ) {
+            r = value;
+            return;
+        }
+
+
+        // should not happen
+        std::cerr << "PopStruct0::set_local_attribute_all_double: " << name << " not found" << std::endl;
+    }
+
+    void set_local_attribute_double(std::string name, int rk, double value) {
+        assert( (rk < size) );
+
+        // Local variable r
+        if ( name.compare("r") == 0 ) {
+            r[rk] = value;
+            return;
+        }
+
+
+        // should not happen
+        std::cerr << "PopStruct0::set_local_attribute_double: " << name << " not found" << std::endl;
+    }
+
+
+
+    // Method called to initialize the data structures
+    void init_population() {
+    #ifdef _DEBUG
+        std::cout << "PopStruct0::init_population(size="<<this->size<<") - this = " << this << std::endl;
+    #endif
+        _active = true;
+
+        // Local variable r
+        r = std::vector<double>(size, 0.0);
+
+
+
+
+
+
+    }
+
+    // Method called to reset the population
+    void reset() {
+
+
+
+    }
+
+    // Method to draw new random numbers
+    void update_rng() {
+#ifdef _TRACE_SIMULATION_STEPS
+    std::cout << "    PopStruct0::update_rng()" << std::endl;
+#endif
+
+    }
+
+    // Method to update global operations on the population (min/max/mean...)
+    void update_global_ops() {
+
+    }
+
+    // Method to enqueue output variables in case outgoing projections have non-zero delay
+    void update_delay() {
+
+    }
+
+    // Method to dynamically change the size of the queue for delayed variables
+    void update_max_delay(int value) {
+
+    }
+
+    // Main method to update neural variables
+    void update() {
+
+        if( _active ) {
+        #ifdef _TRACE_SIMULATION_STEPS
+            std::cout << "    PopStruct0::update()" << std::endl;
+        #endif
+
+            // Updating the local variables
+            #pragma omp simd
+            for(int i = 0; i < size; i++){
+
+                // r = t
+                r[i] = (double(t)*dt);
+
+
+            }
+        } // active
+
+    }
+
+    void spike_gather() {
+
+    }
+
+
+
+    // Memory management: track the memory consumption
+    long int size_in_bytes() {
+        long int size_in_bytes = 0;
+        // Parameters
+        // Variables
+        size_in_bytes += sizeof(std::vector<double>) + sizeof(double) * r.capacity();	// r
+        // RNGs
+
+        return size_in_bytes;
+    }
+
+    // Memory management: destroy all the C++ data
+    void clear() {
+#ifdef _DEBUG
+    std::cout << "PopStruct0::clear() - this = " << this << std::endl;
+#endif
+
+            #ifdef _DEBUG
+                std::cout << "PopStruct0::clear()" << std::endl;
+            #endif
+        // Parameters
+
+        // Variables
+        r.clear();
+        r.shrink_to_fit();
+
+        // RNGs
+
+    }
+};
+